@@ -0,0 +1,332 @@
+# ============================================================================
+# AUDIO_BENCH.PY - MICROBENCHMARK DEL ANÁLISIS DE AUDIO CON SEÑALES SINTÉTICAS
+# ============================================================================
+# Mide el coste de AudioHandler.process_audio() bloque a bloque sin tarjeta de
+# sonido ni sounddevice: los bloques se generan aquí y se meten en la cola del
+# analizador igual que lo haría el callback de captura.
+#
+# Señales (deterministas, con semilla fija):
+# - sine_sweep:  barrido logarítmico 20 Hz → 16 kHz
+# - pink_noise:  ruido rosa (1/f) generado en frecuencia
+# - click_track: clics de 5 ms a un BPM conocido
+# - silence:     ceros (camino de "sin música")
+#
+# Para cada combinación señal × NUM_SAMPLES × SAMPLERATE se informa:
+# - µs/bloque (media y mediana), p99 y máximo
+# - % del presupuesto de tiempo real (duración del bloque de audio)
+# - Memoria: pico asignado durante un bloque y memoria retenida tras todos
+#   (tracemalloc, en una pasada aparte para no falsear los tiempos)
+#
+# Uso:
+#   python audio_bench.py
+#   python audio_bench.py --sizes 1024 2048 --rates 48000 --output base.json
+#   python audio_bench.py --baseline base.json --tolerance 0.10
+# Con --baseline se compara contra un JSON anterior y el proceso termina con
+# código 1 si alguna combinación empeora más de la tolerancia.
+# ============================================================================
+
+import argparse
+import io
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager, redirect_stdout
+import numpy as np
+import config
+from audio_handler import AudioHandler
+from realtime_log import LOG
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+
+CLICK_TRACK_BPM: float = 120.0
+SIGNAL_SEED: int = 1234
+
+
+# ============================================================================
+# SEÑALES SINTÉTICAS
+# ============================================================================
+
+def sine_sweep(num_samples: int, samplerate: int, rng: np.random.Generator) -> np.ndarray:
+    """Barrido exponencial de 20 Hz a 16 kHz (o Nyquist) a lo largo de toda la señal."""
+    duration = num_samples / samplerate
+    f0, f1 = 20.0, min(16000.0, samplerate / 2.0 * 0.95)
+    t = np.arange(num_samples) / samplerate
+    k = np.log(f1 / f0) / duration
+    phase = 2.0 * np.pi * f0 * (np.exp(k * t) - 1.0) / k
+    return (0.5 * np.sin(phase)).astype(np.float32)
+
+
+def pink_noise(num_samples: int, samplerate: int, rng: np.random.Generator) -> np.ndarray:
+    """Ruido rosa: ruido blanco con el espectro escalado por 1/sqrt(f)."""
+    spectrum = np.fft.rfft(rng.standard_normal(num_samples))
+    freqs = np.fft.rfftfreq(num_samples)
+    freqs[0] = freqs[1]
+    noise = np.fft.irfft(spectrum / np.sqrt(freqs), num_samples)
+    return (0.3 * noise / np.max(np.abs(noise))).astype(np.float32)
+
+
+def click_track(num_samples: int, samplerate: int, rng: np.random.Generator) -> np.ndarray:
+    """Clics de 5 ms (ruido con caída exponencial) a CLICK_TRACK_BPM."""
+    signal = np.zeros(num_samples, dtype=np.float32)
+    click_length = int(0.005 * samplerate)
+    click = (rng.uniform(-1.0, 1.0, click_length) *
+             np.exp(-np.linspace(0.0, 6.0, click_length))).astype(np.float32)
+    period = int(round(60.0 / CLICK_TRACK_BPM * samplerate))
+    for start in range(0, num_samples - click_length, period):
+        signal[start:start + click_length] = 0.8 * click
+    return signal
+
+
+def silence(num_samples: int, samplerate: int, rng: np.random.Generator) -> np.ndarray:
+    """Silencio digital."""
+    return np.zeros(num_samples, dtype=np.float32)
+
+
+SIGNALS: Dict[str, Callable[[int, int, np.random.Generator], np.ndarray]] = {
+    'sine_sweep': sine_sweep,
+    'pink_noise': pink_noise,
+    'click_track': click_track,
+    'silence': silence,
+}
+
+
+def make_blocks(signal_name: str, block_size: int, samplerate: int, num_blocks: int) -> List[np.ndarray]:
+    """
+    Genera una señal sintética continua y la trocea en bloques de captura.
+
+    Returns:
+        Lista de bloques float32 contiguos de block_size muestras
+    """
+    rng = np.random.default_rng(SIGNAL_SEED)
+    signal = SIGNALS[signal_name](block_size * num_blocks, samplerate, rng)
+    return [np.ascontiguousarray(block) for block in signal.reshape(num_blocks, block_size)]
+
+
+# ============================================================================
+# MEDICIÓN
+# ============================================================================
+
+@contextmanager
+def audio_config(num_samples: int, samplerate: int) -> Iterator[None]:
+    """Fija NUM_SAMPLES y SAMPLERATE mientras dura el bloque 'with'."""
+    saved = (config.NUM_SAMPLES, config.SAMPLERATE)
+    config.NUM_SAMPLES, config.SAMPLERATE = num_samples, samplerate
+    try:
+        yield
+    finally:
+        config.NUM_SAMPLES, config.SAMPLERATE = saved
+
+
+def offline_handler() -> AudioHandler:
+    """Analizador sin dispositivo de captura (y sin su mensaje de inicio)."""
+    with redirect_stdout(io.StringIO()):
+        return AudioHandler(capture=False)
+
+
+def _run_blocks(handler: AudioHandler, blocks: List[np.ndarray]) -> List[int]:
+    """
+    Pasa los bloques por la cola del analizador y process_audio().
+
+    Returns:
+        Duración de cada process_audio() en nanosegundos
+    """
+    durations = []
+    for block in blocks:
+        handler.audio_queue.put_nowait(block)
+        begin = time.perf_counter_ns()
+        features = handler.process_audio()
+        durations.append(time.perf_counter_ns() - begin)
+        if features is None:
+            # process_audio() informa del error por el anillo de log: se vuelca aquí
+            LOG.drain()
+            raise RuntimeError("process_audio() no devolvió rasgos (ver error arriba)")
+    return durations
+
+
+def _measure_memory(handler: AudioHandler, blocks: List[np.ndarray]) -> Tuple[float, int]:
+    """
+    Memoria asignada por process_audio() según tracemalloc.
+
+    Returns:
+        (mediana del pico por bloque en bytes, bytes retenidos tras todos los bloques)
+    """
+    peaks = []
+    tracemalloc.start()
+    try:
+        start_bytes = tracemalloc.get_traced_memory()[0]
+        for block in blocks:
+            handler.audio_queue.put_nowait(block)
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+            handler.process_audio()
+            peaks.append(tracemalloc.get_traced_memory()[1] - before)
+        retained = tracemalloc.get_traced_memory()[0] - start_bytes
+    finally:
+        tracemalloc.stop()
+    return float(np.median(peaks)), retained
+
+
+def bench_case(signal_name: str, num_samples: int, samplerate: int,
+               num_blocks: int, warmup: int) -> Dict[str, Any]:
+    """
+    Mide una combinación señal × tamaño de bloque × frecuencia de muestreo.
+
+    Returns:
+        Diccionario con los tiempos (µs) y la memoria (KiB) de la combinación
+    """
+    with audio_config(num_samples, samplerate):
+        blocks = make_blocks(signal_name, num_samples, samplerate, warmup + num_blocks)
+
+        # Pasada de tiempos (sin tracemalloc, que ralentiza cada asignación)
+        handler = offline_handler()
+        _run_blocks(handler, blocks[:warmup])
+        durations_us = np.array(_run_blocks(handler, blocks[warmup:]), dtype=np.float64) / 1000.0
+
+        # Pasada de memoria con un analizador nuevo (mismo historial que la de tiempos)
+        handler = offline_handler()
+        _run_blocks(handler, blocks[:warmup])
+        peak_bytes, retained_bytes = _measure_memory(handler, blocks[warmup:])
+
+    block_us = num_samples / samplerate * 1e6
+    mean_us = float(np.mean(durations_us))
+    return {
+        'signal': signal_name,
+        'num_samples': num_samples,
+        'samplerate': samplerate,
+        'blocks': num_blocks,
+        'mean_us': mean_us,
+        'median_us': float(np.median(durations_us)),
+        'p99_us': float(np.percentile(durations_us, 99)),
+        'max_us': float(np.max(durations_us)),
+        'budget_pct': mean_us / block_us * 100.0,
+        'peak_kib_per_block': peak_bytes / 1024.0,
+        'retained_kib': retained_bytes / 1024.0,
+    }
+
+
+def case_key(result: Dict[str, Any]) -> Tuple[str, int, int]:
+    """Clave que identifica una combinación en los informes y el baseline."""
+    return (result['signal'], result['num_samples'], result['samplerate'])
+
+
+# ============================================================================
+# INFORME Y COMPARACIÓN
+# ============================================================================
+
+def print_results(results: List[Dict[str, Any]]) -> None:
+    """Imprime la tabla de resultados."""
+    print("\n" + "=" * 98)
+    print("   🎵 BENCHMARK DEL ANÁLISIS DE AUDIO (process_audio)")
+    print("=" * 98)
+    print(f"   {'Señal':<12}{'Bloque':>7}{'Hz':>7}{'media µs':>11}{'mediana':>10}{'p99 µs':>10}"
+          f"{'máx µs':>10}{'% budget':>10}{'pico KiB':>10}{'ret. KiB':>10}")
+    for r in results:
+        print(f"   {r['signal']:<12}{r['num_samples']:>7}{r['samplerate']:>7}{r['mean_us']:>11.1f}"
+              f"{r['median_us']:>10.1f}{r['p99_us']:>10.1f}{r['max_us']:>10.1f}{r['budget_pct']:>9.2f}%"
+              f"{r['peak_kib_per_block']:>10.1f}{r['retained_kib']:>10.1f}")
+    print("=" * 98)
+
+
+def compare_with_baseline(results: List[Dict[str, Any]], baseline: Dict[str, Any],
+                          tolerance: float) -> bool:
+    """
+    Compara media y p99 con un informe anterior.
+
+    Args:
+        results: Resultados de esta ejecución
+        baseline: Informe JSON anterior (ver save_report)
+        tolerance: Empeoramiento relativo admitido (0.10 = 10 %)
+
+    Returns:
+        True si ninguna combinación empeora más de la tolerancia
+    """
+    previous = {case_key(r): r for r in baseline.get('results', [])}
+    ok = True
+
+    print(f"\n   📊 Comparación con el baseline ({baseline.get('meta', {}).get('timestamp', '?')}), "
+          f"tolerancia {tolerance * 100:.0f} %")
+    print(f"   {'Señal':<12}{'Bloque':>7}{'Hz':>7}{'media':>18}{'p99':>18}")
+    for r in results:
+        old = previous.get(case_key(r))
+        if old is None:
+            print(f"   {r['signal']:<12}{r['num_samples']:>7}{r['samplerate']:>7}   (sin baseline)")
+            continue
+        mean_delta = r['mean_us'] / old['mean_us'] - 1.0 if old['mean_us'] > 0 else 0.0
+        p99_delta = r['p99_us'] / old['p99_us'] - 1.0 if old['p99_us'] > 0 else 0.0
+        regression = mean_delta > tolerance or p99_delta > tolerance
+        ok = ok and not regression
+        mark = "❌" if regression else "✅"
+        print(f"   {r['signal']:<12}{r['num_samples']:>7}{r['samplerate']:>7}"
+              f"{r['mean_us']:>9.1f} µs {mean_delta * 100:>+5.1f}%"
+              f"{r['p99_us']:>9.1f} µs {p99_delta * 100:>+5.1f}%  {mark}")
+    return ok
+
+
+def save_report(path: str, results: List[Dict[str, Any]], args: argparse.Namespace) -> None:
+    """Guarda los resultados y el entorno de la medición en JSON."""
+    report = {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'processor': platform.processor(),
+            'blocks': args.blocks,
+            'warmup': args.warmup,
+        },
+        'results': results,
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"💾 Resultados guardados en {path}")
+
+
+def parse_args() -> argparse.Namespace:
+    """Argumentos de línea de comandos."""
+    parser = argparse.ArgumentParser(description="Microbenchmark del análisis de audio")
+    parser.add_argument('--signals', nargs='+', choices=list(SIGNALS), default=list(SIGNALS),
+                        help="Señales sintéticas a medir")
+    parser.add_argument('--sizes', nargs='+', type=int, default=[1024, 2048, 4096],
+                        help="Valores de NUM_SAMPLES (potencias de 2)")
+    parser.add_argument('--rates', nargs='+', type=int, default=[44100, 48000],
+                        help="Valores de SAMPLERATE")
+    parser.add_argument('--blocks', type=int, default=500, help="Bloques medidos por combinación")
+    parser.add_argument('--warmup', type=int, default=50,
+                        help="Bloques iniciales descartados (cachés y umbral adaptativo)")
+    parser.add_argument('--output', help="Fichero JSON donde guardar los resultados")
+    parser.add_argument('--baseline', help="JSON de una ejecución anterior con el que comparar")
+    parser.add_argument('--tolerance', type=float, default=0.10,
+                        help="Empeoramiento relativo admitido frente al baseline")
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    for size in args.sizes:
+        if size <= 0 or size & (size - 1):
+            print(f"❌ NUM_SAMPLES debe ser potencia de 2: {size}")
+            return 2
+
+    results = []
+    for size in args.sizes:
+        for rate in args.rates:
+            for signal_name in args.signals:
+                results.append(bench_case(signal_name, size, rate, args.blocks, args.warmup))
+
+    print_results(results)
+    if args.output:
+        save_report(args.output, results, args)
+
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        if not compare_with_baseline(results, baseline, args.tolerance):
+            print("❌ Hay combinaciones más lentas que el baseline")
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
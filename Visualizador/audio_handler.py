@@ -4,87 +4,204 @@
 # Este módulo maneja toda la captura, análisis y procesamiento de audio.
 # Implementa detección de beats, análisis frecuencial por bandas (bass, mid, treble),
 # y suavizado temporal para obtener datos estables y reactivos a la música.
+# El resultado de cada bloque son unos AudioFeatures: cómo afectan al estado
+# del visualizador (beats, partículas, patrones) lo decide simulation.step().
+#
+# sounddevice solo hace falta para capturar: el análisis (analyze_block) se
+# puede usar sin él, p. ej. desde los benchmarks de audio_bench.py.
+# Opcionalmente cada bloque analizado se graba en una traza (feature_trace.py).
 # ============================================================================
 
-import sounddevice as sd
 import numpy as np
 import queue
 import config
-import sys
+import time
 from collections import deque
-from typing import Optional, Dict, Any
+from simulation import AudioFeatures
+from metrics import REGISTRY, ANALYSIS_US_BUCKETS
+from realtime_log import LOG, WARNING, ERROR
+from feature_trace import FeatureTraceWriter
+from typing import Optional, Any
 # No se necesita 'random' aquí
 
+try:
+    import sounddevice as sd
+except (ImportError, OSError):
+    # OSError: sounddevice instalado pero sin la librería PortAudio
+    sd = None
+
+
+# Flags de estado del callback de sounddevice (bit i = CALLBACK_FLAGS[i])
+CALLBACK_FLAGS = ('input_underflow', 'input_overflow', 'output_underflow', 'output_overflow', 'priming_output')
+
+
+def _format_callback_status(args: tuple, text: str) -> str:
+    flags = int(args[0])
+    names = [name for bit, name in enumerate(CALLBACK_FLAGS) if flags & (1 << bit)]
+    return f"⚠️  Audio callback status: {', '.join(names) or 'desconocido'}"
+
+
+# Mensajes del hilo de audio y del análisis: nunca print() en el camino caliente
+_LOG_CALLBACK_STATUS = LOG.message(WARNING, "⚠️  Audio callback status", _format_callback_status)
+_LOG_CALLBACK_ERROR = LOG.message(ERROR, "❌ Error en audio callback: {text}")
+_LOG_ANALYSIS_ERROR = LOG.message(ERROR, "❌ Error procesando audio: {text}")
+
+
+def find_loopback_device() -> Optional[int]:
+    """
+    Busca el dispositivo de captura de audio especificado en config.
+    Es independiente de AudioHandler para poder lanzarla en segundo plano
+    durante el arranque (sd.query_devices puede tardar).
+    """
+    if sd is None:
+        print("❌ sounddevice no está disponible: no se puede capturar audio")
+        return None
+
+    try:
+        devices = sd.query_devices()
+        
+        for i, device in enumerate(devices):
+            device_dict = device  # type: ignore
+            if config.DEVICE_NAME in str(device_dict.get('name', '')) and device_dict.get('max_input_channels', 0) > 0:
+                print(f"✅ Dispositivo de audio encontrado: '{device_dict['name']}' (ID: {i})")
+                print(f"   Canales: {device_dict.get('max_input_channels', 0)}, "
+                      f"Sample Rate: {device_dict.get('default_samplerate', 0)} Hz")
+                return i
+        
+        print(f"⚠️  No se encontró '{config.DEVICE_NAME}'. Intentando dispositivo predeterminado.")
+        default_device_tuple = sd.default.device  # type: ignore
+        if default_device_tuple and len(default_device_tuple) > 0:
+            default_device = default_device_tuple[0] if isinstance(default_device_tuple, (list, tuple)) else default_device_tuple
+            if default_device is not None:
+                print(f"   Usando dispositivo predeterminado (ID: {default_device})")
+                return int(default_device)
+        
+        print("❌ No hay dispositivos de entrada disponibles")
+        return None
+        
+    except Exception as e:
+        print(f"❌ Error buscando dispositivos de audio: {e}")
+        return None
+
+
+class AnalysisTables:
+    """
+    Tablas precalculadas del análisis para un tamaño de bloque (NUM_SAMPLES).
+    Se sustituyen enteras (live_config.py las prepara fuera del hilo de render),
+    así que un bloque nunca se analiza con tablas de dos tamaños distintos.
+    """
+
+    def __init__(self, num_samples: int):
+        self.num_samples = num_samples
+        self.hann_window: np.ndarray = np.hanning(num_samples)
+
+        # Índices precalculados para el espectro logarítmico y la forma de onda
+        self.spectrum_bin_starts: np.ndarray = self._compute_log_bin_starts(num_samples)
+        self.waveform_indices: np.ndarray = np.linspace(
+            0, num_samples - 1, config.WAVEFORM_SAMPLES
+        ).astype(np.int64)
+        # Normaliza la FFT con ventana Hann a amplitud de seno (pico = A * N / 4)
+        self.spectrum_scale: float = 4.0 / num_samples
+
+    @staticmethod
+    def _compute_log_bin_starts(num_samples: int) -> np.ndarray:
+        """
+        Calcula el primer bin FFT de cada banda logarítmica del espectro.
+        Las bandas graves que caen dentro de un mismo bin FFT reutilizan su valor.
+        """
+        nyquist = config.SAMPLERATE / 2.0
+        num_fft_bins = num_samples // 2 + 1
+        edges = np.geomspace(config.SPECTRUM_MIN_FREQ, nyquist, config.SPECTRUM_BINS + 1)
+        starts = np.floor(edges[:-1] / nyquist * (num_fft_bins - 1)).astype(np.int64)
+        return np.clip(starts, 0, num_fft_bins - 1)
+
+
 class AudioHandler:
     """
     Gestor de audio que captura sonido del sistema y lo analiza en tiempo real.
     """
     
-    def __init__(self):
-        """Inicializa el manejador de audio y encuentra el dispositivo de captura."""
+    def __init__(self, device_id: Optional[int] = None, capture: bool = True,
+                 trace_path: Optional[str] = None):
+        """
+        Inicializa el manejador de audio y encuentra el dispositivo de captura.
+        
+        Args:
+            device_id: Dispositivo ya localizado en el arranque (si es None se busca)
+            capture: Si es False no se busca dispositivo (solo análisis offline)
+            trace_path: Fichero donde grabar los rasgos de cada bloque (None = no grabar)
+        """
         self.audio_queue: queue.Queue = queue.Queue(maxsize=10)
-        self.device_id: Optional[int] = self._find_loopback_device()
+        self.device_id: Optional[int] = device_id
+        if self.device_id is None and capture:
+            self.device_id = find_loopback_device()
         self.stream: Optional[sd.InputStream] = None
         
-        self.amplitude_buffer: deque = deque(maxlen=config.AUDIO_SMOOTHING_FRAMES)
         self.bass_buffer: deque = deque(maxlen=config.AUDIO_SMOOTHING_FRAMES)
         self.mid_buffer: deque = deque(maxlen=config.AUDIO_SMOOTHING_FRAMES)
         self.treble_buffer: deque = deque(maxlen=config.AUDIO_SMOOTHING_FRAMES)
         
         self.adaptive_threshold: float = config.BEAT_THRESHOLD
         self.beat_energy_history: deque = deque(maxlen=50)
-        self.hann_window: np.ndarray = np.hanning(config.NUM_SAMPLES)
         self.frames_processed: int = 0
         
+        # Tablas del análisis para el tamaño de bloque actual (ver AnalysisTables)
+        self.tables: AnalysisTables = AnalysisTables(config.NUM_SAMPLES)
+        
+        # Métricas: coste del análisis y salud de la captura
+        self.analysis_histogram = REGISTRY.histogram(
+            'analysis_us', "Tiempo de análisis por bloque de audio (µs)", ANALYSIS_US_BUCKETS)
+        self.overflow_counter = REGISTRY.counter('audio_input_overflow_total', "Desbordes de entrada del dispositivo")
+        self.underflow_counter = REGISTRY.counter('audio_input_underflow_total', "Bloques de entrada incompletos")
+        self.dropped_counter = REGISTRY.counter('audio_blocks_dropped_total',
+                                                "Bloques descartados con la cola de análisis llena")
+        
+        self.trace_writer: Optional[FeatureTraceWriter] = None
+        if trace_path:
+            try:
+                self.trace_writer = FeatureTraceWriter(trace_path)
+            except (OSError, ValueError) as e:
+                print(f"⚠️  No se puede grabar la traza en {trace_path}: {e}")
+        
         print("🎵 AudioHandler inicializado correctamente")
 
-    def _find_loopback_device(self) -> Optional[int]:
+    def _compute_log_spectrum(self, fft_data: np.ndarray, tables: 'AnalysisTables') -> np.ndarray:
         """
-        Busca el dispositivo de captura de audio especificado en config.
+        Reduce la FFT a SPECTRUM_BINS bandas logarítmicas normalizadas a [0, 1] (escala dB).
         """
-        try:
-            devices = sd.query_devices()
-            
-            for i, device in enumerate(devices):
-                device_dict = device  # type: ignore
-                if config.DEVICE_NAME in str(device_dict.get('name', '')) and device_dict.get('max_input_channels', 0) > 0:
-                    print(f"✅ Dispositivo de audio encontrado: '{device_dict['name']}' (ID: {i})")
-                    print(f"   Canales: {device_dict.get('max_input_channels', 0)}, "
-                          f"Sample Rate: {device_dict.get('default_samplerate', 0)} Hz")
-                    return i
-            
-            print(f"⚠️  No se encontró '{config.DEVICE_NAME}'. Intentando dispositivo predeterminado.")
-            default_device_tuple = sd.default.device  # type: ignore
-            if default_device_tuple and len(default_device_tuple) > 0:
-                default_device = default_device_tuple[0] if isinstance(default_device_tuple, (list, tuple)) else default_device_tuple
-                if default_device is not None:
-                    print(f"   Usando dispositivo predeterminado (ID: {default_device})")
-                    return int(default_device)
-            
-            print("❌ No hay dispositivos de entrada disponibles")
-            return None
-            
-        except Exception as e:
-            print(f"❌ Error buscando dispositivos de audio: {e}")
-            return None
+        # Pico de cada banda (reduceat repite el bin si la banda es más estrecha que un bin)
+        band_peaks = np.maximum.reduceat(fft_data, tables.spectrum_bin_starts) * tables.spectrum_scale
+        db = 20.0 * np.log10(band_peaks + 1e-9)
+        return np.clip(1.0 - db / config.SPECTRUM_DB_FLOOR, 0.0, 1.0).astype(np.float32)
 
-    def _audio_callback(self, indata: np.ndarray, frames: int, time: Any, status: sd.CallbackFlags) -> None:
+    def _audio_callback(self, indata: np.ndarray, frames: int, time: Any, status: Any) -> None:
         """
         Callback llamado por sounddevice cuando hay datos de audio disponibles.
         """
         if status:
-            print(f"⚠️  Audio callback status: {status}", file=sys.stderr)
+            # Contadores de salud del audio y registro de tamaño fijo (sin E/S en este hilo)
+            flags = 0
+            for bit, name in enumerate(CALLBACK_FLAGS):
+                if getattr(status, name, False):
+                    flags |= 1 << bit
+            if flags & 2:
+                self.overflow_counter.inc()
+            if flags & 1:
+                self.underflow_counter.inc()
+            LOG.log(_LOG_CALLBACK_STATUS, flags)
         
         try:
             mono_data = np.copy(indata[:, 0])
             if self.audio_queue.full():
+                # El análisis no da abasto: se descarta el bloque más antiguo
+                self.dropped_counter.inc()
                 try:
                     self.audio_queue.get_nowait()
                 except queue.Empty:
                     pass
             self.audio_queue.put_nowait(mono_data)
         except Exception as e:
-            print(f"❌ Error en audio callback: {e}", file=sys.stderr)
+            LOG.log(_LOG_CALLBACK_ERROR, text=str(e))
 
     def start_stream(self) -> bool:
         """
@@ -95,14 +212,7 @@ class AudioHandler:
             return False
         
         try:
-            self.stream = sd.InputStream(
-                device=self.device_id,
-                channels=1,
-                samplerate=config.SAMPLERATE,
-                blocksize=config.NUM_SAMPLES,
-                callback=self._audio_callback,
-                dtype=np.float32
-            )
+            self.stream = self._open_stream(config.NUM_SAMPLES)
             self.stream.start()
             print("=" * 70)
             print("🎵 VISUALIZADOR EN MARCHA - Reproduce música para ver los efectos")
@@ -112,6 +222,62 @@ class AudioHandler:
             print(f"❌ Error al iniciar el stream de audio: {e}")
             return False
 
+    def _open_stream(self, num_samples: int) -> Any:
+        """Abre (sin arrancar) un stream de captura con bloques de num_samples muestras."""
+        return sd.InputStream(
+            device=self.device_id,
+            channels=1,
+            samplerate=config.SAMPLERATE,
+            blocksize=num_samples,
+            callback=self._audio_callback,
+            dtype=np.float32
+        )
+
+    def prepare_block_size(self, num_samples: int) -> AnalysisTables:
+        """
+        Prepara un cambio de NUM_SAMPLES fuera del hilo de render: calcula las
+        tablas y, si hay captura, sustituye el stream por otro con el tamaño de
+        bloque nuevo. Hasta que el hilo de render adopta las tablas
+        (adopt_tables) los bloques del tamaño nuevo se descartan.
+        
+        Args:
+            num_samples: Tamaño de bloque nuevo (potencia de 2)
+        
+        Returns:
+            Tablas para adopt_tables()
+        
+        Raises:
+            Exception: Si no se puede abrir el stream nuevo (se mantiene el anterior)
+        """
+        tables = AnalysisTables(num_samples)
+        if self.stream is not None:
+            new_stream = self._open_stream(num_samples)
+            try:
+                # El nuevo arranca antes de parar el anterior: si falla, la captura sigue
+                new_stream.start()
+            except Exception:
+                new_stream.close()
+                raise
+            old_stream = self.stream
+            self.stream = new_stream
+            try:
+                old_stream.stop()
+                old_stream.close()
+            except Exception as e:
+                print(f"⚠️  Error al cerrar el stream anterior: {e}")
+        return tables
+
+    def adopt_tables(self, tables: AnalysisTables) -> None:
+        """Usa las tablas preparadas por prepare_block_size (hilo de render, entre frames)."""
+        self.tables = tables
+        if self.trace_writer is not None and self.trace_writer.num_samples != tables.num_samples:
+            # La cabecera de la traza describe el tamaño de bloque: se sigue en otro fichero
+            try:
+                self.trace_writer = self.trace_writer.rotate(tables.num_samples)
+            except (OSError, ValueError) as e:
+                print(f"⚠️  Grabación de la traza detenida: {e}")
+                self.trace_writer = None
+
     def stop_stream(self) -> None:
         """Detiene y cierra el stream de audio de forma segura."""
         if self.stream:
@@ -121,6 +287,15 @@ class AudioHandler:
                 print("🛑 Stream de audio detenido correctamente")
             except Exception as e:
                 print(f"⚠️  Error al detener el stream: {e}")
+        if self.trace_writer is not None:
+            self.trace_writer.close()
+            self.trace_writer = None
+
+    def _record(self, features: AudioFeatures) -> AudioFeatures:
+        """Graba los rasgos en la traza, si está activa."""
+        if self.trace_writer is not None:
+            self.trace_writer.append(features)
+        return features
 
     def _calculate_band_energy(self, fft_data: np.ndarray, fft_freqs: np.ndarray, 
                                freq_range: tuple) -> float:
@@ -151,76 +326,92 @@ class AudioHandler:
             )
             self.adaptive_threshold = np.clip(self.adaptive_threshold, 0.1, 0.5)
 
-    def process_audio(self, state: Dict[str, Any]) -> None:
+    def process_rms_gate(self) -> Optional[AudioFeatures]:
         """
-        Procesa los datos de audio disponibles y actualiza el estado del visualizador.
+        Análisis mínimo para el modo de ahorro de energía: solo RMS, sin FFT.
+        Vacía la cola para que al despertar se analice audio actual.
+        
+        Returns:
+            Rasgos con solo la amplitud, o None si no hay audio nuevo
+        """
+        data = None
+        try:
+            while True:
+                data = self.audio_queue.get_nowait()
+        except queue.Empty:
+            pass
+        
+        if data is None:
+            return None
+        
+        rms = np.sqrt(np.dot(data, data) / len(data))
+        return self._record(AudioFeatures(rms * config.SENSITIVITY, full_analysis=False))
+
+    def analyze_block(self, data: np.ndarray) -> AudioFeatures:
+        """
+        Analiza un bloque de audio (FFT, bandas, umbral de beat, RMS).
+        No depende del estado del visualizador: solo de los buffers del analizador.
+        
+        Args:
+            data: Bloque mono de config.NUM_SAMPLES muestras float32
+        
+        Returns:
+            Rasgos del bloque para simulation.step()
+        """
+        self.frames_processed += 1
+        tables = self.tables
+        
+        # ANÁLISIS FFT
+        windowed_data = data * tables.hann_window
+        fft_data = np.abs(np.fft.rfft(windowed_data))
+        fft_freqs = np.fft.rfftfreq(len(data), 1.0 / config.SAMPLERATE)
+        
+        # ANÁLISIS POR BANDAS
+        self.bass_buffer.append(self._calculate_band_energy(fft_data, fft_freqs, config.BASS_FREQ_RANGE))
+        self.mid_buffer.append(self._calculate_band_energy(fft_data, fft_freqs, config.MID_FREQ_RANGE))
+        self.treble_buffer.append(self._calculate_band_energy(fft_data, fft_freqs, config.TREBLE_FREQ_RANGE))
+        
+        # ENERGÍA DE BEAT Y UMBRAL ADAPTATIVO (el cooldown lo aplica simulation.step)
+        beat_mask = (fft_freqs >= config.BEAT_FREQ_RANGE[0]) & (fft_freqs <= config.BEAT_FREQ_RANGE[1])
+        total_energy = np.sum(fft_data)
+        beat_energy = np.sum(fft_data[beat_mask]) / total_energy if total_energy > 0 else 0.0
+        self._adapt_beat_threshold(beat_energy)
+        
+        # CÁLCULO DE AMPLITUD
+        rms = np.sqrt(np.mean(data**2))
+        
+        return AudioFeatures(
+            amplitude=float(rms * config.SENSITIVITY),
+            bass=float(np.mean(self.bass_buffer)),
+            mid=float(np.mean(self.mid_buffer)),
+            treble=float(np.mean(self.treble_buffer)),
+            beat_energy=float(beat_energy),
+            beat_threshold=float(self.adaptive_threshold),
+            # ESPECTRO COMPLETO Y FORMA DE ONDA (texturas del shader)
+            spectrum=self._compute_log_spectrum(fft_data, tables),
+            waveform=data[tables.waveform_indices].astype(np.float32),
+        )
+
+    def process_audio(self) -> Optional[AudioFeatures]:
+        """
+        Analiza el siguiente bloque de audio capturado, si lo hay.
+        
+        Returns:
+            Rasgos del bloque, o None si no hay audio nuevo (o falla el análisis)
         """
         try:
             data = self.audio_queue.get_nowait()
-            self.frames_processed += 1
-            
-            # ANÁLISIS FFT
-            windowed_data = data * self.hann_window
-            fft_data = np.abs(np.fft.rfft(windowed_data))
-            fft_freqs = np.fft.rfftfreq(len(data), 1.0 / config.SAMPLERATE)
-            
-            # ANÁLISIS POR BANDAS
-            bass_energy = self._calculate_band_energy(fft_data, fft_freqs, config.BASS_FREQ_RANGE)
-            mid_energy = self._calculate_band_energy(fft_data, fft_freqs, config.MID_FREQ_RANGE)
-            treble_energy = self._calculate_band_energy(fft_data, fft_freqs, config.TREBLE_FREQ_RANGE)
-            
-            self.bass_buffer.append(bass_energy)
-            self.mid_buffer.append(mid_energy)
-            self.treble_buffer.append(treble_energy)
-            
-            state['bass_energy'] = np.mean(self.bass_buffer) if self.bass_buffer else 0.0
-            state['mid_energy'] = np.mean(self.mid_buffer) if self.mid_buffer else 0.0
-            state['treble_energy'] = np.mean(self.treble_buffer) if self.treble_buffer else 0.0
-            
-            # DETECCIÓN DE BEATS
-            beat_mask = (fft_freqs >= config.BEAT_FREQ_RANGE[0]) & (fft_freqs <= config.BEAT_FREQ_RANGE[1])
-            beat_energy = np.sum(fft_data[beat_mask]) / np.sum(fft_data) if np.sum(fft_data) > 0 else 0
-            
-            self._adapt_beat_threshold(beat_energy)
-            
-            time_since_last_beat = state['current_time'] - state['beat_last_time']
-            is_beat = (beat_energy > self.adaptive_threshold and 
-                      time_since_last_beat > config.BEAT_COOLDOWN)
-            
-            if is_beat:
-                # ¡Beat detectado! Actualizar estado
-                state['beat_last_time'] = state['current_time']
-                state['beat_count'] += 1 # <--- SOLO INCREMENTA EL CONTADOR
-                state['beat_intensity'] = min(beat_energy / self.adaptive_threshold, 2.0)
-                
-                state['color_index'] = (state['color_index'] + 1) % len(config.COLOR_PALETTE)
-                
-                for i in range(config.RAYS_PER_BEAT):
-                    idx = (state['drop_index'] + i) % config.MAX_PARTICLES
-                    state['drop_positions'][idx] = np.random.rand(2).astype(np.float32)
-                    state['drop_times'][idx] = state['current_time']
-                
-                state['drop_index'] = (state['drop_index'] + config.RAYS_PER_BEAT) % config.MAX_PARTICLES
-                
-                # --- LA LÓGICA DE CAMBIO DE PATRÓN SE HA MOVIDO A MAIN.PY ---
-            
-            # CÁLCULO DE AMPLITUD
-            rms = np.sqrt(np.mean(data**2))
-            new_amplitude = rms * config.SENSITIVITY
-            state['current_amplitude'] = max(new_amplitude, state['current_amplitude'] * config.DECAY_RATE)
-            self.amplitude_buffer.append(state['current_amplitude'])
-            state['smoothed_amplitude'] = np.mean(self.amplitude_buffer) if self.amplitude_buffer else 0.0
-            
+            while len(data) != self.tables.num_samples:
+                # Bloque del tamaño anterior (o del nuevo aún sin tablas) tras cambiar NUM_SAMPLES
+                data = self.audio_queue.get_nowait()
         except queue.Empty:
-            # No hay datos de audio
-            state['current_amplitude'] *= config.DECAY_RATE
-            state['smoothed_amplitude'] *= config.DECAY_RATE
-            
-            if 'bass_energy' in state:
-                state['bass_energy'] *= config.DECAY_RATE
-                state['mid_energy'] *= config.DECAY_RATE
-                state['treble_energy'] *= config.DECAY_RATE
+            return None
         
+        try:
+            start = time.perf_counter()
+            features = self.analyze_block(data)
+            self.analysis_histogram.observe((time.perf_counter() - start) * 1e6)
+            return self._record(features)
         except Exception as e:
-            print(f"❌ Error procesando audio: {e}", file=sys.stderr)
-            state['current_amplitude'] *= config.DECAY_RATE
\ No newline at end of file
+            LOG.log(_LOG_ANALYSIS_ERROR, text=str(e))
+            return None
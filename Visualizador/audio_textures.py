@@ -0,0 +1,153 @@
+# ============================================================================
+# AUDIO_TEXTURES.PY - STREAMING DEL ANÁLISIS DE AUDIO A TEXTURAS GPU
+# ============================================================================
+# Publica en el shader el espectro completo (en bandas logarítmicas), la forma
+# de onda del último bloque y un espectrograma histórico:
+# - u_spectrum:    textura 1D (SPECTRUM_BINS texels)
+# - u_waveform:    textura 1D (WAVEFORM_SAMPLES texels)
+# - u_spectrogram: textura 2D en anillo (SPECTRUM_BINS x SPECTROGRAM_HISTORY)
+#
+# Las subidas se hacen con glTexSubImage a través de Pixel Buffer Objects
+# "huérfanos" (glBufferData con None antes de escribir), de modo que el driver
+# nunca tiene que esperar a que la GPU termine de leer el frame anterior.
+# El espectrograma solo sube una fila por bloque de audio: el historial
+# completo nunca se vuelve a enviar.
+# ============================================================================
+
+import ctypes
+from OpenGL.GL import *
+import numpy as np
+import config
+from typing import Dict, Any
+
+
+class AudioTextures:
+    """
+    Texturas de espectro, forma de onda y espectrograma alimentadas por PBO.
+
+    Solo sube datos cuando AudioHandler publica un bloque nuevo
+    (state['audio_frame'] cambia), no en cada frame de vídeo.
+    """
+
+    def __init__(self, spectrum_unit: int, waveform_unit: int, spectrogram_unit: int):
+        """
+        Crea las texturas y sus PBOs.
+
+        Args:
+            spectrum_unit: Unidad de textura para el espectro
+            waveform_unit: Unidad de textura para la forma de onda
+            spectrogram_unit: Unidad de textura para el espectrograma
+        """
+        self.spectrum_unit = spectrum_unit
+        self.waveform_unit = waveform_unit
+        self.spectrogram_unit = spectrogram_unit
+
+        self.spectrum_bins: int = config.SPECTRUM_BINS
+        self.waveform_samples: int = config.WAVEFORM_SAMPLES
+        self.history_rows: int = config.SPECTROGRAM_HISTORY
+
+        # Fila más reciente del espectrograma (anillo)
+        self.spectrogram_head: int = self.history_rows - 1
+        self.last_audio_frame: int = -1
+
+        self.spectrum_texture = self._create_texture_1d(spectrum_unit, self.spectrum_bins)
+        self.waveform_texture = self._create_texture_1d(waveform_unit, self.waveform_samples)
+        self.spectrogram_texture = self._create_spectrogram_texture()
+
+        # Un PBO por textura; se huerfanizan en cada subida
+        self.spectrum_pbo, self.waveform_pbo, self.spectrogram_pbo = glGenBuffers(3)
+
+        glActiveTexture(GL_TEXTURE0)
+
+    def _create_texture_1d(self, unit: int, width: int) -> int:
+        """Crea una textura 1D de un canal float inicializada a cero."""
+        texture = glGenTextures(1)
+        glActiveTexture(GL_TEXTURE0 + unit)
+        glBindTexture(GL_TEXTURE_1D, texture)
+        glTexParameteri(GL_TEXTURE_1D, GL_TEXTURE_MIN_FILTER, GL_LINEAR)
+        glTexParameteri(GL_TEXTURE_1D, GL_TEXTURE_MAG_FILTER, GL_LINEAR)
+        glTexParameteri(GL_TEXTURE_1D, GL_TEXTURE_WRAP_S, GL_CLAMP_TO_EDGE)
+        glTexImage1D(GL_TEXTURE_1D, 0, GL_R32F, width, 0, GL_RED, GL_FLOAT,
+                     np.zeros(width, dtype=np.float32))
+        return texture
+
+    def _create_spectrogram_texture(self) -> int:
+        """Crea la textura 2D del espectrograma (filas = instantes, en anillo)."""
+        texture = glGenTextures(1)
+        glActiveTexture(GL_TEXTURE0 + self.spectrogram_unit)
+        glBindTexture(GL_TEXTURE_2D, texture)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_LINEAR)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_LINEAR)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_S, GL_CLAMP_TO_EDGE)
+        # REPEAT en T: el shader lee el anillo sin tener que hacer mod()
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_T, GL_REPEAT)
+        glTexImage2D(GL_TEXTURE_2D, 0, GL_R32F, self.spectrum_bins, self.history_rows,
+                     0, GL_RED, GL_FLOAT,
+                     np.zeros((self.history_rows, self.spectrum_bins), dtype=np.float32))
+        return texture
+
+    def _stream_to_pbo(self, pbo: int, data: np.ndarray) -> None:
+        """
+        Copia 'data' a un PBO huérfano y lo deja enlazado como GL_PIXEL_UNPACK_BUFFER.
+        La llamada glTexSubImage posterior lee del PBO (offset 0).
+        """
+        glBindBuffer(GL_PIXEL_UNPACK_BUFFER, pbo)
+        # Orphaning: el driver entrega memoria nueva si la anterior sigue en uso
+        glBufferData(GL_PIXEL_UNPACK_BUFFER, data.nbytes, None, GL_STREAM_DRAW)
+        glBufferSubData(GL_PIXEL_UNPACK_BUFFER, 0, data.nbytes, data)
+
+    def update(self, state: Dict[str, Any]) -> None:
+        """
+        Sube el bloque de audio más reciente si es nuevo.
+
+        Args:
+            state: Estado global con 'spectrum', 'waveform' y 'audio_frame'
+        """
+        audio_frame = state.get('audio_frame', 0)
+        if audio_frame == self.last_audio_frame:
+            return
+        self.last_audio_frame = audio_frame
+
+        spectrum = np.ascontiguousarray(state['spectrum'], dtype=np.float32)
+        waveform = np.ascontiguousarray(state['waveform'], dtype=np.float32)
+
+        # Espectro actual
+        self._stream_to_pbo(self.spectrum_pbo, spectrum)
+        glActiveTexture(GL_TEXTURE0 + self.spectrum_unit)
+        glBindTexture(GL_TEXTURE_1D, self.spectrum_texture)
+        glTexSubImage1D(GL_TEXTURE_1D, 0, 0, self.spectrum_bins, GL_RED, GL_FLOAT, ctypes.c_void_p(0))
+
+        # Forma de onda
+        self._stream_to_pbo(self.waveform_pbo, waveform)
+        glActiveTexture(GL_TEXTURE0 + self.waveform_unit)
+        glBindTexture(GL_TEXTURE_1D, self.waveform_texture)
+        glTexSubImage1D(GL_TEXTURE_1D, 0, 0, self.waveform_samples, GL_RED, GL_FLOAT, ctypes.c_void_p(0))
+
+        # Espectrograma: solo la fila nueva
+        self.spectrogram_head = (self.spectrogram_head + 1) % self.history_rows
+        self._stream_to_pbo(self.spectrogram_pbo, spectrum)
+        glActiveTexture(GL_TEXTURE0 + self.spectrogram_unit)
+        glBindTexture(GL_TEXTURE_2D, self.spectrogram_texture)
+        glTexSubImage2D(GL_TEXTURE_2D, 0, 0, self.spectrogram_head, self.spectrum_bins, 1,
+                        GL_RED, GL_FLOAT, ctypes.c_void_p(0))
+
+        glBindBuffer(GL_PIXEL_UNPACK_BUFFER, 0)
+        glActiveTexture(GL_TEXTURE0)
+
+    def bind_uniforms(self, program: int) -> None:
+        """
+        Envía al programa las unidades de textura y la cabeza del anillo.
+
+        Args:
+            program: ID del programa de shaders activo
+        """
+        glUniform1i(glGetUniformLocation(program, "u_spectrum"), self.spectrum_unit)
+        glUniform1i(glGetUniformLocation(program, "u_waveform"), self.waveform_unit)
+        glUniform1i(glGetUniformLocation(program, "u_spectrogram"), self.spectrogram_unit)
+        glUniform1f(glGetUniformLocation(program, "u_spectrogram_head"), float(self.spectrogram_head))
+        glUniform1f(glGetUniformLocation(program, "u_spectrogram_rows"), float(self.history_rows))
+
+    def close(self) -> None:
+        """Libera texturas y buffers."""
+        glDeleteTextures([self.spectrum_texture, self.waveform_texture, self.spectrogram_texture])
+        glDeleteBuffers(3, [self.spectrum_pbo, self.waveform_pbo, self.spectrogram_pbo])
@@ -0,0 +1,378 @@
+# ============================================================================
+# BEAT_SWEEP.PY - BARRIDO DE PARÁMETROS DE DETECCIÓN DE BEATS (CALIDAD VS COSTE)
+# ============================================================================
+# Ejecuta el detector de beats real (AudioHandler.analyze_block + la decisión
+# con cooldown de simulation.step) sobre un corpus con beats anotados, para
+# cada combinación de:
+#     BEAT_THRESHOLD × BEAT_COOLDOWN × BEAT_THRESHOLD_ADAPTATION ×
+#     NUM_SAMPLES × BEAT_FREQ_RANGE
+#
+# Corpus:
+# - Ficheros WAV (PCM 8/16/24/32 bits) con sus anotaciones al lado: mismo
+#   nombre con extensión .beats o .txt, un beat por línea (segundos en la
+#   primera columna; el resto de columnas y las líneas con # se ignoran).
+# - Sin corpus: pistas sintéticas de bombo + hi-hat + ruido rosa a varios BPM.
+#
+# Cada par (combinación, pista) es una tarea de un pool de procesos. Por
+# combinación se informa:
+# - Precisión, recall y F-measure (ventana de acierto ±--window segundos)
+# - Error de onset (detección - anotación) medio y desviación, en ms. Incluye
+#   la latencia del bloque: un beat se detecta al terminar su bloque de audio
+# - Coste de CPU por bloque (tiempo de proceso de analyze_block), en µs
+#
+# La tabla final marca el frente de Pareto (ninguna otra combinación tiene
+# más F-measure con menos coste). El coste depende de la máquina: conviene
+# ejecutarlo en el equipo de cada sala.
+#
+# Uso:
+#   python beat_sweep.py
+#   python beat_sweep.py --corpus pistas/ --cooldowns 0.1 0.15 0.2 --sizes 1024 2048
+#   python beat_sweep.py --beat-ranges 20-150 20-500 --output sweep.json --all
+# ============================================================================
+
+import argparse
+import glob
+import itertools
+import json
+import os
+import sys
+import time
+import wave
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+import numpy as np
+import config
+from audio_bench import offline_handler, pink_noise
+from realtime_log import LOG
+from simulation import initialize_state, step
+from typing import Any, Dict, List, Tuple
+
+
+SYNTHETIC_BPMS: Tuple[float, ...] = (90.0, 120.0, 128.0, 140.0, 174.0)
+SYNTHETIC_DURATION: float = 30.0
+SYNTHETIC_SEED: int = 1234
+# Fijada al importar: run_task cambia config.SAMPLERATE según la pista
+SYNTHETIC_SAMPLERATE: int = config.SAMPLERATE
+
+
+# ============================================================================
+# CORPUS
+# ============================================================================
+
+def synthetic_track(bpm: float, samplerate: int, duration: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Pista sintética: bombo (seno con caída de tono 150 → 50 Hz) en cada beat,
+    hi-hat (ruido agudo) a contratiempo y un fondo de ruido rosa.
+
+    Returns:
+        (audio mono float32, instantes de los beats en segundos)
+    """
+    rng = np.random.default_rng(SYNTHETIC_SEED + int(bpm))
+    num_samples = int(duration * samplerate)
+    audio = 0.05 * pink_noise(num_samples, samplerate, rng).astype(np.float64)
+
+    # Bombo de 150 ms
+    t = np.arange(int(0.15 * samplerate)) / samplerate
+    frequency = 50.0 + 100.0 * np.exp(-t * 30.0)
+    kick = np.sin(2.0 * np.pi * np.cumsum(frequency) / samplerate) * np.exp(-t * 25.0)
+
+    # Hi-hat de 30 ms (ruido blanco diferenciado: sobre todo agudos)
+    hat_length = int(0.03 * samplerate)
+    hat = np.diff(rng.standard_normal(hat_length + 1)) * np.exp(-np.linspace(0.0, 8.0, hat_length))
+
+    period = 60.0 / bpm
+    beats = np.arange(period * 0.5, duration - 0.2, period)
+    for beat in beats:
+        start = int(beat * samplerate)
+        audio[start:start + len(kick)] += 0.8 * kick
+        offbeat = int((beat + period / 2.0) * samplerate)
+        audio[offbeat:offbeat + hat_length] += 0.15 * hat[:max(0, num_samples - offbeat)]
+    return audio.astype(np.float32), beats
+
+
+def load_wav(path: str) -> Tuple[np.ndarray, int]:
+    """
+    Lee un WAV PCM y lo mezcla a mono.
+
+    Returns:
+        (audio mono float32 en [-1, 1], frecuencia de muestreo)
+    """
+    with wave.open(path, 'rb') as wav:
+        channels = wav.getnchannels()
+        width = wav.getsampwidth()
+        samplerate = wav.getframerate()
+        raw = wav.readframes(wav.getnframes())
+
+    if width == 1:
+        samples = (np.frombuffer(raw, dtype=np.uint8).astype(np.float32) - 128.0) / 128.0
+    elif width == 2:
+        samples = np.frombuffer(raw, dtype='<i2').astype(np.float32) / 32768.0
+    elif width == 3:
+        # 24 bits: se colocan los 3 bytes en la parte alta de un int32
+        triplets = np.frombuffer(raw, dtype=np.uint8).reshape(-1, 3)
+        padded = np.zeros((len(triplets), 4), dtype=np.uint8)
+        padded[:, 1:] = triplets
+        samples = padded.view('<i4').reshape(-1).astype(np.float32) / 2147483648.0
+    elif width == 4:
+        samples = np.frombuffer(raw, dtype='<i4').astype(np.float32) / 2147483648.0
+    else:
+        raise ValueError(f"{path}: WAV de {width * 8} bits no soportado")
+
+    return samples.reshape(-1, channels).mean(axis=1).astype(np.float32), samplerate
+
+
+def load_annotations(wav_path: str) -> np.ndarray:
+    """Lee los beats anotados (.beats o .txt junto al WAV)."""
+    base = os.path.splitext(wav_path)[0]
+    for extension in ('.beats', '.txt'):
+        path = base + extension
+        if os.path.exists(path):
+            beats = []
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    fields = line.split('#', 1)[0].replace(',', ' ').split()
+                    if fields:
+                        beats.append(float(fields[0]))
+            return np.sort(np.array(beats, dtype=np.float64))
+    raise FileNotFoundError(f"{wav_path}: no hay anotaciones (.beats o .txt)")
+
+
+def find_corpus(paths: List[str]) -> List[str]:
+    """Expande directorios a sus WAV con anotaciones."""
+    tracks = []
+    for path in paths:
+        candidates = sorted(glob.glob(os.path.join(path, '*.wav'))) if os.path.isdir(path) else [path]
+        for candidate in candidates:
+            base = os.path.splitext(candidate)[0]
+            if os.path.exists(base + '.beats') or os.path.exists(base + '.txt'):
+                tracks.append(candidate)
+            else:
+                print(f"⚠️  {candidate}: sin anotaciones, se omite")
+    return tracks
+
+
+@lru_cache(maxsize=16)
+def load_track(track: str) -> Tuple[np.ndarray, int, np.ndarray]:
+    """
+    Carga una pista del corpus (cacheada por proceso del pool).
+
+    Args:
+        track: Ruta de un WAV, o 'synthetic:<bpm>'
+
+    Returns:
+        (audio, frecuencia de muestreo, beats anotados en segundos)
+    """
+    if track.startswith('synthetic:'):
+        audio, beats = synthetic_track(float(track.split(':', 1)[1]), SYNTHETIC_SAMPLERATE, SYNTHETIC_DURATION)
+        return audio, SYNTHETIC_SAMPLERATE, beats
+    audio, samplerate = load_wav(track)
+    return audio, samplerate, load_annotations(track)
+
+
+# ============================================================================
+# EVALUACIÓN
+# ============================================================================
+
+def match_beats(detected: np.ndarray, reference: np.ndarray, window: float) -> Tuple[int, List[float]]:
+    """
+    Emparejamiento uno a uno, en orden temporal, de detecciones y anotaciones.
+
+    Returns:
+        (aciertos, errores detección - anotación de cada acierto en segundos)
+    """
+    errors = []
+    i = j = 0
+    while i < len(detected) and j < len(reference):
+        error = detected[i] - reference[j]
+        if abs(error) <= window:
+            errors.append(float(error))
+            i += 1
+            j += 1
+        elif error < 0:
+            i += 1   # Falso positivo
+        else:
+            j += 1   # Beat anotado sin detectar
+    return len(errors), errors
+
+
+def run_task(params: Dict[str, Any], track: str, window: float) -> Dict[str, Any]:
+    """
+    Tarea del pool: una combinación de parámetros sobre una pista.
+
+    Returns:
+        Aciertos, detecciones, anotaciones, errores de onset y coste de CPU
+    """
+    audio, samplerate, reference = load_track(track)
+
+    # Cada proceso del pool tiene su propio módulo config
+    config.SAMPLERATE = samplerate
+    config.NUM_SAMPLES = params['num_samples']
+    config.BEAT_THRESHOLD = params['threshold']
+    config.BEAT_COOLDOWN = params['cooldown']
+    config.BEAT_THRESHOLD_ADAPTATION = params['adaptation']
+    config.BEAT_FREQ_RANGE = tuple(params['beat_range'])
+
+    handler = offline_handler()
+    state = initialize_state('admin', [0], 0, seed=0)
+    block_size = config.NUM_SAMPLES
+    dt = block_size / samplerate
+    num_blocks = len(audio) // block_size
+
+    detected = []
+    cpu_ns = 0
+    try:
+        for index in range(num_blocks):
+            block = audio[index * block_size:(index + 1) * block_size]
+            begin = time.process_time_ns()
+            features = handler.analyze_block(block)
+            cpu_ns += time.process_time_ns() - begin
+
+            beats_before = state['beats_detected']
+            step(state, features, dt)
+            if state['beats_detected'] > beats_before:
+                # El beat se conoce al terminar el bloque: current_time = fin del bloque
+                detected.append(state['current_time'])
+    finally:
+        # Sin hilo de vaciado en los procesos del pool: los avisos se escriben aquí
+        LOG.drain()
+
+    reference = reference[reference <= num_blocks * dt]
+    hits, errors = match_beats(np.array(detected), reference, window)
+    return {
+        'hits': hits,
+        'detected': len(detected),
+        'reference': len(reference),
+        'errors': errors,
+        'cpu_ns': cpu_ns,
+        'blocks': num_blocks,
+    }
+
+
+def summarize(params: Dict[str, Any], partials: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Agrega los resultados de todas las pistas de una combinación."""
+    hits = sum(p['hits'] for p in partials)
+    detected = sum(p['detected'] for p in partials)
+    reference = sum(p['reference'] for p in partials)
+    errors = np.array([e for p in partials for e in p['errors']], dtype=np.float64) * 1000.0
+    blocks = sum(p['blocks'] for p in partials)
+
+    precision = hits / detected if detected else 0.0
+    recall = hits / reference if reference else 0.0
+    f_measure = 2 * precision * recall / (precision + recall) if precision + recall > 0 else 0.0
+    return {
+        **params,
+        'precision': precision,
+        'recall': recall,
+        'f_measure': f_measure,
+        'onset_error_ms': float(np.mean(errors)) if len(errors) else None,
+        'onset_error_std_ms': float(np.std(errors)) if len(errors) else None,
+        'cpu_us_per_block': sum(p['cpu_ns'] for p in partials) / max(blocks, 1) / 1000.0,
+        'pareto': False,
+    }
+
+
+def mark_pareto(results: List[Dict[str, Any]]) -> None:
+    """Marca las combinaciones no dominadas (más F-measure y menos coste)."""
+    for r in results:
+        r['pareto'] = not any(
+            o['f_measure'] >= r['f_measure'] and o['cpu_us_per_block'] <= r['cpu_us_per_block'] and
+            (o['f_measure'] > r['f_measure'] or o['cpu_us_per_block'] < r['cpu_us_per_block'])
+            for o in results
+        )
+
+
+# ============================================================================
+# INFORME
+# ============================================================================
+
+def print_table(results: List[Dict[str, Any]], show_all: bool) -> None:
+    """Imprime las combinaciones ordenadas por coste (por defecto solo el frente de Pareto)."""
+    rows = sorted((r for r in results if show_all or r['pareto']),
+                  key=lambda r: (r['cpu_us_per_block'], -r['f_measure']))
+    print("\n" + "=" * 104)
+    print("   🥁 BARRIDO DE DETECCIÓN DE BEATS" + ("" if show_all else " - FRENTE DE PARETO"))
+    print("=" * 104)
+    print(f"   {'Umbral':>7}{'Cooldown':>9}{'Adapt.':>8}{'Bloque':>8}{'Rango Hz':>11}"
+          f"{'P':>7}{'R':>7}{'F':>7}{'Error ms':>10}{'± ms':>8}{'CPU µs':>9}  Pareto")
+    for r in rows:
+        error = f"{r['onset_error_ms']:>10.1f}{r['onset_error_std_ms']:>8.1f}" \
+            if r['onset_error_ms'] is not None else f"{'-':>10}{'-':>8}"
+        beat_range = f"{r['beat_range'][0]}-{r['beat_range'][1]}"
+        print(f"   {r['threshold']:>7.2f}{r['cooldown']:>9.2f}{r['adaptation']:>8.3f}{r['num_samples']:>8}"
+              f"{beat_range:>11}{r['precision']:>7.3f}{r['recall']:>7.3f}{r['f_measure']:>7.3f}"
+              f"{error}{r['cpu_us_per_block']:>9.1f}  {'★' if r['pareto'] else ''}")
+    print("=" * 104)
+    print(f"   {len(rows)} de {len(results)} combinaciones")
+
+
+def parse_range(text: str) -> Tuple[int, int]:
+    """Convierte '20-500' en (20, 500)."""
+    low, high = text.split('-', 1)
+    return int(low), int(high)
+
+
+def parse_args() -> argparse.Namespace:
+    """Argumentos de línea de comandos."""
+    parser = argparse.ArgumentParser(description="Barrido de parámetros de detección de beats")
+    parser.add_argument('--corpus', nargs='+', default=[],
+                        help="WAV o directorios con WAV anotados (por defecto, pistas sintéticas)")
+    parser.add_argument('--bpms', nargs='+', type=float, default=list(SYNTHETIC_BPMS),
+                        help="BPM de las pistas sintéticas")
+    parser.add_argument('--thresholds', nargs='+', type=float, default=[config.BEAT_THRESHOLD])
+    parser.add_argument('--cooldowns', nargs='+', type=float, default=[0.1, config.BEAT_COOLDOWN, 0.25])
+    parser.add_argument('--adaptations', nargs='+', type=float,
+                        default=[0.01, config.BEAT_THRESHOLD_ADAPTATION, 0.05])
+    parser.add_argument('--sizes', nargs='+', type=int, default=[1024, 2048, 4096],
+                        help="Valores de NUM_SAMPLES (potencias de 2)")
+    parser.add_argument('--beat-ranges', nargs='+', type=parse_range,
+                        default=[(20, 150), tuple(config.BEAT_FREQ_RANGE)],
+                        help="Rangos BEAT_FREQ_RANGE como LOW-HIGH en Hz")
+    parser.add_argument('--window', type=float, default=0.07,
+                        help="Tolerancia de acierto en segundos")
+    parser.add_argument('--jobs', type=int, default=os.cpu_count() or 1,
+                        help="Procesos del pool")
+    parser.add_argument('--all', action='store_true', help="Mostrar también las combinaciones dominadas")
+    parser.add_argument('--output', help="Fichero JSON donde guardar todos los resultados")
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    for size in args.sizes:
+        if size <= 0 or size & (size - 1):
+            print(f"❌ NUM_SAMPLES debe ser potencia de 2: {size}")
+            return 2
+
+    tracks = find_corpus(args.corpus) if args.corpus else [f'synthetic:{bpm:g}' for bpm in args.bpms]
+    if not tracks:
+        print("❌ El corpus no contiene pistas anotadas")
+        return 2
+
+    combinations = [
+        {'threshold': threshold, 'cooldown': cooldown, 'adaptation': adaptation,
+         'num_samples': size, 'beat_range': list(beat_range)}
+        for threshold, cooldown, adaptation, size, beat_range in itertools.product(
+            args.thresholds, args.cooldowns, args.adaptations, args.sizes, args.beat_ranges)
+    ]
+    print(f"🥁 {len(combinations)} combinaciones × {len(tracks)} pistas en {args.jobs} procesos...")
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+        futures = [[pool.submit(run_task, params, track, args.window) for track in tracks]
+                   for params in combinations]
+        results = [summarize(params, [future.result() for future in row])
+                   for params, row in zip(combinations, futures)]
+    print(f"   Terminado en {time.perf_counter() - start:.1f} s")
+
+    mark_pareto(results)
+    print_table(results, args.all)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump({'tracks': tracks, 'window': args.window, 'results': results}, f, indent=2)
+        print(f"💾 Resultados guardados en {args.output}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -7,8 +7,9 @@
 # ============================================================================
 
 import colorsys
+import glob
 import os
-from typing import Tuple, List
+from typing import Tuple, List, Dict, Any, Optional
 
 # ============================================================================
 # CONFIGURACIÓN DE PANTALLA
@@ -29,6 +30,26 @@ FULLSCREEN: bool = True
 # Activar VSync (sincronización vertical) para evitar screen tearing
 VSYNC: bool = True
 
+# Frame pacer: frames presentados sin esperas al arrancar para medir el refresco real
+FRAME_PACER_CALIBRATION_FRAMES: int = 30
+
+# Margen de seguridad (ms) entre el fin estimado del trabajo y el deadline de VSync
+# Más margen = menos frames fuera de plazo, pero audio muestreado antes
+FRAME_PACER_SAFETY_MS: float = 2.0
+
+# Últimos ms de cada espera en espera activa (time.sleep no es preciso)
+FRAME_PACER_SPIN_MS: float = 1.0
+
+# Número de intervalos entre frames usados para las estadísticas de jitter
+FRAME_PACER_HISTORY: int = 600
+
+# Frames emitidos que pueden estar pendientes en la GPU a la vez
+# 1 = mínima latencia: cada frame se presenta en la misma iteración en que se
+#     analiza su audio (la CPU espera a la GPU cada frame)
+# 2+ = la CPU analiza el frame siguiente mientras la GPU dibuja el actual; el
+#     frame se presenta una iteración después (un frame más de latencia)
+MAX_FRAMES_IN_FLIGHT: int = 2
+
 # ============================================================================
 # CONFIGURACIÓN DE AUDIO
 # ============================================================================
@@ -51,6 +72,12 @@ NUM_SAMPLES: int = 2048
 # Reduce variaciones bruscas en la amplitud
 AUDIO_SMOOTHING_FRAMES: int = 3
 
+# Grabación de rasgos de audio (feature_trace.py): si se indica una ruta, cada
+# bloque analizado se añade a ese fichero binario para repetir la sesión luego
+# sin audio (python main.py --replay-trace RUTA). None = no se graba
+# (también se puede activar con python main.py --record-trace RUTA)
+FEATURE_TRACE_PATH: Optional[str] = None
+
 # ============================================================================
 # CONFIGURACIÓN DE ANÁLISIS FRECUENCIAL
 # ============================================================================
@@ -65,6 +92,21 @@ MID_FREQ_RANGE: Tuple[int, int] = (250, 2000)
 # TREBLE: Frecuencias agudas (platillos, hi-hats, brillos)
 TREBLE_FREQ_RANGE: Tuple[int, int] = (2000, 8000)
 
+# Espectro completo enviado al shader (textura 1D u_spectrum)
+# Número de bandas logarítmicas entre SPECTRUM_MIN_FREQ y SAMPLERATE / 2
+SPECTRUM_BINS: int = 128
+SPECTRUM_MIN_FREQ: float = 20.0
+
+# Rango dinámico del espectro: este nivel (dB) se mapea a 0.0 y 0 dB a 1.0
+SPECTRUM_DB_FLOOR: float = -70.0
+
+# Muestras de forma de onda enviadas al shader (textura 1D u_waveform)
+WAVEFORM_SAMPLES: int = 512
+
+# Filas de historial del espectrograma (textura en anillo u_spectrogram)
+# Cada bloque de audio añade una fila; a 2048 samples / 44100 Hz = ~5.5 s
+SPECTROGRAM_HISTORY: int = 256
+
 # ============================================================================
 # CONFIGURACIÓN DE DETECCIÓN DE RITMO (BEAT DETECTION)
 # ============================================================================
@@ -115,9 +157,16 @@ RANDOM_BEAT_RANGE: Tuple[int, int] = (30, 70)
 
 # --- FIN DE NUEVAS OPCIONES ---
 
-# Número total de patrones visuales disponibles en los shaders
-# IMPORTANTE: Debe coincidir con el número de efectos en fragment.glsl
-TOTAL_PATTERNS: int = 43
+# Carpeta con un fichero .glsl por patrón (ver pattern_registry.py)
+PATTERNS_DIR: str = "shaders/patterns"
+
+# Número total de patrones visuales: se deriva de los ficheros de PATTERNS_DIR
+TOTAL_PATTERNS: int = len(glob.glob(os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                                 PATTERNS_DIR, "*.glsl")))
+
+# Patrones que se usan en los modos "order" y "random" (ids de fichero,
+# p. ej. ["tunnel", "aurora_flow"]). None = todos. Solo se compilan estos
+ENABLED_PATTERNS: Optional[List[str]] = None
 
 # Número de rayos/partículas/gotas generadas por cada beat detectado
 # Mayor valor = efectos más densos y llamativos
@@ -127,6 +176,11 @@ RAYS_PER_BEAT: int = 8
 # 0 = cambio instantáneo, valores más altos = transición gradual
 PATTERN_TRANSITION_TIME: float = 0.5
 
+# Semilla de la simulación (elección de patrones en modo random y posición de
+# las partículas). None = distinta en cada ejecución; un entero hace que la
+# misma secuencia de audio produzca siempre la misma secuencia visual
+SIMULATION_SEED: Optional[int] = None
+
 # ============================================================================
 # CONFIGURACIÓN DE POST-PROCESAMIENTO
 # ============================================================================
@@ -145,6 +199,72 @@ CONTRAST: float = 1.1
 # Saturación de color (1.0 = normal, >1.0 = más saturado, <1.0 = menos saturado)
 SATURATION: float = 1.15
 
+# Umbral de luminancia a partir del cual un píxel contribuye al bloom
+BLOOM_THRESHOLD: float = 0.7
+
+# ============================================================================
+# COSTE DE LOS PATRONES
+# ============================================================================
+
+# La clase de coste de cada patrón se declara en la cabecera @cost de su
+# fichero en PATTERNS_DIR:
+# "heavy": bucles de decenas de iteraciones por píxel (partículas procedurales)
+# "medium": fractales iterados o varias capas de trigonometría
+
+# Modo tablero de ajedrez: sombrea la mitad de los píxeles por frame y
+# reconstruye el resto con el frame anterior (se desactiva en las transiciones)
+CHECKERBOARD_ENABLED: bool = True
+
+# Clases de coste que se renderizan en modo tablero
+CHECKERBOARD_COST_CLASSES: Tuple[str, ...] = ("heavy",)
+
+# ============================================================================
+# NIVELES DE CALIDAD
+# ============================================================================
+
+# Nivel de calidad activo: "low", "medium", "high" o "ultra"
+QUALITY_TIER: str = "high"
+
+# Parámetros de cada nivel:
+# - render_scale: Escala de la resolución interna de los patrones (1.0 = nativa)
+# - bloom_levels: Niveles de la cadena de bloom (0 = sin bloom, 1 = 1/2, 2 = 1/2 + 1/4, 3 = hasta 1/8)
+QUALITY_TIERS: Dict[str, Dict[str, Any]] = {
+    "low":    {"render_scale": 0.5,  "bloom_levels": 0},
+    "medium": {"render_scale": 0.75, "bloom_levels": 1},
+    "high":   {"render_scale": 1.0,  "bloom_levels": 2},
+    "ultra":  {"render_scale": 1.0,  "bloom_levels": 3},
+}
+
+# ============================================================================
+# PRESETS DE RENDIMIENTO Y RECARGA EN CALIENTE (live_config.py)
+# ============================================================================
+# Con --config RUTA un fichero JSON sobrescribe parámetros de este módulo,
+# p. ej. {"preset": "medium", "BLOOM_INTENSITY": 0.4}. El fichero se vigila
+# mientras el visualizador corre: los cambios se validan y preparan en un hilo
+# aparte y se aplican todos a la vez entre dos frames.
+
+# Preset activo (None = los valores de este fichero; --preset NOMBRE)
+PERFORMANCE_PRESET: Optional[str] = None
+
+# Cada preset fija calidad (escala interna y bloom), FPS y tamaño de bloque de audio
+# "high" son los valores por defecto de este fichero
+PERFORMANCE_PRESETS: Dict[str, Dict[str, Any]] = {
+    "low":    {"QUALITY_TIER": "low",    "TARGET_FPS": 30,  "NUM_SAMPLES": 4096,
+               "BLOOM_INTENSITY": 0.0,  "CHECKERBOARD_ENABLED": True},
+    "medium": {"QUALITY_TIER": "medium", "TARGET_FPS": 60,  "NUM_SAMPLES": 2048,
+               "BLOOM_INTENSITY": 0.3,  "CHECKERBOARD_ENABLED": True},
+    "high":   {"QUALITY_TIER": "high",   "TARGET_FPS": 60,  "NUM_SAMPLES": 2048,
+               "BLOOM_INTENSITY": 0.3,  "CHECKERBOARD_ENABLED": True},
+    "ultra":  {"QUALITY_TIER": "ultra",  "TARGET_FPS": 120, "NUM_SAMPLES": 1024,
+               "BLOOM_INTENSITY": 0.35, "CHECKERBOARD_ENABLED": False},
+}
+
+# Fichero de configuración vigilado (None = sin fichero; --config RUTA)
+CONFIG_FILE_PATH: Optional[str] = None
+
+# Cada cuántos segundos se comprueba si el fichero ha cambiado
+CONFIG_POLL_SECONDS: float = 0.5
+
 # ============================================================================
 # PALETAS DE COLOR
 # ============================================================================
@@ -187,6 +307,14 @@ PALETTE_OCEAN: List[Tuple[float, float, float]] = [
     (0.3, 1.0, 0.5),   # Verde azulado
 ]
 
+# Paletas seleccionables por nombre (control remoto: "palette fire")
+PALETTES: Dict[str, List[Tuple[float, float, float]]] = {
+    "default": COLOR_PALETTE,
+    "cyberpunk": PALETTE_CYBERPUNK,
+    "fire": PALETTE_FIRE,
+    "ocean": PALETTE_OCEAN,
+}
+
 # ============================================================================
 # CONFIGURACIÓN DE DEPURACIÓN Y LOGGING
 # ============================================================================
@@ -200,19 +328,200 @@ SHOW_FPS: bool = True
 # Mostrar información de audio en tiempo real
 SHOW_AUDIO_INFO: bool = False
 
-# Nivel de logging (DEBUG, INFO, WARNING, ERROR, CRITICAL)
+# Nivel de logging (DEBUG, INFO, WARNING, ERROR, CRITICAL); con DEBUG_MODE se ve todo
 LOG_LEVEL: str = "INFO"
 
+# Registros del anillo de log del audio y del render (realtime_log.py)
+LOG_RING_SIZE: int = 1024
+
+# Mensajes por segundo de cada tipo como máximo (el resto se resume en una línea)
+LOG_RATE_LIMIT: int = 5
+
+# Periodo del hilo que vacía el anillo y escribe en consola (segundos)
+LOG_DRAIN_INTERVAL: float = 0.05
+
+# Recargar los shaders al guardar cambios en shaders/*.glsl (sin reiniciar)
+# Si el shader nuevo no compila se sigue usando el anterior y se imprime el log
+SHADER_HOT_RELOAD: bool = True
+
+# Cada cuántos segundos se comprueba si los ficheros de shaders han cambiado
+SHADER_RELOAD_POLL_SECONDS: float = 0.5
+
 # ============================================================================
 # CONFIGURACIÓN DE RENDIMIENTO
 # ============================================================================
 
 # Número máximo de partículas/gotas activas simultáneamente
-MAX_PARTICLES: int = 10
+# Se almacenan en un anillo de numpy y se envían al shader mediante una textura,
+# por lo que pueden ser miles sin aumentar el coste por píxel
+MAX_PARTICLES: int = 4096
+
+# Tiempo de vida de cada partícula (segundos)
+PARTICLE_LIFETIME: float = 4.0
+
+# Rejilla de binning en espacio de pantalla (tiles en X, tiles en Y)
+# Cada píxel solo evalúa las partículas asignadas a su tile
+PARTICLE_GRID: Tuple[int, int] = (16, 9)
+
+# Máximo de partículas por tile/sector (acota el coste por píxel)
+# Se inyecta en fragment.glsl como #define PARTICLE_BIN_CAPACITY al compilar
+PARTICLE_BIN_CAPACITY: int = 16
+
+# Número de sectores angulares para patrones radiales (ej. orbe con rayos)
+PARTICLE_ANGULAR_SECTORS: int = 32
+
+# Radio de influencia inicial de una partícula (en coordenadas UV)
+# (por defecto: cada patrón puede declarar el suyo con @particle_radius)
+PARTICLE_INFLUENCE_RADIUS: float = 0.25
+
+# Crecimiento del radio de influencia por segundo (ondas y explosiones se expanden)
+# (por defecto: cada patrón puede declarar el suyo con @particle_expansion)
+PARTICLE_EXPANSION_SPEED: float = 0.9
 
 # Usar threading para procesamiento de audio (mejora rendimiento)
 USE_AUDIO_THREADING: bool = True
 
+# Lado (en texels) de la textura de ruido precalculada (potencia de 2)
+# Los patrones leen el ruido de esta textura en lugar de calcularlo por píxel
+NOISE_TEXTURE_SIZE: int = 256
+
+# Semilla del banco de ruido (cambiarla genera ruido distinto)
+NOISE_SEED: int = 1337
+
+# Carpeta para datos generados que se reutilizan entre ejecuciones
+CACHE_DIR: str = ".cache"
+
+# Miniaturas animadas de los patrones en el menú admin: se renderizan una sola
+# vez (todas en una pasada) y se guardan en CACHE_DIR; solo se regeneran si
+# cambia el código de los shaders
+THUMBNAIL_SIZE: Tuple[int, int] = (160, 90)
+
+# Frames de animación por miniatura y tiempo de shader entre frames (segundos)
+THUMBNAIL_FRAMES: int = 4
+THUMBNAIL_FRAME_INTERVAL: float = 0.5
+
+# ============================================================================
+# MODO DE AHORRO DE ENERGÍA
+# ============================================================================
+# Para instalaciones 24/7: tras un silencio prolongado (o al perder el foco)
+# se reducen FPS y resolución interna y el análisis de audio se sustituye por
+# una simple puerta de RMS. Al volver la música se recupera todo en < 1 beat.
+
+# Activar el modo de ahorro de energía
+POWER_SAVE_ENABLED: bool = True
+
+# Segundos de silencio continuo antes de entrar en ahorro
+POWER_SAVE_SILENCE_SECONDS: float = 30.0
+
+# Amplitud suavizada (smoothed_amplitude) por debajo de la cual se considera silencio
+POWER_SAVE_SILENCE_THRESHOLD: float = 0.02
+
+# Amplitud instantánea que despierta el visualizador (mayor que la de silencio: histéresis)
+POWER_SAVE_WAKE_THRESHOLD: float = 0.05
+
+# Entrar en ahorro también cuando la ventana pierde el foco
+POWER_SAVE_ON_FOCUS_LOSS: bool = True
+
+# FPS y escala de resolución interna durante el ahorro
+POWER_SAVE_FPS: int = 15
+POWER_SAVE_RENDER_SCALE: float = 0.5
+
+# Duración de la rampa de vuelta a calidad completa (segundos)
+# 0.25 s es menos de un beat incluso a 240 BPM
+POWER_SAVE_RAMP_SECONDS: float = 0.25
+
+# ============================================================================
+# RED: UN NODO DE CAPTURA Y VARIOS NODOS DE RENDER (feature_net.py)
+# ============================================================================
+# Con varias pantallas por sala, un único equipo captura y analiza el audio
+# (python main.py --capture-node) y publica los rasgos por UDP multicast; cada
+# pantalla (python main.py --render-node) los consume en lugar de capturar.
+
+# Grupo multicast y puerto de los paquetes de rasgos
+NET_MULTICAST_GROUP: str = "239.255.42.99"
+NET_PORT: int = 5005
+
+# Saltos de router permitidos (1 = solo la red local)
+NET_TTL: int = 1
+
+# IP de la interfaz de red a usar ("0.0.0.0" = la que elija el sistema)
+NET_INTERFACE: str = "0.0.0.0"
+
+# Retardo de reproducción en los nodos de render (segundos): absorbe el jitter
+# de la red para que todos apliquen cada paquete en el mismo instante
+NET_PLAYOUT_DELAY: float = 0.05
+
+# Paquetes usados para estimar el desfase de reloj con el nodo de captura
+# (mínimo del retardo de ida; ~10 s a 2048 muestras / 44100 Hz)
+NET_CLOCK_WINDOW: int = 200
+
+# ============================================================================
+# BUS LOCAL: UN ANALIZADOR Y VARIOS RENDERERS EN EL MISMO EQUIPO (feature_bus.py)
+# ============================================================================
+# En un equipo con varias salidas, un proceso analiza el audio
+# (python main.py --bus-analyzer) y cada pantalla es un proceso renderer
+# (python main.py --bus-renderer --display N) que lee de memoria compartida.
+
+# Nombre del segmento de memoria compartida
+FEATURE_BUS_NAME: str = "visualizador_rasgos"
+
+# Ranuras del anillo (a 2048 / 44100, 64 ranuras son ~3 s de audio)
+FEATURE_BUS_CAPACITY: int = 64
+
+# Segundos sin bloques nuevos tras los que un renderer da el analizador por
+# muerto y vuelve a abrir el bus (el analizador publica incluso en silencio)
+FEATURE_BUS_STALL_SECONDS: float = 2.0
+
+# Pantalla en la que se abre la ventana (0 = principal; --display N)
+DISPLAY_INDEX: int = 0
+
+# ============================================================================
+# VIDEOWALL: UN LIENZO VIRTUAL REPARTIDO ENTRE VARIOS RENDERERS
+# ============================================================================
+# Cada nodo de render (python main.py --render-node --wall 4x4 --tile C,F)
+# dibuja solo su rectángulo del lienzo; el nodo de captura hace de
+# coordinador y reparte tiempo, patrón y semilla. Todos los tiles deben tener
+# la misma resolución.
+
+# Tiles del lienzo (columnas, filas); (1, 1) = sin videowall
+VIDEOWALL_GRID: Tuple[int, int] = (1, 1)
+
+# Tile que dibuja este proceso (columna, fila); la fila 0 es la de arriba
+VIDEOWALL_TILE: Tuple[int, int] = (0, 0)
+
+# ============================================================================
+# CONTROL REMOTO (control_server.py)
+# ============================================================================
+# Con --control, un hilo asyncio acepta órdenes (patrón, modo, paleta, calidad)
+# por HTTP, WebSocket y OSC; el bucle de render las aplica al inicio de cada
+# frame, así que la red nunca bloquea el dibujado.
+
+# Interfaz de escucha ("127.0.0.1" = solo este equipo; "0.0.0.0" = toda la red)
+CONTROL_HOST: str = "127.0.0.1"
+
+# Puerto HTTP (también acepta WebSocket en la misma ruta)
+CONTROL_HTTP_PORT: int = 8765
+
+# Puerto UDP de OSC (mesas de luces; 0 = desactivado)
+CONTROL_OSC_PORT: int = 9000
+
+# Órdenes pendientes como máximo (si el bucle se atasca se descartan las más antiguas)
+CONTROL_QUEUE_SIZE: int = 64
+
+# ============================================================================
+# MÉTRICAS (metrics.py)
+# ============================================================================
+# Histogramas de tiempo de frame, tiempo de GPU por patrón, coste del análisis
+# y contadores de salud del audio; baratos de mantener siempre activos.
+
+# Endpoint de Prometheus (GET /metrics); 0 = desactivado
+METRICS_HOST: str = "127.0.0.1"
+METRICS_PORT: int = 9108
+
+# Volcado periódico en JSONL (None = desactivado; --metrics-dump RUTA)
+METRICS_DUMP_PATH: Optional[str] = None
+METRICS_DUMP_SECONDS: float = 10.0
+
 # ============================================================================
 # VALIDACIÓN DE CONFIGURACIÓN
 # ============================================================================
@@ -226,6 +535,10 @@ def validate_config() -> bool:
         # Validar resolución
         assert SCREEN_WIDTH > 0 and SCREEN_HEIGHT > 0, "Resolución inválida"
         assert TARGET_FPS > 0, "FPS objetivo debe ser mayor que 0"
+        assert FRAME_PACER_CALIBRATION_FRAMES > 0, "FRAME_PACER_CALIBRATION_FRAMES debe ser mayor que 0"
+        assert FRAME_PACER_SAFETY_MS >= 0.0 and FRAME_PACER_SPIN_MS >= 0.0, "Márgenes del frame pacer inválidos"
+        assert FRAME_PACER_HISTORY > 0, "FRAME_PACER_HISTORY debe ser mayor que 0"
+        assert 1 <= MAX_FRAMES_IN_FLIGHT <= 4, "MAX_FRAMES_IN_FLIGHT debe estar entre 1 y 4"
         
         # Validar audio
         assert SAMPLERATE > 0, "Sample rate inválido"
@@ -235,6 +548,10 @@ def validate_config() -> bool:
         assert BASS_FREQ_RANGE[0] < BASS_FREQ_RANGE[1], "Rango BASS inválido"
         assert MID_FREQ_RANGE[0] < MID_FREQ_RANGE[1], "Rango MID inválido"
         assert TREBLE_FREQ_RANGE[0] < TREBLE_FREQ_RANGE[1], "Rango TREBLE inválido"
+        assert SPECTRUM_BINS > 0 and WAVEFORM_SAMPLES > 0, "Tamaños de espectro/forma de onda inválidos"
+        assert 0.0 < SPECTRUM_MIN_FREQ < SAMPLERATE / 2, "SPECTRUM_MIN_FREQ inválido"
+        assert SPECTRUM_DB_FLOOR < 0.0, "SPECTRUM_DB_FLOOR debe ser negativo"
+        assert SPECTROGRAM_HISTORY > 0, "SPECTROGRAM_HISTORY debe ser mayor que 0"
         
         # Validar detección de beats
         assert 0.0 < BEAT_THRESHOLD < 1.0, "BEAT_THRESHOLD debe estar entre 0 y 1"
@@ -249,6 +566,67 @@ def validate_config() -> bool:
         assert TOTAL_PATTERNS > 0, "Debe haber al menos un patrón visual"
         assert len(COLOR_PALETTE) > 0, "La paleta de colores no puede estar vacía"
         
+        assert ENABLED_PATTERNS is None or len(ENABLED_PATTERNS) > 0, "ENABLED_PATTERNS no puede estar vacío"
+        
+        # Validar clases de coste en modo tablero
+        assert all(cost in ("light", "medium", "heavy") for cost in CHECKERBOARD_COST_CLASSES), \
+            "CHECKERBOARD_COST_CLASSES solo admite 'light', 'medium' o 'heavy'"
+        
+        # Validar niveles de calidad
+        assert QUALITY_TIER in QUALITY_TIERS, f"QUALITY_TIER debe ser uno de {list(QUALITY_TIERS)}"
+        for tier_name, tier in QUALITY_TIERS.items():
+            assert 0.0 < tier["render_scale"] <= 1.0, f"render_scale inválido en el nivel '{tier_name}'"
+            assert 0 <= tier["bloom_levels"] <= 3, f"bloom_levels debe estar entre 0 y 3 en el nivel '{tier_name}'"
+        
+        # Validar presets de rendimiento
+        assert PERFORMANCE_PRESET is None or PERFORMANCE_PRESET in PERFORMANCE_PRESETS, \
+            f"PERFORMANCE_PRESET debe ser None o uno de {list(PERFORMANCE_PRESETS)}"
+        for preset_name, preset in PERFORMANCE_PRESETS.items():
+            unknown = [key for key in preset if key not in globals()]
+            assert not unknown, f"El preset '{preset_name}' usa parámetros desconocidos: {unknown}"
+            assert preset.get("QUALITY_TIER", QUALITY_TIER) in QUALITY_TIERS, \
+                f"QUALITY_TIER inválido en el preset '{preset_name}'"
+        assert CONFIG_POLL_SECONDS > 0.0, "CONFIG_POLL_SECONDS debe ser mayor que 0"
+
+        # Validar modo de ahorro de energía
+        assert POWER_SAVE_SILENCE_SECONDS > 0.0, "POWER_SAVE_SILENCE_SECONDS debe ser mayor que 0"
+        assert 0.0 <= POWER_SAVE_SILENCE_THRESHOLD < POWER_SAVE_WAKE_THRESHOLD, \
+            "POWER_SAVE_WAKE_THRESHOLD debe ser mayor que POWER_SAVE_SILENCE_THRESHOLD"
+        assert 0 < POWER_SAVE_FPS <= TARGET_FPS, "POWER_SAVE_FPS debe estar entre 1 y TARGET_FPS"
+        assert 0.0 < POWER_SAVE_RENDER_SCALE <= 1.0, "POWER_SAVE_RENDER_SCALE debe estar en (0, 1]"
+        assert POWER_SAVE_RAMP_SECONDS > 0.0, "POWER_SAVE_RAMP_SECONDS debe ser mayor que 0"
+
+        assert 0 < NET_PORT < 65536, "NET_PORT inválido"
+        assert NET_TTL >= 1, "NET_TTL debe ser al menos 1"
+        assert NET_PLAYOUT_DELAY >= 0.0, "NET_PLAYOUT_DELAY no puede ser negativo"
+        assert NET_CLOCK_WINDOW > 0, "NET_CLOCK_WINDOW debe ser mayor que 0"
+        assert FEATURE_BUS_CAPACITY >= 2, "FEATURE_BUS_CAPACITY debe ser al menos 2"
+        assert FEATURE_BUS_STALL_SECONDS > 0.0, "FEATURE_BUS_STALL_SECONDS debe ser mayor que 0"
+        assert DISPLAY_INDEX >= 0, "DISPLAY_INDEX no puede ser negativo"
+        assert 0 < CONTROL_HTTP_PORT < 65536, "CONTROL_HTTP_PORT inválido"
+        assert 0 <= CONTROL_OSC_PORT < 65536, "CONTROL_OSC_PORT inválido"
+        assert CONTROL_QUEUE_SIZE > 0, "CONTROL_QUEUE_SIZE debe ser mayor que 0"
+        assert LOG_LEVEL in ("DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"), "LOG_LEVEL inválido"
+        assert LOG_RING_SIZE > 0, "LOG_RING_SIZE debe ser mayor que 0"
+        assert LOG_RATE_LIMIT > 0, "LOG_RATE_LIMIT debe ser mayor que 0"
+        assert LOG_DRAIN_INTERVAL > 0.0, "LOG_DRAIN_INTERVAL debe ser mayor que 0"
+        assert 0 <= METRICS_PORT < 65536, "METRICS_PORT inválido"
+        assert METRICS_DUMP_SECONDS > 0.0, "METRICS_DUMP_SECONDS debe ser mayor que 0"
+        assert VIDEOWALL_GRID[0] >= 1 and VIDEOWALL_GRID[1] >= 1, "VIDEOWALL_GRID inválido"
+        assert 0 <= VIDEOWALL_TILE[0] < VIDEOWALL_GRID[0] and 0 <= VIDEOWALL_TILE[1] < VIDEOWALL_GRID[1], \
+            "VIDEOWALL_TILE está fuera de VIDEOWALL_GRID"
+
+        assert SHADER_RELOAD_POLL_SECONDS > 0.0, "SHADER_RELOAD_POLL_SECONDS debe ser mayor que 0"
+        
+        # Validar sistema de partículas
+        assert MAX_PARTICLES >= RAYS_PER_BEAT, "MAX_PARTICLES debe ser >= RAYS_PER_BEAT"
+        assert PARTICLE_GRID[0] > 0 and PARTICLE_GRID[1] > 0, "PARTICLE_GRID inválido"
+        assert PARTICLE_BIN_CAPACITY > 0, "PARTICLE_BIN_CAPACITY debe ser mayor que 0"
+        assert PARTICLE_ANGULAR_SECTORS > 0, "PARTICLE_ANGULAR_SECTORS debe ser mayor que 0"
+        assert NOISE_TEXTURE_SIZE > 0 and (NOISE_TEXTURE_SIZE & (NOISE_TEXTURE_SIZE - 1)) == 0, "NOISE_TEXTURE_SIZE debe ser potencia de 2"
+        assert THUMBNAIL_SIZE[0] > 0 and THUMBNAIL_SIZE[1] > 0, "THUMBNAIL_SIZE inválido"
+        assert THUMBNAIL_FRAMES > 0 and THUMBNAIL_FRAME_INTERVAL > 0.0, "Animación de miniaturas inválida"
+
         return True
     except AssertionError as e:
         print(f"❌ Error de configuración: {e}")
@@ -259,6 +637,10 @@ if __name__ != "__main__":
     if not validate_config():
         raise ValueError("Configuración inválida. Revisa los parámetros en config.py")
 
+def get_quality_settings() -> Dict[str, Any]:
+    """Devuelve los parámetros del nivel de calidad activo (QUALITY_TIER)."""
+    return QUALITY_TIERS[QUALITY_TIER]
+
 # ============================================================================
 # INFORMACIÓN DEL SISTEMA
 # ============================================================================
@@ -269,6 +651,10 @@ def print_config_info():
     print("CONFIGURACIÓN DEL VISUALIZADOR DE MÚSICA")
     print("="*70)
     print(f"Resolución: {SCREEN_WIDTH}x{SCREEN_HEIGHT} @ {TARGET_FPS} FPS")
+    print(f"Calidad: {QUALITY_TIER} (escala {get_quality_settings()['render_scale']}, "
+          f"bloom {get_quality_settings()['bloom_levels']} niveles)")
+    if PERFORMANCE_PRESET is not None:
+        print(f"Preset de rendimiento: {PERFORMANCE_PRESET}")
     print(f"Audio: {SAMPLERATE} Hz, {NUM_SAMPLES} samples/buffer")
     print(f"Dispositivo: {DEVICE_NAME}")
     print(f"Patrones visuales: {TOTAL_PATTERNS}")
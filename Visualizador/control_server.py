@@ -0,0 +1,457 @@
+# ============================================================================
+# CONTROL_SERVER.PY - CONTROL REMOTO SIN BLOQUEOS (HTTP / WEBSOCKET / OSC)
+# ============================================================================
+# Un hilo propio con un bucle asyncio atiende tres protocolos:
+# - HTTP:      curl -X POST http://127.0.0.1:8765/pattern/5
+# - WebSocket: en el mismo puerto; cada mensaje de texto es una orden ("mode random")
+# - OSC (UDP): /visualizador/palette "fire" (mesas de luces)
+#
+# Las órdenes se validan en el hilo de red y se dejan en una deque acotada:
+# append() y popleft() son atómicos en CPython, así que ni el hilo de red ni
+# el de render toman locks. El bucle principal las vacía una vez por frame
+# (drain()), por lo que la latencia es como mucho de un frame y la red nunca
+# puede bloquear el dibujado.
+# ============================================================================
+
+import asyncio
+import base64
+import hashlib
+import struct
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple
+import config
+from simulation import get_next_beat_target, next_pattern_index, set_pattern
+from realtime_log import LOG, DEBUG, INFO, WARNING
+
+
+# Órdenes que cambian la simulación (en un nodo de render las decide el nodo de captura)
+SIMULATION_COMMANDS: FrozenSet[str] = frozenset({'pattern', 'next', 'mode', 'color'})
+# Órdenes que solo afectan al dibujado local
+RENDER_COMMANDS: FrozenSet[str] = frozenset({'palette', 'quality'})
+ALL_COMMANDS: FrozenSet[str] = SIMULATION_COMMANDS | RENDER_COMMANDS
+
+PATTERN_MODES: Tuple[str, ...] = ('order', 'random', 'admin')
+
+# Límites de lo que se lee de la red
+MAX_REQUEST_BYTES: int = 8192
+MAX_MESSAGE_BYTES: int = 1024
+
+WEBSOCKET_GUID: str = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+# Mensajes del bucle de render al aplicar órdenes
+_LOG_APPLIED = LOG.message(INFO, "🎛️  Control remoto {text}")
+_LOG_FAILED = LOG.message(WARNING, "⚠️  Control remoto {text}")
+_LOG_BAD_OSC = LOG.message(DEBUG, "⚠️  OSC de {text}")
+
+
+class ControlCommand:
+    """Orden ya validada, pendiente de aplicar en el bucle de render."""
+
+    __slots__ = ('name', 'value', 'source', 'received')
+
+    def __init__(self, name: str, value: Any, source: str):
+        self.name = name
+        self.value = value
+        self.source = source            # 'http', 'ws' u 'osc'
+        self.received = time.perf_counter()
+
+    def __repr__(self) -> str:
+        return f"{self.name} {self.value}" if self.value is not None else self.name
+
+
+def parse_command(name: str, value: Any = None, source: str = 'http',
+                  allowed: FrozenSet[str] = ALL_COMMANDS) -> ControlCommand:
+    """
+    Valida una orden (lo que no depende del estado del visualizador).
+
+    Args:
+        name: 'pattern', 'next', 'mode', 'color', 'palette' o 'quality'
+        value: Argumento de la orden (texto o número)
+        source: Protocolo por el que llegó
+        allowed: Órdenes que acepta este proceso
+
+    Returns:
+        La orden con el argumento ya convertido
+
+    Raises:
+        ValueError: Si la orden o su argumento no son válidos
+    """
+    name = name.strip().lower()
+    if name not in ALL_COMMANDS:
+        raise ValueError(f"orden desconocida '{name}' (válidas: {', '.join(sorted(ALL_COMMANDS))})")
+    if name not in allowed:
+        raise ValueError(f"'{name}' no se acepta en este nodo")
+
+    if name == 'next':
+        return ControlCommand(name, None, source)
+    if value is None or str(value).strip() == '':
+        raise ValueError(f"'{name}' necesita un argumento")
+
+    if name in ('pattern', 'color'):
+        try:
+            number = int(float(value))
+        except ValueError:
+            raise ValueError(f"'{name}' espera un número, no '{value}'")
+        if number < 0:
+            raise ValueError(f"'{name}' no admite números negativos")
+        return ControlCommand(name, number, source)
+
+    text = str(value).strip().lower()
+    choices = {'mode': PATTERN_MODES, 'palette': tuple(config.PALETTES),
+               'quality': tuple(config.QUALITY_TIERS)}[name]
+    if text not in choices:
+        raise ValueError(f"'{name}' espera uno de {', '.join(choices)}, no '{text}'")
+    return ControlCommand(name, text, source)
+
+
+def parse_command_line(line: str, source: str, allowed: FrozenSet[str] = ALL_COMMANDS) -> ControlCommand:
+    """Orden en texto: "pattern 5", "pattern=5" o "next"."""
+    parts = line.replace('=', ' ').split(None, 1)
+    if not parts:
+        raise ValueError("orden vacía")
+    return parse_command(parts[0], parts[1] if len(parts) > 1 else None, source, allowed)
+
+
+def apply_command(state: Dict[str, Any], command: ControlCommand, renderer: Optional[Any] = None) -> str:
+    """
+    Aplica una orden al estado (y al renderer) entre dos frames.
+
+    Args:
+        state: Diccionario de estado del visualizador
+        command: Orden validada por parse_command()
+        renderer: Renderer para 'quality' (None en el nodo de captura)
+
+    Returns:
+        Descripción del cambio aplicado
+
+    Raises:
+        ValueError: Si la orden no puede aplicarse en el estado actual
+    """
+    name, value = command.name, command.value
+
+    if name == 'pattern':
+        if value not in state['scheduled_patterns']:
+            raise ValueError(f"el patrón {value} no está compilado en esta sesión")
+        set_pattern(state, value)
+        return f"patrón {value}"
+
+    if name == 'next':
+        if state['pattern_mode'] == 'admin':
+            raise ValueError("en modo admin el patrón solo cambia con 'pattern N'")
+        set_pattern(state, next_pattern_index(state))
+        return f"patrón {state['pattern_index']}"
+
+    if name == 'mode':
+        state['pattern_mode'] = value
+        state['beat_count'] = 0
+        state['current_beat_target'] = get_next_beat_target(state)
+        return f"modo '{value}'"
+
+    if name == 'color':
+        state['color_index'] = value % len(config.COLOR_PALETTE)
+        return f"color {state['color_index']}"
+
+    if name == 'palette':
+        config.COLOR_PALETTE = config.PALETTES[value]
+        state['color_index'] %= len(config.COLOR_PALETTE)
+        return f"paleta '{value}'"
+
+    if renderer is None:
+        raise ValueError("'quality' necesita un renderer")
+    renderer.set_quality_tier(value)
+    return f"calidad '{value}'"
+
+
+def _parse_osc_string(data: bytes, offset: int) -> Tuple[str, int]:
+    """Cadena OSC: terminada en NUL y rellenada hasta múltiplo de 4."""
+    end = data.index(b'\0', offset)
+    return data[offset:end].decode('utf-8'), (end + 4) & ~3
+
+
+def parse_osc(data: bytes) -> List[Tuple[str, List[Any]]]:
+    """
+    Mensajes de un paquete OSC 1.0 (mensaje suelto o #bundle, anidado).
+
+    Returns:
+        Lista de (dirección, argumentos)
+
+    Raises:
+        ValueError: Si el paquete está mal formado
+    """
+    try:
+        if data.startswith(b'#bundle\0'):
+            messages = []
+            offset = 16   # '#bundle\0' + timetag de 8 bytes (se aplica al recibir)
+            while offset + 4 <= len(data):
+                size = struct.unpack_from('>i', data, offset)[0]
+                offset += 4
+                messages.extend(parse_osc(data[offset:offset + size]))
+                offset += size
+            return messages
+
+        address, offset = _parse_osc_string(data, 0)
+        if offset >= len(data):
+            return [(address, [])]
+        tags, offset = _parse_osc_string(data, offset)
+        arguments: List[Any] = []
+        for tag in tags.lstrip(','):
+            if tag == 'i':
+                arguments.append(struct.unpack_from('>i', data, offset)[0])
+                offset += 4
+            elif tag == 'f':
+                arguments.append(struct.unpack_from('>f', data, offset)[0])
+                offset += 4
+            elif tag == 's':
+                text, offset = _parse_osc_string(data, offset)
+                arguments.append(text)
+            elif tag in 'TF':
+                arguments.append(tag == 'T')
+            else:
+                raise ValueError(f"tipo OSC no soportado '{tag}'")
+        return [(address, arguments)]
+    except (struct.error, UnicodeDecodeError) as e:
+        raise ValueError(f"paquete OSC mal formado: {e}")
+
+
+class _OscProtocol(asyncio.DatagramProtocol):
+    """Receptor OSC: /visualizador/<orden> [argumento] (o /<orden>)."""
+
+    def __init__(self, server: 'ControlServer'):
+        self.server = server
+
+    def datagram_received(self, data: bytes, addr: Tuple[str, int]) -> None:
+        try:
+            messages = parse_osc(data)
+        except ValueError as e:
+            self.server.rejected += 1
+            LOG.log(_LOG_BAD_OSC, text=f"{addr[0]}: {e}")
+            return
+        for address, arguments in messages:
+            name = address.rstrip('/').rsplit('/', 1)[-1]
+            self.server.submit(name, arguments[0] if arguments else None, 'osc')
+
+
+class ControlServer:
+    """
+    Servidor de control remoto en su propio hilo asyncio.
+
+    Características:
+    - HTTP y WebSocket en un puerto, OSC por UDP en otro
+    - Valida cada orden al recibirla y responde al cliente en el acto
+    - Cola sin locks (deque acotada) que el bucle de render vacía por frame
+    - Nunca espera al bucle de render ni éste a la red
+    """
+
+    def __init__(self, allowed: FrozenSet[str] = ALL_COMMANDS):
+        """
+        Args:
+            allowed: Órdenes que acepta este proceso (en un nodo de render solo
+                las de dibujado; la simulación la manda el nodo de captura)
+        """
+        self.allowed = allowed
+        self.queue: deque = deque(maxlen=config.CONTROL_QUEUE_SIZE)
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.stop_event: Optional[asyncio.Event] = None
+        self.thread: Optional[threading.Thread] = None
+        self.ready = threading.Event()
+        self.error: Optional[str] = None
+
+        self.accepted = 0
+        self.rejected = 0
+        self.dropped = 0
+        self.applied = 0
+        self.max_latency_ms = 0.0
+
+    # --- Hilo de red ---
+
+    def start(self) -> bool:
+        """Arranca el hilo y espera a que los puertos estén abiertos."""
+        self.thread = threading.Thread(target=self._run, name="control-server", daemon=True)
+        self.thread.start()
+        self.ready.wait(5.0)
+        if self.error is not None:
+            print(f"❌ Control remoto: {self.error}")
+            return False
+        osc = f", OSC udp/{config.CONTROL_OSC_PORT}" if config.CONTROL_OSC_PORT else ""
+        print(f"🎛️  Control remoto en http://{config.CONTROL_HOST}:{config.CONTROL_HTTP_PORT} "
+              f"(WebSocket en el mismo puerto{osc})")
+        return True
+
+    def _run(self) -> None:
+        try:
+            asyncio.run(self._serve())
+        except Exception as e:
+            self.error = str(e)
+            self.ready.set()
+
+    async def _serve(self) -> None:
+        self.loop = asyncio.get_running_loop()
+        self.stop_event = asyncio.Event()
+        http = await asyncio.start_server(self._handle_http, config.CONTROL_HOST, config.CONTROL_HTTP_PORT)
+        transport = None
+        if config.CONTROL_OSC_PORT:
+            transport, _ = await self.loop.create_datagram_endpoint(
+                lambda: _OscProtocol(self), local_addr=(config.CONTROL_HOST, config.CONTROL_OSC_PORT))
+        self.ready.set()
+        try:
+            await self.stop_event.wait()
+        finally:
+            http.close()
+            await http.wait_closed()
+            if transport is not None:
+                transport.close()
+
+    def submit(self, name: str, value: Any, source: str) -> str:
+        """Valida y encola una orden (hilo de red). Devuelve la respuesta al cliente."""
+        try:
+            command = parse_command(name, value, source, self.allowed)
+        except ValueError as e:
+            self.rejected += 1
+            return f"error: {e}"
+        return self._enqueue(command)
+
+    def submit_line(self, line: str, source: str) -> str:
+        """Como submit(), con la orden en texto ("pattern 5")."""
+        try:
+            command = parse_command_line(line, source, self.allowed)
+        except ValueError as e:
+            self.rejected += 1
+            return f"error: {e}"
+        return self._enqueue(command)
+
+    def _enqueue(self, command: ControlCommand) -> str:
+        if len(self.queue) == self.queue.maxlen:
+            self.dropped += 1   # La deque descarta la más antigua
+        self.queue.append(command)
+        self.accepted += 1
+        return "ok"
+
+    async def _handle_http(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Petición HTTP: /<orden>[/<argumento>] (o el argumento en el cuerpo de un POST)."""
+        try:
+            head = await asyncio.wait_for(reader.readuntil(b'\r\n\r\n'), 5.0)
+            if len(head) > MAX_REQUEST_BYTES:
+                raise ValueError("cabecera demasiado grande")
+            lines = head.decode('latin-1').split('\r\n')
+            method, path, _ = lines[0].split(' ', 2)
+            headers = {}
+            for line in lines[1:]:
+                if ':' in line:
+                    key, value = line.split(':', 1)
+                    headers[key.strip().lower()] = value.strip()
+
+            if headers.get('upgrade', '').lower() == 'websocket':
+                await self._handle_websocket(reader, writer, headers)
+                return
+
+            body = b''
+            length = int(headers.get('content-length', '0'))
+            if length > MAX_MESSAGE_BYTES:
+                raise ValueError("cuerpo demasiado grande")
+            if length:
+                body = await asyncio.wait_for(reader.readexactly(length), 5.0)
+
+            parts = [p for p in path.split('?', 1)[0].split('/') if p]
+            if not parts:
+                status, reply = 200, f"órdenes: {', '.join(sorted(self.allowed))}"
+            else:
+                value = parts[1] if len(parts) > 1 else (body.decode('utf-8').strip() or None)
+                reply = self.submit(parts[0], value, 'http')
+                status = 202 if reply == "ok" else 400
+        except (ValueError, UnicodeDecodeError, asyncio.IncompleteReadError,
+                asyncio.LimitOverrunError, asyncio.TimeoutError) as e:
+            status, reply = 400, f"error: {e}"
+
+        reason = {200: 'OK', 202: 'Accepted', 400: 'Bad Request'}[status]
+        payload = (reply + "\n").encode('utf-8')
+        writer.write(f"HTTP/1.1 {status} {reason}\r\nContent-Type: text/plain; charset=utf-8\r\n"
+                     f"Content-Length: {len(payload)}\r\nConnection: close\r\n\r\n".encode('latin-1') + payload)
+        try:
+            await writer.drain()
+        except ConnectionError:
+            pass
+        writer.close()
+
+    async def _handle_websocket(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter,
+                                headers: Dict[str, str]) -> None:
+        """WebSocket (RFC 6455): cada mensaje de texto es una orden; se responde "ok" o el error."""
+        key = headers.get('sec-websocket-key', '')
+        accept = base64.b64encode(hashlib.sha1((key + WEBSOCKET_GUID).encode('ascii')).digest()).decode('ascii')
+        writer.write(("HTTP/1.1 101 Switching Protocols\r\nUpgrade: websocket\r\nConnection: Upgrade\r\n"
+                      f"Sec-WebSocket-Accept: {accept}\r\n\r\n").encode('latin-1'))
+        try:
+            while True:
+                first, second = await reader.readexactly(2)
+                opcode = first & 0x0F
+                length = second & 0x7F
+                if length == 126:
+                    length = struct.unpack('>H', await reader.readexactly(2))[0]
+                elif length == 127:
+                    length = struct.unpack('>Q', await reader.readexactly(8))[0]
+                if length > MAX_MESSAGE_BYTES:
+                    break
+                mask = await reader.readexactly(4) if second & 0x80 else b''
+                payload = await reader.readexactly(length)
+                if mask:
+                    payload = bytes(byte ^ mask[i % 4] for i, byte in enumerate(payload))
+
+                if opcode == 0x8:     # Cierre
+                    self._send_frame(writer, 0x8, payload[:2])
+                    break
+                if opcode == 0x9:     # Ping
+                    self._send_frame(writer, 0xA, payload)
+                elif opcode == 0x1:   # Texto
+                    reply = self.submit_line(payload.decode('utf-8', errors='replace'), 'ws')
+                    self._send_frame(writer, 0x1, reply.encode('utf-8'))
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError, asyncio.CancelledError):
+            pass   # Cliente desconectado o servidor cerrándose (stop())
+        writer.close()
+
+    @staticmethod
+    def _send_frame(writer: asyncio.StreamWriter, opcode: int, payload: bytes) -> None:
+        """Trama WebSocket del servidor (sin máscara)."""
+        if len(payload) < 126:
+            header = bytes((0x80 | opcode, len(payload)))
+        else:
+            header = bytes((0x80 | opcode, 126)) + struct.pack('>H', len(payload))
+        writer.write(header + payload)
+
+    # --- Bucle de render ---
+
+    def drain(self) -> List[ControlCommand]:
+        """Órdenes recibidas desde el último frame (sin bloquear)."""
+        commands = []
+        while self.queue:
+            try:
+                commands.append(self.queue.popleft())
+            except IndexError:
+                break
+        return commands
+
+    def apply_pending(self, state: Dict[str, Any], renderer: Optional[Any] = None) -> None:
+        """Vacía la cola y aplica las órdenes (una vez por frame, antes de step)."""
+        if not self.queue:
+            return
+        now = time.perf_counter()
+        for command in self.drain():
+            self.max_latency_ms = max(self.max_latency_ms, (now - command.received) * 1000.0)
+            try:
+                description = apply_command(state, command, renderer)
+            except ValueError as e:
+                LOG.log(_LOG_FAILED, text=f"({command.source}) '{command}': {e}")
+                continue
+            self.applied += 1
+            LOG.log(_LOG_APPLIED, text=f"({command.source}): {description}")
+
+    def stop(self) -> None:
+        """Cierra los puertos y termina el hilo."""
+        if self.loop is not None and self.stop_event is not None:
+            self.loop.call_soon_threadsafe(self.stop_event.set)
+        if self.thread is not None:
+            self.thread.join(2.0)
+        print(f"🎛️  Órdenes aceptadas: {self.accepted} | Aplicadas: {self.applied} | "
+              f"Rechazadas: {self.rejected} | Descartadas: {self.dropped} | "
+              f"Latencia máx.: {self.max_latency_ms:.1f} ms")
@@ -0,0 +1,153 @@
+# ============================================================================
+# DISPLAY.PY - VENTANA Y CONTEXTO OPENGL ÚNICOS
+# ============================================================================
+# La ventana y el contexto OpenGL se crean una sola vez al arrancar y los
+# comparten el menú (gui.py) y el visualizador (renderer.py):
+# - El menú se dibuja con pygame en una Surface en memoria, que se sube a una
+#   textura y se muestra con un quad de pantalla completa.
+# - Al elegir un modo no se destruye ni se recrea nada: el paso del menú a la
+#   visualización es inmediato, sin parpadeo, y el driver ya está caliente.
+# ============================================================================
+
+import pygame
+from pygame.locals import *
+from OpenGL.GL import *
+import config
+from typing import List, Optional
+
+
+class Display:
+    """
+    Ventana sin bordes a pantalla completa con contexto OpenGL.
+
+    Características:
+    - Se crea una vez y vive hasta el final del programa
+    - Presenta Surfaces de pygame (menús) a través de una textura
+    - Sube solo los rectángulos modificados si se indican
+    """
+
+    def __init__(self):
+        """Inicializa Pygame y crea la ventana OpenGL."""
+        print("🖥️  Creando ventana y contexto OpenGL...")
+        pygame.init()
+
+        # Obtener resolución de pantalla completa de la pantalla elegida
+        desktop_sizes = pygame.display.get_desktop_sizes()
+        self.display_index: int = config.DISPLAY_INDEX
+        if self.display_index >= len(desktop_sizes):
+            print(f"⚠️  No existe la pantalla {self.display_index}: se usa la principal")
+            self.display_index = 0
+        self.width, self.height = desktop_sizes[self.display_index]
+
+        # Actualizar config con la resolución real
+        config.SCREEN_WIDTH = self.width
+        config.SCREEN_HEIGHT = self.height
+
+        # VSync: el atributo debe fijarse antes de crear el contexto
+        if config.VSYNC:
+            pygame.display.gl_set_attribute(pygame.GL_SWAP_CONTROL, 1)
+
+        # Ventana sin bordes (evita problemas con alt+tab)
+        self.window = pygame.display.set_mode((self.width, self.height), DOUBLEBUF | OPENGL | NOFRAME,
+                                              display=self.display_index)
+        pygame.display.set_caption("Visualizador Generativo de Música - Premium Edition")
+
+        glViewport(0, 0, self.width, self.height)
+        glMatrixMode(GL_PROJECTION)
+        glLoadIdentity()
+        glOrtho(-1, 1, -1, 1, -1, 1)
+        glMatrixMode(GL_MODELVIEW)
+        glLoadIdentity()
+
+        # Permitir todos los eventos importantes de ventana
+        pygame.event.set_allowed([pygame.QUIT, pygame.KEYDOWN, pygame.KEYUP,
+                                  pygame.WINDOWFOCUSGAINED, pygame.WINDOWFOCUSLOST,
+                                  pygame.WINDOWMINIMIZED, pygame.WINDOWRESTORED,
+                                  pygame.WINDOWEXPOSED, pygame.WINDOWSHOWN, pygame.WINDOWHIDDEN,
+                                  pygame.MOUSEMOTION, pygame.MOUSEBUTTONDOWN])
+        pygame.display.set_allow_screensaver(True)
+
+        print(f"   OpenGL Version: {glGetString(GL_VERSION).decode()}")
+        print(f"   GLSL Version: {glGetString(GL_SHADING_LANGUAGE_VERSION).decode()}")
+        print(f"   Renderer: {glGetString(GL_RENDERER).decode()}")
+
+        # Textura donde se sube la Surface del menú (se crea al primer uso)
+        self.surface_texture: Optional[int] = None
+
+    def create_surface(self) -> pygame.Surface:
+        """Surface en memoria del tamaño de la ventana para dibujar menús."""
+        return pygame.Surface((self.width, self.height))
+
+    def _ensure_surface_texture(self) -> bool:
+        """Crea la textura del menú si no existe. Devuelve True si es nueva."""
+        if self.surface_texture is not None:
+            return False
+        self.surface_texture = glGenTextures(1)
+        glBindTexture(GL_TEXTURE_2D, self.surface_texture)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_NEAREST)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_NEAREST)
+        glTexImage2D(GL_TEXTURE_2D, 0, GL_RGBA8, self.width, self.height, 0,
+                     GL_RGBA, GL_UNSIGNED_BYTE, None)
+        return True
+
+    def _upload_rect(self, surface: pygame.Surface, rect: pygame.Rect) -> None:
+        """Sube un rectángulo de la Surface a la misma zona de la textura."""
+        rect = rect.clip(surface.get_rect())
+        if rect.width == 0 or rect.height == 0:
+            return
+        # Filas de arriba abajo: la textura se dibuja con la coordenada V invertida
+        pixels = pygame.image.tostring(surface.subsurface(rect), "RGBA", False)
+        glTexSubImage2D(GL_TEXTURE_2D, 0, rect.x, rect.y, rect.width, rect.height,
+                        GL_RGBA, GL_UNSIGNED_BYTE, pixels)
+
+    def present_surface(self, surface: pygame.Surface,
+                        dirty_rects: Optional[List[pygame.Rect]] = None) -> None:
+        """
+        Muestra una Surface de pygame a pantalla completa.
+
+        Args:
+            surface: Surface del tamaño de la ventana
+            dirty_rects: Zonas modificadas desde la última llamada (None = todo)
+        """
+        new_texture = self._ensure_surface_texture()
+        glBindFramebuffer(GL_FRAMEBUFFER, 0)
+        glUseProgram(0)
+        glViewport(0, 0, self.width, self.height)
+        glActiveTexture(GL_TEXTURE0)
+        glBindTexture(GL_TEXTURE_2D, self.surface_texture)
+        glPixelStorei(GL_UNPACK_ALIGNMENT, 1)
+
+        if dirty_rects is None or new_texture:
+            self._upload_rect(surface, surface.get_rect())
+        else:
+            for rect in dirty_rects:
+                self._upload_rect(surface, rect)
+
+        # El back buffer no conserva el frame anterior: siempre se dibuja entero
+        glPushAttrib(GL_ALL_ATTRIB_BITS)
+        glDisable(GL_BLEND)
+        glEnable(GL_TEXTURE_2D)
+        glBegin(GL_QUADS)
+        glTexCoord2f(0, 1); glVertex2f(-1, -1)
+        glTexCoord2f(1, 1); glVertex2f(1, -1)
+        glTexCoord2f(1, 0); glVertex2f(1, 1)
+        glTexCoord2f(0, 0); glVertex2f(-1, 1)
+        glEnd()
+        glPopAttrib()
+        glBindTexture(GL_TEXTURE_2D, 0)
+
+        pygame.display.flip()
+
+    def release_surface_texture(self) -> None:
+        """Libera la textura del menú (al pasar a la visualización)."""
+        if self.surface_texture is not None:
+            glDeleteTextures([self.surface_texture])
+            self.surface_texture = None
+
+    def close(self) -> None:
+        """Destruye el contexto y cierra Pygame."""
+        try:
+            self.release_surface_texture()
+        except Exception:
+            pass
+        pygame.quit()
@@ -0,0 +1,408 @@
+# ============================================================================
+# FEATURE_BUS.PY - BUS DE RASGOS EN MEMORIA COMPARTIDA (VARIOS RENDERERS LOCALES)
+# ============================================================================
+# En un equipo con varias GPUs / salidas, un único proceso captura y analiza
+# el audio (python main.py --bus-analyzer) y publica los AudioFeatures de cada
+# bloque en un anillo de multiprocessing.shared_memory. Cada pantalla es un
+# proceso renderer independiente (python main.py --bus-renderer --display N)
+# con su propio Renderer, modo y programación de patrones, que lee el anillo
+# sin locks en lugar de capturar: la captura y la FFT se hacen una sola vez.
+#
+# Seqlock por ranura (un escritor, N lectores sin bloqueo):
+# - El escritor del bloque n pone seq = 2n+1 (impar: escribiendo), copia los
+#   datos, pone seq = 2n+2 (par: listo) y después publica write_index = n.
+# - El lector lee seq, copia la ranura y vuelve a leer seq: si no es 2n+2 las
+#   dos veces, el escritor la estaba reescribiendo y el bloque se descarta.
+# Los lectores nunca frenan al escritor; uno que se retrasa salta bloques
+# (como la cola de AudioHandler). El orden de escrituras se apoya en el modelo
+# de memoria de x86-64 (stores ordenados) y en que cada campo de control es un
+# entero de 8 bytes alineado.
+#
+# Reinicio del analizador: si el segmento sigue existiendo (en Windows basta
+# con que un renderer lo tenga abierto) y tiene la misma forma, el analizador
+# nuevo lo reutiliza y cambia 'session'; los renderers vuelven a empezar. Si
+# no, crea otro con el mismo nombre, y los renderers que miraban el anterior
+# lo detectan porque write_index deja de avanzar (FEATURE_BUS_STALL_SECONDS)
+# y vuelven a abrir el bus por nombre.
+# ============================================================================
+
+import os
+import random
+import time
+import numpy as np
+import config
+from multiprocessing import shared_memory
+from realtime_log import LOG, INFO, WARNING
+from simulation import AudioFeatures
+from typing import Optional, Tuple
+
+
+BUS_MAGIC: bytes = b'VFBUS001'
+
+HEADER_DTYPE = np.dtype([
+    ('magic', 'S8'),
+    ('capacity', '<u4'),
+    ('spectrum_bins', '<u4'),
+    ('waveform_samples', '<u4'),
+    ('session', '<u4'),          # Cambia si el analizador se reinicia
+    ('write_index', '<i8'),      # Último bloque publicado (-1 = ninguno)
+    ('reserved', 'u1', (32,)),
+])
+HEADER_SIZE: int = 64
+
+FLAG_FULL_ANALYSIS: int = 1
+
+assert HEADER_DTYPE.itemsize == HEADER_SIZE
+
+# Reconexión del renderer (desde process_audio, en el bucle de render)
+_LOG_STALLED = LOG.message(WARNING, "⚠️  El bus de rasgos no avanza desde hace {0:.1f} s: reabriendo")
+_LOG_REATTACHED = LOG.message(INFO, "🚌 Reconectado al bus de rasgos '{text}'")
+
+
+def slot_dtype(spectrum_bins: int, waveform_samples: int) -> np.dtype:
+    """Ranura del anillo: control del seqlock + rasgos completos del bloque."""
+    return np.dtype([
+        ('seq', '<u8'),
+        ('time', '<f8'),             # Segundos desde el arranque del analizador
+        ('amplitude', '<f4'),
+        ('bass', '<f4'),
+        ('mid', '<f4'),
+        ('treble', '<f4'),
+        ('beat_energy', '<f4'),
+        ('beat_threshold', '<f4'),
+        ('flags', '<u4'),
+        ('reserved', '<u4'),
+        ('spectrum', '<f4', (spectrum_bins,)),
+        ('waveform', '<f4', (waveform_samples,)),
+    ])
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """
+    Abre un segmento existente sin que este proceso lo borre al salir
+    (el resource_tracker de POSIX lo haría con cualquier proceso que lo abra).
+    """
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)   # Python >= 3.13
+    except TypeError:
+        shm = shared_memory.SharedMemory(name=name)
+        if os.name == 'posix':
+            from multiprocessing import resource_tracker
+            resource_tracker.unregister(shm._name, 'shared_memory')  # type: ignore[attr-defined]
+        return shm
+
+
+class FeatureBusWriter:
+    """
+    Escritor único del anillo (proceso analizador).
+
+    Características:
+    - Crea el segmento, o reutiliza el de un analizador anterior si tiene la
+      misma forma (los renderers conectados siguen en él con otra sesión)
+    - publish() no reserva memoria: copia en una ranura preasignada
+    - Nunca espera a los lectores
+    """
+
+    def __init__(self, name: Optional[str] = None, capacity: Optional[int] = None):
+        """
+        Args:
+            name: Nombre del segmento (por defecto config.FEATURE_BUS_NAME)
+            capacity: Ranuras del anillo (por defecto config.FEATURE_BUS_CAPACITY)
+        """
+        self.name = name or config.FEATURE_BUS_NAME
+        self.capacity = capacity or config.FEATURE_BUS_CAPACITY
+        self.slot = slot_dtype(config.SPECTRUM_BINS, config.WAVEFORM_SAMPLES)
+        size = HEADER_SIZE + self.capacity * self.slot.itemsize
+
+        try:
+            self.shm = shared_memory.SharedMemory(name=self.name, create=True, size=size)
+            previous_session = None
+        except FileExistsError:
+            # Segmento de un analizador anterior (quizá aún abierto por renderers)
+            self.shm, previous_session = self._reuse_or_recreate(size)
+
+        self.header = np.ndarray((), dtype=HEADER_DTYPE, buffer=self.shm.buf)
+        self.slots = np.ndarray((self.capacity,), dtype=self.slot, buffer=self.shm.buf, offset=HEADER_SIZE)
+        # Primero se invalidan las ranuras y write_index, después cambia la
+        # sesión: un lector nunca toma un bloque viejo como de la sesión nueva
+        self.slots['seq'] = 0
+        self.header['write_index'] = -1
+        self.header['capacity'] = self.capacity
+        self.header['spectrum_bins'] = config.SPECTRUM_BINS
+        self.header['waveform_samples'] = config.WAVEFORM_SAMPLES
+        if previous_session is None:
+            self.header['session'] = random.getrandbits(32)
+        else:
+            self.header['session'] = (previous_session + 1) & 0xFFFFFFFF
+        self.header['magic'] = BUS_MAGIC   # Al final: los lectores ya pueden abrirlo
+
+        self.next_index = 0
+        self.start = time.perf_counter()
+        print(f"🚌 Bus de rasgos '{self.name}': {self.capacity} ranuras de {self.slot.itemsize} bytes")
+
+    def _reuse_or_recreate(self, size: int) -> Tuple[shared_memory.SharedMemory, Optional[int]]:
+        """
+        Abre el segmento existente si tiene la misma forma; si no, lo borra y
+        crea otro.
+
+        Returns:
+            (segmento, sesión anterior o None si el segmento es nuevo)
+
+        Raises:
+            FileExistsError: Si el segmento no es compatible y no se puede
+                borrar (Windows, con renderers que aún lo tienen abierto)
+        """
+        existing = _attach(self.name)
+        if existing.size >= size:
+            header = np.ndarray((), dtype=HEADER_DTYPE, buffer=existing.buf)
+            if (bytes(header['magic']) == BUS_MAGIC and
+                    header['capacity'] == self.capacity and
+                    header['spectrum_bins'] == config.SPECTRUM_BINS and
+                    header['waveform_samples'] == config.WAVEFORM_SAMPLES):
+                session = int(header['session'])
+                del header
+                print(f"🚌 Reutilizando el bus de rasgos '{self.name}' del analizador anterior")
+                return existing, session
+            del header
+        existing.close()
+        existing.unlink()
+        return shared_memory.SharedMemory(name=self.name, create=True, size=size), None
+
+    def publish(self, features: AudioFeatures) -> None:
+        """Publica los rasgos de un bloque."""
+        index = self.next_index
+        slot = self.slots[index % self.capacity]
+
+        slot['seq'] = 2 * index + 1   # Escribiendo
+        slot['time'] = time.perf_counter() - self.start
+        slot['amplitude'] = features.amplitude
+        slot['bass'] = features.bass
+        slot['mid'] = features.mid
+        slot['treble'] = features.treble
+        slot['beat_energy'] = features.beat_energy
+        slot['beat_threshold'] = features.beat_threshold
+        slot['flags'] = FLAG_FULL_ANALYSIS if features.full_analysis else 0
+        if features.spectrum is not None:
+            slot['spectrum'] = features.spectrum
+        if features.waveform is not None:
+            slot['waveform'] = features.waveform
+        slot['seq'] = 2 * index + 2   # Listo
+
+        self.header['write_index'] = index
+        self.next_index += 1
+
+    def close(self) -> None:
+        """Cierra y borra el segmento."""
+        self.header = None
+        self.slots = None
+        self.shm.close()
+        try:
+            self.shm.unlink()
+        except FileNotFoundError:
+            pass
+
+
+class FeatureBusReader:
+    """
+    Lector sin bloqueo del anillo (un proceso renderer).
+
+    Tiene la interfaz de AudioHandler que usa el bucle principal:
+    start_stream(), process_audio(), process_rms_gate() y stop_stream().
+    Si el analizador deja de publicar durante FEATURE_BUS_STALL_SECONDS se
+    vuelve a abrir el bus por nombre (el analizador puede haberlo recreado).
+    """
+
+    def __init__(self, name: Optional[str] = None):
+        self.name = name or config.FEATURE_BUS_NAME
+        self.shm: Optional[shared_memory.SharedMemory] = None
+        self.header: Optional[np.ndarray] = None
+        self.slots: Optional[np.ndarray] = None
+        self.session = None
+        self.last_index = -1
+        # Detección de un analizador muerto: último write_index visto y cuándo cambió
+        self.last_seen = -1
+        self.last_progress = time.perf_counter()
+        # Como la cola de AudioHandler: si el renderer se retrasa, se saltan bloques
+        self.max_pending = 10
+
+        self.read = 0
+        self.skipped = 0
+        self.torn = 0
+        self.reattaches = 0
+
+    def _connect(self) -> Optional[str]:
+        """
+        Abre el segmento por nombre y valida su cabecera.
+
+        Returns:
+            None si se conectó, o el motivo por el que no se pudo
+        """
+        try:
+            shm = _attach(self.name)
+        except FileNotFoundError:
+            return f"No hay bus de rasgos '{self.name}': arranca antes python main.py --bus-analyzer"
+
+        header = np.ndarray((), dtype=HEADER_DTYPE, buffer=shm.buf)
+        reason = None
+        if bytes(header['magic']) != BUS_MAGIC:
+            reason = f"El segmento '{self.name}' no es un bus de rasgos"
+        elif (header['spectrum_bins'] != config.SPECTRUM_BINS or
+                header['waveform_samples'] != config.WAVEFORM_SAMPLES):
+            reason = "SPECTRUM_BINS / WAVEFORM_SAMPLES distintos de los del analizador"
+        if reason is not None:
+            del header
+            shm.close()
+            return reason
+
+        self.shm = shm
+        self.header = header
+        slot = slot_dtype(config.SPECTRUM_BINS, config.WAVEFORM_SAMPLES)
+        self.slots = np.ndarray((int(header['capacity']),), dtype=slot, buffer=shm.buf,
+                                offset=HEADER_SIZE)
+        self.session = None
+        self.last_seen = -1
+        self.last_progress = time.perf_counter()
+        return None
+
+    def _disconnect(self) -> None:
+        """Suelta la vista del segmento actual (sin borrarlo)."""
+        self.header = None
+        self.slots = None
+        if self.shm is not None:
+            self.shm.close()
+            self.shm = None
+
+    def start_stream(self) -> bool:
+        """Abre el segmento del analizador (que debe estar en marcha)."""
+        reason = self._connect()
+        if reason is not None:
+            print(f"❌ {reason}")
+            return False
+        print(f"🚌 Conectado al bus de rasgos '{self.name}'")
+        return True
+
+    def _reattach(self, stalled: float) -> None:
+        """Vuelve a abrir el bus por nombre tras FEATURE_BUS_STALL_SECONDS sin bloques."""
+        LOG.log(_LOG_STALLED, stalled)
+        self._disconnect()
+        if self._connect() is None:
+            self.reattaches += 1
+            LOG.log(_LOG_REATTACHED, text=self.name)
+        else:
+            # Se reintenta tras otro intervalo
+            self.last_progress = time.perf_counter()
+
+    def _read_slot(self, index: int) -> Optional[np.ndarray]:
+        """Copia la ranura del bloque 'index' si no se reescribió mientras se leía."""
+        position = index % len(self.slots)
+        expected = 2 * index + 2
+        if self.slots['seq'][position] != expected:
+            return None
+        record = self.slots[position:position + 1].copy()
+        if self.slots['seq'][position] != expected:
+            return None
+        return record[0]
+
+    def _latest_index(self) -> int:
+        """
+        Último bloque publicado (-1 si no hay bus), reiniciando la lectura si
+        cambió la sesión y reabriendo el bus si el analizador dejó de publicar.
+        """
+        now = time.perf_counter()
+        stalled = now - self.last_progress
+        if self.header is None:
+            if stalled >= config.FEATURE_BUS_STALL_SECONDS:
+                self._reattach(stalled)
+            if self.header is None:
+                return -1
+
+        session = int(self.header['session'])
+        if session != self.session:
+            self.session = session
+            self.last_index = -1
+        latest = int(self.header['write_index'])
+        if latest != self.last_seen:
+            self.last_seen = latest
+            self.last_progress = now
+        elif stalled >= config.FEATURE_BUS_STALL_SECONDS:
+            self._reattach(stalled)
+            return -1
+        return latest
+
+    def process_audio(self) -> Optional[AudioFeatures]:
+        """Siguiente bloque publicado que este renderer no haya leído, o None."""
+        latest = self._latest_index()
+        if latest <= self.last_index:
+            return None
+
+        if self.last_index < 0:
+            # Recién conectado: se empieza por el bloque más reciente
+            index = latest
+        else:
+            index = max(self.last_index + 1, latest - min(self.max_pending, len(self.slots)) + 1)
+            self.skipped += index - self.last_index - 1
+        while index <= latest:
+            record = self._read_slot(index)
+            self.last_index = index
+            if record is not None:
+                self.read += 1
+                full_analysis = bool(record['flags'] & FLAG_FULL_ANALYSIS)
+                return AudioFeatures(
+                    float(record['amplitude']), float(record['bass']), float(record['mid']),
+                    float(record['treble']), float(record['beat_energy']), float(record['beat_threshold']),
+                    spectrum=record['spectrum'] if full_analysis else None,
+                    waveform=record['waveform'] if full_analysis else None,
+                    full_analysis=full_analysis,
+                )
+            # Ranura reescrita mientras se leía: el escritor ya va por delante
+            self.torn += 1
+            index += 1
+        return None
+
+    def process_rms_gate(self) -> Optional[AudioFeatures]:
+        """Modo ahorro: solo la amplitud del último bloque publicado."""
+        latest = self._latest_index()
+        if latest <= self.last_index:
+            return None
+        self.last_index = latest
+        record = self._read_slot(latest)
+        if record is None:
+            return None
+        return AudioFeatures(float(record['amplitude']), full_analysis=False)
+
+    def stop_stream(self) -> None:
+        """Se desconecta del segmento (sin borrarlo: es del analizador)."""
+        self._disconnect()
+        print(f"🚌 Bloques leídos: {self.read} | Saltados: {self.skipped} | Reescritos al leer: {self.torn} | "
+              f"Reconexiones: {self.reattaches}")
+
+
+def run_bus_analyzer() -> int:
+    """
+    Proceso analizador: captura, analiza y publica en el bus, sin ventana.
+
+    Returns:
+        Código de salida del programa
+    """
+    from audio_handler import AudioHandler
+
+    audio_handler = AudioHandler()
+    if not audio_handler.start_stream():
+        return 1
+    writer = FeatureBusWriter()
+    print("🚌 Analizador en marcha: arranca los renderers con python main.py --bus-renderer --display N")
+    try:
+        while True:
+            features = audio_handler.process_audio()
+            if features is None:
+                time.sleep(0.001)
+                continue
+            writer.publish(features)
+    except KeyboardInterrupt:
+        print("\n👋 Deteniendo analizador...")
+    finally:
+        audio_handler.stop_stream()
+        blocks = writer.next_index
+        writer.close()
+    print(f"   Bloques publicados: {blocks}")
+    return 0
@@ -0,0 +1,449 @@
+# ============================================================================
+# FEATURE_NET.PY - DIFUSIÓN DE RASGOS DE AUDIO A VARIOS NODOS DE RENDER
+# ============================================================================
+# Con varias pantallas por sala, cada una con su propia captura y FFT, los
+# visuales se desincronizan. En su lugar:
+#
+# - Nodo de captura (python main.py --capture-node): captura y analiza el
+#   audio, ejecuta simulation.step() y publica por UDP multicast un paquete
+#   compacto por bloque con número de secuencia: rasgos de audio, espectro y
+#   forma de onda cuantizados y las DECISIONES del paso (beat, color, patrón).
+# - Nodo de render (python main.py --render-node): no captura. Estima el
+#   desfase entre su reloj y el del nodo de captura (mínimo del retardo de
+#   ida sobre una ventana de paquetes) y aplica cada paquete cuando su reloj
+#   estimado alcanza "instante de captura + NET_PLAYOUT_DELAY". Todos los
+#   nodos aplican así cada beat y cada cambio de patrón en el mismo instante,
+#   y por tanto en el mismo frame.
+#
+# Como los beats y patrones los decide el nodo de captura, un nodo de render
+# que arranca tarde (o pierde paquetes) se resincroniza con el siguiente.
+# La semilla y el número de beat de la sesión viajan en el paquete, y las
+# partículas de cada beat salen solo de (semilla, número de beat): coinciden
+# en todos los nodos aunque uno se una tarde, pierda un beat o el nodo de
+# captura se reinicie.
+# ============================================================================
+
+import select
+import socket
+import struct
+import time
+import numpy as np
+import config
+from collections import deque
+from realtime_log import LOG, DEBUG, INFO, WARNING
+from simulation import AudioFeatures, initialize_state, step, trigger_beat
+from typing import Any, Dict, List, Optional
+
+
+PACKET_MAGIC: bytes = b'VFNP'
+PACKET_VERSION: int = 2
+
+# magic, versión, modo, flags, (relleno), semilla, secuencia, número de beat,
+# instante del bloque, instante del último cambio de patrón,
+# amplitud, bass, mid, treble, intensidad del beat,
+# patrón, patrón anterior, color, beats, objetivo de beats, SHAPE_CHANGE_BEATS,
+# bandas de espectro, muestras de forma de onda
+# (después: espectro en uint8 y forma de onda en int8)
+HEADER_STRUCT = struct.Struct('<4sBBBxIIIdd5f8H')
+
+FLAG_BEAT: int = 1
+FLAG_FULL_ANALYSIS: int = 2
+
+MODE_CODES: Dict[str, int] = {'admin': 0, 'order': 1, 'random': 2}
+MODE_NAMES: Dict[int, str] = {code: name for name, code in MODE_CODES.items()}
+
+# Mensajes del nodo de render, que recibe y aplica paquetes en cada frame
+_LOG_NET_ERROR = LOG.message(DEBUG, "⚠️  Error de red: {text}")
+_LOG_SESSION_RESTART = LOG.message(INFO, "📡 Nodo de captura reiniciado (semilla {0:.0f}): resincronizando")
+_LOG_PATTERN_MISSING = LOG.message(WARNING, "⚠️  Patrón {0:.0f} no compilado en este nodo "
+                                            "(¿ENABLED_PATTERNS distinto?)")
+
+
+class FeaturePacket:
+    """Contenido de un paquete de rasgos ya decodificado."""
+
+    def __init__(self, seed: int, seq: int, beat_number: int, capture_time: float, pattern_mode: str,
+                 features: AudioFeatures, beat: bool, beat_intensity: float,
+                 pattern_index: int, prev_pattern_index: int, pattern_change_time: float,
+                 color_index: int, beat_count: int, beat_target: int, shape_change_beats: int):
+        self.seed = seed
+        self.seq = seq
+        self.beat_number = beat_number
+        self.capture_time = capture_time
+        self.pattern_mode = pattern_mode
+        self.features = features
+        self.beat = beat
+        self.beat_intensity = beat_intensity
+        self.pattern_index = pattern_index
+        self.prev_pattern_index = prev_pattern_index
+        self.pattern_change_time = pattern_change_time
+        self.color_index = color_index
+        self.beat_count = beat_count
+        self.beat_target = beat_target
+        self.shape_change_beats = shape_change_beats
+
+
+def encode_packet(state: Dict[str, Any], features: AudioFeatures, seq: int, beat: bool) -> bytes:
+    """
+    Empaqueta los rasgos de un bloque y las decisiones de step() tras aplicarlo.
+
+    Args:
+        state: Estado del nodo de captura (ya avanzado con estos rasgos)
+        features: Rasgos del bloque
+        seq: Número de secuencia
+        beat: True si step() detectó un beat en este bloque
+    """
+    spectrum = state['spectrum']
+    waveform = state['waveform']
+    flags = (FLAG_BEAT if beat else 0) | (FLAG_FULL_ANALYSIS if features.full_analysis else 0)
+    header = HEADER_STRUCT.pack(
+        PACKET_MAGIC, PACKET_VERSION, MODE_CODES[state['pattern_mode']], flags,
+        state['seed'] & 0xFFFFFFFF, seq & 0xFFFFFFFF, state['beat_number'] & 0xFFFFFFFF,
+        state['current_time'], state['pattern_change_time'],
+        state['current_amplitude'], state['bass_energy'], state['mid_energy'], state['treble_energy'],
+        state['beat_intensity'],
+        state['pattern_index'], state['prev_pattern_index'], state['color_index'],
+        min(state['beat_count'], 0xFFFF), min(state['current_beat_target'], 0xFFFF),
+        config.SHAPE_CHANGE_BEATS, len(spectrum), len(waveform),
+    )
+    spectrum_bytes = np.clip(np.asarray(spectrum) * 255.0 + 0.5, 0, 255).astype(np.uint8).tobytes()
+    waveform_bytes = np.clip(np.asarray(waveform) * 127.0, -127, 127).astype(np.int8).tobytes()
+    return header + spectrum_bytes + waveform_bytes
+
+
+def decode_packet(data: bytes) -> Optional[FeaturePacket]:
+    """
+    Decodifica un paquete recibido.
+
+    Returns:
+        El paquete, o None si no es un paquete de rasgos válido
+    """
+    if len(data) < HEADER_STRUCT.size:
+        return None
+    (magic, version, mode, flags, seed, seq, beat_number, capture_time, pattern_change_time,
+     amplitude, bass, mid, treble, beat_intensity,
+     pattern_index, prev_pattern_index, color_index, beat_count, beat_target, shape_change_beats,
+     spectrum_bins, waveform_samples) = HEADER_STRUCT.unpack_from(data)
+    if magic != PACKET_MAGIC or version != PACKET_VERSION or mode not in MODE_NAMES:
+        return None
+    if len(data) != HEADER_STRUCT.size + spectrum_bins + waveform_samples:
+        return None
+
+    offset = HEADER_STRUCT.size
+    spectrum = np.frombuffer(data, dtype=np.uint8, count=spectrum_bins, offset=offset)
+    waveform = np.frombuffer(data, dtype=np.int8, count=waveform_samples, offset=offset + spectrum_bins)
+    # Si la configuración del nodo difiere, se conserva la textura anterior
+    full_analysis = bool(flags & FLAG_FULL_ANALYSIS)
+    features = AudioFeatures(
+        amplitude, bass, mid, treble,
+        spectrum=(spectrum.astype(np.float32) / 255.0
+                  if full_analysis and spectrum_bins == config.SPECTRUM_BINS else None),
+        waveform=(waveform.astype(np.float32) / 127.0
+                  if full_analysis and waveform_samples == config.WAVEFORM_SAMPLES else None),
+        full_analysis=full_analysis,
+    )
+    return FeaturePacket(seed, seq, beat_number, capture_time, MODE_NAMES[mode], features,
+                         bool(flags & FLAG_BEAT), beat_intensity,
+                         pattern_index, prev_pattern_index, pattern_change_time,
+                         color_index, beat_count, beat_target, shape_change_beats)
+
+
+# ============================================================================
+# NODO DE CAPTURA
+# ============================================================================
+
+class FeaturePublisher:
+    """Emisor UDP multicast de paquetes de rasgos."""
+
+    def __init__(self, group: Optional[str] = None, port: Optional[int] = None):
+        self.address = (group or config.NET_MULTICAST_GROUP, port or config.NET_PORT)
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_UDP)
+        self.sock.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_TTL, config.NET_TTL)
+        # Loopback activo: nodos de render en el mismo equipo (y pruebas locales)
+        self.sock.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_LOOP, 1)
+        if config.NET_INTERFACE != "0.0.0.0":
+            self.sock.setsockopt(socket.IPPROTO_IP, socket.IP_MULTICAST_IF,
+                                 socket.inet_aton(config.NET_INTERFACE))
+        self.seq = 0
+
+    def publish(self, state: Dict[str, Any], features: AudioFeatures, beat: bool) -> None:
+        """Envía el paquete de un bloque (los errores de red no detienen la captura)."""
+        try:
+            self.sock.sendto(encode_packet(state, features, self.seq, beat), self.address)
+        except OSError as e:
+            if config.DEBUG_MODE:
+                print(f"⚠️  Error enviando paquete {self.seq}: {e}")
+        self.seq += 1
+
+    def close(self) -> None:
+        self.sock.close()
+
+
+def run_capture_node(pattern_mode: str, pattern_index: int = 0, control: bool = False) -> int:
+    """
+    Bucle del nodo de captura: audio → step() → multicast, sin ventana.
+
+    Args:
+        pattern_mode: 'admin', 'order' o 'random'
+        pattern_index: Patrón fijo en modo admin
+        control: Aceptar órdenes remotas (patrón, modo, color) para toda la sala
+
+    Returns:
+        Código de salida del programa
+    """
+    from audio_handler import AudioHandler
+    from pattern_registry import PatternRegistry
+    from control_server import ControlServer, SIMULATION_COMMANDS
+    from metrics import MetricsExporter, BeatRateMeter
+
+    registry = PatternRegistry()
+    scheduled = registry.scheduled_indices(pattern_mode, pattern_index)
+    if control and pattern_mode == 'admin':
+        scheduled = sorted(set(registry.scheduled_indices('order')) | {pattern_index})
+    initial = pattern_index if pattern_mode == 'admin' else scheduled[0]
+    state = initialize_state(pattern_mode, scheduled, initial, config.SIMULATION_SEED)
+
+    audio_handler = AudioHandler()
+    if not audio_handler.start_stream():
+        return 1
+    publisher = FeaturePublisher()
+    print(f"📡 Nodo de captura publicando en {publisher.address[0]}:{publisher.address[1]} "
+          f"(modo '{pattern_mode}', semilla {state['seed']})")
+
+    control_server = ControlServer(SIMULATION_COMMANDS) if control else None
+    if control_server is not None and not control_server.start():
+        control_server = None
+
+    metrics_exporter = MetricsExporter()
+    metrics_exporter.start()
+    beat_meter = BeatRateMeter()
+
+    start = time.perf_counter()
+    try:
+        while True:
+            features = audio_handler.process_audio()
+            if features is None:
+                time.sleep(0.001)
+                continue
+            if control_server is not None:
+                control_server.apply_pending(state)
+            beats_before = state['beats_detected']
+            step(state, features, (time.perf_counter() - start) - state['current_time'])
+            publisher.publish(state, features, state['beats_detected'] > beats_before)
+            beat_meter.update(state)
+    except KeyboardInterrupt:
+        print("\n👋 Deteniendo nodo de captura...")
+    finally:
+        if control_server is not None:
+            control_server.stop()
+        metrics_exporter.stop()
+        audio_handler.stop_stream()
+        publisher.close()
+    print(f"   Paquetes enviados: {publisher.seq} | Beats: {state['beats_detected']} | "
+          f"Cambios de patrón: {state['pattern_changes']}")
+    return 0
+
+
+# ============================================================================
+# NODO DE RENDER
+# ============================================================================
+
+class ClockOffsetEstimator:
+    """
+    Desfase entre el reloj local y el del nodo de captura.
+
+    Cada paquete da "llegada local - instante de captura" = desfase + retardo
+    de red. El mínimo sobre una ventana es el paquete que menos esperó, así
+    que se acerca al desfase real más el retardo mínimo (igual en todos los
+    nodos de una misma red). La ventana deslizante sigue la deriva de relojes.
+    """
+
+    def __init__(self, window: Optional[int] = None):
+        self.samples: deque = deque(maxlen=window or config.NET_CLOCK_WINDOW)
+        self.offset: Optional[float] = None
+
+    def add(self, local_arrival: float, remote_time: float) -> None:
+        self.samples.append(local_arrival - remote_time)
+        self.offset = min(self.samples)
+
+    def reset(self) -> None:
+        self.samples.clear()
+        self.offset = None
+
+
+class NetworkFeatureSource:
+    """
+    Receptor de paquetes de rasgos para un nodo de render.
+
+    Características:
+    - Sustituye a AudioHandler: start_stream() / stop_stream()
+    - advance(state) avanza la simulación con los paquetes que ya tocan
+    - Descarta duplicados y paquetes antiguos; cuenta perdidos y tardíos
+    - Detecta un reinicio del nodo de captura (semilla distinta) y continúa
+      sin saltos de tiempo
+    """
+
+    def __init__(self, group: Optional[str] = None, port: Optional[int] = None):
+        group = group or config.NET_MULTICAST_GROUP
+        port = port or config.NET_PORT
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_UDP)
+        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        if hasattr(socket, 'SO_REUSEPORT'):
+            # Varios nodos de render en el mismo equipo
+            self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+        self.sock.bind(('', port))
+        membership = struct.pack('4s4s', socket.inet_aton(group), socket.inet_aton(config.NET_INTERFACE))
+        self.sock.setsockopt(socket.IPPROTO_IP, socket.IP_ADD_MEMBERSHIP, membership)
+        self.sock.setblocking(False)
+
+        self.clock = ClockOffsetEstimator()
+        self.pending: Dict[int, FeaturePacket] = {}
+        self.first_packet: Optional[FeaturePacket] = None
+        self.session_seed: Optional[int] = None
+        self.last_seq: Optional[int] = None
+        # Suma a los instantes del nodo de captura (cambia si este se reinicia)
+        self.time_base = 0.0
+        self.last_time = 0.0
+        self._warned_patterns = False
+
+        self.received = 0
+        self.lost = 0
+        self.late = 0
+        self.sessions = 0
+
+    # --- Recepción ---
+
+    def _receive(self) -> None:
+        """Lee todos los paquetes disponibles sin bloquear."""
+        while True:
+            try:
+                data = self.sock.recv(2048)
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError as e:
+                LOG.log(_LOG_NET_ERROR, text=str(e))
+                return
+            arrival = time.perf_counter()
+            packet = decode_packet(data)
+            if packet is None:
+                continue
+            self.received += 1
+
+            if packet.seed != self.session_seed:
+                self._start_session(packet, arrival)
+            elif self.last_seq is not None and packet.seq <= self.last_seq:
+                continue   # Duplicado o llegó después de uno posterior ya aplicado
+
+            self.clock.add(arrival, packet.capture_time)
+            self.pending[packet.seq] = packet
+
+    def _start_session(self, packet: FeaturePacket, arrival: float) -> None:
+        """Primer paquete de un nodo de captura (o de uno reiniciado)."""
+        self.sessions += 1
+        if self.first_packet is None:
+            self.first_packet = packet
+        else:
+            LOG.log(_LOG_SESSION_RESTART, packet.seed)
+            # La escala de tiempo continúa donde estaba
+            self.time_base = self.last_time + config.NET_PLAYOUT_DELAY - packet.capture_time
+        self.session_seed = packet.seed
+        self.last_seq = None
+        self.pending.clear()
+        self.clock.reset()
+
+    def wait_for_session(self, timeout: float) -> bool:
+        """
+        Espera (hasta 'timeout' segundos) al primer paquete del nodo de captura.
+
+        Returns:
+            True si ya se ha recibido algún paquete
+        """
+        if self.first_packet is None:
+            select.select([self.sock], [], [], timeout)
+            self._receive()
+        return self.first_packet is not None
+
+    # --- Interfaz de AudioHandler ---
+
+    def start_stream(self) -> bool:
+        return self.first_packet is not None
+
+    def stop_stream(self) -> None:
+        self.sock.close()
+        print(f"📡 Paquetes recibidos: {self.received} | Perdidos: {self.lost} | "
+              f"Tardíos: {self.late} | Sesiones: {self.sessions}")
+
+    # --- Simulación ---
+
+    def session_time(self) -> float:
+        """Instante de simulación: reloj estimado del nodo de captura menos el retardo."""
+        if self.clock.offset is None:
+            return self.last_time
+        now = time.perf_counter() - self.clock.offset + self.time_base - config.NET_PLAYOUT_DELAY
+        # El desfase estimado solo puede bajar: el tiempo no retrocede
+        self.last_time = max(self.last_time, now)
+        return self.last_time
+
+    def _due_packets(self, now: float) -> List[FeaturePacket]:
+        """Paquetes pendientes cuyo instante ya ha llegado, en orden de secuencia."""
+        due = sorted((p for p in self.pending.values() if p.capture_time + self.time_base <= now),
+                     key=lambda p: p.seq)
+        for packet in due:
+            del self.pending[packet.seq]
+        return due
+
+    def _apply_decisions(self, state: Dict[str, Any], packet: FeaturePacket) -> None:
+        """Copia las decisiones del nodo de captura (beat, color y patrón)."""
+        # Un nodo de captura reiniciado trae otra semilla para sus partículas
+        state['seed'] = packet.seed
+        if packet.beat:
+            trigger_beat(state, packet.beat_intensity, packet.beat_number)
+        state['color_index'] = packet.color_index % len(config.COLOR_PALETTE)
+        state['beat_count'] = packet.beat_count
+        state['current_beat_target'] = packet.beat_target
+
+        if packet.pattern_index != state['pattern_index']:
+            if packet.pattern_index not in state['scheduled_patterns']:
+                if not self._warned_patterns:
+                    LOG.log(_LOG_PATTERN_MISSING, packet.pattern_index)
+                    self._warned_patterns = True
+                return
+            state['prev_pattern_index'] = state['pattern_index']
+            state['pattern_index'] = packet.pattern_index
+            state['pattern_change_time'] = packet.pattern_change_time + self.time_base
+            state['pattern_changes'] += 1
+
+    def advance(self, state: Dict[str, Any]) -> None:
+        """
+        Avanza la simulación de un frame con los paquetes que ya tocan.
+        Sustituye a 'process_audio() + step()' del bucle principal.
+        """
+        self._receive()
+        now = self.session_time()
+
+        applied = False
+        for packet in self._due_packets(now):
+            if self.last_seq is not None and packet.seq > self.last_seq + 1:
+                self.lost += packet.seq - self.last_seq - 1
+            self.last_seq = packet.seq
+
+            packet_time = packet.capture_time + self.time_base
+            if packet_time < state['current_time']:
+                self.late += 1
+            step(state, packet.features, max(0.0, packet_time - state['current_time']),
+                 local_decisions=False)
+            self._apply_decisions(state, packet)
+            applied = True
+
+        if not applied:
+            step(state, None, max(0.0, now - state['current_time']), local_decisions=False)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Estadísticas de recepción y sincronización."""
+        return {
+            'received': self.received,
+            'lost': self.lost,
+            'late': self.late,
+            'pending': len(self.pending),
+            'clock_offset_ms': self.clock.offset * 1000.0 if self.clock.offset is not None else None,
+        }
@@ -0,0 +1,360 @@
+# ============================================================================
+# FEATURE_TRACE.PY - GRABACIÓN Y REPETICIÓN DE RASGOS DE AUDIO
+# ============================================================================
+# Graba los AudioFeatures de cada bloque analizado en un fichero binario de
+# solo añadir, y los repite después sin dispositivo de audio ni FFT:
+# - Reproducir exactamente un problema de rendimiento visto en un show
+# - Repetir horas de sesión en segundos (sin pantalla, con simulation.step)
+#
+# Formato (little-endian):
+#   Cabecera de 32 bytes: magic 'VFTRACE1', versión, tamaño de registro,
+#   SAMPLERATE, NUM_SAMPLES y hora de inicio (epoch).
+#   Registros de 40 bytes (RECORD_DTYPE): instante, bloque, amplitud, bandas,
+#   energía y umbral de beat y flags.
+# Al ser registros de tamaño fijo el fichero se abre con np.memmap sin
+# leerlo entero. Un registro a medias (corte del programa) se ignora. El
+# espectro y la forma de onda no se graban: al repetir, las texturas de audio
+# del shader conservan su último valor.
+#
+# Uso:
+#   python main.py --record-trace show.vft      (o config.FEATURE_TRACE_PATH)
+#   python main.py --replay-trace show.vft      (visualizador sin audio)
+#   python feature_trace.py show.vft            (resumen + repetición sin pantalla)
+# ============================================================================
+
+import os
+import struct
+import sys
+import time
+import numpy as np
+import config
+from simulation import AudioFeatures, initialize_state, step
+from typing import Any, BinaryIO, Dict, Optional, Tuple
+
+
+TRACE_MAGIC: bytes = b'VFTRACE1'
+TRACE_VERSION: int = 1
+
+# magic, versión, tamaño de registro, samplerate, num_samples, inicio (epoch)
+HEADER_STRUCT = struct.Struct('<8sIIIId')
+HEADER_SIZE: int = 32
+
+FLAG_FULL_ANALYSIS: int = 1
+FLAG_BEAT_CANDIDATE: int = 2
+
+RECORD_DTYPE = np.dtype([
+    ('time', '<f8'),            # Segundos desde el inicio de la traza
+    ('block', '<u4'),           # Número de bloque
+    ('amplitude', '<f4'),
+    ('bass', '<f4'),
+    ('mid', '<f4'),
+    ('treble', '<f4'),
+    ('beat_energy', '<f4'),
+    ('beat_threshold', '<f4'),
+    ('flags', 'u1'),            # FLAG_FULL_ANALYSIS | FLAG_BEAT_CANDIDATE
+    ('reserved', 'u1', (3,)),
+])
+
+assert HEADER_STRUCT.size == HEADER_SIZE and RECORD_DTYPE.itemsize == 40
+
+
+def _check_header(header: bytes, path: str) -> Tuple[int, int, float]:
+    """
+    Valida la cabecera de una traza.
+
+    Returns:
+        (samplerate, num_samples, inicio en epoch)
+
+    Raises:
+        ValueError: Si no es una traza de esta versión
+    """
+    if len(header) < HEADER_SIZE:
+        raise ValueError(f"{path}: cabecera incompleta")
+    magic, version, record_size, samplerate, num_samples, started = HEADER_STRUCT.unpack(header)
+    if magic != TRACE_MAGIC or version != TRACE_VERSION or record_size != RECORD_DTYPE.itemsize:
+        raise ValueError(f"{path}: no es una traza de rasgos v{TRACE_VERSION}")
+    return samplerate, num_samples, started
+
+
+class FeatureTraceWriter:
+    """
+    Grabador de rasgos en un fichero de solo añadir.
+
+    Características:
+    - Un registro de tamaño fijo por bloque (40 bytes: ~3 MB por hora a 2048/44100)
+    - Si el fichero ya existe se continúa a partir de su último instante
+      (solo si su cabecera tiene el mismo SAMPLERATE y NUM_SAMPLES)
+    - Escritura con el buffer del fichero: sin llamada al sistema por bloque
+    """
+
+    def __init__(self, path: str, num_samples: Optional[int] = None):
+        """
+        Args:
+            path: Fichero de la traza (se crea si no existe)
+            num_samples: Tamaño de bloque de los registros (por defecto config.NUM_SAMPLES)
+
+        Raises:
+            ValueError: Si el fichero existe y no es una traza con el mismo
+                SAMPLERATE y NUM_SAMPLES
+        """
+        self.path = path
+        self.samplerate: int = config.SAMPLERATE
+        self.num_samples: int = num_samples or config.NUM_SAMPLES
+        self.time_offset = 0.0
+        self.block = 0
+
+        existing = os.path.exists(path) and os.path.getsize(path) >= HEADER_SIZE
+        if existing:
+            with open(path, 'rb') as f:
+                samplerate, block_size, _ = _check_header(f.read(HEADER_SIZE), path)
+            if (samplerate, block_size) != (self.samplerate, self.num_samples):
+                raise ValueError(f"{path}: traza grabada a {samplerate} Hz con bloques de {block_size}; "
+                                 f"no se añaden bloques de {self.num_samples} a {self.samplerate} Hz")
+        self.file: BinaryIO = open(path, 'r+b' if existing else 'wb')
+        if existing:
+            self.file.seek(HEADER_SIZE)
+            count = (os.path.getsize(path) - HEADER_SIZE) // RECORD_DTYPE.itemsize
+            valid_size = HEADER_SIZE + count * RECORD_DTYPE.itemsize
+            if count > 0:
+                # Continúa tras el último registro (1 s de hueco marca el corte)
+                self.file.seek(valid_size - RECORD_DTYPE.itemsize)
+                last = np.frombuffer(self.file.read(RECORD_DTYPE.itemsize), dtype=RECORD_DTYPE)[0]
+                self.time_offset = float(last['time']) + 1.0
+                self.block = int(last['block']) + 1
+            # Descarta un registro a medias de una ejecución interrumpida
+            self.file.truncate(valid_size)
+            self.file.seek(valid_size)
+        else:
+            self.file.write(HEADER_STRUCT.pack(TRACE_MAGIC, TRACE_VERSION, RECORD_DTYPE.itemsize,
+                                               self.samplerate, self.num_samples, time.time()))
+
+        self.start = time.perf_counter()
+        self._record = np.zeros(1, dtype=RECORD_DTYPE)
+        print(f"⏺️  Grabando rasgos de audio en {path}")
+
+    def append(self, features: AudioFeatures, timestamp: Optional[float] = None) -> None:
+        """
+        Añade un registro.
+
+        Args:
+            features: Rasgos del bloque
+            timestamp: Segundos desde el inicio (None = reloj de la grabación)
+        """
+        if timestamp is None:
+            timestamp = time.perf_counter() - self.start
+        record = self._record[0]
+        record['time'] = self.time_offset + timestamp
+        record['block'] = self.block
+        record['amplitude'] = features.amplitude
+        record['bass'] = features.bass
+        record['mid'] = features.mid
+        record['treble'] = features.treble
+        record['beat_energy'] = features.beat_energy
+        record['beat_threshold'] = features.beat_threshold
+        record['flags'] = ((FLAG_FULL_ANALYSIS if features.full_analysis else 0) |
+                           (FLAG_BEAT_CANDIDATE if features.beat_candidate else 0))
+        self.file.write(self._record.tobytes())
+        self.block += 1
+
+    def rotate(self, num_samples: int) -> 'FeatureTraceWriter':
+        """
+        Cierra esta traza y sigue grabando en otra con el nuevo tamaño de bloque.
+
+        La nueva se llama como la original con el tamaño de bloque como sufijo
+        (show.vft -> show.1024.vft), así cada fichero describe bien sus registros.
+
+        Args:
+            num_samples: Tamaño de bloque de los registros siguientes
+
+        Returns:
+            El grabador de la nueva traza
+
+        Raises:
+            ValueError: Si la nueva traza ya existe con otra cabecera
+        """
+        self.close()
+        base, ext = os.path.splitext(self.path)
+        if base.endswith(f".{self.num_samples}"):
+            base = base[:-len(f".{self.num_samples}")]
+        return FeatureTraceWriter(f"{base}.{num_samples}{ext}", num_samples)
+
+    def close(self) -> None:
+        """Vuelca y cierra el fichero."""
+        if not self.file.closed:
+            self.file.close()
+            print(f"⏹️  Traza cerrada: {self.block} bloques en {self.path}")
+
+
+class FeatureTraceReader:
+    """
+    Lectura de una traza mediante np.memmap (sin cargarla en memoria).
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: Fichero de la traza
+
+        Raises:
+            ValueError: Si el fichero no es una traza válida
+        """
+        with open(path, 'rb') as f:
+            samplerate, num_samples, started = _check_header(f.read(HEADER_SIZE), path)
+
+        self.path = path
+        self.samplerate: int = samplerate
+        self.num_samples: int = num_samples
+        self.started: float = started
+
+        count = (os.path.getsize(path) - HEADER_SIZE) // RECORD_DTYPE.itemsize
+        self.records: np.ndarray = (
+            np.memmap(path, dtype=RECORD_DTYPE, mode='r', offset=HEADER_SIZE, shape=(count,))
+            if count > 0 else np.zeros(0, dtype=RECORD_DTYPE)
+        )
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    @property
+    def duration(self) -> float:
+        """Segundos entre el primer y el último registro."""
+        if len(self.records) == 0:
+            return 0.0
+        return float(self.records['time'][-1] - self.records['time'][0])
+
+    def features(self, index: int) -> AudioFeatures:
+        """Reconstruye los AudioFeatures del registro 'index'."""
+        record = self.records[index]
+        return AudioFeatures(
+            amplitude=float(record['amplitude']),
+            bass=float(record['bass']),
+            mid=float(record['mid']),
+            treble=float(record['treble']),
+            beat_energy=float(record['beat_energy']),
+            beat_threshold=float(record['beat_threshold']),
+            full_analysis=bool(record['flags'] & FLAG_FULL_ANALYSIS),
+            # La decisión del directo: recalcularla con los float32 grabados
+            # puede cambiar beats con la energía justo en el umbral
+            beat_candidate=bool(record['flags'] & FLAG_BEAT_CANDIDATE),
+        )
+
+    def close(self) -> None:
+        """Suelta el mapeo del fichero (se libera con la última referencia)."""
+        self.records = np.zeros(0, dtype=RECORD_DTYPE)
+
+
+class TraceReplaySource:
+    """
+    Sustituto de AudioHandler que entrega los rasgos de una traza a su ritmo
+    original (o acelerado), sin dispositivo de audio ni FFT.
+
+    Tiene la misma interfaz que usa el bucle principal: start_stream(),
+    process_audio(), process_rms_gate() y stop_stream().
+    """
+
+    def __init__(self, path: str, speed: float = 1.0, loop: bool = False):
+        """
+        Args:
+            path: Fichero de la traza
+            speed: Velocidad de reproducción (2.0 = el doble de rápido)
+            loop: Volver al principio al terminar (si no, silencio)
+        """
+        self.reader = FeatureTraceReader(path)
+        # Copia contigua de los instantes (8 bytes/bloque) para searchsorted
+        self.times: np.ndarray = np.ascontiguousarray(self.reader.records['time'])
+        self.speed = speed
+        self.loop = loop
+        self.position = 0
+        self.start: Optional[float] = None
+        # Como la cola de AudioHandler: si el bucle se retrasa, se saltan bloques
+        self.max_pending = 10
+        print(f"⏯️  Repitiendo traza {path}: {len(self.reader)} bloques, {self.reader.duration:.1f} s")
+
+    def start_stream(self) -> bool:
+        """Pone en marcha el reloj de la repetición."""
+        if len(self.reader) == 0:
+            print("❌ La traza está vacía")
+            return False
+        self.start = time.perf_counter()
+        self.position = 0
+        return True
+
+    def _trace_time(self) -> float:
+        """Instante actual en la escala de tiempo de la traza."""
+        elapsed = (time.perf_counter() - self.start) * self.speed if self.start is not None else 0.0
+        return float(self.times[0]) + elapsed
+
+    def _due_count(self) -> int:
+        """Registros pendientes cuyo instante ya ha llegado."""
+        if self.position >= len(self.reader):
+            if not self.loop:
+                return 0
+            self.start = time.perf_counter()
+            self.position = 0
+        end = int(np.searchsorted(self.times, self._trace_time(), side='right'))
+        return max(0, end - self.position)
+
+    def process_audio(self) -> Optional[AudioFeatures]:
+        """Siguiente bloque de la traza si ya le toca, o None."""
+        pending = self._due_count()
+        if pending == 0:
+            return None
+        if pending > self.max_pending:
+            self.position += pending - self.max_pending
+        features = self.reader.features(self.position)
+        self.position += 1
+        return features
+
+    def process_rms_gate(self) -> Optional[AudioFeatures]:
+        """Modo ahorro: salta al último bloque vencido y entrega solo su amplitud."""
+        pending = self._due_count()
+        if pending == 0:
+            return None
+        self.position += pending
+        return AudioFeatures(self.reader.features(self.position - 1).amplitude, full_analysis=False)
+
+    def stop_stream(self) -> None:
+        """Cierra la traza."""
+        self.reader.close()
+
+
+def replay_headless(path: str, pattern_mode: str = "order", seed: int = 0) -> Dict[str, Any]:
+    """
+    Repite una traza completa con simulation.step(), sin pantalla ni reloj real.
+    El dt de cada paso es la diferencia entre instantes de registros consecutivos.
+
+    Returns:
+        Estado final de la simulación
+    """
+    reader = FeatureTraceReader(path)
+    patterns = list(range(config.TOTAL_PATTERNS))
+    state = initialize_state(pattern_mode, patterns, patterns[0], seed)
+    times = np.ascontiguousarray(reader.records['time'])
+    previous = float(times[0]) if len(reader) else 0.0
+    for index in range(len(reader)):
+        now = float(times[index])
+        step(state, reader.features(index), now - previous)
+        previous = now
+    reader.close()
+    return state
+
+
+if __name__ == '__main__':
+    if len(sys.argv) != 2:
+        print("Uso: python feature_trace.py TRAZA")
+        sys.exit(2)
+
+    trace_reader = FeatureTraceReader(sys.argv[1])
+    flags = trace_reader.records['flags']
+    print(f"📼 {sys.argv[1]}: {len(trace_reader)} bloques, {trace_reader.duration:.1f} s "
+          f"({trace_reader.samplerate} Hz, {trace_reader.num_samples} muestras/bloque, "
+          f"grabada {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(trace_reader.started))})")
+    print(f"   Candidatos a beat: {int(np.count_nonzero(flags & FLAG_BEAT_CANDIDATE))} | "
+          f"Bloques en modo ahorro: {int(np.count_nonzero((flags & FLAG_FULL_ANALYSIS) == 0))}")
+    trace_reader.close()
+
+    begin = time.perf_counter()
+    final_state = replay_headless(sys.argv[1])
+    elapsed = time.perf_counter() - begin
+    print(f"⏱️  Repetición sin pantalla en {elapsed:.3f} s | Beats: {final_state['beats_detected']} | "
+          f"Cambios de patrón: {final_state['pattern_changes']}")
@@ -0,0 +1,94 @@
+# ============================================================================
+# FRAME_FENCES.PY - LÍMITE DE FRAMES EN VUELO CON FENCES DE OPENGL
+# ============================================================================
+# Permite solapar el trabajo de CPU del frame N+1 (análisis de audio, lógica de
+# patrones, preparación de uniforms) con la ejecución en GPU del frame N:
+# tras emitir los comandos de un frame se inserta un fence (glFenceSync) y se
+# hace glFlush para que la GPU empiece ya, sin esperar al swap.
+#
+# Antes de emitir un frame nuevo se espera (glClientWaitSync) solo si ya hay
+# MAX_FRAMES_IN_FLIGHT frames pendientes en la GPU. Así la latencia entre el
+# audio muestreado y la imagen en pantalla queda acotada.
+# ============================================================================
+
+import time
+from OpenGL.GL import *
+import config
+from collections import deque
+from realtime_log import LOG, WARNING
+from typing import Dict, Any
+
+
+_LOG_WAIT_FAILED = LOG.message(WARNING, "⚠️  glClientWaitSync falló: se descarta el fence")
+
+
+class FrameFences:
+    """
+    Cola de fences de GPU, uno por frame emitido.
+
+    Características:
+    - Retira sin bloquear los fences ya señalados
+    - Bloquea solo al superar config.MAX_FRAMES_IN_FLIGHT
+    - Se desactiva solo si el contexto no soporta sync objects (OpenGL < 3.2)
+    - Contabiliza esperas y tiempo bloqueado (indicador de frames limitados por GPU)
+    """
+
+    # Tiempo máximo de una espera (ns); evita colgar el bucle si el driver falla
+    WAIT_TIMEOUT_NS: int = 100_000_000
+
+    def __init__(self, max_in_flight: int = None):
+        """
+        Args:
+            max_in_flight: Frames máximos pendientes en GPU (por defecto config.MAX_FRAMES_IN_FLIGHT)
+        """
+        self.max_in_flight: int = max_in_flight or config.MAX_FRAMES_IN_FLIGHT
+        self.fences: deque = deque()
+        self.enabled: bool = bool(glFenceSync)
+
+        self.waits: int = 0
+        self.wait_seconds: float = 0.0
+
+        if not self.enabled:
+            print("⚠️  glFenceSync no disponible: sin límite de frames en vuelo")
+
+    def _retire_signaled(self) -> None:
+        """Elimina de la cola los fences que la GPU ya ha completado (sin bloquear)."""
+        while self.fences:
+            result = glClientWaitSync(self.fences[0], 0, 0)
+            if result not in (GL_ALREADY_SIGNALED, GL_CONDITION_SATISFIED):
+                break
+            glDeleteSync(self.fences.popleft())
+
+    def wait_for_slot(self) -> None:
+        """Bloquea hasta que haya menos de max_in_flight frames pendientes en GPU."""
+        if not self.enabled:
+            return
+
+        self._retire_signaled()
+        while len(self.fences) >= self.max_in_flight:
+            start = time.perf_counter()
+            result = glClientWaitSync(self.fences[0], GL_SYNC_FLUSH_COMMANDS_BIT, self.WAIT_TIMEOUT_NS)
+            self.waits += 1
+            self.wait_seconds += time.perf_counter() - start
+            if result == GL_WAIT_FAILED:
+                LOG.log(_LOG_WAIT_FAILED)
+            glDeleteSync(self.fences.popleft())
+
+    def insert(self) -> None:
+        """Inserta el fence del frame recién emitido y envía los comandos a la GPU."""
+        if self.enabled:
+            self.fences.append(glFenceSync(GL_SYNC_GPU_COMMANDS_COMPLETE, 0))
+        glFlush()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Esperas por GPU y tiempo total bloqueado."""
+        return {
+            'in_flight': len(self.fences),
+            'waits': self.waits,
+            'wait_ms': self.wait_seconds * 1000.0,
+        }
+
+    def close(self) -> None:
+        """Libera los fences pendientes."""
+        while self.fences:
+            glDeleteSync(self.fences.popleft())
@@ -0,0 +1,222 @@
+# ============================================================================
+# FRAME_PACER.PY - PLANIFICACIÓN DE FRAMES CONTRA EL DEADLINE DE VSYNC
+# ============================================================================
+# Sustituye al par "flip con VSync + clock.tick(TARGET_FPS)", que esperaba dos
+# veces por frame y producía un ritmo irregular cuando la frecuencia de la
+# pantalla y TARGET_FPS no coincidían.
+#
+# Funcionamiento:
+# 1. Calibración: los primeros frames se presentan sin esperas para medir el
+#    periodo real de refresco (si VSync está activo el flip se bloquea en él).
+# 2. Periodo de frame: el múltiplo entero del refresco más cercano a
+#    1 / TARGET_FPS (sin VSync efectivo, directamente 1 / TARGET_FPS).
+# 3. Inicio tardío: cada frame empieza en "deadline - trabajo estimado - margen",
+#    así el audio se muestrea lo más cerca posible del momento en que se ve.
+# 4. Telemetría: frames fuera de plazo y jitter del intervalo entre frames.
+# ============================================================================
+
+import time
+import numpy as np
+import config
+from metrics import REGISTRY, FRAME_MS_BUCKETS
+from realtime_log import LOG, DEBUG
+from collections import deque
+from typing import Dict, Optional
+
+
+_LOG_MISSED_DEADLINE = LOG.message(DEBUG, "⏱️  Frame fuera de plazo ({0:.1f} ms tarde)")
+
+
+class FramePacer:
+    """
+    Planificador de inicio de frame con detección de deadlines perdidos.
+
+    Uso en el bucle principal:
+        pacer.wait_for_frame_start()
+        ... muestrear audio, actualizar estado, emitir comandos GL ...
+        pacer.mark_submitted()
+        renderer.present()
+        pacer.mark_presented()
+    """
+
+    def __init__(self, target_fps: Optional[int] = None, vsync: Optional[bool] = None):
+        """
+        Args:
+            target_fps: FPS objetivo (por defecto config.TARGET_FPS)
+            vsync: Si el flip está sincronizado con el refresco (por defecto config.VSYNC)
+        """
+        self.target_period: float = 1.0 / (target_fps or config.TARGET_FPS)
+        self.vsync: bool = config.VSYNC if vsync is None else vsync
+
+        # Periodo de refresco medido (None = sin calibrar o sin VSync efectivo)
+        self.refresh_period: Optional[float] = None
+        self.frame_period: float = self.target_period
+        self._calibration_intervals: list = []
+        self.calibrated: bool = not self.vsync
+
+        # Marcas de tiempo del frame en curso
+        self.frame_start: float = time.perf_counter()
+        self.last_present: Optional[float] = None
+        self.next_deadline: Optional[float] = None
+
+        # Estimación del trabajo de CPU por frame (media móvil exponencial)
+        self.work_estimate: float = 0.0
+
+        # Estadísticas
+        self.intervals: deque = deque(maxlen=config.FRAME_PACER_HISTORY)
+        self.frames: int = 0
+        self.missed_deadlines: int = 0
+        self.interval_histogram = REGISTRY.histogram(
+            'frame_interval_ms', "Intervalo entre frames presentados (ms)", FRAME_MS_BUCKETS)
+        self.work_histogram = REGISTRY.histogram(
+            'frame_work_ms', "Trabajo de CPU por frame hasta el flip (ms)", FRAME_MS_BUCKETS)
+        self.missed_counter = REGISTRY.counter('missed_deadlines_total', "Frames fuera de plazo")
+
+    # ------------------------------------------------------------------
+    # Planificación
+    # ------------------------------------------------------------------
+
+    def _finish_calibration(self) -> None:
+        """Fija el periodo de refresco y el periodo de frame tras la calibración."""
+        median_interval = float(np.median(self._calibration_intervals))
+        self.calibrated = True
+
+        # Un flip que vuelve en < 2 ms no está bloqueando en el vblank
+        if median_interval < 0.002:
+            self.refresh_period = None
+            self.frame_period = self.target_period
+            print("   ⏱️  Frame pacer: VSync no efectivo, ritmo por temporizador "
+                  f"({1.0 / self.frame_period:.1f} FPS)")
+            return
+
+        self.refresh_period = median_interval
+        self._update_frame_period()
+        multiple = int(round(self.frame_period / self.refresh_period))
+        print(f"   ⏱️  Frame pacer: refresco {1.0 / self.refresh_period:.1f} Hz, "
+              f"1 frame cada {multiple} refresco(s) ({1.0 / self.frame_period:.1f} FPS)")
+
+    def _update_frame_period(self) -> None:
+        """Recalcula el periodo de frame a partir del objetivo y el refresco medido."""
+        if self.refresh_period is None:
+            self.frame_period = self.target_period
+            return
+        multiple = max(1, int(round(self.target_period / self.refresh_period)))
+        self.frame_period = self.refresh_period * multiple
+
+    def set_target_fps(self, target_fps: int) -> None:
+        """
+        Cambia el FPS objetivo en caliente (p. ej. modo ahorro de energía).
+
+        Args:
+            target_fps: Nuevo FPS objetivo
+        """
+        target_period = 1.0 / target_fps
+        if target_period == self.target_period:
+            return
+        self.target_period = target_period
+        if self.calibrated:
+            self._update_frame_period()
+            # El siguiente deadline se replanifica desde el último flip
+            if self.last_present is not None:
+                self.next_deadline = self.last_present + self.frame_period
+
+    def wait_for_frame_start(self) -> float:
+        """
+        Espera hasta el instante planificado de inicio del frame.
+
+        Returns:
+            Instante de inicio del frame (time.perf_counter)
+        """
+        if self.calibrated and self.next_deadline is not None:
+            margin = config.FRAME_PACER_SAFETY_MS / 1000.0
+            start_at = self.next_deadline - self.work_estimate - margin
+            # Con VSync el flip ya espera al vblank: no hace falta dormir más allá
+            # del refresco anterior al deadline
+            if self.refresh_period is not None:
+                start_at = min(start_at, self.next_deadline - self.refresh_period)
+            self._sleep_until(start_at)
+
+        self.frame_start = time.perf_counter()
+        return self.frame_start
+
+    def _sleep_until(self, target: float) -> None:
+        """Duerme hasta 'target' y termina con una espera activa corta (precisión)."""
+        spin = config.FRAME_PACER_SPIN_MS / 1000.0
+        remaining = target - time.perf_counter()
+        if remaining > spin:
+            time.sleep(remaining - spin)
+        while time.perf_counter() < target:
+            pass
+
+    def mark_submitted(self) -> None:
+        """Registra que el frame terminó de emitir comandos (justo antes del flip)."""
+        work = time.perf_counter() - self.frame_start
+        self.work_histogram.observe(work * 1000.0)
+        alpha = 0.1
+        # Sube rápido y baja despacio: mejor empezar antes que llegar tarde
+        if work > self.work_estimate:
+            self.work_estimate = work
+        else:
+            self.work_estimate = self.work_estimate * (1.0 - alpha) + work * alpha
+
+    def mark_presented(self) -> None:
+        """Registra el retorno del flip, detecta deadlines perdidos y planifica el siguiente."""
+        now = time.perf_counter()
+        self.frames += 1
+
+        if self.last_present is not None:
+            interval = now - self.last_present
+            self.intervals.append(interval)
+            self.interval_histogram.observe(interval * 1000.0)
+
+            if not self.calibrated:
+                self._calibration_intervals.append(interval)
+                if len(self._calibration_intervals) >= config.FRAME_PACER_CALIBRATION_FRAMES:
+                    self._finish_calibration()
+
+        if self.calibrated and self.next_deadline is not None:
+            tolerance = (self.refresh_period or self.frame_period) * 0.5
+            if now > self.next_deadline + tolerance:
+                self.missed_deadlines += 1
+                self.missed_counter.inc()
+                LOG.log(_LOG_MISSED_DEADLINE, (now - self.next_deadline) * 1000.0)
+                # Reanclar al presente: no intentar recuperar frames perdidos
+                self.next_deadline = now
+
+        self.last_present = now
+        if self.calibrated:
+            base = self.next_deadline if self.next_deadline is not None else now
+            self.next_deadline = base + self.frame_period
+
+    def reset(self) -> None:
+        """Descarta la planificación (tras una pausa o cambio de ritmo)."""
+        self.last_present = None
+        self.next_deadline = None
+
+    # ------------------------------------------------------------------
+    # Telemetría
+    # ------------------------------------------------------------------
+
+    def get_stats(self) -> Dict[str, float]:
+        """
+        Estadísticas del intervalo entre frames presentados.
+
+        Returns:
+            Diccionario con frames, deadlines perdidos y tiempos en milisegundos
+        """
+        stats = {
+            'frames': self.frames,
+            'missed_deadlines': self.missed_deadlines,
+            'frame_period_ms': self.frame_period * 1000.0,
+            'mean_ms': 0.0,
+            'jitter_ms': 0.0,
+            'p99_ms': 0.0,
+            'max_ms': 0.0,
+        }
+        if self.intervals:
+            intervals_ms = np.asarray(self.intervals) * 1000.0
+            stats['mean_ms'] = float(np.mean(intervals_ms))
+            stats['jitter_ms'] = float(np.std(intervals_ms))
+            stats['p99_ms'] = float(np.percentile(intervals_ms, 99))
+            stats['max_ms'] = float(np.max(intervals_ms))
+        return stats
@@ -0,0 +1,81 @@
+# ============================================================================
+# GPU_TIMER.PY - TIEMPO DE GPU POR FRAME CON TIMER QUERIES (SIN BLOQUEAR)
+# ============================================================================
+# Cada frame se envuelve en un par glBeginQuery/glEndQuery(GL_TIME_ELAPSED).
+# El resultado no se pide en el mismo frame (eso esperaría a la GPU): las
+# queries se guardan en cola y se leen unos frames después, solo cuando
+# GL_QUERY_RESULT_AVAILABLE indica que ya están listas. Cada medida va al
+# histograma 'gpu_frame_ms' con el patrón que se dibujó en ese frame.
+# ============================================================================
+
+from OpenGL.GL import *
+from collections import deque
+from typing import Any, Optional
+from metrics import REGISTRY, GPU_MS_BUCKETS
+
+
+class GpuTimer:
+    """
+    Medidor del tiempo de GPU por frame.
+
+    Características:
+    - Reserva de queries reutilizadas (sin crear objetos por frame)
+    - Lectura diferida y sin bloqueo de los resultados
+    - Si no quedan queries libres, el frame simplemente no se mide
+    - Se desactiva solo si el contexto no soporta GL_TIME_ELAPSED (OpenGL < 3.3)
+    """
+
+    # Queries en vuelo como máximo (holgura sobre MAX_FRAMES_IN_FLIGHT)
+    POOL_SIZE: int = 8
+
+    def __init__(self):
+        self.histogram = REGISTRY.histogram(
+            'gpu_frame_ms', "Tiempo de GPU por frame (ms)", GPU_MS_BUCKETS, label='pattern')
+        self.pending: deque = deque()
+        self.active: Optional[tuple] = None
+        self.free: list = []
+        try:
+            self.enabled: bool = bool(glGenQueries) and bool(glGetQueryObjectui64v)
+            if self.enabled:
+                self.free = list(glGenQueries(self.POOL_SIZE))
+        except Exception:
+            self.enabled = False
+        if not self.enabled:
+            print("⚠️  GL_TIME_ELAPSED no disponible: sin tiempo de GPU por patrón")
+
+    def begin(self, label: Any) -> None:
+        """Empieza a medir el frame (label: patrón que se dibuja)."""
+        if self.active is not None:
+            self.end()   # El frame anterior no llegó a end() (error al dibujar)
+        if not self.enabled or not self.free:
+            return
+        query = self.free.pop()
+        glBeginQuery(GL_TIME_ELAPSED, query)
+        self.active = (query, label)
+
+    def end(self) -> None:
+        """Termina la medida del frame en curso."""
+        if self.active is None:
+            return
+        glEndQuery(GL_TIME_ELAPSED)
+        self.pending.append(self.active)
+        self.active = None
+
+    def collect(self) -> None:
+        """Lee las medidas ya disponibles (en orden; se detiene en la primera pendiente)."""
+        while self.pending:
+            query, label = self.pending[0]
+            if not glGetQueryObjectiv(query, GL_QUERY_RESULT_AVAILABLE):
+                break
+            nanoseconds = glGetQueryObjectui64v(query, GL_QUERY_RESULT)
+            self.histogram.labels(label).observe(int(nanoseconds) / 1e6)
+            self.free.append(self.pending.popleft()[0])
+
+    def close(self) -> None:
+        """Libera las queries."""
+        if self.enabled:
+            queries = self.free + [query for query, _ in self.pending]
+            if self.active is not None:
+                queries.append(self.active[0])
+            if queries:
+                glDeleteQueries(len(queries), queries)
@@ -1,12 +1,22 @@
 # ============================================================================
 # GUI.PY - INTERFAZ GRÁFICA DE USUARIO
 # ============================================================================
-# Pantalla de inicio con botones para seleccionar el modo de visualización
+# Pantalla de inicio con botones para seleccionar el modo de visualización.
+# Se dibuja en una Surface en memoria y se presenta en la ventana OpenGL
+# compartida (display.py), la misma que usa después el visualizador.
+#
+# Los menús solo redibujan lo que cambia: se pinta todo una vez al entrar y
+# después únicamente los botones cuyo estado (hover, frame de la miniatura)
+# ha cambiado, subiendo a la textura solo esos rectángulos. Sin cambios no se
+# presenta nada y el bucle duerme esperando eventos (CPU casi nula en reposo).
 # ============================================================================
 
+import numpy as np
 import pygame
 import config
-from typing import Optional, Tuple, Dict
+from display import Display
+from thumbnails import ThumbnailAtlas
+from typing import Optional, Tuple, Dict, Callable, List
 
 class Button:
     """Botón interactivo con efecto hover"""
@@ -18,9 +28,34 @@ class Button:
         self.color = color
         self.hover_color = hover_color
         self.is_hovered = False
+        
+        # Estado visual con el que se dibujó por última vez (None = nunca)
+        self.drawn_state = None
+    
+    @property
+    def bounds(self) -> pygame.Rect:
+        """Zona que ocupa el botón al dibujarse (incluida la sombra)"""
+        return self.rect.union(self.rect.move(5, 5))
+    
+    def visual_state(self):
+        """Estado del que depende el aspecto del botón"""
+        return self.is_hovered
+    
+    def needs_redraw(self) -> bool:
+        """True si el aspecto ha cambiado desde el último dibujo"""
+        return self.visual_state() != self.drawn_state
+    
+    def redraw(self, screen: pygame.Surface, font: pygame.font.Font,
+               background: pygame.Surface) -> pygame.Rect:
+        """Restaura el fondo bajo el botón y lo vuelve a dibujar. Retorna la zona modificada"""
+        area = self.bounds
+        screen.blit(background, area, area)
+        self.draw(screen, font)
+        return area
     
     def draw(self, screen: pygame.Surface, font: pygame.font.Font):
         """Dibuja el botón en la pantalla"""
+        self.drawn_state = self.visual_state()
         current_color = self.hover_color if self.is_hovered else self.color
         
         # Sombra del botón
@@ -55,24 +90,69 @@ class Button:
         return False
 
 
+class ThumbnailButton(Button):
+    """Botón de patrón con miniatura; anima la miniatura mientras tiene el ratón encima"""
+    
+    def __init__(self, x: int, y: int, width: int, height: int, text: str,
+                 frames: List[pygame.Surface]):
+        super().__init__(x, y, width, height, text, (40, 40, 60), (80, 80, 120))
+        self.frames = frames
+        self.frame_index = 0
+    
+    @property
+    def bounds(self) -> pygame.Rect:
+        """Zona que ocupa el botón (sin sombra)"""
+        return self.rect.copy()
+    
+    def visual_state(self):
+        """Hover y frame visible de la miniatura"""
+        return (self.is_hovered, self.frame_index if self.is_hovered else 0)
+    
+    def draw(self, screen: pygame.Surface, font: pygame.font.Font):
+        """Dibuja la miniatura (frame actual si hay hover, el primero si no) y el número"""
+        self.drawn_state = self.visual_state()
+        frame = self.frames[self.frame_index if self.is_hovered else 0]
+        screen.blit(frame, self.rect)
+        
+        border_color = (255, 255, 255) if self.is_hovered else (120, 120, 140)
+        pygame.draw.rect(screen, border_color, self.rect, 3 if self.is_hovered else 1)
+        
+        # Número del patrón en la esquina
+        label = font.render(self.text, True, (255, 255, 255))
+        label_rect = label.get_rect(topleft=(self.rect.x + 6, self.rect.y + 4))
+        pygame.draw.rect(screen, (0, 0, 0), label_rect.inflate(6, 2))
+        screen.blit(label, label_rect)
+
+
+# Gradientes de fondo ya generados, por resolución
+_gradient_cache: Dict[Tuple[int, int], pygame.Surface] = {}
+
+
 class GUI:
     """Interfaz gráfica de inicio para seleccionar modo de visualización"""
     
-    def __init__(self):
-        """Inicializa la GUI"""
-        pygame.init()
-        
-        # Obtener resolución de pantalla completa
-        display_info = pygame.display.Info()
-        self.screen_width = display_info.current_w
-        self.screen_height = display_info.current_h
-        
-        # Crear ventana maximizada sin bordes (mejor que FULLSCREEN para alt+tab)
-        self.screen = pygame.display.set_mode(
-            (self.screen_width, self.screen_height),
-            pygame.NOFRAME
-        )
-        pygame.display.set_caption("Visualizador de Música")
+    # Espera máxima por eventos en reposo (ms): acota el retraso del trabajo de arranque
+    IDLE_TIMEOUT_MS: int = 250
+    
+    def __init__(self, display: Display, on_idle: Optional[Callable[[], None]] = None,
+                 thumbnails: Optional[ThumbnailAtlas] = None):
+        """
+        Inicializa la GUI sobre la ventana compartida.
+        
+        Args:
+            display: Ventana y contexto OpenGL únicos del programa
+            on_idle: Llamada tras presentar cada frame del menú (trabajo de
+                     arranque en segundo plano que necesita el contexto GL)
+            thumbnails: Miniaturas de los patrones para el menú admin (opcional)
+        """
+        self.display = display
+        self.on_idle = on_idle
+        self.thumbnails = thumbnails
+        self.screen_width = display.width
+        self.screen_height = display.height
+        
+        # Los menús se dibujan en memoria y se presentan como textura
+        self.screen = display.create_surface()
         
         # Mantener cursor visible en la GUI
         pygame.mouse.set_visible(True)
@@ -90,15 +170,54 @@ class GUI:
         # Gradiente de fondo
         self.bg_gradient = self._create_gradient()
     
+    def _present(self, dirty_rects: Optional[List[pygame.Rect]] = None) -> None:
+        """Presenta el menú subiendo solo las zonas indicadas (None = toda la pantalla)"""
+        self.display.present_surface(self.screen, dirty_rects)
+    
+    def _wait_events(self, timeout_ms: int) -> List[pygame.event.Event]:
+        """
+        Duerme hasta el siguiente evento (o hasta timeout_ms) y devuelve los pendientes.
+        En cada despertar cede el hilo al trabajo de arranque que necesita el contexto GL.
+        """
+        event = pygame.event.wait(timeout_ms)
+        if self.on_idle is not None:
+            self.on_idle()
+        if event.type == pygame.NOEVENT:
+            return []
+        return [event] + pygame.event.get()
+    
+    def _refresh(self, buttons: List[Tuple[Button, pygame.font.Font]],
+                 dirty: List[pygame.Rect], exposed: bool) -> None:
+        """Redibuja los botones que han cambiado y presenta solo si hay algo nuevo"""
+        for button, font in buttons:
+            if button.needs_redraw():
+                dirty.append(button.redraw(self.screen, font, self.bg_gradient))
+        if dirty or exposed:
+            self._present(dirty)
+    
+    def _draw_text(self, text: str, font: pygame.font.Font, color: Tuple[int, int, int],
+                   center: Tuple[int, int]) -> pygame.Rect:
+        """Dibuja un texto centrado y retorna su rectángulo"""
+        surface = font.render(text, True, color)
+        rect = surface.get_rect(center=center)
+        self.screen.blit(surface, rect)
+        return rect
+    
     def _create_gradient(self) -> pygame.Surface:
-        """Crea un gradiente de fondo animado"""
-        gradient = pygame.Surface((self.screen_width, self.screen_height))
-        for y in range(self.screen_height):
-            ratio = y / self.screen_height
-            r = int(15 + (40 - 15) * ratio)
-            g = int(5 + (25 - 5) * ratio)
-            b = int(35 + (60 - 35) * ratio)
-            pygame.draw.line(gradient, (r, g, b), (0, y), (self.screen_width, y))
+        """Crea el gradiente vertical de fondo (vectorizado y cacheado por resolución)"""
+        size = (self.screen_width, self.screen_height)
+        if size in _gradient_cache:
+            return _gradient_cache[size]
+        
+        ratio = np.arange(self.screen_height) / self.screen_height
+        top = np.array([15, 5, 35], dtype=np.float64)
+        bottom = np.array([40, 25, 60], dtype=np.float64)
+        column = (top + (bottom - top) * ratio[:, np.newaxis]).astype(np.uint8)
+        
+        # surfarray indexa [x, y]: la misma columna de color se repite en cada x
+        gradient = pygame.Surface(size)
+        pygame.surfarray.blit_array(gradient, np.broadcast_to(column, (self.screen_width,) + column.shape))
+        _gradient_cache[size] = gradient
         return gradient
     
     def show_main_menu(self) -> Dict:
@@ -129,14 +248,22 @@ class GUI:
                    (150, 50, 50), (200, 80, 80)),
         ]
         
-        clock = pygame.time.Clock()
-        running = True
+        # Dibujo completo una sola vez
+        self.screen.blit(self.bg_gradient, (0, 0))
+        self._draw_text("🎵 VISUALIZADOR MUSICAL 🎵", self.title_font, (255, 255, 255),
+                        (center_x, center_y - spacing * 3))
+        self._draw_text("Selecciona un modo de visualización", self.info_font, (200, 200, 200),
+                        (center_x, int(center_y - spacing * 2.5)))
+        for button in buttons:
+            button.draw(self.screen, self.button_font)
+        self._present()
         
-        # Animar el fondo
-        time_offset = 0
+        drawable = [(button, self.button_font) for button in buttons]
+        running = True
         
         while running:
-            for event in pygame.event.get():
+            exposed = False
+            for event in self._wait_events(self.IDLE_TIMEOUT_MS):
                 if event.type == pygame.QUIT:
                     return {'mode': 'exit'}
                 
@@ -144,11 +271,9 @@ class GUI:
                     if event.key == pygame.K_ESCAPE:
                         return {'mode': 'exit'}
                 
-                # Prevenir bloqueos al cambiar ventanas
-                if event.type == pygame.WINDOWFOCUSGAINED:
-                    pass
-                elif event.type == pygame.WINDOWFOCUSLOST:
-                    pass
+                # La ventana se ha vuelto a mostrar: presentar de nuevo sin subir nada
+                if event.type in (pygame.WINDOWEXPOSED, pygame.WINDOWRESTORED):
+                    exposed = True
                 
                 # Manejar clics en botones
                 for i, button in enumerate(buttons):
@@ -162,27 +287,8 @@ class GUI:
                         elif i == 3:  # SALIR
                             return {'mode': 'exit'}
             
-            time_offset += 0.01
-            
-            # Dibujar
-            self.screen.blit(self.bg_gradient, (0, 0))
-            
-            # Título
-            title = self.title_font.render("🎵 VISUALIZADOR MUSICAL 🎵", True, (255, 255, 255))
-            title_rect = title.get_rect(center=(center_x, center_y - spacing * 3))
-            self.screen.blit(title, title_rect)
-            
-            # Subtítulo
-            subtitle = self.info_font.render("Selecciona un modo de visualización", True, (200, 200, 200))
-            subtitle_rect = subtitle.get_rect(center=(center_x, center_y - spacing * 2.5))
-            self.screen.blit(subtitle, subtitle_rect)
-            
-            # Botones
-            for button in buttons:
-                button.draw(self.screen, self.button_font)
-            
-            pygame.display.flip()
-            clock.tick(60)
+            # Solo se redibujan los botones cuyo hover ha cambiado
+            self._refresh(drawable, [], exposed)
         
         return {'mode': 'exit'}
     
@@ -191,15 +297,21 @@ class GUI:
         center_x = self.screen_width // 2
         center_y = self.screen_height // 2
         
+        # Miniaturas de los patrones (de la caché en disco, o una sola pasada de render)
+        thumbnails = self.thumbnails.surfaces() if self.thumbnails is not None else None
+        
         # Crear botones de patrones en grid - ajustado para que quepa todo
         patterns_per_row = 8
-        button_size = 90
+        if thumbnails:
+            button_width, button_height = config.THUMBNAIL_SIZE
+        else:
+            button_width = button_height = 90
         spacing = 15
         total_rows = (config.TOTAL_PATTERNS + patterns_per_row - 1) // patterns_per_row
         
         # Calcular tamaño del grid
-        grid_width = patterns_per_row * (button_size + spacing) - spacing
-        grid_height = total_rows * (button_size + spacing) - spacing
+        grid_width = patterns_per_row * (button_width + spacing) - spacing
+        grid_height = total_rows * (button_height + spacing) - spacing
         
         # Centrar el grid verticalmente considerando el título
         start_x = center_x - grid_width // 2
@@ -209,21 +321,49 @@ class GUI:
         for i in range(config.TOTAL_PATTERNS):
             row = i // patterns_per_row
             col = i % patterns_per_row
-            x = start_x + col * (button_size + spacing)
-            y = start_y + row * (button_size + spacing)
-            btn = Button(x, y, button_size, button_size, str(i), 
-                        (80, 80, 120), (120, 120, 180))
+            x = start_x + col * (button_width + spacing)
+            y = start_y + row * (button_height + spacing)
+            if thumbnails:
+                btn = ThumbnailButton(x, y, button_width, button_height, str(i), thumbnails[i])
+            else:
+                btn = Button(x, y, button_width, button_height, str(i), 
+                            (80, 80, 120), (120, 120, 180))
             buttons.append(btn)
         
         # Botón volver
         back_button = Button(50, self.screen_height - 120, 200, 70, "← VOLVER", 
                             (80, 80, 80), (120, 120, 120))
         
-        clock = pygame.time.Clock()
+        label_font = self.info_font if thumbnails else self.button_font
+        frame_ms = int(config.THUMBNAIL_FRAME_INTERVAL * 1000)
+        
+        # Dibujo completo una sola vez
+        self.screen.blit(self.bg_gradient, (0, 0))
+        self._draw_text("MODO ADMIN", self.title_font, (255, 255, 255), (center_x, 80))
+        for button in buttons:
+            button.draw(self.screen, label_font)
+        back_button.draw(self.screen, self.button_font)
+        
+        # Franja del subtítulo (cambia con el patrón bajo el ratón)
+        subtitle_band = pygame.Rect(0, 150 - 25, self.screen_width, 50)
+        default_subtitle = f"Selecciona un patrón visual (0-{config.TOTAL_PATTERNS - 1})"
+        shown_subtitle = default_subtitle
+        self._draw_text(shown_subtitle, self.info_font, (200, 200, 200), (center_x, 150))
+        self._present()
+        
+        drawable = [(button, label_font) for button in buttons] + [(back_button, self.button_font)]
+        hovered = None
         running = True
         
         while running:
-            for event in pygame.event.get():
+            # Con una miniatura animándose se despierta en el siguiente cambio de frame
+            if thumbnails and hovered is not None:
+                timeout = frame_ms - pygame.time.get_ticks() % frame_ms
+            else:
+                timeout = self.IDLE_TIMEOUT_MS
+            
+            exposed = False
+            for event in self._wait_events(timeout):
                 if event.type == pygame.QUIT:
                     return {'mode': 'exit'}
                 
@@ -231,9 +371,9 @@ class GUI:
                     if event.key == pygame.K_ESCAPE:
                         return self.show_main_menu()
                 
-                # Prevenir bloqueos
-                if event.type in (pygame.WINDOWFOCUSGAINED, pygame.WINDOWFOCUSLOST):
-                    pass
+                # La ventana se ha vuelto a mostrar: presentar de nuevo sin subir nada
+                if event.type in (pygame.WINDOWEXPOSED, pygame.WINDOWRESTORED):
+                    exposed = True
                 
                 # Botón volver
                 if back_button.handle_event(event):
@@ -244,26 +384,24 @@ class GUI:
                     if button.handle_event(event):
                         return {'mode': 'admin', 'pattern': i, 'beats': 0}
             
-            # Dibujar
-            self.screen.blit(self.bg_gradient, (0, 0))
-            
-            # Título
-            title = self.title_font.render("MODO ADMIN", True, (255, 255, 255))
-            title_rect = title.get_rect(center=(center_x, 80))
-            self.screen.blit(title, title_rect)
-            
-            subtitle = self.info_font.render("Selecciona un patrón visual (0-35)", True, (200, 200, 200))
-            subtitle_rect = subtitle.get_rect(center=(center_x, 150))
-            self.screen.blit(subtitle, subtitle_rect)
-            
-            # Botones
-            for button in buttons:
-                button.draw(self.screen, self.button_font)
+            # Animar la miniatura bajo el ratón
+            hovered = next((i for i, button in enumerate(buttons) if button.is_hovered), None)
+            if thumbnails and hovered is not None:
+                buttons[hovered].frame_index = (pygame.time.get_ticks() // frame_ms) % len(thumbnails[hovered])
             
-            back_button.draw(self.screen, self.button_font)
+            dirty = []
+            if self.thumbnails is not None and hovered is not None:
+                subtitle_text = f"{hovered}: {self.thumbnails.pattern_registry.get(hovered).name}"
+            else:
+                subtitle_text = default_subtitle
+            if subtitle_text != shown_subtitle:
+                self.screen.blit(self.bg_gradient, subtitle_band, subtitle_band)
+                self._draw_text(subtitle_text, self.info_font, (200, 200, 200), (center_x, 150))
+                shown_subtitle = subtitle_text
+                dirty.append(subtitle_band)
             
-            pygame.display.flip()
-            clock.tick(60)
+            # Solo se redibujan los botones cuyo hover o frame ha cambiado
+            self._refresh(drawable, dirty, exposed)
         
         return {'mode': 'exit'}
     
@@ -293,11 +431,22 @@ class GUI:
         back_button = Button(50, self.screen_height - 120, 200, 70, "← VOLVER", 
                             (80, 80, 80), (120, 120, 120))
         
-        clock = pygame.time.Clock()
+        # Dibujo completo una sola vez
+        self.screen.blit(self.bg_gradient, (0, 0))
+        self._draw_text("MODO ORDER", self.title_font, (255, 255, 255), (center_x, 150))
+        self._draw_text("Selecciona los beats para cambiar de patrón", self.info_font, (200, 200, 200),
+                        (center_x, 240))
+        for button, _ in buttons:
+            button.draw(self.screen, self.button_font)
+        back_button.draw(self.screen, self.button_font)
+        self._present()
+        
+        drawable = [(button, self.button_font) for button, _ in buttons] + [(back_button, self.button_font)]
         running = True
         
         while running:
-            for event in pygame.event.get():
+            exposed = False
+            for event in self._wait_events(self.IDLE_TIMEOUT_MS):
                 if event.type == pygame.QUIT:
                     return {'mode': 'exit'}
                 
@@ -305,9 +454,9 @@ class GUI:
                     if event.key == pygame.K_ESCAPE:
                         return self.show_main_menu()
                 
-                # Prevenir bloqueos
-                if event.type in (pygame.WINDOWFOCUSGAINED, pygame.WINDOWFOCUSLOST):
-                    pass
+                # La ventana se ha vuelto a mostrar: presentar de nuevo sin subir nada
+                if event.type in (pygame.WINDOWEXPOSED, pygame.WINDOWRESTORED):
+                    exposed = True
                 
                 # Botón volver
                 if back_button.handle_event(event):
@@ -318,29 +467,12 @@ class GUI:
                     if button.handle_event(event):
                         return {'mode': 'order', 'pattern': 0, 'beats': beats}
             
-            # Dibujar
-            self.screen.blit(self.bg_gradient, (0, 0))
-            
-            # Título
-            title = self.title_font.render("MODO ORDER", True, (255, 255, 255))
-            title_rect = title.get_rect(center=(center_x, 150))
-            self.screen.blit(title, title_rect)
-            
-            subtitle = self.info_font.render("Selecciona los beats para cambiar de patrón", True, (200, 200, 200))
-            subtitle_rect = subtitle.get_rect(center=(center_x, 240))
-            self.screen.blit(subtitle, subtitle_rect)
-            
-            # Botones
-            for button, _ in buttons:
-                button.draw(self.screen, self.button_font)
-            
-            back_button.draw(self.screen, self.button_font)
-            
-            pygame.display.flip()
-            clock.tick(60)
+            # Solo se redibujan los botones cuyo hover ha cambiado
+            self._refresh(drawable, [], exposed)
         
         return {'mode': 'exit'}
     
     def close(self):
-        """Cierra la GUI"""
-        pygame.quit()
+        """Libera los recursos del menú (la ventana sigue abierta para el visualizador)"""
+        self.display.release_surface_texture()
+        pygame.mouse.set_visible(False)
@@ -0,0 +1,323 @@
+# ============================================================================
+# LIVE_CONFIG.PY - PRESETS DE RENDIMIENTO Y RECARGA EN CALIENTE DE LA CONFIGURACIÓN
+# ============================================================================
+# config.py es un módulo de globales que el resto del programa lee cada frame.
+# Con --config RUTA un fichero JSON sobrescribe parte de esos parámetros:
+#
+#     {"preset": "medium", "BLOOM_INTENSITY": 0.4, "SENSITIVITY": 3.0}
+#
+# "preset" expande uno de config.PERFORMANCE_PRESETS y el resto de claves van
+# por encima. El fichero se aplica entero al arrancar (antes de crear nada) y
+# después se vigila sin parar el visualizador:
+# 1. Un hilo vigilante comprueba la fecha de modificación, lee el JSON y
+#    valida el resultado con las mismas reglas de validate_config(), pero
+#    sobre una copia de la configuración: el módulo config no se toca.
+# 2. Lo caro se prepara en ese mismo hilo: con un NUM_SAMPLES nuevo, las
+#    tablas del análisis y el stream de captura con el tamaño de bloque nuevo.
+# 3. El hilo de render aplica todos los cambios a la vez entre dos frames
+#    (apply_pending), junto con el nivel de calidad (FBOs y bloom).
+# Las claves que solo se leen al arrancar (resolución, dispositivo, red...)
+# no se cambian en caliente: se avisa de que requieren reiniciar.
+# ============================================================================
+
+import json
+import os
+import threading
+import types
+import config
+from realtime_log import LOG, INFO
+from typing import Any, Dict, List, Optional, Tuple
+
+
+# Parámetros que se pueden cambiar en caliente: se releen cada frame o los
+# aplica apply_pending (QUALITY_TIER, CHECKERBOARD_ENABLED, NUM_SAMPLES)
+LIVE_KEYS: Tuple[str, ...] = (
+    "PERFORMANCE_PRESET", "QUALITY_TIER", "TARGET_FPS", "NUM_SAMPLES",
+    "CHECKERBOARD_ENABLED", "CHECKERBOARD_COST_CLASSES",
+    "BLOOM_INTENSITY", "BLOOM_THRESHOLD", "VIGNETTE_INTENSITY", "CONTRAST", "SATURATION",
+    "SENSITIVITY", "DECAY_RATE", "BEAT_COOLDOWN", "BEAT_THRESHOLD_ADAPTATION",
+    "SHAPE_CHANGE_BEATS", "RANDOM_BEAT_RANGE", "PATTERN_TRANSITION_TIME",
+    "POWER_SAVE_ENABLED", "POWER_SAVE_SILENCE_SECONDS", "POWER_SAVE_SILENCE_THRESHOLD",
+    "POWER_SAVE_WAKE_THRESHOLD", "POWER_SAVE_ON_FOCUS_LOSS", "POWER_SAVE_FPS",
+    "POWER_SAVE_RENDER_SCALE", "POWER_SAVE_RAMP_SECONDS",
+    "DEBUG_MODE", "LOG_LEVEL", "LOG_RATE_LIMIT",
+)
+
+# Valores de config.py antes de aplicar ningún fichero: al quitar una clave
+# del fichero (o el preset) se vuelve a ellos
+_DEFAULTS: Dict[str, Any] = {name: getattr(config, name) for name in LIVE_KEYS}
+
+_MISSING = object()
+
+_LOG_APPLIED = LOG.message(INFO, "⚙️  Configuración aplicada entre frames: {text}")
+
+
+def _coerce(name: str, value: Any) -> Any:
+    """
+    Comprueba que 'name' es un parámetro de config.py y adapta el valor JSON
+    a su tipo (listas a tuplas, enteros a float).
+
+    Raises:
+        ValueError: Parámetro desconocido o tipo incorrecto
+    """
+    if not name.isupper() or not hasattr(config, name):
+        raise ValueError(f"parámetro desconocido: '{name}'")
+    current = getattr(config, name)
+    if isinstance(current, bool):
+        valid = isinstance(value, bool)
+    elif isinstance(current, int):
+        valid = isinstance(value, int) and not isinstance(value, bool)
+    elif isinstance(current, float):
+        valid = isinstance(value, (int, float)) and not isinstance(value, bool)
+        value = float(value) if valid else value
+    elif isinstance(current, tuple):
+        valid = isinstance(value, list)
+        value = tuple(tuple(v) if isinstance(v, list) else v for v in value) if valid else value
+    elif current is None:
+        valid = True   # Parámetro opcional desactivado: cualquier valor JSON
+    else:
+        valid = isinstance(value, type(current))
+    if not valid:
+        raise ValueError(f"'{name}' espera un valor de tipo {type(current).__name__}, no {value!r}")
+    return value
+
+
+def read_config_file(path: Optional[str], preset: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Lee el fichero de configuración y devuelve los parámetros que fija.
+
+    Args:
+        path: Fichero JSON (None = solo el preset)
+        preset: Preset si el fichero no indica "preset"
+
+    Returns:
+        {parámetro: valor}: los del preset y, por encima, los del fichero
+
+    Raises:
+        OSError: Si no se puede leer el fichero
+        ValueError: JSON inválido, preset o parámetro desconocido, tipo incorrecto
+    """
+    data: Dict[str, Any] = {}
+    if path:
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+        if not isinstance(data, dict):
+            raise ValueError("se esperaba un objeto JSON {parámetro: valor}")
+        data = dict(data)
+
+    preset = data.pop('preset', preset)
+    values: Dict[str, Any] = {'PERFORMANCE_PRESET': preset}
+    if preset is not None:
+        if preset not in config.PERFORMANCE_PRESETS:
+            raise ValueError(f"preset desconocido: '{preset}' (disponibles: {list(config.PERFORMANCE_PRESETS)})")
+        values.update(config.PERFORMANCE_PRESETS[preset])
+    for name, value in data.items():
+        values[name] = _coerce(name, value)
+    return values
+
+
+def validate_values(values: Dict[str, Any]) -> bool:
+    """
+    Ejecuta validate_config() sobre una copia de la configuración con 'values'
+    aplicados; el módulo config no cambia (se puede llamar desde otro hilo).
+    """
+    namespace = dict(vars(config))
+    namespace.update(values)
+    validator = types.FunctionType(config.validate_config.__code__, namespace)
+    return validator()
+
+
+def apply_startup_config(path: Optional[str], preset: Optional[str]) -> bool:
+    """
+    Arranque: aplica el fichero (o solo el preset) antes de crear ningún componente.
+
+    Returns:
+        False si el fichero no se puede leer o la configuración resultante no es válida
+    """
+    try:
+        values = read_config_file(path, preset)
+    except (OSError, ValueError) as e:
+        print(f"❌ No se pudo leer la configuración {path}: {e}")
+        return False
+    if not validate_values(values):
+        return False
+    for name, value in values.items():
+        setattr(config, name, value)
+    config.CONFIG_FILE_PATH = path
+    origin = path or "config.py"
+    if config.PERFORMANCE_PRESET is not None:
+        origin += f" (preset '{config.PERFORMANCE_PRESET}')"
+    print(f"⚙️  Configuración: {origin}")
+    return True
+
+
+class LiveConfig:
+    """
+    Vigilante del fichero de configuración + intercambio atómico entre frames.
+
+    Uso (una vez por frame desde el hilo de render):
+        live_config.apply_pending(renderer)
+
+    Características:
+    - Lectura, validación y preparación del audio fuera del hilo de render
+    - Solo se aplican las claves cuyo valor cambió en el fichero: lo que se
+      cambió por otra vía (menú, control remoto) no se pisa
+    - Si el fichero nuevo no es válido se mantiene la configuración actual
+    """
+
+    def __init__(self, path: str, preset: Optional[str], audio_source: Any):
+        """
+        Args:
+            path: Fichero JSON ya aplicado con apply_startup_config()
+            preset: Preset de --preset (si el fichero no indica "preset")
+            audio_source: Fuente de audio del bucle (AudioHandler u otra)
+        """
+        self.path = path
+        self.preset = preset
+        self.audio_source = audio_source
+
+        # Cambios listos para aplicar (los escribe el hilo vigilante)
+        self._pending_changes: Dict[str, Any] = {}
+        self._pending_tables: Any = None
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+
+        self.reloads: int = 0
+        self.failures: int = 0
+
+        self._mtime = self._read_mtime()
+        try:
+            self.file_values: Dict[str, Any] = read_config_file(path, preset)
+        except (OSError, ValueError):
+            self.file_values = {}
+        self._thread = threading.Thread(target=self._watch_loop, name="ConfigWatcher", daemon=True)
+        self._thread.start()
+        print(f"   🔁 Recarga en caliente de {os.path.basename(path)} activa")
+
+    # ------------------------------------------------------------------
+    # Hilo vigilante
+    # ------------------------------------------------------------------
+
+    def _read_mtime(self) -> Optional[int]:
+        try:
+            return os.stat(self.path).st_mtime_ns
+        except OSError:
+            return None
+
+    def _watch_loop(self) -> None:
+        """Comprueba periódicamente el fichero y prepara los cambios."""
+        while not self._stop_event.wait(config.CONFIG_POLL_SECONDS):
+            mtime = self._read_mtime()
+            if mtime == self._mtime:
+                continue
+            self._mtime = mtime
+            self.reload()
+
+    def _diff(self, values: Dict[str, Any]) -> Tuple[Dict[str, Any], List[str]]:
+        """
+        Claves cuyo valor cambió respecto a la última lectura válida del fichero.
+
+        Returns:
+            (cambios aplicables en caliente, claves que requieren reiniciar)
+        """
+        changes: Dict[str, Any] = {}
+        restart: List[str] = []
+        for name in sorted(set(values) | set(self.file_values)):
+            new = values.get(name, _DEFAULTS.get(name, _MISSING))
+            if new == self.file_values.get(name, _MISSING):
+                continue
+            if name in LIVE_KEYS:
+                changes[name] = new
+            else:
+                restart.append(name)
+        return changes, restart
+
+    def reload(self) -> bool:
+        """
+        Lee, valida y prepara el fichero (hilo vigilante; también sirve para forzarlo).
+
+        Returns:
+            True si quedan cambios pendientes de aplicar
+        """
+        name = os.path.basename(self.path)
+        try:
+            values = read_config_file(self.path, self.preset)
+        except (OSError, ValueError) as e:
+            print(f"❌ {name}: {e}. Se mantiene la configuración actual")
+            self.failures += 1
+            return False
+
+        changes, restart = self._diff(values)
+        if restart:
+            print(f"⚠️  {name}: requieren reiniciar (se ignoran en caliente): {', '.join(restart)}")
+
+        with self._lock:
+            candidate = dict(self._pending_changes)
+        candidate.update(changes)
+        if not validate_values(candidate):
+            print(f"❌ {name}: configuración inválida. Se mantiene la actual")
+            self.failures += 1
+            return False
+        self.file_values = values
+
+        tables = None
+        if 'NUM_SAMPLES' in changes:
+            tables = self._prepare_block_size(changes['NUM_SAMPLES'])
+            if tables is None:
+                del changes['NUM_SAMPLES']
+
+        if not changes:
+            return False
+        with self._lock:
+            self._pending_changes.update(changes)
+            if tables is not None:
+                self._pending_tables = tables
+        print(f"🔁 {name}: {', '.join(changes)} se aplican en el próximo frame")
+        return True
+
+    def _prepare_block_size(self, num_samples: int) -> Any:
+        """Tablas del análisis y stream nuevos para NUM_SAMPLES (None si no se puede)."""
+        prepare = getattr(self.audio_source, 'prepare_block_size', None)
+        if prepare is None:
+            print("⚠️  NUM_SAMPLES solo se cambia en caliente con captura local: requiere reiniciar")
+            return None
+        try:
+            return prepare(num_samples)
+        except Exception as e:
+            print(f"❌ No se pudo reabrir el audio con NUM_SAMPLES={num_samples}: {e}")
+            self.failures += 1
+            return None
+
+    # ------------------------------------------------------------------
+    # Intercambio (hilo de render)
+    # ------------------------------------------------------------------
+
+    def apply_pending(self, renderer: Any) -> bool:
+        """
+        Aplica los cambios preparados, todos a la vez (llamar entre dos frames).
+
+        Returns:
+            True si se aplicó algún cambio
+        """
+        if not self._pending_changes:
+            return False
+        with self._lock:
+            changes, tables = self._pending_changes, self._pending_tables
+            self._pending_changes, self._pending_tables = {}, None
+
+        for name, value in changes.items():
+            setattr(config, name, value)
+        if tables is not None:
+            self.audio_source.adopt_tables(tables)
+        if 'QUALITY_TIER' in changes or 'CHECKERBOARD_ENABLED' in changes:
+            # El tablero también reserva su FBO al crear el post-procesador
+            renderer.set_quality_tier(config.QUALITY_TIER)
+
+        self.reloads += 1
+        LOG.log(_LOG_APPLIED, text=', '.join(changes))
+        return True
+
+    def close(self) -> None:
+        """Detiene el hilo vigilante (antes de cerrar el stream de audio)."""
+        self._stop_event.set()
+        self._thread.join(2.0)
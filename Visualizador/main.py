@@ -7,84 +7,75 @@
 # Arquitectura:
 # - AudioHandler: Captura y analiza audio del sistema
 # - Renderer: Renderiza efectos visuales usando OpenGL/GLSL
+# - simulation.step: Lógica determinista (beats, partículas, patrones)
 # - Main Loop: Coordina todo y mantiene el estado sincronizado
+#
+# Opciones:
+#   --startup-report       Imprime el desglose de tiempos del arranque
+#   --record-trace RUTA    Graba los rasgos de audio de la sesión (feature_trace.py)
+#   --replay-trace RUTA    Usa una traza grabada en lugar del audio en vivo
+#   --capture-node         Solo captura y publica rasgos por la red (sin ventana)
+#   --render-node          Visualiza los rasgos del nodo de captura (sin audio)
+#   --bus-analyzer         Solo analiza y publica en memoria compartida (sin ventana)
+#   --bus-renderer         Lee los rasgos del analizador local en lugar de capturar
+#   --display N            Pantalla en la que abrir la ventana
+#   --wall CxF --tile C,F  Videowall: dibuja solo el tile C,F de un lienzo CxF
+#   --control              Control remoto por HTTP/WebSocket/OSC (control_server.py)
+#   --metrics-port N       Puerto del endpoint de Prometheus (0 = sin endpoint)
+#   --metrics-dump RUTA    Vuelca las métricas en JSONL cada METRICS_DUMP_SECONDS
+#   --config RUTA          Fichero JSON de configuración, recargado en caliente (live_config.py)
+#   --preset NOMBRE        Preset de rendimiento: low, medium, high o ultra
 # ============================================================================
 
+import time
+# Referencia del perfil de arranque: mide también el tiempo de importación
+_PROCESS_START = time.perf_counter()
+
 import pygame
-import numpy as np
 import config
 from renderer import Renderer
 from audio_handler import AudioHandler
 from gui import GUI
+from display import Display
+from frame_pacer import FramePacer
+from power_save import PowerSaver
+from pattern_registry import PatternRegistry
+from startup import StartupProfiler, StartupPreloader
+from thumbnails import ThumbnailAtlas
+from simulation import initialize_state, step, advance_pattern
+from feature_trace import TraceReplaySource
+from feature_net import NetworkFeatureSource, run_capture_node
+from feature_bus import FeatureBusReader, run_bus_analyzer
+from control_server import ControlServer, RENDER_COMMANDS
+from metrics import MetricsExporter, BeatRateMeter
+from realtime_log import LOG, DEBUG, INFO
+from live_config import LiveConfig, apply_startup_config
+import argparse
 import sys
 import traceback
-from typing import Dict, Any
-import random
+from typing import Tuple
+
+_IMPORTS_DONE = time.perf_counter()
+
+# Mensajes del bucle principal (realtime_log.py: sin print() entre frames)
+_LOG_WINDOW_EVENT = LOG.message(DEBUG, "🔍 Ventana {text}")
+_LOG_DEBUG_TOGGLE = LOG.message(INFO, "🐛 Debug mode",
+                                lambda args, text: f"🐛 Debug mode: {'ON' if args[0] else 'OFF'}")
+_LOG_MANUAL_PATTERN = LOG.message(INFO, "🎨 Patrón cambiado manualmente a: {0:.0f}. Próximo en {1:.0f} beats.")
+_LOG_MANUAL_COLOR = LOG.message(INFO, "🎨 Color cambiado manualmente a: {0:.0f}")
+_LOG_STATS_FRAME = LOG.message(DEBUG, "\n📊 STATS - Frame {0:.0f}:")
+_LOG_STATS_PATTERN = LOG.message(DEBUG, "   Patrón: {0:.0f} {text}")
+_LOG_STATS_AMPLITUDE = LOG.message(DEBUG, "   Amplitud: {0:.3f}")
+_LOG_STATS_POWER = LOG.message(DEBUG, "   Energía: {text} (escala {0:.2f}, {1:.0f} FPS)")
+_LOG_STATS_PARTICLES = LOG.message(DEBUG, "   Partículas activas: {0:.0f}")
+_LOG_STATS_PACING = LOG.message(DEBUG, "   Frame: {0:.2f} ms (jitter {1:.2f} ms, p99 {2:.2f} ms) | "
+                                       "Fuera de plazo: {3:.0f}")
+_LOG_STATS_GPU = LOG.message(DEBUG, "   GPU: {0:.0f} frames en vuelo | Esperas: {1:.0f} ({2:.1f} ms)")
 
 # ============================================================================
 # FUNCIONES DE INICIALIZACIÓN Y LÓGICA
 # ============================================================================
 
-def _get_next_beat_target(current_mode: str) -> int:
-    """
-    Obtiene el número de beats para el próximo cambio de patrón,
-    según el modo seleccionado.
-    """
-    if current_mode == "random":
-        # Devuelve un número aleatorio dentro del rango especificado en config.py
-        return random.randint(config.RANDOM_BEAT_RANGE[0], config.RANDOM_BEAT_RANGE[1])
-    else:
-        # Devuelve el número fijo del modo "order"
-        return config.SHAPE_CHANGE_BEATS
-
-def initialize_state(pattern_mode: str, initial_pattern: int = 0) -> Dict[str, Any]:
-    """
-    Inicializa el diccionario de estado que contiene toda la información
-    del visualizador que cambia en cada frame.
-    
-    Returns:
-        Diccionario con el estado inicial del visualizador
-    """
-    state = {
-        # === TIEMPO ===
-        'current_time': 0.0,
-        
-        # === AUDIO - AMPLITUD ===
-        'current_amplitude': 0.0,
-        'smoothed_amplitude': 0.0,
-        
-        # === AUDIO - BANDAS DE FRECUENCIA ===
-        'bass_energy': 0.0,
-        'mid_energy': 0.0,
-        'treble_energy': 0.0,
-        
-        # === DETECCIÓN DE BEATS ===
-        'beat_last_time': 0.0,
-        'beat_count': 0,
-        'beat_intensity': 0.0,
-        'current_beat_target': 0, # Se establecerá después de inicializar
-        
-        # === COLORES ===
-        'color_index': 0,
-        
-        # === PATRONES VISUALES ===
-        'pattern_mode': pattern_mode, # Almacena el modo elegido ('admin', 'random', 'order')
-        'pattern_index': initial_pattern, # Usa el índice inicial (0 o el elegido por admin)
-        'prev_pattern_index': initial_pattern,
-        'pattern_change_time': 0.0,
-        
-        # === PARTÍCULAS/GOTAS (efectos generados por beats) ===
-        'drop_positions': np.random.rand(config.MAX_PARTICLES, 2).astype(np.float32),
-        'drop_times': np.zeros(config.MAX_PARTICLES, dtype=np.float32),
-        'drop_index': 0,
-        
-        # === ESTADÍSTICAS ===
-        'frames_rendered': 0,
-    }
-    # Establece el primer objetivo de beats
-    state['current_beat_target'] = _get_next_beat_target(state['pattern_mode'])
-    return state
-
 def print_welcome_message():
     """Imprime mensaje de bienvenida con información del programa."""
     print("\n" + "=" * 70)
@@ -102,6 +93,91 @@ def print_welcome_message():
     print("   • Pantalla completa automática")
     print("\n" + "=" * 70)
 
+def _grid_arg(text: str) -> Tuple[int, int]:
+    """'4x4' -> (4, 4)"""
+    try:
+        columns, rows = (int(part) for part in text.lower().split('x'))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"se esperaba COLxFIL, no '{text}'")
+    return columns, rows
+
+def _tile_arg(text: str) -> Tuple[int, int]:
+    """'2,1' -> (2, 1)"""
+    try:
+        column, row = (int(part) for part in text.split(','))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"se esperaba COL,FIL, no '{text}'")
+    return column, row
+
+def parse_args() -> argparse.Namespace:
+    """
+    Opciones de línea de comandos. El fichero de --config (y --preset) se
+    aplica antes que el resto: así sus valores son los valores por defecto
+    de las demás opciones.
+    """
+    config_parser = argparse.ArgumentParser(add_help=False)
+    config_parser.add_argument('--config', metavar='RUTA', default=config.CONFIG_FILE_PATH,
+                               help="fichero JSON de configuración (se recarga en caliente al guardarlo)")
+    config_parser.add_argument('--preset', choices=list(config.PERFORMANCE_PRESETS),
+                               default=config.PERFORMANCE_PRESET,
+                               help="preset de rendimiento (el \"preset\" del fichero tiene prioridad)")
+    early_args, _ = config_parser.parse_known_args()
+    if early_args.config or early_args.preset:
+        if not apply_startup_config(early_args.config, early_args.preset):
+            config_parser.exit(1, "❌ No se puede iniciar el programa debido a errores de configuración\n")
+    
+    parser = argparse.ArgumentParser(description="Visualizador generativo de música", parents=[config_parser])
+    parser.add_argument('--startup-report', action='store_true',
+                        help="imprime el desglose de tiempos del arranque")
+    parser.add_argument('--record-trace', metavar='RUTA', default=config.FEATURE_TRACE_PATH,
+                        help="graba los rasgos de audio de cada bloque en RUTA")
+    parser.add_argument('--replay-trace', metavar='RUTA',
+                        help="repite una traza grabada (sin dispositivo de audio ni FFT)")
+    parser.add_argument('--replay-speed', type=float, default=1.0,
+                        help="velocidad de la repetición de --replay-trace")
+    parser.add_argument('--capture-node', action='store_true',
+                        help="nodo de captura: analiza el audio y publica los rasgos por multicast")
+    parser.add_argument('--render-node', action='store_true',
+                        help="nodo de render: usa los rasgos del nodo de captura en lugar del audio")
+    parser.add_argument('--mode', choices=['order', 'random', 'admin'], default='order',
+                        help="modo de cambio de patrón del nodo de captura")
+    parser.add_argument('--pattern', type=int, default=0,
+                        help="patrón fijo del nodo de captura en modo admin")
+    parser.add_argument('--beats', type=int, default=config.SHAPE_CHANGE_BEATS,
+                        help="beats por cambio de patrón del nodo de captura en modo order")
+    parser.add_argument('--bus-analyzer', action='store_true',
+                        help="analizador local: publica los rasgos en memoria compartida")
+    parser.add_argument('--bus-renderer', action='store_true',
+                        help="renderer local: lee los rasgos del analizador en lugar de capturar")
+    parser.add_argument('--display', type=int, default=config.DISPLAY_INDEX,
+                        help="pantalla en la que abrir la ventana (0 = principal)")
+    parser.add_argument('--wall', type=_grid_arg, default=config.VIDEOWALL_GRID, metavar='COLxFIL',
+                        help="videowall: tiles del lienzo virtual, p. ej. 4x4 (con --render-node)")
+    parser.add_argument('--control', action='store_true',
+                        help="acepta órdenes remotas por HTTP, WebSocket y OSC")
+    parser.add_argument('--metrics-port', type=int, default=config.METRICS_PORT,
+                        help="puerto del endpoint de métricas de Prometheus (0 = desactivado)")
+    parser.add_argument('--metrics-dump', metavar='RUTA', default=config.METRICS_DUMP_PATH,
+                        help="vuelca las métricas en RUTA (JSONL) cada METRICS_DUMP_SECONDS")
+    parser.add_argument('--tile', type=_tile_arg, default=config.VIDEOWALL_TILE, metavar='COL,FIL',
+                        help="videowall: tile que dibuja este proceso (fila 0 = arriba)")
+    return parser.parse_args()
+
+def wait_for_capture_node(network_source: NetworkFeatureSource,
+                          preloader: StartupPreloader) -> dict:
+    """
+    Nodo de render: en lugar del menú, espera al primer paquete del nodo de
+    captura y adopta su modo y patrón. ESC o cerrar la ventana cancelan.
+    """
+    print(f"📡 Esperando al nodo de captura en {config.NET_MULTICAST_GROUP}:{config.NET_PORT}... (ESC para salir)")
+    while not network_source.wait_for_session(0.1):
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT or (event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE):
+                return {'mode': 'exit'}
+        preloader.poll()
+    packet = network_source.first_packet
+    return {'mode': packet.pattern_mode, 'pattern': packet.pattern_index, 'beats': packet.shape_change_beats}
+
 def validate_environment() -> bool:
     """
     Valida que el entorno esté correctamente configurado.
@@ -134,26 +210,76 @@ def main():
     Función principal del programa.
     Inicializa todos los componentes y ejecuta el bucle principal.
     """
+    args = parse_args()
+    LOG.start()
+    profiler = StartupProfiler(_PROCESS_START)
+    profiler.record("importaciones", _PROCESS_START, _IMPORTS_DONE)
+    
     try:
         # Mostrar mensaje de bienvenida
         print_welcome_message()
         
-        # Validar entorno
-        if not validate_environment():
+        # Validar entorno (el tile del videowall se valida con el resto de la configuración)
+        config.VIDEOWALL_GRID = args.wall
+        config.VIDEOWALL_TILE = args.tile
+        config.METRICS_PORT = args.metrics_port
+        config.METRICS_DUMP_PATH = args.metrics_dump
+        with profiler.phase("validación del entorno"):
+            environment_ok = validate_environment()
+        if not environment_ok:
             print("\n❌ No se puede iniciar el programa debido a errores de configuración")
             input("Presiona Enter para salir...")
             return 1
         
+        # Nodo de captura: sin ventana ni renderizado
+        if args.capture_node:
+            config.SHAPE_CHANGE_BEATS = args.beats
+            return run_capture_node(args.mode, args.pattern, args.control)
+        
+        # Analizador del bus local: sin ventana ni renderizado
+        if args.bus_analyzer:
+            return run_bus_analyzer()
+        
+        config.DISPLAY_INDEX = args.display
+        if config.VIDEOWALL_GRID != (1, 1):
+            print(f"🧱 Videowall {config.VIDEOWALL_GRID[0]}x{config.VIDEOWALL_GRID[1]}: "
+                  f"tile {config.VIDEOWALL_TILE[0]},{config.VIDEOWALL_TILE[1]}")
+            if not args.render_node:
+                print("⚠️  Sin --render-node cada tile lleva su propio tiempo, patrón y semilla")
+        
+        # Una sola ventana y contexto OpenGL para el menú y el visualizador
+        with profiler.phase("ventana y contexto OpenGL"):
+            display = Display()
+        
+        # Solo se leen las cabeceras: el código se ensambla para los patrones programados
+        with profiler.phase("registro de patrones"):
+            pattern_registry = PatternRegistry()
+        
+        # Ruido, dispositivo de audio y shaders se preparan mientras se ve el menú
+        preloader = StartupPreloader(pattern_registry, profiler)
+        
         # ================================================================
         # MOSTRAR GUI PARA SELECCIONAR MODO
         # ================================================================
-        gui = GUI()
-        user_config = gui.show_main_menu()
-        gui.close()
+        network_source = None
+        if args.render_node:
+            # Nodo de render: el modo y el patrón los marca el nodo de captura
+            network_source = NetworkFeatureSource()
+            with profiler.phase("espera al nodo de captura"):
+                user_config = wait_for_capture_node(network_source, preloader)
+        else:
+            with profiler.phase("menú (interacción del usuario)"):
+                gui = GUI(display, on_idle=preloader.poll, thumbnails=ThumbnailAtlas(pattern_registry))
+                user_config = gui.show_main_menu()
+                gui.close()
         
         # Si el usuario sale, terminar
         if user_config['mode'] == 'exit':
             print("\n👋 Saliendo del programa...")
+            if network_source is not None:
+                network_source.stop_stream()
+            preloader.close()
+            display.close()
             return 0
         
         # Extraer configuración seleccionada
@@ -179,26 +305,74 @@ def main():
         # ================================================================
         print("\n🚀 Iniciando componentes del visualizador...\n")
         
-        renderer = Renderer()
-        audio_handler = AudioHandler()
+        # Solo se compilan los patrones que pueden mostrarse en esta sesión
+        scheduled_patterns = pattern_registry.scheduled_indices(current_pattern_mode, admin_pattern_index)
+        if network_source is not None or (args.control and current_pattern_mode == 'admin'):
+            # Con control remoto (propio o del nodo de captura) el patrón puede
+            # cambiarse también en modo admin
+            scheduled_patterns = sorted(set(pattern_registry.scheduled_indices('order')) | {admin_pattern_index})
+        if current_pattern_mode == 'admin' or network_source is not None:
+            initial_pattern = admin_pattern_index
+        else:
+            initial_pattern = scheduled_patterns[0]
+        
+        prepared_program = preloader.take_program(scheduled_patterns)
+        noise_bank = preloader.result('noise_bank')
+        with profiler.phase("renderer"):
+            renderer = Renderer(display, pattern_registry, scheduled_patterns,
+                                prepared_program=prepared_program, noise_bank=noise_bank)
         
-        if not audio_handler.start_stream():
+        with profiler.phase("audio"):
+            if network_source is not None:
+                audio_handler = network_source
+            elif args.replay_trace:
+                audio_handler = TraceReplaySource(args.replay_trace, args.replay_speed)
+            elif args.bus_renderer:
+                audio_handler = FeatureBusReader()
+            else:
+                audio_handler = AudioHandler(preloader.result('audio_device'),
+                                             trace_path=args.record_trace)
+            stream_ok = audio_handler.start_stream()
+        
+        if not stream_ok:
             print("\n❌ No se pudo iniciar la captura de audio")
             renderer.close()
+            display.close()
             input("\nPresiona Enter para salir...")
             return 1
         
         # Inicializar estado (pasa el modo y el índice inicial elegido)
-        state = initialize_state(current_pattern_mode, admin_pattern_index)
+        # En un nodo de render la semilla es la del nodo de captura (mismas partículas)
+        seed = network_source.first_packet.seed if network_source is not None else config.SIMULATION_SEED
+        state = initialize_state(current_pattern_mode, scheduled_patterns, initial_pattern, seed)
         
         if current_pattern_mode != 'admin':
             print(f"🔥 Modo de cambio: '{state['pattern_mode']}'. Próximo cambio en {state['current_beat_target']} beats.")
         
+        # Control remoto: en un nodo de render la simulación la manda el nodo de captura
+        control_server = None
+        if args.control:
+            control_server = ControlServer(RENDER_COMMANDS) if network_source is not None else ControlServer()
+            if not control_server.start():
+                control_server = None
+        
+        # Fichero de configuración: los cambios se preparan en otro hilo y se aplican entre frames
+        live_config = LiveConfig(args.config, args.preset, audio_handler) if args.config else None
+        
+        # Métricas: endpoint de Prometheus y volcado JSONL en hilos propios
+        metrics_exporter = MetricsExporter()
+        metrics_exporter.start()
+        beat_meter = BeatRateMeter()
+        
         clock = pygame.time.Clock()
+        pacer = FramePacer()
+        power_saver = PowerSaver()
         start_time = pygame.time.get_ticks()
         running = True
         
         print("\n✅ Todos los componentes iniciados correctamente\n")
+        if args.startup_report:
+            profiler.report()
         
         # ================================================================
         # BUCLE PRINCIPAL
@@ -208,6 +382,9 @@ def main():
         has_focus = True
         minimized = False
         
+        # Hay un frame emitido a la GPU pendiente de presentar
+        frame_pending = False
+        
         while running:
             # Pump de eventos para asegurar respuesta del sistema operativo
             pygame.event.pump()
@@ -223,20 +400,18 @@ def main():
                 elif event.type == pygame.WINDOWFOCUSGAINED:
                     has_focus = True
                     minimized = False
-                    if config.DEBUG_MODE:
-                        print("🔍 Ventana recuperó el foco")
+                    power_saver.set_focus(has_focus)
+                    LOG.log(_LOG_WINDOW_EVENT, text="recuperó el foco")
                 elif event.type == pygame.WINDOWFOCUSLOST:
                     has_focus = False
-                    if config.DEBUG_MODE:
-                        print("🔍 Ventana perdió el foco")
+                    power_saver.set_focus(has_focus)
+                    LOG.log(_LOG_WINDOW_EVENT, text="perdió el foco")
                 elif event.type == pygame.WINDOWMINIMIZED:
                     minimized = True
-                    if config.DEBUG_MODE:
-                        print("🔍 Ventana minimizada")
+                    LOG.log(_LOG_WINDOW_EVENT, text="minimizada")
                 elif event.type == pygame.WINDOWRESTORED:
                     minimized = False
-                    if config.DEBUG_MODE:
-                        print("🔍 Ventana restaurada")
+                    LOG.log(_LOG_WINDOW_EVENT, text="restaurada")
                 elif event.type in (pygame.WINDOWEXPOSED, pygame.WINDOWSHOWN):
                     # Ventana se volvió visible
                     pass
@@ -248,84 +423,113 @@ def main():
                     
                     elif event.key == pygame.K_d:
                         config.DEBUG_MODE = not config.DEBUG_MODE
-                        print(f"🐛 Debug mode: {'ON' if config.DEBUG_MODE else 'OFF'}")
+                        LOG.log(_LOG_DEBUG_TOGGLE, float(config.DEBUG_MODE))
                     
-                    # SPACE: Cambiar patrón manualmente (SOLO SI NO ES ADMIN)
-                    elif event.key == pygame.K_SPACE and state['pattern_mode'] != 'admin':
-                        state['beat_count'] = 0
-                        state['pattern_change_time'] = state['current_time']
-                        state['prev_pattern_index'] = state['pattern_index']
-                        
-                        if state['pattern_mode'] == "random":
-                            new_index = np.random.randint(0, config.TOTAL_PATTERNS)
-                            while new_index == state['pattern_index']:
-                                new_index = np.random.randint(0, config.TOTAL_PATTERNS)
-                            state['pattern_index'] = new_index
-                        else:
-                            state['pattern_index'] = (state['pattern_index'] + 1) % config.TOTAL_PATTERNS
-                        
-                        state['current_beat_target'] = _get_next_beat_target(state['pattern_mode'])
-                        print(f"🎨 Patrón cambiado manualmente a: {state['pattern_index']}. Próximo en {state['current_beat_target']} beats.")
+                    # SPACE: Cambiar patrón manualmente (SOLO SI NO ES ADMIN NI NODO DE RENDER)
+                    elif (event.key == pygame.K_SPACE and state['pattern_mode'] != 'admin' and
+                          network_source is None):
+                        advance_pattern(state)
+                        LOG.log(_LOG_MANUAL_PATTERN, state['pattern_index'], state['current_beat_target'])
                     
                     # C: Cambiar color manualmente
                     elif event.key == pygame.K_c:
                         state['color_index'] = (state['color_index'] + 1) % len(config.COLOR_PALETTE)
-                        print(f"🎨 Color cambiado manually a: {state['color_index']}")
+                        LOG.log(_LOG_MANUAL_COLOR, state['color_index'])
+            
+            # 2. ESPERA HASTA EL INICIO PLANIFICADO DEL FRAME
+            # El pacer deja la espera aquí (y no tras el flip) para que el audio
+            # se muestree lo más tarde posible antes de dibujar
+            pacer.wait_for_frame_start()
+            
+            # Órdenes del control remoto recibidas desde el frame anterior
+            if control_server is not None:
+                control_server.apply_pending(state, renderer)
+            
+            # Cambios del fichero de configuración ya validados y preparados
+            if live_config is not None:
+                live_config.apply_pending(renderer)
+            
+            if network_source is not None:
+                # 3-4. NODO DE RENDER: paquetes que ya tocan según el reloj del nodo de
+                # captura; beats y cambios de patrón llegan decididos
+                network_source.advance(state)
+            else:
+                # 3. PROCESAMIENTO DE AUDIO (solo puerta de RMS en modo ahorro)
+                if power_saver.analysis_paused:
+                    features = audio_handler.process_rms_gate()
+                else:
+                    features = audio_handler.process_audio()
+                
+                # 4. PASO DE SIMULACIÓN: beats, partículas, cambio de patrón y transiciones
+                # (núcleo determinista de simulation.py; el reloj real solo aporta dt)
+                now = (pygame.time.get_ticks() - start_time) / 1000.0
+                step(state, features, now - state['current_time'])
             
-            # 2. ACTUALIZACIÓN DEL TIEMPO
-            state['current_time'] = (pygame.time.get_ticks() - start_time) / 1000.0
+            beat_meter.update(state)
             
-            # 3. PROCESAMIENTO DE AUDIO
-            audio_handler.process_audio(state)
+            # Modo ahorro de energía: FPS y resolución según silencio/foco
+            power_saver.update(state)
+            pacer.set_target_fps(power_saver.target_fps)
+            renderer.set_scene_scale(power_saver.render_scale)
             
             # Si la ventana está minimizada, no renderizar (ahorra recursos)
             if minimized:
                 clock.tick(10)  # Reducir FPS cuando está minimizado
+                pacer.reset()
                 continue
             
-            # --- LÓGICA DE CAMBIO DE PATRÓN AUTOMÁTICO ---
-            # (Se salta si estamos en modo admin)
-            if state['pattern_mode'] != 'admin':
-                if state['beat_count'] >= state['current_beat_target']:
-                    state['beat_count'] = 0
-                    state['pattern_change_time'] = state['current_time']
-                    state['prev_pattern_index'] = state['pattern_index']
-                    
-                    if state['pattern_mode'] == "random":
-                        new_index = random.randint(0, config.TOTAL_PATTERNS - 1)
-                        while new_index == state['pattern_index']:
-                            new_index = random.randint(0, config.TOTAL_PATTERNS - 1)
-                        state['pattern_index'] = new_index
-                    else:
-                        state['pattern_index'] = (state['pattern_index'] + 1) % config.TOTAL_PATTERNS
-                    
-                    state['current_beat_target'] = _get_next_beat_target(state['pattern_mode'])
-                    
-                    if config.DEBUG_MODE:
-                        print(f"🎨 CAMBIO DE PATRÓN a: {state['pattern_index']}. Próximo cambio en {state['current_beat_target']} beats.")
-            
-            # 4. RENDERIZADO
-            renderer.render(state)
-            
-            # 5. CONTROL DE FRAMERATE
-            clock.tick(config.TARGET_FPS)
+            if renderer.frame_fences.max_in_flight > 1:
+                # 5. PRESENTACIÓN DEL FRAME ANTERIOR
+                # Sus comandos se emitieron en la iteración previa: la GPU lo ha estado
+                # dibujando mientras la CPU hacía el análisis de este frame.
+                # El ritmo lo marcan el pacer y el VSync, sin clock.tick
+                pacer.mark_submitted()
+                if frame_pending:
+                    renderer.present()
+                    pacer.mark_presented()
+                
+                # 6. EMISIÓN DEL FRAME SIGUIENTE (fence + glFlush, sin esperar al swap)
+                renderer.render(state)
+                frame_pending = True
+            else:
+                # 5-6. MÍNIMA LATENCIA (MAX_FRAMES_IN_FLIGHT = 1): el frame se
+                # presenta en la misma iteración en que se analizó su audio
+                renderer.render(state)
+                pacer.mark_submitted()
+                renderer.present()
+                pacer.mark_presented()
             state['frames_rendered'] += 1
             
-            if config.DEBUG_MODE and state['frames_rendered'] % 300 == 0:
+            if state['frames_rendered'] % 300 == 0 and LOG.enabled(DEBUG):
                 debug_beat_info = f"Beats: {state['beat_count']} / {state['current_beat_target']}"
                 if state['pattern_mode'] == 'admin':
                     debug_beat_info = "(Modo Admin: cambios bloqueados)"
                 
-                print(f"\n📊 STATS - Frame {state['frames_rendered']}:")
-                print(f"   Patrón: {state['pattern_index']} {debug_beat_info}")
-                print(f"   Amplitud: {state['current_amplitude']:.3f}")
+                LOG.log(_LOG_STATS_FRAME, state['frames_rendered'])
+                LOG.log(_LOG_STATS_PATTERN, state['pattern_index'], text=debug_beat_info)
+                LOG.log(_LOG_STATS_AMPLITUDE, state['current_amplitude'])
+                LOG.log(_LOG_STATS_POWER, power_saver.render_scale, power_saver.target_fps,
+                        text=power_saver.mode)
+                LOG.log(_LOG_STATS_PARTICLES, state['particles'].active_count(state['current_time']))
+                pacing = pacer.get_stats()
+                LOG.log(_LOG_STATS_PACING, pacing['mean_ms'], pacing['jitter_ms'], pacing['p99_ms'],
+                        pacing['missed_deadlines'])
+                fences = renderer.frame_fences.get_stats()
+                LOG.log(_LOG_STATS_GPU, fences['in_flight'], fences['waits'], fences['wait_ms'])
                 
         # ================================================================
         # LIMPIEZA Y CIERRE
         # ================================================================
         print("\n🧹 Limpiando recursos...")
+        if control_server is not None:
+            control_server.stop()
+        if live_config is not None:
+            live_config.close()
+        metrics_exporter.stop()
         audio_handler.stop_stream()
+        LOG.stop()
         renderer.close()
+        display.close()
         
         print(f"\n📊 ESTADÍSTICAS FINALES:")
         print(f"   Frames renderizados: {state['frames_rendered']}")
@@ -333,6 +537,14 @@ def main():
         if state['current_time'] > 0:
             avg_fps = state['frames_rendered'] / state['current_time']
             print(f"   FPS promedio: {avg_fps:.2f}")
+        pacing = pacer.get_stats()
+        print(f"   Periodo de frame: {pacing['frame_period_ms']:.2f} ms")
+        print(f"   Jitter: {pacing['jitter_ms']:.2f} ms (p99 {pacing['p99_ms']:.2f} ms, "
+              f"máx {pacing['max_ms']:.2f} ms)")
+        print(f"   Deadlines perdidos: {pacing['missed_deadlines']}")
+        print(f"   Tiempo en modo ahorro: {power_saver.saving_seconds:.1f} segundos")
+        fences = renderer.frame_fences.get_stats()
+        print(f"   Esperas por GPU: {fences['waits']} ({fences['wait_ms']:.1f} ms en total)")
         
         print("\n" + "=" * 70)
         print("   ✅ Visualizador cerrado correctamente")
@@ -0,0 +1,329 @@
+# ============================================================================
+# METRICS.PY - REGISTRO DE MÉTRICAS, ENDPOINT PROMETHEUS Y VOLCADO JSONL
+# ============================================================================
+# Registro en proceso de contadores, gauges e histogramas de cubetas fijas.
+# Los módulos piden sus métricas una vez (al crearse) y en el camino caliente
+# solo suman enteros: observe() es una búsqueda binaria sobre ~10 límites y
+# dos sumas, sin reservar memoria ni tomar locks (cada métrica tiene un único
+# hilo escritor; los lectores toleran una lectura a medio actualizar).
+#
+# MetricsExporter publica el registro:
+# - GET http://127.0.0.1:9108/metrics en formato de texto de Prometheus
+# - Una línea JSON cada METRICS_DUMP_SECONDS en METRICS_DUMP_PATH
+# ============================================================================
+
+import json
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import config
+
+
+# Límites de cubeta (unidades en el nombre de cada métrica)
+FRAME_MS_BUCKETS: Tuple[float, ...] = (4.0, 8.0, 12.0, 16.7, 20.0, 25.0, 33.3, 50.0, 100.0, 250.0)
+GPU_MS_BUCKETS: Tuple[float, ...] = (0.5, 1.0, 2.0, 4.0, 8.0, 12.0, 16.7, 25.0, 50.0)
+ANALYSIS_US_BUCKETS: Tuple[float, ...] = (50.0, 100.0, 200.0, 500.0, 1000.0, 2000.0, 5000.0, 10000.0, 20000.0)
+
+
+class Counter:
+    """Contador monótono."""
+
+    __slots__ = ('value',)
+
+    def __init__(self):
+        self.value = 0
+
+    def inc(self, amount: int = 1) -> None:
+        self.value += amount
+
+
+class Gauge:
+    """Valor instantáneo."""
+
+    __slots__ = ('value',)
+
+    def __init__(self):
+        self.value = 0.0
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+
+class Histogram:
+    """Histograma de cubetas fijas (no acumuladas; la exposición las acumula)."""
+
+    __slots__ = ('bounds', 'counts', 'sum', 'count')
+
+    def __init__(self, bounds: Sequence[float]):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)   # Última: +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        """Cubetas acumuladas al estilo Prometheus: [(le, cuenta), ...]."""
+        result = []
+        total = 0
+        for bound, count in zip(self.bounds, self.counts):
+            total += count
+            result.append((f"{bound:g}", total))
+        result.append(("+Inf", total + self.counts[-1]))
+        return result
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Cuantil aproximado (límite superior de la cubeta que lo contiene).
+
+        Returns:
+            El límite, o None si cae en la cubeta +Inf (por encima del último límite)
+        """
+        if self.count == 0:
+            return 0.0
+        target = q * self.count
+        total = 0
+        for bound, count in zip(self.bounds, self.counts):
+            total += count
+            if total >= target:
+                return bound
+        return None
+
+
+class MetricFamily:
+    """Métrica con nombre, ayuda y, opcionalmente, una etiqueta (p. ej. 'pattern')."""
+
+    def __init__(self, name: str, help_text: str, kind: str, label: Optional[str],
+                 bounds: Sequence[float] = ()):
+        self.name = name
+        self.help = help_text
+        self.kind = kind                 # 'counter', 'gauge' o 'histogram'
+        self.label = label
+        self.bounds = bounds
+        self.children: Dict[str, Any] = {}
+
+    def _new(self) -> Any:
+        if self.kind == 'counter':
+            return Counter()
+        if self.kind == 'gauge':
+            return Gauge()
+        return Histogram(self.bounds)
+
+    def labels(self, value: Any) -> Any:
+        """Métrica hija para un valor de la etiqueta (se crea la primera vez)."""
+        key = str(value)
+        child = self.children.get(key)
+        if child is None:
+            child = self.children[key] = self._new()
+        return child
+
+
+class MetricsRegistry:
+    """
+    Registro de métricas del proceso.
+
+    Características:
+    - counter() / gauge() / histogram() devuelven la misma métrica si ya existe
+    - Sin etiqueta se devuelve la métrica; con etiqueta, la familia (.labels(v))
+    - render_prometheus() y snapshot() leen sin detener a los escritores
+    """
+
+    PREFIX: str = "visualizador_"
+
+    def __init__(self):
+        self.families: Dict[str, MetricFamily] = {}
+
+    def _get(self, name: str, help_text: str, kind: str, label: Optional[str],
+             bounds: Sequence[float] = ()) -> Any:
+        family = self.families.get(name)
+        if family is None:
+            family = self.families[name] = MetricFamily(name, help_text, kind, label, bounds)
+        elif family.kind != kind:
+            raise ValueError(f"La métrica '{name}' ya existe como {family.kind}")
+        return family if label is not None else family.labels('')
+
+    def counter(self, name: str, help_text: str, label: Optional[str] = None) -> Any:
+        return self._get(name, help_text, 'counter', label)
+
+    def gauge(self, name: str, help_text: str, label: Optional[str] = None) -> Any:
+        return self._get(name, help_text, 'gauge', label)
+
+    def histogram(self, name: str, help_text: str, bounds: Sequence[float],
+                  label: Optional[str] = None) -> Any:
+        return self._get(name, help_text, 'histogram', label, bounds)
+
+    def render_prometheus(self) -> str:
+        """Todas las métricas en formato de texto de Prometheus (0.0.4)."""
+        lines = []
+        for family in list(self.families.values()):
+            name = self.PREFIX + family.name
+            lines.append(f"# HELP {name} {family.help}")
+            lines.append(f"# TYPE {name} {family.kind}")
+            for key, child in list(family.children.items()):
+                label = f'{family.label}="{key}"' if family.label is not None else ''
+                if family.kind == 'histogram':
+                    prefix = f"{label}," if label else ''
+                    for le, count in child.cumulative():
+                        lines.append(f'{name}_bucket{{{prefix}le="{le}"}} {count}')
+                    suffix = f"{{{label}}}" if label else ''
+                    lines.append(f"{name}_sum{suffix} {child.sum:.6g}")
+                    lines.append(f"{name}_count{suffix} {child.count}")
+                else:
+                    suffix = f"{{{label}}}" if label else ''
+                    lines.append(f"{name}{suffix} {child.value:.6g}")
+        return "\n".join(lines) + "\n"
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Valores actuales como diccionario (para el volcado JSONL)."""
+        result: Dict[str, Any] = {}
+        for family in list(self.families.values()):
+            values = {}
+            for key, child in list(family.children.items()):
+                if family.kind == 'histogram':
+                    values[key] = {
+                        'count': child.count,
+                        'sum': round(child.sum, 3),
+                        'p50': child.quantile(0.5),       # None: por encima del último límite
+                        'p99': child.quantile(0.99),
+                        'overflow': child.counts[-1],     # Observaciones en la cubeta +Inf
+                        'buckets': child.counts[:],
+                    }
+                else:
+                    values[key] = child.value
+            result[family.name] = values if family.label is not None else values.get('')
+        return result
+
+
+# Registro único del proceso
+REGISTRY = MetricsRegistry()
+
+
+class BeatRateMeter:
+    """Beats del estado convertidos en contador total y ritmo (BPM) del último minuto."""
+
+    WINDOW_SECONDS: float = 60.0
+
+    def __init__(self, registry: MetricsRegistry = REGISTRY):
+        self.beats_total = registry.counter('beats_total', "Beats detectados")
+        self.beat_rate = registry.gauge('beat_rate_bpm', "Beats por minuto (último minuto)")
+        self.pattern_changes = registry.counter('pattern_changes_total', "Cambios de patrón")
+        self.beat_times: deque = deque()
+        self.last_beats = 0
+        self.last_changes = 0
+
+    def update(self, state: Dict[str, Any]) -> None:
+        """Una vez por frame, tras el paso de simulación."""
+        now = state['current_time']
+        new_beats = state['beats_detected'] - self.last_beats
+        if new_beats > 0:
+            self.beats_total.inc(new_beats)
+            self.beat_times.extend([now] * new_beats)
+            self.last_beats = state['beats_detected']
+        while self.beat_times and self.beat_times[0] < now - self.WINDOW_SECONDS:
+            self.beat_times.popleft()
+        window = min(self.WINDOW_SECONDS, now) or 1.0
+        self.beat_rate.set(len(self.beat_times) * 60.0 / window)
+
+        new_changes = state['pattern_changes'] - self.last_changes
+        if new_changes > 0:
+            self.pattern_changes.inc(new_changes)
+            self.last_changes = state['pattern_changes']
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    """GET /metrics (texto de Prometheus)."""
+
+    registry: MetricsRegistry = REGISTRY
+
+    def do_GET(self) -> None:
+        if self.path.split('?', 1)[0] != '/metrics':
+            self.send_error(404)
+            return
+        body = self.registry.render_prometheus().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass   # Sin una línea en consola por cada scrape
+
+
+class MetricsExporter:
+    """
+    Publica el registro en segundo plano: endpoint HTTP y volcado JSONL.
+
+    Características:
+    - Hilos daemon: nunca retrasan el bucle de render
+    - Si el puerto está ocupado (otro proceso) se avisa y se sigue sin endpoint
+    """
+
+    def __init__(self, port: Optional[int] = None, dump_path: Optional[str] = None,
+                 registry: MetricsRegistry = REGISTRY):
+        """
+        Args:
+            port: Puerto HTTP (por defecto config.METRICS_PORT; 0 = sin endpoint)
+            dump_path: Fichero JSONL (por defecto config.METRICS_DUMP_PATH; None = sin volcado)
+            registry: Registro a publicar
+        """
+        self.port = config.METRICS_PORT if port is None else port
+        self.dump_path = dump_path if dump_path is not None else config.METRICS_DUMP_PATH
+        self.registry = registry
+        self.server: Optional[ThreadingHTTPServer] = None
+        self.stop_event = threading.Event()
+        self.threads: List[threading.Thread] = []
+
+    def start(self) -> None:
+        if self.port:
+            try:
+                self.server = ThreadingHTTPServer((config.METRICS_HOST, self.port), _MetricsHandler)
+            except OSError as e:
+                print(f"⚠️  Métricas: no se pudo abrir el puerto {self.port} ({e})")
+            else:
+                self.server.daemon_threads = True
+                self._spawn(self.server.serve_forever, "metrics-http")
+                print(f"📈 Métricas en http://{config.METRICS_HOST}:{self.port}/metrics")
+        if self.dump_path:
+            self._spawn(self._dump_loop, "metrics-dump")
+            print(f"📈 Volcado de métricas cada {config.METRICS_DUMP_SECONDS:g} s en {self.dump_path}")
+
+    def _spawn(self, target: Any, name: str) -> None:
+        thread = threading.Thread(target=target, name=name, daemon=True)
+        thread.start()
+        self.threads.append(thread)
+
+    def _dump(self) -> None:
+        # JSON estricto: un Infinity/NaN rompería a los consumidores del volcado
+        line = json.dumps({'time': round(time.time(), 3), 'metrics': self.registry.snapshot()},
+                          allow_nan=False)
+        with open(self.dump_path, 'a', encoding='utf-8') as f:
+            f.write(line + "\n")
+
+    def _dump_loop(self) -> None:
+        while not self.stop_event.wait(config.METRICS_DUMP_SECONDS):
+            try:
+                self._dump()
+            except OSError as e:
+                print(f"⚠️  Métricas: no se pudo escribir {self.dump_path} ({e})")
+                return
+            except ValueError as e:
+                print(f"⚠️  Métricas: valor no representable en JSON ({e})")
+
+    def stop(self) -> None:
+        """Cierra el endpoint y escribe un último volcado."""
+        self.stop_event.set()
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+        if self.dump_path:
+            try:
+                self._dump()
+            except (OSError, ValueError):
+                pass
@@ -0,0 +1,170 @@
+# ============================================================================
+# NOISE_BANK.PY - BANCO DE TEXTURAS DE RUIDO PRECALCULADAS
+# ============================================================================
+# Genera una única textura RGBA8 tileable con cuatro tipos de ruido:
+# - R: Ruido de valor (value noise) interpolado con smoothstep
+# - G: Ruido de gradiente (Perlin clásico)
+# - B: Distancia al punto de Voronoi más cercano (F1)
+# - A: Ruido blanco (un valor aleatorio por texel, sustituye al hash sin())
+#
+# La generación está vectorizada con numpy y se hace una sola vez: el
+# resultado se guarda en disco y en ejecuciones posteriores solo se lee.
+# Los patrones del fragment shader hacen un fetch de textura en lugar de
+# evaluar el hash con sin() varias veces por píxel.
+# ============================================================================
+
+import os
+import numpy as np
+import config
+from typing import Optional
+
+# Versión del algoritmo de generación (cambiarla invalida la caché en disco)
+NOISE_BANK_VERSION: int = 1
+
+# Celdas de la red de ruido por cada lado de la textura
+VALUE_NOISE_CELLS: int = 32
+GRADIENT_NOISE_CELLS: int = 16
+VORONOI_CELLS: int = 8
+
+
+def _fade(t: np.ndarray) -> np.ndarray:
+    """Curva de interpolación quíntica de Perlin (derivadas continuas)."""
+    return t * t * t * (t * (t * 6.0 - 15.0) + 10.0)
+
+
+def _lattice_coords(size: int, cells: int):
+    """
+    Coordenadas de red para cada texel de una textura tileable.
+
+    Returns:
+        Tupla (x0, x1, fx) con índice de celda, índice siguiente (con wrap)
+        y parte fraccionaria, todos con forma (size,)
+    """
+    coords = (np.arange(size, dtype=np.float64) + 0.5) * cells / size
+    cell = np.floor(coords).astype(np.int64)
+    return cell % cells, (cell + 1) % cells, coords - cell
+
+
+def _value_noise(rng: np.random.Generator, size: int, cells: int) -> np.ndarray:
+    """Ruido de valor tileable en [0, 1]."""
+    lattice = rng.random((cells, cells))
+    x0, x1, fx = _lattice_coords(size, cells)
+    y0, y1, fy = _lattice_coords(size, cells)
+
+    sx = _fade(fx)[np.newaxis, :]
+    sy = _fade(fy)[:, np.newaxis]
+
+    top = lattice[np.ix_(y0, x0)] * (1.0 - sx) + lattice[np.ix_(y0, x1)] * sx
+    bottom = lattice[np.ix_(y1, x0)] * (1.0 - sx) + lattice[np.ix_(y1, x1)] * sx
+    return top * (1.0 - sy) + bottom * sy
+
+
+def _gradient_noise(rng: np.random.Generator, size: int, cells: int) -> np.ndarray:
+    """Ruido de gradiente (Perlin) tileable, reescalado a [0, 1]."""
+    angles = rng.random((cells, cells)) * 2.0 * np.pi
+    grad_x, grad_y = np.cos(angles), np.sin(angles)
+
+    x0, x1, fx = _lattice_coords(size, cells)
+    y0, y1, fy = _lattice_coords(size, cells)
+    fx = fx[np.newaxis, :]
+    fy = fy[:, np.newaxis]
+
+    def corner(yi: np.ndarray, xi: np.ndarray, dx: np.ndarray, dy: np.ndarray) -> np.ndarray:
+        return grad_x[np.ix_(yi, xi)] * dx + grad_y[np.ix_(yi, xi)] * dy
+
+    n00 = corner(y0, x0, fx, fy)
+    n10 = corner(y0, x1, fx - 1.0, fy)
+    n01 = corner(y1, x0, fx, fy - 1.0)
+    n11 = corner(y1, x1, fx - 1.0, fy - 1.0)
+
+    sx, sy = _fade(fx), _fade(fy)
+    noise = (n00 * (1.0 - sx) + n10 * sx) * (1.0 - sy) + (n01 * (1.0 - sx) + n11 * sx) * sy
+    # El rango teórico de Perlin 2D es [-sqrt(0.5), sqrt(0.5)]
+    return np.clip(noise * np.sqrt(2.0) * 0.5 + 0.5, 0.0, 1.0)
+
+
+def _voronoi_f1(rng: np.random.Generator, size: int, cells: int) -> np.ndarray:
+    """Distancia F1 de Voronoi tileable (en unidades de celda), recortada a [0, 1]."""
+    feature_points = rng.random((cells, cells, 2))
+
+    coords = (np.arange(size, dtype=np.float64) + 0.5) * cells / size
+    px = coords[np.newaxis, :]
+    py = coords[:, np.newaxis]
+    cell_x = np.floor(px).astype(np.int64)
+    cell_y = np.floor(py).astype(np.int64)
+
+    min_dist = np.full((size, size), np.inf)
+    # 9 vecinos: cada iteración está vectorizada sobre todos los texels
+    for oy in (-1, 0, 1):
+        for ox in (-1, 0, 1):
+            nx = cell_x + ox
+            ny = cell_y + oy
+            point = feature_points[ny % cells, nx % cells]
+            dx = nx + point[..., 0] - px
+            dy = ny + point[..., 1] - py
+            min_dist = np.minimum(min_dist, np.sqrt(dx * dx + dy * dy))
+    return np.clip(min_dist, 0.0, 1.0)
+
+
+def generate_noise_bank(size: int, seed: int) -> np.ndarray:
+    """
+    Genera el banco de ruido completo.
+
+    Args:
+        size: Lado de la textura en texels (potencia de 2)
+        seed: Semilla del generador aleatorio
+
+    Returns:
+        Array uint8 de forma (size, size, 4) listo para glTexImage2D
+    """
+    rng = np.random.default_rng(seed)
+    channels = np.stack([
+        _value_noise(rng, size, VALUE_NOISE_CELLS),
+        _gradient_noise(rng, size, GRADIENT_NOISE_CELLS),
+        _voronoi_f1(rng, size, VORONOI_CELLS),
+        rng.random((size, size)),
+    ], axis=-1)
+    return np.ascontiguousarray(np.round(channels * 255.0).astype(np.uint8))
+
+
+def _cache_path(size: int, seed: int) -> str:
+    """Ruta del fichero de caché para unos parámetros dados."""
+    filename = f"noise_bank_v{NOISE_BANK_VERSION}_{size}_{seed}.npy"
+    return os.path.join(config.CACHE_DIR, filename)
+
+
+def load_noise_bank(size: Optional[int] = None, seed: Optional[int] = None) -> np.ndarray:
+    """
+    Devuelve el banco de ruido, leyéndolo de la caché en disco si existe.
+    Si no existe (o está corrupto) lo genera y lo guarda.
+
+    Args:
+        size: Lado de la textura (por defecto config.NOISE_TEXTURE_SIZE)
+        seed: Semilla (por defecto config.NOISE_SEED)
+
+    Returns:
+        Array uint8 de forma (size, size, 4)
+    """
+    size = size if size is not None else config.NOISE_TEXTURE_SIZE
+    seed = seed if seed is not None else config.NOISE_SEED
+    path = _cache_path(size, seed)
+
+    try:
+        bank = np.load(path)
+        if bank.shape == (size, size, 4) and bank.dtype == np.uint8:
+            print(f"   🌫️  Banco de ruido cargado de caché: {path}")
+            return bank
+    except (OSError, ValueError):
+        pass
+
+    bank = generate_noise_bank(size, seed)
+    print(f"   🌫️  Banco de ruido generado ({size}x{size})")
+
+    try:
+        os.makedirs(config.CACHE_DIR, exist_ok=True)
+        np.save(path, bank)
+    except OSError as e:
+        # Sin caché solo se pierde tiempo en el próximo arranque
+        print(f"⚠️  No se pudo guardar la caché de ruido: {e}")
+
+    return bank
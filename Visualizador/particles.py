@@ -0,0 +1,214 @@
+# ============================================================================
+# PARTICLES.PY - SISTEMA DE PARTÍCULAS CON BINNING EN ESPACIO DE PANTALLA
+# ============================================================================
+# Gestiona los "rayos"/gotas generados por cada beat. Las partículas viven en
+# arrays de numpy que se actualizan en bloque (sin bucles Python por partícula)
+# y se reparten cada frame en una rejilla de tiles de pantalla y en sectores
+# angulares. El shader solo recorre la lista de su tile/sector, de modo que el
+# coste por píxel queda acotado por PARTICLE_BIN_CAPACITY aunque haya miles de
+# partículas activas.
+#
+# Las partículas que se dibujan se eligen de forma global (las
+# PARTICLE_BIN_CAPACITY vivas más recientes) y solo después se reparten: si
+# cada tile eligiera las suyas, dos tiles vecinos se quedarían con conjuntos
+# distintos y se verían cortes en sus bordes. El radio con el que se reparte
+# cada partícula sale del alcance real del patrón (cabeceras @particle_* de
+# pattern_registry.py), así un tile nunca pierde una partícula que le afecta.
+#
+# Layout de la textura de bins (RGBA32F, ancho = PARTICLE_BIN_CAPACITY):
+# - Filas [0, tiles_x * tiles_y): un tile cartesiano cada una (fila = ty * tiles_x + tx)
+# - Filas siguientes: un sector angular alrededor del centro de pantalla
+# - Cada texel: (x, y, tiempo de nacimiento, semilla). Semilla < 0 = slot vacío
+# ============================================================================
+
+import numpy as np
+import config
+from typing import Optional
+
+# Valor de semilla que marca un slot vacío (el shader corta el bucle al verlo)
+EMPTY_SLOT_SEED: float = -1.0
+
+# Semiancho angular de un rayo en radianes (coincide con smoothstep(0.2, 0.0, diff) en el shader)
+RAY_ANGULAR_HALF_WIDTH: float = 0.2
+
+
+class ParticleSystem:
+    """
+    Almacén de partículas en anillo con actualización vectorizada y binning.
+
+    Características:
+    - Capacidad fija (config.MAX_PARTICLES), sin reservas de memoria por frame
+    - Emisión en bloque: todas las partículas de un beat en una sola operación
+    - Binning cartesiano (tiles) y angular (sectores) ordenado por recencia
+    - Resultado listo para subir a la GPU como textura RGBA32F
+    """
+
+    def __init__(self, rng: Optional[np.random.Generator] = None):
+        """
+        Reserva los arrays de partículas y de bins.
+
+        Args:
+            rng: Generador aleatorio a usar (permite ejecuciones deterministas)
+        """
+        self.rng: np.random.Generator = rng if rng is not None else np.random.default_rng()
+        self.capacity: int = config.MAX_PARTICLES
+
+        # Datos por partícula: posición en UV, instante de nacimiento y semilla
+        self.positions: np.ndarray = np.zeros((self.capacity, 2), dtype=np.float32)
+        self.spawn_times: np.ndarray = np.full(self.capacity, -np.inf, dtype=np.float32)
+        self.seeds: np.ndarray = np.zeros(self.capacity, dtype=np.float32)
+        self.next_index: int = 0
+
+        # Geometría de la rejilla de bins
+        self.tiles_x, self.tiles_y = config.PARTICLE_GRID
+        self.num_tiles: int = self.tiles_x * self.tiles_y
+        self.num_sectors: int = config.PARTICLE_ANGULAR_SECTORS
+        self.bin_capacity: int = config.PARTICLE_BIN_CAPACITY
+        self.bin_rows: int = self.num_tiles + self.num_sectors
+
+        # Textura de bins (filas x slots x RGBA)
+        self.bins: np.ndarray = np.zeros((self.bin_rows, self.bin_capacity, 4), dtype=np.float32)
+        self.bins[:, :, 3] = EMPTY_SLOT_SEED
+        self._bins_empty: bool = True
+
+        # Tiempo del último nacimiento (lo usan los patrones que reaccionan al último beat)
+        self.last_spawn_time: float = 0.0
+
+    def spawn(self, current_time: float, count: int, rng: Optional[np.random.Generator] = None) -> None:
+        """
+        Emite 'count' partículas nuevas en posiciones aleatorias.
+        Si el anillo está lleno se sobrescriben las más antiguas.
+
+        Args:
+            current_time: Instante de nacimiento (segundos)
+            count: Número de partículas a emitir
+            rng: Generador para esta emisión (por defecto el del sistema)
+        """
+        count = min(count, self.capacity)
+        if count <= 0:
+            return
+
+        rng = rng if rng is not None else self.rng
+        indices = (self.next_index + np.arange(count)) % self.capacity
+        self.positions[indices] = rng.random((count, 2), dtype=np.float32)
+        self.spawn_times[indices] = current_time
+        self.seeds[indices] = rng.random(count, dtype=np.float32)
+        self.next_index = int((self.next_index + count) % self.capacity)
+        self.last_spawn_time = current_time
+
+    def alive_indices(self, current_time: float, lifetime: Optional[float] = None) -> np.ndarray:
+        """
+        Devuelve los índices de las partículas vivas, de la más reciente a la más antigua.
+
+        Args:
+            current_time: Tiempo actual (segundos)
+            lifetime: Edad máxima (por defecto config.PARTICLE_LIFETIME)
+        """
+        if lifetime is None:
+            lifetime = config.PARTICLE_LIFETIME
+        ages = current_time - self.spawn_times
+        alive = np.nonzero((ages >= 0.0) & (ages < min(lifetime, config.PARTICLE_LIFETIME)))[0]
+        # Orden por recencia: los bins se quedan con las partículas más nuevas
+        return alive[np.argsort(-self.spawn_times[alive], kind='stable')]
+
+    def _scatter_into_bins(self, particle_ids: np.ndarray, rows: np.ndarray) -> None:
+        """
+        Escribe pares (partícula, fila) en la textura de bins respetando la capacidad.
+        Los pares deben llegar ordenados por recencia de partícula.
+        """
+        if rows.size == 0:
+            return
+
+        # Orden estable por fila: dentro de cada fila se conserva la recencia
+        order = np.argsort(rows, kind='stable')
+        rows = rows[order]
+        particle_ids = particle_ids[order]
+
+        # Rango de cada par dentro de su fila
+        first_in_row = np.searchsorted(rows, rows, side='left')
+        slots = np.arange(rows.size) - first_in_row
+        keep = slots < self.bin_capacity
+        rows, slots, particle_ids = rows[keep], slots[keep], particle_ids[keep]
+
+        self.bins[rows, slots, 0] = self.positions[particle_ids, 0]
+        self.bins[rows, slots, 1] = self.positions[particle_ids, 1]
+        self.bins[rows, slots, 2] = self.spawn_times[particle_ids]
+        self.bins[rows, slots, 3] = self.seeds[particle_ids]
+
+    def _bin_tiles(self, alive: np.ndarray, ages: np.ndarray, radius: float, expansion: float) -> None:
+        """Asigna cada partícula viva a todos los tiles que cubre su radio de influencia."""
+        radius = np.minimum(radius + expansion * ages, 1.5)
+        pos = self.positions[alive]
+
+        x0 = np.clip(np.floor((pos[:, 0] - radius) * self.tiles_x), 0, self.tiles_x - 1).astype(np.int64)
+        x1 = np.clip(np.floor((pos[:, 0] + radius) * self.tiles_x), 0, self.tiles_x - 1).astype(np.int64)
+        y0 = np.clip(np.floor((pos[:, 1] - radius) * self.tiles_y), 0, self.tiles_y - 1).astype(np.int64)
+        y1 = np.clip(np.floor((pos[:, 1] + radius) * self.tiles_y), 0, self.tiles_y - 1).astype(np.int64)
+
+        span_x = x1 - x0 + 1
+        span_y = y1 - y0 + 1
+        counts = span_x * span_y
+
+        # Expandir cada partícula en sus pares (partícula, tile) sin bucles
+        pair_particle = np.repeat(np.arange(alive.size), counts)
+        pair_offset = np.arange(pair_particle.size) - np.repeat(np.cumsum(counts) - counts, counts)
+        tx = x0[pair_particle] + pair_offset % span_x[pair_particle]
+        ty = y0[pair_particle] + pair_offset // span_x[pair_particle]
+
+        self._scatter_into_bins(alive[pair_particle], ty * self.tiles_x + tx)
+
+    def _bin_sectors(self, alive: np.ndarray) -> None:
+        """Asigna cada rayo a los sectores angulares que abarca alrededor del centro."""
+        pos = self.positions[alive] - 0.5
+        angles = np.arctan2(pos[:, 1], pos[:, 0])
+        sector_width = 2.0 * np.pi / self.num_sectors
+
+        s0 = np.floor((angles + np.pi - RAY_ANGULAR_HALF_WIDTH) / sector_width).astype(np.int64)
+        s1 = np.floor((angles + np.pi + RAY_ANGULAR_HALF_WIDTH) / sector_width).astype(np.int64)
+        counts = s1 - s0 + 1
+
+        pair_particle = np.repeat(np.arange(alive.size), counts)
+        pair_offset = np.arange(pair_particle.size) - np.repeat(np.cumsum(counts) - counts, counts)
+        sectors = (s0[pair_particle] + pair_offset) % self.num_sectors
+
+        self._scatter_into_bins(alive[pair_particle], self.num_tiles + sectors)
+
+    def build_bins(self, current_time: float, radius: Optional[float] = None,
+                   expansion: Optional[float] = None, lifetime: Optional[float] = None) -> bool:
+        """
+        Reconstruye la textura de bins para el instante actual.
+
+        Args:
+            current_time: Tiempo actual (segundos)
+            radius: Alcance de una partícula recién nacida en UV
+                (por defecto config.PARTICLE_INFLUENCE_RADIUS)
+            expansion: Crecimiento del alcance por segundo
+                (por defecto config.PARTICLE_EXPANSION_SPEED)
+            lifetime: Edad a partir de la cual el patrón ya no la dibuja
+                (por defecto config.PARTICLE_LIFETIME)
+
+        Returns:
+            True si el contenido cambió y hay que subirlo a la GPU
+        """
+        if radius is None:
+            radius = config.PARTICLE_INFLUENCE_RADIUS
+        if expansion is None:
+            expansion = config.PARTICLE_EXPANSION_SPEED
+
+        # Selección global: todos los tiles y sectores ven el mismo conjunto
+        alive = self.alive_indices(current_time, lifetime)[:self.bin_capacity]
+        if alive.size == 0 and self._bins_empty:
+            return False
+
+        self.bins[:, :, 3] = EMPTY_SLOT_SEED
+        self._bins_empty = alive.size == 0
+        if alive.size > 0:
+            ages = (current_time - self.spawn_times[alive]).astype(np.float32)
+            self._bin_tiles(alive, ages, radius, expansion)
+            self._bin_sectors(alive)
+        return True
+
+    def active_count(self, current_time: float) -> int:
+        """Número de partículas vivas en el instante dado."""
+        ages = current_time - self.spawn_times
+        return int(np.count_nonzero((ages >= 0.0) & (ages < config.PARTICLE_LIFETIME)))
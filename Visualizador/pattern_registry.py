@@ -0,0 +1,196 @@
+# ============================================================================
+# PATTERN_REGISTRY.PY - REGISTRO DE PATRONES VISUALES (PLUGINS GLSL)
+# ============================================================================
+# Cada patrón vive en su propio fichero shaders/patterns/NN_<id>.glsl:
+# - NN fija el índice del patrón (orden de los ficheros)
+# - El fichero define float pattern_<id>(vec2 uv, float time, float amp)
+# - Una cabecera de comentarios declara sus metadatos:
+#       // @name: Gotas de Lluvia
+#       // @cost: light          (light / medium / heavy)
+#       // @particles: true      (lee los bins de partículas)
+#       // @particle_radius: 0.0       (alcance en UV de una partícula recién nacida)
+#       // @particle_expansion: 0.9    (crecimiento del alcance por segundo)
+#       // @particle_lifetime: 1.5     (edad a partir de la cual ya no se dibuja)
+#   Las tres @particle_* describen dónde deja de verse la contribución de una
+#   partícula (menos de 1/255); por defecto PARTICLE_INFLUENCE_RADIUS,
+#   PARTICLE_EXPANSION_SPEED y PARTICLE_LIFETIME.
+#
+# Al arrancar solo se leen las cabeceras. El código completo se lee y se
+# inserta en fragment.glsl únicamente para los patrones programados (el
+# elegido en modo admin, o ENABLED_PATTERNS en order/random), de modo que
+# añadir patrones no alarga la compilación ni la cadena if/else por píxel.
+# ============================================================================
+
+import os
+import re
+import config
+from typing import Dict, List, Optional
+
+# Clases de coste admitidas en la cabecera @cost
+PATTERN_COST_CLASSES = ("light", "medium", "heavy")
+
+# Marcadores de fragment.glsl que sustituye el registro
+PATTERNS_MARKER: str = "// @PATTERNS"
+DISPATCH_MARKER: str = "// @PATTERN_DISPATCH"
+
+_FILENAME_RE = re.compile(r"^(\d+)_(\w+)\.glsl$")
+_HEADER_RE = re.compile(r"^//\s*@(\w+)\s*:\s*(.*?)\s*$")
+
+
+class PatternInfo:
+    """Metadatos de un patrón leídos de la cabecera de su fichero."""
+
+    def __init__(self, index: int, pattern_id: str, path: str, name: str, cost: str,
+                 uses_particles: bool, particle_radius: float = 0.0,
+                 particle_expansion: float = 0.0, particle_lifetime: float = 0.0):
+        self.index = index
+        self.pattern_id = pattern_id
+        self.path = path
+        self.name = name
+        self.cost = cost
+        self.uses_particles = uses_particles
+        self.particle_radius = particle_radius
+        self.particle_expansion = particle_expansion
+        self.particle_lifetime = particle_lifetime
+
+    @property
+    def function_name(self) -> str:
+        """Nombre de la función GLSL del patrón."""
+        return f"pattern_{self.pattern_id}"
+
+
+class PatternRegistry:
+    """
+    Descubre los patrones de config.PATTERNS_DIR y ensambla el fragment shader.
+
+    Características:
+    - TOTAL_PATTERNS se deriva del número de ficheros (no hay constante manual)
+    - Solo lee las cabeceras al arrancar
+    - Ensambla el shader con los patrones programados y su cadena de despacho
+    """
+
+    def __init__(self, patterns_dir: Optional[str] = None):
+        """
+        Args:
+            patterns_dir: Carpeta de patrones (por defecto config.PATTERNS_DIR)
+
+        Raises:
+            ValueError: Si algún fichero tiene un nombre o una cabecera inválidos
+        """
+        self.patterns_dir = patterns_dir or config.PATTERNS_DIR
+        self.patterns: List[PatternInfo] = self._discover()
+        self._by_id: Dict[str, PatternInfo] = {p.pattern_id: p for p in self.patterns}
+
+        if not self.patterns:
+            raise ValueError(f"No hay patrones en {self.patterns_dir}")
+
+        heavy = sum(1 for p in self.patterns if p.cost == "heavy")
+        print(f"   🧩 {len(self.patterns)} patrones registrados ({heavy} pesados)")
+
+    def _discover(self) -> List[PatternInfo]:
+        """Lee las cabeceras de todos los ficheros de patrones, en orden."""
+        filenames = sorted(f for f in os.listdir(self.patterns_dir) if f.endswith(".glsl"))
+        patterns = []
+        for index, filename in enumerate(filenames):
+            match = _FILENAME_RE.match(filename)
+            if not match:
+                raise ValueError(f"Nombre de patrón inválido: {filename} (se espera NN_<id>.glsl)")
+            path = os.path.join(self.patterns_dir, filename)
+            header = self._read_header(path)
+
+            cost = header.get("cost", "light")
+            if cost not in PATTERN_COST_CLASSES:
+                raise ValueError(f"{filename}: @cost debe ser uno de {PATTERN_COST_CLASSES}")
+
+            try:
+                reach = [float(header.get(key, default)) for key, default in (
+                    ("particle_radius", config.PARTICLE_INFLUENCE_RADIUS),
+                    ("particle_expansion", config.PARTICLE_EXPANSION_SPEED),
+                    ("particle_lifetime", config.PARTICLE_LIFETIME),
+                )]
+            except ValueError:
+                raise ValueError(f"{filename}: @particle_radius/@particle_expansion/@particle_lifetime "
+                                 f"deben ser números")
+
+            patterns.append(PatternInfo(
+                index=index,
+                pattern_id=match.group(2),
+                path=path,
+                name=header.get("name", match.group(2)),
+                cost=cost,
+                uses_particles=header.get("particles", "false").lower() == "true",
+                particle_radius=reach[0],
+                particle_expansion=reach[1],
+                particle_lifetime=reach[2],
+            ))
+        return patterns
+
+    def _read_header(self, path: str) -> Dict[str, str]:
+        """Lee las líneas '// @clave: valor' del principio del fichero."""
+        header = {}
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                match = _HEADER_RE.match(line)
+                if not match:
+                    break
+                header[match.group(1)] = match.group(2)
+        return header
+
+    def __len__(self) -> int:
+        return len(self.patterns)
+
+    def get(self, index: int) -> PatternInfo:
+        """Metadatos del patrón con índice 'index'."""
+        return self.patterns[index]
+
+    def scheduled_indices(self, mode: str, admin_pattern: int = 0) -> List[int]:
+        """
+        Patrones que pueden mostrarse en esta sesión.
+
+        Args:
+            mode: Modo elegido en la GUI ('admin', 'order' o 'random')
+            admin_pattern: Patrón elegido en modo admin
+
+        Returns:
+            Lista ordenada de índices de patrón
+
+        Raises:
+            ValueError: Si ENABLED_PATTERNS contiene un id desconocido
+        """
+        if mode == 'admin':
+            return [admin_pattern]
+        if config.ENABLED_PATTERNS is None:
+            return [p.index for p in self.patterns]
+
+        unknown = [pid for pid in config.ENABLED_PATTERNS if pid not in self._by_id]
+        if unknown:
+            raise ValueError(f"ENABLED_PATTERNS contiene patrones desconocidos: {unknown}")
+        return sorted(self._by_id[pid].index for pid in config.ENABLED_PATTERNS)
+
+    def paths(self, indices: List[int]) -> List[str]:
+        """Ficheros de los patrones indicados."""
+        return [self.patterns[i].path for i in indices]
+
+    def assemble(self, template: str, indices: List[int]) -> str:
+        """
+        Inserta el código de los patrones y su despacho en fragment.glsl.
+
+        Args:
+            template: Código de fragment.glsl con los marcadores @PATTERNS y @PATTERN_DISPATCH
+            indices: Patrones a incluir
+
+        Returns:
+            Código fuente completo del fragment shader
+        """
+        sources = []
+        dispatch = []
+        for position, index in enumerate(indices):
+            pattern = self.patterns[index]
+            with open(pattern.path, 'r', encoding='utf-8') as f:
+                sources.append(f"// --- {os.path.basename(pattern.path)} ---\n{f.read()}")
+            keyword = "if" if position == 0 else "else if"
+            dispatch.append(f"    {keyword} (u_pattern_index == {index}) "
+                            f"intensity = {pattern.function_name}(uv, u_time, u_amplitude);")
+
+        source = template.replace(PATTERNS_MARKER, "\n".join(sources), 1)
+        return source.replace(DISPATCH_MARKER, "\n".join(dispatch).lstrip(), 1)
@@ -0,0 +1,303 @@
+# ============================================================================
+# POSTPROCESS.PY - ETAPA DE POST-PROCESADO SOBRE EL FBO DE LA ESCENA
+# ============================================================================
+# Los patrones se dibujan en un FBO de coma flotante (a la escala del nivel de
+# calidad). Esta etapa lo compone en pantalla:
+# 0. (Modo tablero) reconstrucción de la mitad no sombreada con el frame anterior
+# 1. Bright-pass + reducción a 1/2 de resolución
+# 2. Cadena de niveles (1/2, 1/4, 1/8) con desenfoque gaussiano separable
+#    (horizontal + vertical) en cada nivel
+# 3. Composición: escena + bloom, viñeta, contraste y saturación
+#
+# El desenfoque nunca se hace a resolución completa: el coste del bloom es
+# una fracción del de un blur a pantalla completa y el resplandor se extiende
+# de verdad (el antiguo bloom por píxel no podía salir del propio píxel).
+# ============================================================================
+
+from OpenGL.GL import *
+from OpenGL.GL import shaders
+import config
+from typing import List, Tuple
+
+
+class RenderTarget:
+    """FBO con una textura de color RGBA16F."""
+
+    def __init__(self, width: int, height: int):
+        self.width = width
+        self.height = height
+
+        self.texture = glGenTextures(1)
+        glBindTexture(GL_TEXTURE_2D, self.texture)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_LINEAR)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_LINEAR)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_S, GL_CLAMP_TO_EDGE)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_T, GL_CLAMP_TO_EDGE)
+        glTexImage2D(GL_TEXTURE_2D, 0, GL_RGBA16F, width, height, 0, GL_RGBA, GL_FLOAT, None)
+
+        self.fbo = glGenFramebuffers(1)
+        glBindFramebuffer(GL_FRAMEBUFFER, self.fbo)
+        glFramebufferTexture2D(GL_FRAMEBUFFER, GL_COLOR_ATTACHMENT0, GL_TEXTURE_2D, self.texture, 0)
+        status = glCheckFramebufferStatus(GL_FRAMEBUFFER)
+        glBindFramebuffer(GL_FRAMEBUFFER, 0)
+        if status != GL_FRAMEBUFFER_COMPLETE:
+            raise RuntimeError(f"FBO incompleto ({width}x{height}): estado {status}")
+
+    def bind(self) -> None:
+        """Enlaza el FBO como destino y ajusta el viewport a su tamaño."""
+        glBindFramebuffer(GL_FRAMEBUFFER, self.fbo)
+        glViewport(0, 0, self.width, self.height)
+
+    def delete(self) -> None:
+        """Libera el FBO y su textura."""
+        glDeleteFramebuffers(1, [self.fbo])
+        glDeleteTextures([self.texture])
+
+
+def _load_source(filepath: str) -> str:
+    """Lee el código fuente de un shader."""
+    with open(filepath, 'r', encoding='utf-8') as f:
+        return f.read()
+
+
+def _build_program(vertex_path: str, fragment_path: str) -> int:
+    """Compila y linkea un programa a partir de dos ficheros GLSL."""
+    vertex_shader = shaders.compileShader(_load_source(vertex_path), GL_VERTEX_SHADER)
+    fragment_shader = shaders.compileShader(_load_source(fragment_path), GL_FRAGMENT_SHADER)
+    return shaders.compileProgram(vertex_shader, fragment_shader)
+
+
+class PostProcessor:
+    """
+    Cadena de post-procesado: bloom a media/cuarta resolución y composición final.
+
+    Características:
+    - Escena en FBO RGBA16F (conserva valores > 1.0 para el bloom)
+    - Bloom separable en cadena de niveles reducidos
+    - Número de niveles según config.QUALITY_TIERS (0 = bloom desactivado)
+    - Viñeta, contraste y saturación en una sola pasada de composición
+    - Modo tablero de ajedrez opcional (mitad de píxeles + historial)
+    - Escala de escena dinámica sin reasignar FBOs (modo ahorro de energía)
+    """
+
+    # Unidades de textura de las pasadas (no pisan las de los patrones)
+    SOURCE_TEXTURE_UNIT: int = 8
+    BLOOM_TEXTURE_UNIT_BASE: int = 9
+
+    def __init__(self, quad_vbo: int, output_size: Tuple[int, int], scene_size: Tuple[int, int],
+                 bloom_levels: int):
+        """
+        Crea los FBOs y compila los shaders de post-procesado.
+
+        Args:
+            quad_vbo: VBO del quad de pantalla completa (compartido con el renderer)
+            output_size: Resolución de la pantalla (ancho, alto)
+            scene_size: Resolución interna de la escena (ancho, alto)
+            bloom_levels: Niveles de la cadena de bloom (0-3)
+        """
+        self.quad_vbo = quad_vbo
+        self.output_width, self.output_height = output_size
+        self.bloom_levels = bloom_levels
+
+        # Dos FBOs de escena alternos: el del frame anterior sirve de historial
+        self.scene_targets: List[RenderTarget] = [RenderTarget(*scene_size), RenderTarget(*scene_size)]
+        self.scene_index: int = 0
+        
+        # Parte del FBO de escena usada este frame (modo ahorro: < 1.0)
+        self.scene_scale: float = 1.0
+        self.scene_viewport: Tuple[int, int] = scene_size
+        
+        # Destino a media anchura para el modo tablero (solo si está habilitado)
+        self.checker_target = None
+        if config.CHECKERBOARD_ENABLED:
+            self.checker_target = RenderTarget((scene_size[0] + 1) // 2, scene_size[1])
+
+        # Cada nivel tiene dos texturas: [resultado, intermedia del blur horizontal]
+        self.bloom_chain: List[Tuple[RenderTarget, RenderTarget]] = []
+        width, height = scene_size
+        for _ in range(bloom_levels):
+            width, height = max(1, width // 2), max(1, height // 2)
+            self.bloom_chain.append((RenderTarget(width, height), RenderTarget(width, height)))
+        glBindTexture(GL_TEXTURE_2D, 0)
+
+        self.downsample_program = _build_program('shaders/vertex.glsl', 'shaders/bloom_downsample.glsl')
+        self.blur_program = _build_program('shaders/vertex.glsl', 'shaders/bloom_blur.glsl')
+        self.composite_program = _build_program('shaders/vertex.glsl', 'shaders/post_composite.glsl')
+        self.resolve_program = _build_program('shaders/vertex.glsl', 'shaders/checkerboard_resolve.glsl')
+
+        sizes = ", ".join(f"{level.width}x{level.height}" for level, _ in self.bloom_chain) or "desactivado"
+        print(f"   🌟 Post-procesado: escena {scene_size[0]}x{scene_size[1]}, bloom [{sizes}]")
+
+    @property
+    def scene(self) -> RenderTarget:
+        """FBO de la escena del frame actual."""
+        return self.scene_targets[self.scene_index]
+
+    @property
+    def history(self) -> RenderTarget:
+        """FBO de la escena del frame anterior."""
+        return self.scene_targets[1 - self.scene_index]
+
+    def begin_scene(self, checkerboard: bool, scale: float = 1.0) -> None:
+        """
+        Alterna los FBOs de escena y enlaza el destino de los patrones.
+
+        Args:
+            checkerboard: True para dibujar solo la mitad de los píxeles
+            scale: Fracción de la escena a dibujar (< 1.0 en modo ahorro: se usa
+                   una esquina del FBO, sin reasignar texturas)
+        """
+        self.scene_index = 1 - self.scene_index
+        self.scene_scale = scale
+        if scale < 1.0:
+            self.scene.bind()
+            self.scene_viewport = (max(1, int(self.scene.width * scale)),
+                                   max(1, int(self.scene.height * scale)))
+            glViewport(0, 0, *self.scene_viewport)
+        elif checkerboard and self.checker_target is not None:
+            self.checker_target.bind()
+            self.scene_viewport = (self.scene.width, self.scene.height)
+        else:
+            self.scene.bind()
+            self.scene_viewport = (self.scene.width, self.scene.height)
+
+    def _resolve_checkerboard(self, parity: int) -> None:
+        """Reconstruye la escena completa a partir de la mitad sombreada y el historial."""
+        self.scene.bind()
+        program = self.resolve_program
+        glUseProgram(program)
+
+        glActiveTexture(GL_TEXTURE0 + self.SOURCE_TEXTURE_UNIT)
+        glBindTexture(GL_TEXTURE_2D, self.checker_target.texture)
+        glUniform1i(glGetUniformLocation(program, "u_current"), self.SOURCE_TEXTURE_UNIT)
+        glActiveTexture(GL_TEXTURE0 + self.BLOOM_TEXTURE_UNIT_BASE)
+        glBindTexture(GL_TEXTURE_2D, self.history.texture)
+        glUniform1i(glGetUniformLocation(program, "u_history"), self.BLOOM_TEXTURE_UNIT_BASE)
+        glActiveTexture(GL_TEXTURE0)
+
+        glUniform2f(glGetUniformLocation(program, "u_size"), float(self.scene.width), float(self.scene.height))
+        glUniform2f(glGetUniformLocation(program, "u_current_size"),
+                    float(self.checker_target.width), float(self.checker_target.height))
+        glUniform1f(glGetUniformLocation(program, "u_parity"), float(parity))
+        self._draw_quad(program)
+
+    def _draw_quad(self, program: int) -> None:
+        """Dibuja el quad de pantalla completa con el programa indicado."""
+        glBindBuffer(GL_ARRAY_BUFFER, self.quad_vbo)
+        position_loc = glGetAttribLocation(program, "position")
+        glVertexAttribPointer(position_loc, 2, GL_FLOAT, GL_FALSE, 0, None)
+        glEnableVertexAttribArray(position_loc)
+        glDrawArrays(GL_QUADS, 0, 4)
+
+    def _bind_source(self, program: int, target: RenderTarget) -> None:
+        """Enlaza la textura de 'target' como u_source del programa."""
+        glActiveTexture(GL_TEXTURE0 + self.SOURCE_TEXTURE_UNIT)
+        glBindTexture(GL_TEXTURE_2D, target.texture)
+        glUniform1i(glGetUniformLocation(program, "u_source"), self.SOURCE_TEXTURE_UNIT)
+
+    def _downsample(self, source: RenderTarget, destination: RenderTarget, apply_threshold: bool) -> None:
+        """Reduce 'source' a 'destination' (opcionalmente con bright-pass)."""
+        destination.bind()
+        glUseProgram(self.downsample_program)
+        self._bind_source(self.downsample_program, source)
+        glUniform2f(glGetUniformLocation(self.downsample_program, "u_source_size"),
+                    float(source.width), float(source.height))
+        glUniform2f(glGetUniformLocation(self.downsample_program, "u_target_size"),
+                    float(destination.width), float(destination.height))
+        glUniform1f(glGetUniformLocation(self.downsample_program, "u_threshold"), config.BLOOM_THRESHOLD)
+        glUniform1i(glGetUniformLocation(self.downsample_program, "u_apply_threshold"), int(apply_threshold))
+        self._draw_quad(self.downsample_program)
+
+    def _blur(self, source: RenderTarget, destination: RenderTarget, horizontal: bool) -> None:
+        """Una pasada del blur gaussiano separable."""
+        destination.bind()
+        glUseProgram(self.blur_program)
+        self._bind_source(self.blur_program, source)
+        glUniform2f(glGetUniformLocation(self.blur_program, "u_target_size"),
+                    float(destination.width), float(destination.height))
+        if horizontal:
+            direction = (1.0 / source.width, 0.0)
+        else:
+            direction = (0.0, 1.0 / source.height)
+        glUniform2f(glGetUniformLocation(self.blur_program, "u_direction"), *direction)
+        self._draw_quad(self.blur_program)
+
+    def _build_bloom(self) -> int:
+        """
+        Ejecuta la cadena de bloom.
+
+        Returns:
+            Número de niveles generados (0 si el bloom está desactivado)
+        """
+        if self.bloom_levels == 0 or config.BLOOM_INTENSITY <= 0.0 or self.scene_scale < 1.0:
+            return 0
+
+        source = self.scene
+        for index, (level, scratch) in enumerate(self.bloom_chain):
+            self._downsample(source, level, apply_threshold=(index == 0))
+            self._blur(level, scratch, horizontal=True)
+            self._blur(scratch, level, horizontal=False)
+            source = level
+        return len(self.bloom_chain)
+
+    def apply(self, checkerboard: bool = False, parity: int = 0) -> None:
+        """
+        Compone la escena (ya dibujada tras begin_scene) en el framebuffer por defecto.
+        Deja enlazado el framebuffer por defecto y ningún programa activo.
+
+        Args:
+            checkerboard: True si la escena se dibujó en modo tablero
+            parity: Paridad del tablero usada este frame (0 o 1)
+        """
+        if checkerboard and self.checker_target is not None and self.scene_scale >= 1.0:
+            self._resolve_checkerboard(parity)
+
+        active_levels = self._build_bloom()
+
+        glBindFramebuffer(GL_FRAMEBUFFER, 0)
+        glViewport(0, 0, self.output_width, self.output_height)
+        glUseProgram(self.composite_program)
+        program = self.composite_program
+
+        glActiveTexture(GL_TEXTURE0 + self.SOURCE_TEXTURE_UNIT)
+        glBindTexture(GL_TEXTURE_2D, self.scene.texture)
+        glUniform1i(glGetUniformLocation(program, "u_scene"), self.SOURCE_TEXTURE_UNIT)
+
+        for index in range(3):
+            unit = self.BLOOM_TEXTURE_UNIT_BASE + index
+            glActiveTexture(GL_TEXTURE0 + unit)
+            if index < active_levels:
+                glBindTexture(GL_TEXTURE_2D, self.bloom_chain[index][0].texture)
+            glUniform1i(glGetUniformLocation(program, f"u_bloom{index}"), unit)
+        glActiveTexture(GL_TEXTURE0)
+
+        glUniform1i(glGetUniformLocation(program, "u_bloom_levels"), active_levels)
+        glUniform2f(glGetUniformLocation(program, "u_scene_scale"),
+                    self.scene_viewport[0] / self.scene.width,
+                    self.scene_viewport[1] / self.scene.height)
+        glUniform2f(glGetUniformLocation(program, "u_output_size"),
+                    float(self.output_width), float(self.output_height))
+        columns, rows = config.VIDEOWALL_GRID
+        column, row = config.VIDEOWALL_TILE
+        glUniform2f(glGetUniformLocation(program, "u_wall_grid"), float(columns), float(rows))
+        glUniform2f(glGetUniformLocation(program, "u_wall_tile"), float(column), float(rows - 1 - row))
+        glUniform1f(glGetUniformLocation(program, "u_bloom_intensity"), config.BLOOM_INTENSITY)
+        glUniform1f(glGetUniformLocation(program, "u_vignette_intensity"), config.VIGNETTE_INTENSITY)
+        glUniform1f(glGetUniformLocation(program, "u_contrast"), config.CONTRAST)
+        glUniform1f(glGetUniformLocation(program, "u_saturation"), config.SATURATION)
+
+        self._draw_quad(program)
+        glUseProgram(0)
+
+    def close(self) -> None:
+        """Libera FBOs, texturas y programas."""
+        for target in self.scene_targets:
+            target.delete()
+        if self.checker_target is not None:
+            self.checker_target.delete()
+        for level, scratch in self.bloom_chain:
+            level.delete()
+            scratch.delete()
+        for program in (self.downsample_program, self.blur_program, self.composite_program,
+                        self.resolve_program):
+            glDeleteProgram(program)
@@ -0,0 +1,111 @@
+# ============================================================================
+# POWER_SAVE.PY - MÁQUINA DE ESTADOS DEL MODO DE AHORRO DE ENERGÍA
+# ============================================================================
+# Decide, frame a frame, si el visualizador trabaja a pleno rendimiento o en
+# modo de ahorro:
+# - ACTIVO:  análisis FFT completo, TARGET_FPS y resolución del nivel de calidad
+# - AHORRO:  solo puerta de RMS, POWER_SAVE_FPS y POWER_SAVE_RENDER_SCALE
+#
+# Se entra en AHORRO tras POWER_SAVE_SILENCE_SECONDS de silencio (según
+# smoothed_amplitude) o al perder el foco de la ventana. Se vuelve a ACTIVO en
+# cuanto la amplitud instantánea supera POWER_SAVE_WAKE_THRESHOLD, y la
+# resolución sube en una rampa de POWER_SAVE_RAMP_SECONDS (menos de un beat).
+# ============================================================================
+
+import config
+from realtime_log import LOG, INFO
+from typing import Dict, Any, Optional
+
+
+# update() corre una vez por frame (realtime_log.py: sin print() en el bucle)
+_LOG_SAVING = LOG.message(INFO, "💤 Modo ahorro de energía ({text})")
+_LOG_ACTIVE = LOG.message(INFO, "⚡ Modo activo: recuperando calidad completa")
+
+
+class PowerSaver:
+    """
+    Máquina de estados ACTIVO <-> AHORRO.
+
+    Características:
+    - Detección de silencio con histéresis (umbral de silencio < umbral de despertar)
+    - Ahorro opcional al perder el foco (config.POWER_SAVE_ON_FOCUS_LOSS)
+    - Nivel continuo 0.0 (ahorro) - 1.0 (activo) para rampas de resolución
+    - Contabiliza el tiempo total pasado en ahorro
+    """
+
+    ACTIVE: str = "active"
+    SAVING: str = "saving"
+
+    def __init__(self):
+        self.mode: str = self.ACTIVE
+        self.level: float = 1.0
+        self.has_focus: bool = True
+
+        self.silence_since: Optional[float] = None
+        self.last_time: Optional[float] = None
+        self.saving_seconds: float = 0.0
+
+    def set_focus(self, has_focus: bool) -> None:
+        """Registra si la ventana tiene el foco."""
+        self.has_focus = has_focus
+
+    def update(self, state: Dict[str, Any]) -> None:
+        """
+        Actualiza el estado a partir de la amplitud de audio y el foco.
+
+        Args:
+            state: Estado global con 'current_time', 'current_amplitude' y 'smoothed_amplitude'
+        """
+        now = state['current_time']
+        dt = 0.0 if self.last_time is None else max(0.0, now - self.last_time)
+        self.last_time = now
+
+        if not config.POWER_SAVE_ENABLED:
+            self.mode = self.ACTIVE
+            self.level = 1.0
+            return
+
+        # Seguimiento del silencio (con histéresis entre los dos umbrales)
+        if state['current_amplitude'] > config.POWER_SAVE_WAKE_THRESHOLD:
+            self.silence_since = None
+        elif state['smoothed_amplitude'] < config.POWER_SAVE_SILENCE_THRESHOLD:
+            if self.silence_since is None:
+                self.silence_since = now
+
+        silent = (self.silence_since is not None and
+                  now - self.silence_since >= config.POWER_SAVE_SILENCE_SECONDS)
+        unfocused = config.POWER_SAVE_ON_FOCUS_LOSS and not self.has_focus
+
+        new_mode = self.SAVING if (silent or unfocused) else self.ACTIVE
+        if new_mode != self.mode:
+            self.mode = new_mode
+            if new_mode == self.SAVING:
+                reason = "silencio" if silent else "ventana sin foco"
+                LOG.log(_LOG_SAVING, text=reason)
+            else:
+                LOG.log(_LOG_ACTIVE)
+
+        if self.mode == self.SAVING:
+            self.saving_seconds += dt
+
+        # Rampa del nivel hacia 0 (ahorro) o 1 (activo)
+        step = dt / config.POWER_SAVE_RAMP_SECONDS
+        if self.mode == self.SAVING:
+            self.level = max(0.0, self.level - step)
+        else:
+            self.level = min(1.0, self.level + step)
+
+    @property
+    def analysis_paused(self) -> bool:
+        """True si el análisis completo debe sustituirse por la puerta de RMS."""
+        return self.mode == self.SAVING
+
+    @property
+    def render_scale(self) -> float:
+        """Fracción de la resolución interna a usar este frame."""
+        return config.POWER_SAVE_RENDER_SCALE + (1.0 - config.POWER_SAVE_RENDER_SCALE) * self.level
+
+    @property
+    def target_fps(self) -> int:
+        """FPS objetivo: reducido solo cuando la rampa ha llegado al ahorro completo."""
+        return config.POWER_SAVE_FPS if self.level <= 0.0 else config.TARGET_FPS
@@ -0,0 +1,242 @@
+# ============================================================================
+# REALTIME_LOG.PY - LOGGING SEGURO PARA EL HILO DE AUDIO Y EL BUCLE DE RENDER
+# ============================================================================
+# Un print() desde el callback de audio o desde el bucle de render puede
+# bloquearse en la consola (terminal lenta, tubería llena): una ráfaga de
+# avisos acaba en cortes de audio o tirones de frame. Aquí los caminos
+# calientes solo copian un registro de tamaño fijo en un anillo preasignado:
+#
+# - Cada mensaje se registra una vez al importar el módulo que lo usa
+#   (nivel + formato); en el camino caliente solo viajan su id, hasta cuatro
+#   números y, opcionalmente, un texto corto (p. ej. el de una excepción).
+# - Varios hilos escriben sin locks: cada registro toma un número de secuencia
+#   (itertools.count es atómico en CPython) y publica su ranura poniendo
+#   seq al final, como el seqlock de feature_bus.py.
+# - Un hilo de fondo vacía el anillo cada LOG_DRAIN_INTERVAL, formatea y
+#   escribe, con un límite de LOG_RATE_LIMIT mensajes por segundo de cada tipo
+#   (el resto se resume en una línea). Si el anillo se llena se pierden los
+#   registros más antiguos, nunca se espera.
+# ============================================================================
+
+import atexit
+import itertools
+import sys
+import threading
+import time
+import numpy as np
+import config
+from metrics import REGISTRY
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+DEBUG: int = 10
+INFO: int = 20
+WARNING: int = 30
+ERROR: int = 40
+CRITICAL: int = 50
+
+LEVELS: Dict[str, int] = {'DEBUG': DEBUG, 'INFO': INFO, 'WARNING': WARNING, 'ERROR': ERROR, 'CRITICAL': CRITICAL}
+
+TEXT_BYTES: int = 96
+
+RECORD_DTYPE = np.dtype([
+    ('seq', '<u8'),              # Secuencia + 1 (0 = ranura nunca escrita)
+    ('time', '<f8'),             # time.perf_counter() al registrar
+    ('message', '<u2'),          # Id del mensaje registrado
+    ('reserved', 'u1', (6,)),
+    ('args', '<f8', (4,)),
+    ('text', f'S{TEXT_BYTES}'),
+])
+
+
+class LogMessage:
+    """Tipo de mensaje registrado: nivel y formato (o función que lo formatea)."""
+
+    def __init__(self, message_id: int, level: int, template: str,
+                 formatter: Optional[Callable[[Tuple[float, ...], str], str]]):
+        self.id = message_id
+        self.level = level
+        self.template = template
+        self.formatter = formatter
+
+    def format(self, args: Tuple[float, ...], text: str) -> str:
+        if self.formatter is not None:
+            return self.formatter(args, text)
+        return self.template.format(*args, text=text)
+
+
+class RealtimeLog:
+    """
+    Anillo de registros de log con vaciado en segundo plano.
+
+    Características:
+    - log() no reserva buffers, no toma locks y nunca espera a la consola
+    - Filtro por nivel en el propio log() (config.LOG_LEVEL; DEBUG con DEBUG_MODE)
+    - Límite de mensajes por segundo y tipo, con resumen de los suprimidos
+    - Contabiliza registros perdidos (anillo lleno) y suprimidos en las métricas
+    """
+
+    def __init__(self, capacity: Optional[int] = None):
+        """
+        Args:
+            capacity: Registros del anillo (por defecto config.LOG_RING_SIZE)
+        """
+        self.capacity = capacity or config.LOG_RING_SIZE
+        self.ring = np.zeros(self.capacity, dtype=RECORD_DTYPE)
+        self.messages: List[LogMessage] = []
+        self._sequence = itertools.count()
+        self.head = -1            # Último número de secuencia tomado (aprox. con varios escritores)
+        self.next_read = 0
+
+        self.thread: Optional[threading.Thread] = None
+        self.stop_event = threading.Event()
+        self.drain_lock = threading.Lock()   # Solo entre el hilo de fondo y stop()
+
+        # Límite por tipo de mensaje: {id: (segundo, emitidos, suprimidos)}
+        self.rate_window: Dict[int, List[int]] = {}
+
+        self.dropped_counter = REGISTRY.counter('log_records_dropped_total', "Registros de log perdidos (anillo lleno)")
+        self.suppressed_counter = REGISTRY.counter('log_records_suppressed_total',
+                                                   "Registros de log suprimidos por el límite de frecuencia")
+
+    # --- Registro de mensajes (al importar) ---
+
+    def message(self, level: int, template: str,
+                formatter: Optional[Callable[[Tuple[float, ...], str], str]] = None) -> LogMessage:
+        """
+        Registra un tipo de mensaje.
+
+        Args:
+            level: DEBUG, INFO, WARNING, ERROR o CRITICAL
+            template: Formato con {0}..{3} (números) y {text}
+            formatter: Alternativa a template: f(args, text) -> str
+
+        Returns:
+            El mensaje, para pasarlo a log()
+        """
+        message = LogMessage(len(self.messages), level, template, formatter)
+        self.messages.append(message)
+        return message
+
+    # --- Camino caliente ---
+
+    def enabled(self, level: int) -> bool:
+        """True si un mensaje de ese nivel se registraría."""
+        return config.DEBUG_MODE or level >= LEVELS.get(config.LOG_LEVEL, INFO)
+
+    def log(self, message: LogMessage, a: float = 0.0, b: float = 0.0, c: float = 0.0, d: float = 0.0,
+            text: str = '') -> None:
+        """
+        Registra un mensaje (seguro en el callback de audio y en el bucle de render).
+
+        Args:
+            message: Mensaje registrado con message()
+            a, b, c, d: Argumentos numéricos del formato
+            text: Texto corto opcional (se trunca a TEXT_BYTES bytes)
+        """
+        if not (config.DEBUG_MODE or message.level >= LEVELS.get(config.LOG_LEVEL, INFO)):
+            return
+        seq = next(self._sequence)
+        slot = self.ring[seq % self.capacity]
+        slot['seq'] = 0            # Escribiendo: el lector no la toma a medias
+        slot['time'] = time.perf_counter()
+        slot['message'] = message.id
+        slot['args'] = (a, b, c, d)
+        slot['text'] = text.encode('utf-8', errors='replace')[:TEXT_BYTES]
+        slot['seq'] = seq + 1      # Publicada
+        if seq > self.head:
+            self.head = seq
+
+    # --- Hilo de fondo ---
+
+    def start(self) -> None:
+        """Arranca el hilo que vacía el anillo (idempotente)."""
+        if self.thread is not None:
+            return
+        self.thread = threading.Thread(target=self._run, name="realtime-log", daemon=True)
+        self.thread.start()
+        atexit.register(self.stop)
+
+    def _run(self) -> None:
+        while not self.stop_event.wait(config.LOG_DRAIN_INTERVAL):
+            self.drain()
+
+    def drain(self) -> None:
+        """Formatea y escribe los registros publicados desde el último vaciado."""
+        with self.drain_lock:
+            head = self.head
+            if head - self.next_read >= self.capacity:
+                # Los escritores dieron la vuelta al anillo: se pierden los más antiguos
+                lost = head - self.capacity + 1 - self.next_read
+                self.dropped_counter.inc(lost)
+                self.next_read += lost
+
+            while self.next_read <= head:
+                position = self.next_read % self.capacity
+                expected = self.next_read + 1
+                seq = int(self.ring['seq'][position])
+                if seq < expected:
+                    break          # Aún escribiéndose: se recoge en el próximo vaciado
+                if seq > expected:
+                    self.dropped_counter.inc()   # Reescrita por un registro posterior
+                else:
+                    record = self.ring[position:position + 1].copy()[0]
+                    if int(self.ring['seq'][position]) == expected:
+                        self._emit(record)
+                    else:
+                        self.dropped_counter.inc()
+                self.next_read += 1
+
+            self._flush_suppressed(int(time.perf_counter()))
+
+    def _emit(self, record: np.void) -> None:
+        message_id = int(record['message'])
+        if message_id >= len(self.messages):
+            return
+        message = self.messages[message_id]
+
+        second = int(record['time'])
+        window = self.rate_window.setdefault(message_id, [second, 0, 0])
+        if window[0] != second:
+            self._report_suppressed(message, window)
+            window[:] = [second, 0, 0]
+        if window[1] >= config.LOG_RATE_LIMIT:
+            window[2] += 1
+            self.suppressed_counter.inc()
+            return
+        window[1] += 1
+
+        args = tuple(float(x) for x in record['args'])
+        text = bytes(record['text']).decode('utf-8', errors='replace')
+        try:
+            line = message.format(args, text)
+        except (IndexError, KeyError, ValueError) as e:
+            line = f"{message.template!r} {args} {text} (formato inválido: {e})"
+        stream = sys.stderr if message.level >= WARNING else sys.stdout
+        print(line, file=stream)
+
+    def _report_suppressed(self, message: LogMessage, window: List[int]) -> None:
+        if window[2]:
+            stream = sys.stderr if message.level >= WARNING else sys.stdout
+            first_line = message.template.split('{', 1)[0].strip() or f"mensaje {message.id}"
+            print(f"   … {window[2]} mensajes más de «{first_line}» en 1 s (suprimidos)", file=stream)
+            window[2] = 0
+
+    def _flush_suppressed(self, second: int) -> None:
+        """Resume los suprimidos de ventanas ya cerradas aunque no lleguen más mensajes."""
+        for message_id, window in self.rate_window.items():
+            if window[2] and window[0] != second:
+                self._report_suppressed(self.messages[message_id], window)
+
+    def stop(self) -> None:
+        """Detiene el hilo y escribe lo que quede en el anillo."""
+        self.stop_event.set()
+        if self.thread is not None:
+            self.thread.join(1.0)
+        self.drain()
+        self._flush_suppressed(-1)
+        sys.stdout.flush()
+
+
+# Anillo único del proceso
+LOG = RealtimeLog()
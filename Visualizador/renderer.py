@@ -12,85 +12,113 @@ from OpenGL.GL import *
 from OpenGL.GL import shaders
 import numpy as np
 import config
+from noise_bank import load_noise_bank
+from audio_textures import AudioTextures
+from postprocess import PostProcessor
+from frame_fences import FrameFences
+from gpu_timer import GpuTimer
+from metrics import REGISTRY
+from realtime_log import LOG, DEBUG, WARNING, ERROR
+from shader_reload import ShaderHotReloader
+from pattern_registry import PatternRegistry
+from display import Display
 import sys
 import time
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Tuple
+
+# Mensajes del bucle de render (realtime_log.py: un error repetido en cada
+# frame no debe convertirse en 60 print() por segundo)
+_LOG_RENDER_ERROR = LOG.message(ERROR, "❌ Error durante el renderizado: {text}")
+_LOG_RENDER_ERROR_AT = LOG.message(DEBUG, "   en {text}")
+_LOG_PRESENT_ERROR = LOG.message(ERROR, "❌ Error al presentar el frame: {text}")
+_LOG_GL_ERROR = LOG.message(WARNING, "⚠️  OpenGL Error: {0:.0f}")
+_LOG_FPS_ERROR = LOG.message(DEBUG, "⚠️  Error dibujando FPS: {text}")
 
 class Renderer:
     """
     Motor de renderizado OpenGL que gestiona shaders, geometría y dibujado.
     
     Características:
-    - Compilación y validación de shaders GLSL
+    - Compilación y validación de shaders GLSL (con recarga en caliente)
     - Renderizado en pantalla completa con quad (cuadrilátero)
     - Envío eficiente de uniforms al GPU
+    - Partículas enviadas como textura con binning en espacio de pantalla
+    - Escena en FBO a la escala del nivel de calidad + post-procesado (bloom)
+    - Frames en vuelo acotados con fences (CPU y GPU trabajan solapadas)
     - Contador de FPS en tiempo real
     - Manejo robusto de errores OpenGL
     - Soporte para transiciones suaves entre efectos
     """
     
-    def __init__(self):
-        """Inicializa Pygame, OpenGL, compila shaders y configura la geometría."""
+    # Unidades de textura reservadas (la 0 la usa el contador de FPS)
+    PARTICLE_TEXTURE_UNIT: int = 1
+    NOISE_TEXTURE_UNIT: int = 2
+    SPECTRUM_TEXTURE_UNIT: int = 3
+    WAVEFORM_TEXTURE_UNIT: int = 4
+    SPECTROGRAM_TEXTURE_UNIT: int = 5
+    
+    def __init__(self, display: Display, pattern_registry: PatternRegistry, scheduled_patterns: List[int],
+                 prepared_program: Optional[Tuple[int, int, int]] = None,
+                 noise_bank: Optional[np.ndarray] = None):
+        """
+        Compila shaders y configura la geometría sobre la ventana compartida.
+        
+        Args:
+            display: Ventana y contexto OpenGL únicos del programa
+            pattern_registry: Registro de patrones (shaders/patterns)
+            scheduled_patterns: Índices de los patrones a compilar en el shader
+            prepared_program: (programa, vertex, fragment) ya enviados a compilar
+                              durante el menú para estos mismos patrones
+            noise_bank: Banco de ruido ya cargado en segundo plano
+        """
+        self.display = display
+        self.pattern_registry = pattern_registry
+        self.scheduled_patterns = scheduled_patterns
         try:
             print("🎨 Inicializando motor de renderizado...")
             
-            # Inicializar Pygame
-            pygame.init()
-            
-            # Obtener resolución de pantalla completa
-            display_info = pygame.display.Info()
-            screen_width = display_info.current_w
-            screen_height = display_info.current_h
-            
-            # Actualizar config con la resolución real
-            config.SCREEN_WIDTH = screen_width
-            config.SCREEN_HEIGHT = screen_height
-            
-            # Configurar flags (ventana sin bordes para evitar problemas con alt+tab)
-            display_flags = DOUBLEBUF | OPENGL | NOFRAME
-            
-            # Crear ventana
-            self.screen = pygame.display.set_mode(
-                (screen_width, screen_height), 
-                display_flags
-            )
-            pygame.display.set_caption("Visualizador Generativo de Música - Premium Edition")
-            
-            # Configurar OpenGL viewport correctamente
+            # La ventana y el contexto ya existen (los creó Display para el menú)
+            screen_width = display.width
+            screen_height = display.height
             glViewport(0, 0, screen_width, screen_height)
-            glMatrixMode(GL_PROJECTION)
-            glLoadIdentity()
-            glOrtho(-1, 1, -1, 1, -1, 1)
-            glMatrixMode(GL_MODELVIEW)
-            glLoadIdentity()
             
             # Ocultar cursor para experiencia inmersiva
             pygame.mouse.set_visible(False)
             
-            # Configurar VSync si está habilitado
-            if config.VSYNC:
-                pygame.display.gl_set_attribute(pygame.GL_SWAP_CONTROL, 1)
+            # Compilar y linkear shaders
+            self.shader_program: int = self._compile_shaders(prepared_program)
             
-            # Permitir todos los eventos importantes de ventana
-            pygame.event.set_allowed([pygame.QUIT, pygame.KEYDOWN, pygame.KEYUP, 
-                                     pygame.WINDOWFOCUSGAINED, pygame.WINDOWFOCUSLOST,
-                                     pygame.WINDOWMINIMIZED, pygame.WINDOWRESTORED,
-                                     pygame.WINDOWEXPOSED, pygame.WINDOWSHOWN, pygame.WINDOWHIDDEN,
-                                     pygame.MOUSEMOTION, pygame.MOUSEBUTTONDOWN])
+            # Recarga en caliente: vigila los GLSL y recompila sin reiniciar
+            self.shader_reloader: Optional[ShaderHotReloader] = None
+            if config.SHADER_HOT_RELOAD:
+                self.shader_reloader = ShaderHotReloader(self._scene_shader_paths, self._build_scene_sources)
             
-            # Configurar la ventana para que responda a eventos del sistema
-            pygame.display.set_allow_screensaver(True)
+            # Configurar geometría (quad de pantalla completa)
+            self._setup_quad()
             
-            # Información sobre el contexto OpenGL
-            print(f"   OpenGL Version: {glGetString(GL_VERSION).decode()}")
-            print(f"   GLSL Version: {glGetString(GL_SHADING_LANGUAGE_VERSION).decode()}")
-            print(f"   Renderer: {glGetString(GL_RENDERER).decode()}")
+            # Textura de bins de partículas
+            self._setup_particle_texture()
             
-            # Compilar y linkear shaders
-            self.shader_program: int = self._compile_shaders()
+            # Banco de ruido precalculado (sustituye al hash sin() por píxel)
+            self._setup_noise_texture(noise_bank)
             
-            # Configurar geometría (quad de pantalla completa)
-            self._setup_quad()
+            # Espectro, forma de onda y espectrograma (streaming por PBO)
+            self.audio_textures = AudioTextures(
+                self.SPECTRUM_TEXTURE_UNIT,
+                self.WAVEFORM_TEXTURE_UNIT,
+                self.SPECTROGRAM_TEXTURE_UNIT
+            )
+            
+            # FBO de la escena y cadena de post-procesado según el nivel de calidad
+            self.screen_size: Tuple[int, int] = (screen_width, screen_height)
+            self._create_post_processor()
+            
+            # Fences por frame: acotan cuántos frames puede llevar la GPU de retraso
+            self.frame_fences = FrameFences()
+            
+            # Tiempo de GPU por frame y patrón (timer queries leídas sin bloquear)
+            self.gpu_timer = GpuTimer()
+            self.fps_gauge = REGISTRY.gauge('fps', "FPS del último segundo")
             
             # Variables para cálculo de FPS
             self.frame_count: int = 0
@@ -101,6 +129,12 @@ class Renderer:
             # Variables para transiciones suaves entre patrones
             self.pattern_transition_progress: float = 1.0  # 0.0 = transición activa, 1.0 = sin transición
             
+            # Modo tablero de ajedrez (paridad alterna en cada frame)
+            self.checker_parity: int = 0
+            
+            # Fracción de la resolución interna usada (modo ahorro de energía)
+            self.scene_scale: float = 1.0
+            
             # Fuente para texto (FPS counter)
             if config.SHOW_FPS:
                 try:
@@ -119,7 +153,8 @@ class Renderer:
             self._emergency_shutdown()
             raise
 
-    def _load_shader_source(self, filepath: str) -> str:
+    @staticmethod
+    def _load_shader_source(filepath: str) -> str:
         """
         Carga el código fuente de un shader desde un archivo.
         
@@ -147,22 +182,124 @@ class Renderer:
             print(f"   Asegúrate de que el archivo esté guardado en UTF-8")
             raise
 
-    def _compile_shaders(self) -> int:
+    @staticmethod
+    def _shader_defines() -> Dict[str, Any]:
+        """
+        Constantes de compilación que se inyectan en el fragment shader.
+        
+        Returns:
+            Diccionario nombre -> valor de los #define a insertar
+        """
+        return {
+            'PARTICLE_BIN_CAPACITY': config.PARTICLE_BIN_CAPACITY,
+        }
+
+    @staticmethod
+    def _inject_defines(source: str, defines: Dict[str, Any]) -> str:
+        """
+        Inserta líneas #define justo después de la directiva #version.
+        
+        Args:
+            source: Código fuente GLSL
+            defines: Diccionario nombre -> valor
+            
+        Returns:
+            Código fuente con los #define insertados
+        """
+        define_lines = "".join(f"#define {name} {value}\n" for name, value in defines.items())
+        lines = source.split("\n", 1)
+        if lines[0].startswith("#version"):
+            return lines[0] + "\n" + define_lines + (lines[1] if len(lines) > 1 else "")
+        return define_lines + source
+
+    def _scene_shader_paths(self) -> List[str]:
+        """Ficheros GLSL que forman el programa de escena (solo patrones programados)."""
+        return (['shaders/vertex.glsl', 'shaders/fragment.glsl'] +
+                self.pattern_registry.paths(self.scheduled_patterns))
+
+    @staticmethod
+    def build_scene_sources(pattern_registry: PatternRegistry,
+                            scheduled_patterns: List[int]) -> Tuple[str, str]:
+        """
+        Lee y ensambla el código fuente del programa de escena (sin llamadas GL).
+        También lo usa el arranque en paralelo (startup.py) antes de crear el Renderer.
+        
+        Args:
+            pattern_registry: Registro de patrones
+            scheduled_patterns: Patrones a incluir en el shader
+        
+        Returns:
+            Tupla (vertex_source, fragment_source) con los #define ya inyectados
+        """
+        vertex_source = Renderer._load_shader_source('shaders/vertex.glsl')
+        fragment_source = Renderer._load_shader_source('shaders/fragment.glsl')
+        fragment_source = pattern_registry.assemble(fragment_source, scheduled_patterns)
+        fragment_source = Renderer._inject_defines(fragment_source, Renderer._shader_defines())
+        return vertex_source, fragment_source
+
+    def _build_scene_sources(self) -> Tuple[str, str]:
+        """Fuentes del programa de escena de esta sesión (las usa la recarga en caliente)."""
+        return self.build_scene_sources(self.pattern_registry, self.scheduled_patterns)
+
+    def _poll_shader_reload(self) -> None:
+        """Avanza la recarga en caliente y cambia de programa si el nuevo está listo."""
+        if self.shader_reloader is None:
+            return
+        new_program = self.shader_reloader.step()
+        if new_program is not None:
+            old_program = self.shader_program
+            self.shader_program = new_program
+            glDeleteProgram(old_program)
+
+    def _adopt_prepared_program(self, prepared: Tuple[int, int, int]) -> Optional[int]:
+        """
+        Recoge el programa que se envió a compilar durante el menú.
+        Solo bloquea si el driver aún no ha terminado.
+        
+        Args:
+            prepared: Tupla (programa, vertex_shader, fragment_shader)
+        
+        Returns:
+            ID del programa si compiló y linkeó, None si hay que compilar de nuevo
+        """
+        program, vertex_shader, fragment_shader = prepared
+        ok = (glGetShaderiv(vertex_shader, GL_COMPILE_STATUS) == GL_TRUE and
+              glGetShaderiv(fragment_shader, GL_COMPILE_STATUS) == GL_TRUE and
+              glGetProgramiv(program, GL_LINK_STATUS) == GL_TRUE)
+        glDeleteShader(vertex_shader)
+        glDeleteShader(fragment_shader)
+        if not ok:
+            # La compilación normal repite el proceso e imprime el log completo
+            glDeleteProgram(program)
+            return None
+        
+        print(f"   ✅ Shaders precompilados durante el menú "
+              f"({len(self.scheduled_patterns)}/{len(self.pattern_registry)} patrones)")
+        return program
+
+    def _compile_shaders(self, prepared: Optional[Tuple[int, int, int]] = None) -> int:
         """
         Compila y linkea los shaders vertex y fragment.
         
+        Args:
+            prepared: Programa ya enviado a compilar en el arranque (opcional)
+        
         Returns:
             ID del programa de shader compilado y linkeado
             
         Raises:
             RuntimeError: Si hay errores de compilación o linkeo
         """
+        if prepared is not None:
+            program = self._adopt_prepared_program(prepared)
+            if program is not None:
+                return program
+        
         try:
             print("   🔨 Compilando shaders...")
             
             # Cargar código fuente
-            vertex_source = self._load_shader_source('shaders/vertex.glsl')
-            fragment_source = self._load_shader_source('shaders/fragment.glsl')
+            vertex_source, fragment_source = self._build_scene_sources()
             
             # Compilar shaders individuales
             vertex_shader = shaders.compileShader(vertex_source, GL_VERTEX_SHADER)
@@ -179,7 +316,8 @@ class Renderer:
                 if info_log:
                     print(f"   Info Log: {info_log.decode()}")
             
-            print("   ✅ Shaders compilados correctamente")
+            print(f"   ✅ Shaders compilados correctamente "
+                  f"({len(self.scheduled_patterns)}/{len(self.pattern_registry)} patrones)")
             return program
             
         except Exception as e:
@@ -247,6 +385,96 @@ class Renderer:
         
         print("   📐 Geometría configurada (fullscreen quad)")
 
+    def _setup_particle_texture(self) -> None:
+        """
+        Crea la textura RGBA32F que contiene los bins de partículas.
+        Ancho = PARTICLE_BIN_CAPACITY slots, alto = tiles + sectores angulares.
+        """
+        grid_x, grid_y = config.PARTICLE_GRID
+        self.particle_bin_rows: int = grid_x * grid_y + config.PARTICLE_ANGULAR_SECTORS
+        
+        empty_bins = np.zeros((self.particle_bin_rows, config.PARTICLE_BIN_CAPACITY, 4), dtype=np.float32)
+        empty_bins[:, :, 3] = -1.0
+        
+        self.particle_texture = glGenTextures(1)
+        glActiveTexture(GL_TEXTURE0 + self.PARTICLE_TEXTURE_UNIT)
+        glBindTexture(GL_TEXTURE_2D, self.particle_texture)
+        # NEAREST: cada texel es una partícula, no se debe interpolar
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_NEAREST)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_NEAREST)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_S, GL_CLAMP_TO_EDGE)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_T, GL_CLAMP_TO_EDGE)
+        glTexImage2D(
+            GL_TEXTURE_2D, 0, GL_RGBA32F,
+            config.PARTICLE_BIN_CAPACITY, self.particle_bin_rows,
+            0, GL_RGBA, GL_FLOAT, empty_bins
+        )
+        glActiveTexture(GL_TEXTURE0)
+        
+        print(f"   ✨ Textura de partículas: {config.PARTICLE_BIN_CAPACITY}x{self.particle_bin_rows} "
+              f"(capacidad total {config.MAX_PARTICLES})")
+
+    def _setup_noise_texture(self, bank: Optional[np.ndarray] = None) -> None:
+        """
+        Sube el banco de ruido a la GPU como textura RGBA8 tileable.
+        Se queda enlazada de forma permanente a NOISE_TEXTURE_UNIT.
+        
+        Args:
+            bank: Banco ya cargado (si es None se lee de la caché o se genera)
+        """
+        if bank is None:
+            bank = load_noise_bank()
+        size = bank.shape[0]
+        
+        self.noise_texture = glGenTextures(1)
+        glActiveTexture(GL_TEXTURE0 + self.NOISE_TEXTURE_UNIT)
+        glBindTexture(GL_TEXTURE_2D, self.noise_texture)
+        # LINEAR para ruido continuo; el ruido blanco se lee en centros de texel
+        # (sin mipmaps: así el fetch del hash es exacto en cualquier escala)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_LINEAR)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_LINEAR)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_S, GL_REPEAT)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_T, GL_REPEAT)
+        glPixelStorei(GL_UNPACK_ALIGNMENT, 1)
+        glTexImage2D(
+            GL_TEXTURE_2D, 0, GL_RGBA8,
+            size, size,
+            0, GL_RGBA, GL_UNSIGNED_BYTE, bank
+        )
+        glActiveTexture(GL_TEXTURE0)
+        self.noise_size: int = size
+
+    def _upload_particles(self, state: Dict[str, Any]) -> None:
+        """
+        Reconstruye los bins de partículas y los sube a la GPU si cambiaron.
+        
+        Args:
+            state: Diccionario con el estado global (contiene 'particles')
+        """
+        particles = state['particles']
+        glActiveTexture(GL_TEXTURE0 + self.PARTICLE_TEXTURE_UNIT)
+        glBindTexture(GL_TEXTURE_2D, self.particle_texture)
+        
+        # Alcance del patrón actual y del anterior (durante la transición se ven los dos)
+        patterns = [self.pattern_registry.get(i) for i in
+                    {state['pattern_index'], state.get('prev_pattern_index', state['pattern_index'])}]
+        patterns = [p for p in patterns if p.uses_particles]
+        if particles.build_bins(state['current_time'],
+                                radius=max(p.particle_radius for p in patterns),
+                                expansion=max(p.particle_expansion for p in patterns),
+                                lifetime=max(p.particle_lifetime for p in patterns)):
+            glTexSubImage2D(
+                GL_TEXTURE_2D, 0, 0, 0,
+                particles.bin_capacity, particles.bin_rows,
+                GL_RGBA, GL_FLOAT, particles.bins
+            )
+        glActiveTexture(GL_TEXTURE0)
+
+    def _patterns_use_particles(self, state: Dict[str, Any]) -> bool:
+        """True si el patrón actual (o el anterior, durante la transición) lee partículas."""
+        indices = {state['pattern_index'], state.get('prev_pattern_index', state['pattern_index'])}
+        return any(self.pattern_registry.get(i).uses_particles for i in indices)
+
     def _calculate_fps(self) -> None:
         """
         Calcula los FPS (frames por segundo) actuales.
@@ -259,6 +487,7 @@ class Renderer:
         # Actualizar FPS cada segundo
         if elapsed >= 1.0:
             self.current_fps = self.frame_count / elapsed
+            self.fps_gauge.set(self.current_fps)
             self.frame_count = 0
             self.fps_timer = current_time
             
@@ -339,21 +568,78 @@ class Renderer:
             glPopAttrib()
             
         except Exception as e:
-            if config.DEBUG_MODE:
-                print(f"⚠️  Error dibujando FPS: {e}")
+            LOG.log(_LOG_FPS_ERROR, text=str(e))
+
+    def _create_post_processor(self) -> None:
+        """Crea el FBO de escena y la cadena de bloom del nivel de calidad activo."""
+        quality = config.get_quality_settings()
+        screen_width, screen_height = self.screen_size
+        self.render_width: int = max(1, int(screen_width * quality['render_scale']))
+        self.render_height: int = max(1, int(screen_height * quality['render_scale']))
+        self.post_processor = PostProcessor(
+            self.vbo,
+            self.screen_size,
+            (self.render_width, self.render_height),
+            quality['bloom_levels']
+        )
 
-    def _update_pattern_transition(self, state: Dict[str, Any]) -> None:
+    def set_quality_tier(self, tier: str) -> None:
         """
-        Actualiza el progreso de la transición entre patrones visuales.
+        Cambia el nivel de calidad en caliente (entre dos frames).
+        Recrea el FBO de escena y la cadena de bloom; los shaders de los
+        patrones no cambian.
+        
+        Args:
+            tier: Clave de config.QUALITY_TIERS
+        """
+        if tier not in config.QUALITY_TIERS:
+            raise ValueError(f"Nivel de calidad desconocido: '{tier}'")
+        config.QUALITY_TIER = tier
+        self.post_processor.close()
+        self._create_post_processor()
+
+    def set_scene_scale(self, scale: float) -> None:
+        """
+        Ajusta la fracción de la resolución interna a dibujar (modo ahorro).
+        No reasigna FBOs: la escena ocupa una esquina del FBO existente.
+        
+        Args:
+            scale: Escala en (0, 1]
+        """
+        self.scene_scale = min(1.0, max(0.01, scale))
+
+    def _use_checkerboard(self, state: Dict[str, Any]) -> bool:
+        """
+        Decide si el frame actual se sombrea en modo tablero de ajedrez.
+        Solo para patrones caros según el perfil de coste, y nunca durante
+        una transición (el historial sería de otro patrón y dejaría estela).
         
         Args:
             state: Diccionario con el estado global
         """
-        if config.PATTERN_TRANSITION_TIME > 0:
-            time_since_change = state['current_time'] - state.get('pattern_change_time', 0)
-            self.pattern_transition_progress = min(time_since_change / config.PATTERN_TRANSITION_TIME, 1.0)
-        else:
-            self.pattern_transition_progress = 1.0
+        if not config.CHECKERBOARD_ENABLED or self.pattern_transition_progress < 1.0:
+            return False
+        if self.scene_scale < 1.0:
+            return False
+        cost_class = self.pattern_registry.get(state['pattern_index']).cost
+        return cost_class in config.CHECKERBOARD_COST_CLASSES
+
+    @staticmethod
+    def _tile_geometry(scene_width: int, scene_height: int) -> Tuple[Tuple[float, float], Tuple[float, float]]:
+        """
+        Videowall: tamaño del lienzo virtual y origen de este tile en él, en
+        píxeles de la escena local (así la escala de render de cada nodo no
+        cambia el encuadre). Sin videowall, el lienzo es la propia escena.
+        
+        Returns:
+            ((ancho, alto) del lienzo, (x, y) del origen del tile)
+        """
+        columns, rows = config.VIDEOWALL_GRID
+        column, row = config.VIDEOWALL_TILE
+        canvas = (float(scene_width * columns), float(scene_height * rows))
+        # La fila 0 es la de arriba; en OpenGL el eje Y crece hacia arriba
+        origin = (float(scene_width * column), float(scene_height * (rows - 1 - row)))
+        return canvas, origin
 
     def render(self, state: Dict[str, Any]) -> None:
         """
@@ -361,6 +647,7 @@ class Renderer:
         
         Este es el método principal de renderizado, llamado en cada frame.
         Envía todos los uniforms necesarios al shader y dibuja la geometría.
+        No intercambia buffers: el frame se muestra después con present().
         
         Args:
             state: Diccionario con todo el estado actual del visualizador
@@ -369,11 +656,22 @@ class Renderer:
             # Calcular FPS
             self._calculate_fps()
             
-            # Actualizar transición de patrón
-            self._update_pattern_transition(state)
+            # Progreso de la transición de patrón (lo calcula simulation.step)
+            self.pattern_transition_progress = state['transition_progress']
+            
+            # Cambiar al programa recargado si ha terminado de compilar
+            self._poll_shader_reload()
             
-            # Asegurar que el viewport esté configurado correctamente
-            glViewport(0, 0, config.SCREEN_WIDTH, config.SCREEN_HEIGHT)
+            # No emitir más comandos si la GPU ya lleva MAX_FRAMES_IN_FLIGHT frames pendientes
+            self.frame_fences.wait_for_slot()
+            self.gpu_timer.collect()
+            self.gpu_timer.begin(self.pattern_registry.get(state['pattern_index']).pattern_id)
+            
+            # Dibujar la escena en el FBO (viewport = resolución interna,
+            # media anchura en modo tablero o una fracción en modo ahorro)
+            checkerboard = self._use_checkerboard(state)
+            self.checker_parity = 1 - self.checker_parity
+            self.post_processor.begin_scene(checkerboard, self.scene_scale)
             
             # Limpiar buffers
             glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
@@ -387,9 +685,15 @@ class Renderer:
             # Los uniforms son variables globales del shader que se mantienen
             # constantes durante el dibujado de la geometría.
             
-            # Resolución de pantalla (para calcular coordenadas UV)
+            # Resolución del lienzo (para calcular coordenadas UV): la escena,
+            # o el videowall completo con este tile en u_tile_origin
+            scene_width, scene_height = self.post_processor.scene_viewport
+            canvas, tile_origin = self._tile_geometry(scene_width, scene_height)
             u_resolution = glGetUniformLocation(self.shader_program, "u_resolution")
-            glUniform2f(u_resolution, float(config.SCREEN_WIDTH), float(config.SCREEN_HEIGHT))
+            glUniform2f(u_resolution, *canvas)
+            
+            u_tile_origin = glGetUniformLocation(self.shader_program, "u_tile_origin")
+            glUniform2f(u_tile_origin, *tile_origin)
             
             # Tiempo actual (para animaciones temporales)
             u_time = glGetUniformLocation(self.shader_program, "u_time")
@@ -417,6 +721,13 @@ class Renderer:
             u_base_color = glGetUniformLocation(self.shader_program, "u_base_color")
             glUniform3fv(u_base_color, 1, config.COLOR_PALETTE[state['color_index']])
             
+            # Modo tablero de ajedrez
+            u_checkerboard = glGetUniformLocation(self.shader_program, "u_checkerboard")
+            glUniform1i(u_checkerboard, int(checkerboard))
+            
+            u_checker_parity = glGetUniformLocation(self.shader_program, "u_checker_parity")
+            glUniform1f(u_checker_parity, float(self.checker_parity))
+            
             # Índices de patrones (actual y anterior para transición)
             u_pattern = glGetUniformLocation(self.shader_program, "u_pattern_index")
             glUniform1i(u_pattern, state['pattern_index'])
@@ -432,51 +743,88 @@ class Renderer:
             u_beat_intensity = glGetUniformLocation(self.shader_program, "u_beat_intensity")
             glUniform1f(u_beat_intensity, state.get('beat_intensity', 0.0))
             
-            # Posiciones y tiempos de partículas/gotas
-            u_drops_pos = glGetUniformLocation(self.shader_program, "u_drops_pos")
-            glUniform2fv(u_drops_pos, config.MAX_PARTICLES, state['drop_positions'])
+            # Partículas/gotas: bins en textura + geometría de la rejilla
+            # (solo se reconstruyen si el patrón actual o el anterior las usa)
+            if self._patterns_use_particles(state):
+                self._upload_particles(state)
             
-            u_drops_time = glGetUniformLocation(self.shader_program, "u_drops_time")
-            glUniform1fv(u_drops_time, config.MAX_PARTICLES, state['drop_times'])
+            u_particle_bins = glGetUniformLocation(self.shader_program, "u_particle_bins")
+            glUniform1i(u_particle_bins, self.PARTICLE_TEXTURE_UNIT)
             
-            # Post-processing uniforms
-            u_bloom = glGetUniformLocation(self.shader_program, "u_bloom_intensity")
-            glUniform1f(u_bloom, config.BLOOM_INTENSITY)
+            u_particle_grid = glGetUniformLocation(self.shader_program, "u_particle_grid")
+            glUniform2f(u_particle_grid, float(config.PARTICLE_GRID[0]), float(config.PARTICLE_GRID[1]))
             
-            u_vignette = glGetUniformLocation(self.shader_program, "u_vignette_intensity")
-            glUniform1f(u_vignette, config.VIGNETTE_INTENSITY)
+            u_particle_sectors = glGetUniformLocation(self.shader_program, "u_particle_sectors")
+            glUniform1f(u_particle_sectors, float(config.PARTICLE_ANGULAR_SECTORS))
             
-            u_contrast = glGetUniformLocation(self.shader_program, "u_contrast")
-            glUniform1f(u_contrast, config.CONTRAST)
+            u_particle_bin_rows = glGetUniformLocation(self.shader_program, "u_particle_bin_rows")
+            glUniform1f(u_particle_bin_rows, float(self.particle_bin_rows))
             
-            u_saturation = glGetUniformLocation(self.shader_program, "u_saturation")
-            glUniform1f(u_saturation, config.SATURATION)
+            # Banco de ruido precalculado
+            u_noise_bank = glGetUniformLocation(self.shader_program, "u_noise_bank")
+            glUniform1i(u_noise_bank, self.NOISE_TEXTURE_UNIT)
+            
+            u_noise_size = glGetUniformLocation(self.shader_program, "u_noise_size")
+            glUniform1f(u_noise_size, float(self.noise_size))
+            
+            # Espectro completo, forma de onda y espectrograma
+            self.audio_textures.update(state)
+            self.audio_textures.bind_uniforms(self.shader_program)
+            
+            # Instante del último beat (patrones que giran/pulsan con cada golpe)
+            u_last_beat_time = glGetUniformLocation(self.shader_program, "u_last_beat_time")
+            glUniform1f(u_last_beat_time, state.get('beat_last_time', 0.0))
             
             # ================================================================
             # DIBUJAR GEOMETRÍA
             # ================================================================
+            glBindBuffer(GL_ARRAY_BUFFER, self.vbo)
+            position_loc = glGetAttribLocation(self.shader_program, "position")
+            glVertexAttribPointer(position_loc, 2, GL_FLOAT, GL_FALSE, 0, None)
+            glEnableVertexAttribArray(position_loc)
             glDrawArrays(GL_QUADS, 0, 4)
             
+            # ================================================================
+            # POST-PROCESADO (bloom, viñeta, contraste, saturación)
+            # ================================================================
+            # Compone el FBO en pantalla y deja el framebuffer por defecto enlazado
+            self.post_processor.apply(checkerboard, self.checker_parity)
+            
             # Dibujar FPS counter sobre el renderizado
             self._draw_fps_counter()
+            self.gpu_timer.end()
             
-            # Intercambiar buffers (mostrar el frame renderizado)
+            # Fence + glFlush: la GPU empieza este frame mientras la CPU prepara el siguiente
+            self.frame_fences.insert()
+        
+        except Exception as e:
+            LOG.log(_LOG_RENDER_ERROR, text=f"{type(e).__name__}: {e}")
+            if LOG.enabled(DEBUG) and e.__traceback__ is not None:
+                import traceback
+                frame = traceback.extract_tb(e.__traceback__)[-1]
+                LOG.log(_LOG_RENDER_ERROR_AT, text=f"{frame.filename}:{frame.lineno} ({frame.name})")
+
+    def present(self) -> None:
+        """
+        Intercambia buffers y muestra el frame emitido por render().
+        
+        Separado de render() para que el FramePacer pueda medir por separado
+        el trabajo de CPU del frame y la espera del flip (VSync).
+        """
+        try:
             pygame.display.flip()
             
             # Verificar errores de OpenGL (solo en modo debug)
             if config.DEBUG_MODE:
                 error = glGetError()
                 if error != GL_NO_ERROR:
-                    print(f"⚠️  OpenGL Error: {error}")
+                    LOG.log(_LOG_GL_ERROR, error)
         
         except Exception as e:
-            print(f"❌ Error durante el renderizado: {e}")
-            if config.DEBUG_MODE:
-                import traceback
-                traceback.print_exc()
+            LOG.log(_LOG_PRESENT_ERROR, text=str(e))
 
     def close(self) -> None:
-        """Limpia recursos y cierra Pygame de forma segura."""
+        """Libera los recursos de OpenGL (la ventana la cierra Display)."""
         try:
             print("\n🎨 Cerrando renderer...")
             
@@ -484,13 +832,26 @@ class Renderer:
             if hasattr(self, 'vbo'):
                 glDeleteBuffers(1, [self.vbo])
             
+            # Eliminar texturas
+            if hasattr(self, 'particle_texture'):
+                glDeleteTextures([self.particle_texture])
+            if hasattr(self, 'noise_texture'):
+                glDeleteTextures([self.noise_texture])
+            if hasattr(self, 'audio_textures'):
+                self.audio_textures.close()
+            if getattr(self, 'shader_reloader', None) is not None:
+                self.shader_reloader.close()
+            if hasattr(self, 'frame_fences'):
+                self.frame_fences.close()
+            if hasattr(self, 'gpu_timer'):
+                self.gpu_timer.close()
+            if hasattr(self, 'post_processor'):
+                self.post_processor.close()
+            
             # Eliminar programa de shaders
             if hasattr(self, 'shader_program'):
                 glDeleteProgram(self.shader_program)
             
-            # Cerrar Pygame
-            pygame.quit()
-            
             print("✅ Renderer cerrado correctamente")
         except Exception as e:
             print(f"⚠️  Error al cerrar el renderer: {e}")
@@ -0,0 +1,229 @@
+# ============================================================================
+# SHADER_RELOAD.PY - RECARGA EN CALIENTE DE SHADERS
+# ============================================================================
+# Vigila los ficheros GLSL del programa de escena y, cuando cambian, compila
+# un programa nuevo sin parar el visualizador:
+# 1. Un hilo vigilante comprueba las fechas de modificación y lee/ensambla el
+#    código fuente fuera del hilo de render (sin E/S en el bucle principal).
+# 2. El hilo de render compila por etapas repartidas en varios frames
+#    (compilar -> linkear -> comprobar), de modo que ningún frame paga la
+#    compilación completa. Si el driver soporta KHR_parallel_shader_compile,
+#    el estado se consulta sin bloquear hasta que la compilación termina.
+# 3. Solo si compila, linkea y valida se intercambia el programa (de forma
+#    atómica entre dos frames). Si falla se mantiene el programa anterior y
+#    se imprime el log del compilador.
+# ============================================================================
+
+import os
+import threading
+from OpenGL.GL import *
+import config
+from typing import Callable, List, Optional, Tuple
+
+# GL_COMPLETION_STATUS_KHR (KHR_parallel_shader_compile / ARB_parallel_shader_compile)
+GL_COMPLETION_STATUS_KHR: int = 0x91B1
+
+
+class ShaderHotReloader:
+    """
+    Vigilante de ficheros + compilación amortizada + intercambio atómico.
+
+    Uso (una vez por frame desde el hilo de render):
+        new_program = reloader.step()
+        if new_program is not None:
+            ... usar new_program y borrar el anterior ...
+    """
+
+    # Etapas de la compilación amortizada
+    IDLE: str = "idle"
+    COMPILING: str = "compiling"
+    LINKING: str = "linking"
+
+    def __init__(self, watch_paths: Callable[[], List[str]],
+                 build_sources: Callable[[], Tuple[str, str]]):
+        """
+        Args:
+            watch_paths: Devuelve la lista de ficheros a vigilar
+            build_sources: Lee y ensambla (vertex_source, fragment_source); sin llamadas GL
+        """
+        self.watch_paths = watch_paths
+        self.build_sources = build_sources
+
+        # Fuentes nuevas listas para compilar (las escribe el hilo vigilante)
+        self._pending_sources: Optional[Tuple[str, str]] = None
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+
+        # Estado de la compilación en curso (solo hilo de render)
+        self.stage: str = self.IDLE
+        self.vertex_shader: Optional[int] = None
+        self.fragment_shader: Optional[int] = None
+        self.program: Optional[int] = None
+        self.parallel_compile: bool = self._has_parallel_compile()
+
+        self.reloads: int = 0
+        self.failures: int = 0
+
+        self._mtimes = self._read_mtimes()
+        self._thread = threading.Thread(target=self._watch_loop, name="ShaderWatcher", daemon=True)
+        self._thread.start()
+        print(f"   🔁 Recarga en caliente de shaders activa ({len(self._mtimes)} ficheros vigilados)")
+
+    def _has_parallel_compile(self) -> bool:
+        """True si el driver permite consultar el estado de compilación sin bloquear."""
+        try:
+            extensions = set()
+            for i in range(glGetIntegerv(GL_NUM_EXTENSIONS)):
+                extensions.add(glGetStringi(GL_EXTENSIONS, i).decode())
+            return bool(extensions & {"GL_KHR_parallel_shader_compile", "GL_ARB_parallel_shader_compile"})
+        except Exception:
+            return False
+
+    # ------------------------------------------------------------------
+    # Hilo vigilante (sin llamadas GL)
+    # ------------------------------------------------------------------
+
+    def _read_mtimes(self) -> dict:
+        """Fecha de modificación de cada fichero vigilado (None si no existe)."""
+        mtimes = {}
+        for path in self.watch_paths():
+            try:
+                mtimes[path] = os.stat(path).st_mtime_ns
+            except OSError:
+                mtimes[path] = None
+        return mtimes
+
+    def _watch_loop(self) -> None:
+        """Comprueba periódicamente los ficheros y prepara las fuentes nuevas."""
+        while not self._stop_event.wait(config.SHADER_RELOAD_POLL_SECONDS):
+            mtimes = self._read_mtimes()
+            if mtimes == self._mtimes:
+                continue
+            changed = [os.path.basename(path) for path, mtime in mtimes.items()
+                       if self._mtimes.get(path) != mtime]
+            self._mtimes = mtimes
+
+            print(f"🔁 Cambio detectado en shaders ({', '.join(changed)}), recompilando...")
+            try:
+                sources = self.build_sources()
+            except (OSError, UnicodeDecodeError) as e:
+                print(f"❌ No se pudieron leer los shaders: {e}")
+                continue
+
+            with self._lock:
+                self._pending_sources = sources
+
+    # ------------------------------------------------------------------
+    # Compilación amortizada (hilo de render)
+    # ------------------------------------------------------------------
+
+    def _is_complete(self, handle: int, is_program: bool) -> bool:
+        """Consulta sin bloquear si el driver ha terminado (solo con compilación paralela)."""
+        if not self.parallel_compile:
+            return True
+        if is_program:
+            return bool(glGetProgramiv(handle, GL_COMPLETION_STATUS_KHR))
+        return bool(glGetShaderiv(handle, GL_COMPLETION_STATUS_KHR))
+
+    def _compile(self, source: str, shader_type: int) -> int:
+        """Envía un shader a compilar sin consultar el resultado."""
+        shader = glCreateShader(shader_type)
+        glShaderSource(shader, source)
+        glCompileShader(shader)
+        return shader
+
+    def _shader_log(self, shader: int) -> str:
+        log = glGetShaderInfoLog(shader)
+        return log.decode() if isinstance(log, bytes) else str(log)
+
+    def _program_log(self, program: int) -> str:
+        log = glGetProgramInfoLog(program)
+        return log.decode() if isinstance(log, bytes) else str(log)
+
+    def _discard(self) -> None:
+        """Libera los objetos de la compilación en curso."""
+        for shader in (self.vertex_shader, self.fragment_shader):
+            if shader:
+                glDeleteShader(shader)
+        if self.program:
+            glDeleteProgram(self.program)
+        self.vertex_shader = self.fragment_shader = self.program = None
+        self.stage = self.IDLE
+
+    def _fail(self, what: str, log: str) -> None:
+        """Informa de un error y conserva el programa actual."""
+        self.failures += 1
+        print("\n" + "!" * 70)
+        print(f"   ❌ {what}: se mantiene el programa anterior")
+        print("!" * 70)
+        print(log.strip() or "(sin log)")
+        print("=" * 70)
+        self._discard()
+
+    def step(self) -> Optional[int]:
+        """
+        Avanza una etapa de la compilación pendiente (como mucho una por frame).
+
+        Returns:
+            ID del programa nuevo cuando está listo para el intercambio, si no None
+        """
+        if self.stage == self.IDLE:
+            with self._lock:
+                sources, self._pending_sources = self._pending_sources, None
+            if sources is None:
+                return None
+            vertex_source, fragment_source = sources
+            self.vertex_shader = self._compile(vertex_source, GL_VERTEX_SHADER)
+            self.fragment_shader = self._compile(fragment_source, GL_FRAGMENT_SHADER)
+            self.stage = self.COMPILING
+            return None
+
+        if self.stage == self.COMPILING:
+            if not (self._is_complete(self.vertex_shader, False) and
+                    self._is_complete(self.fragment_shader, False)):
+                return None
+            for name, shader in (("Vertex shader", self.vertex_shader),
+                                 ("Fragment shader", self.fragment_shader)):
+                if glGetShaderiv(shader, GL_COMPILE_STATUS) != GL_TRUE:
+                    self._fail(f"{name} no compila", self._shader_log(shader))
+                    return None
+            self.program = glCreateProgram()
+            glAttachShader(self.program, self.vertex_shader)
+            glAttachShader(self.program, self.fragment_shader)
+            glLinkProgram(self.program)
+            self.stage = self.LINKING
+            return None
+
+        if self.stage == self.LINKING:
+            if not self._is_complete(self.program, True):
+                return None
+            if glGetProgramiv(self.program, GL_LINK_STATUS) != GL_TRUE:
+                self._fail("El programa no linkea", self._program_log(self.program))
+                return None
+            # Validación: el renderer necesita el atributo 'position' del quad
+            if glGetAttribLocation(self.program, "position") < 0:
+                self._fail("El programa no pasa la validación",
+                           "Falta el atributo 'position' en el vertex shader")
+                return None
+            # glValidateProgram depende del estado actual (unidades de textura):
+            # como en la compilación inicial, solo es una advertencia
+            glValidateProgram(self.program)
+            if glGetProgramiv(self.program, GL_VALIDATE_STATUS) != GL_TRUE:
+                print("⚠️  Advertencia: el programa recargado no pasó glValidateProgram")
+
+            program = self.program
+            glDeleteShader(self.vertex_shader)
+            glDeleteShader(self.fragment_shader)
+            self.vertex_shader = self.fragment_shader = self.program = None
+            self.stage = self.IDLE
+            self.reloads += 1
+            print(f"✅ Shaders recargados en caliente (recarga #{self.reloads})")
+            return program
+
+        return None
+
+    def close(self) -> None:
+        """Detiene el hilo vigilante y libera la compilación en curso."""
+        self._stop_event.set()
+        self._thread.join(timeout=1.0)
+        self._discard()
@@ -0,0 +1,21 @@
+#version 120
+
+// Desenfoque gaussiano separable de 9 taps en 5 lecturas
+// (aprovecha el filtrado bilineal para leer dos texels por fetch).
+// Se ejecuta dos veces por nivel: horizontal y vertical.
+
+uniform sampler2D u_source;
+uniform vec2 u_target_size;
+uniform vec2 u_direction;  // (1/ancho, 0) u (0, 1/alto)
+
+void main() {
+    vec2 uv = gl_FragCoord.xy / u_target_size;
+
+    vec3 color = texture2D(u_source, uv).rgb * 0.2270270270;
+    color += texture2D(u_source, uv + u_direction * 1.3846153846).rgb * 0.3162162162;
+    color += texture2D(u_source, uv - u_direction * 1.3846153846).rgb * 0.3162162162;
+    color += texture2D(u_source, uv + u_direction * 3.2307692308).rgb * 0.0702702703;
+    color += texture2D(u_source, uv - u_direction * 3.2307692308).rgb * 0.0702702703;
+
+    gl_FragColor = vec4(color, 1.0);
+}
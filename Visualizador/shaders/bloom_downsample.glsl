@@ -0,0 +1,34 @@
+#version 120
+
+// Reducción 2x para la cadena de bloom.
+// En el primer nivel aplica además el filtro de brillo (bright-pass).
+
+uniform sampler2D u_source;
+uniform vec2 u_source_size;
+uniform vec2 u_target_size;
+uniform float u_threshold;
+uniform int u_apply_threshold;
+
+vec3 bright_pass(vec3 color) {
+    float lum = dot(color, vec3(0.299, 0.587, 0.114));
+    // Conserva el tono: escala el color por la fracción de luminancia sobre el umbral
+    return color * (max(lum - u_threshold, 0.0) / max(lum, 0.0001));
+}
+
+void main() {
+    vec2 uv = gl_FragCoord.xy / u_target_size;
+    vec2 texel = 1.0 / u_source_size;
+
+    // 4 lecturas bilineales en las diagonales = promedio de 16 texels de origen
+    vec3 color = texture2D(u_source, uv + texel * vec2(-1.0, -1.0)).rgb;
+    color += texture2D(u_source, uv + texel * vec2( 1.0, -1.0)).rgb;
+    color += texture2D(u_source, uv + texel * vec2(-1.0,  1.0)).rgb;
+    color += texture2D(u_source, uv + texel * vec2( 1.0,  1.0)).rgb;
+    color *= 0.25;
+
+    if (u_apply_threshold == 1) {
+        color = bright_pass(color);
+    }
+
+    gl_FragColor = vec4(color, 1.0);
+}
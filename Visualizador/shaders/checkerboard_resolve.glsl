@@ -0,0 +1,40 @@
+#version 120
+
+// Reconstrucción del modo tablero de ajedrez (checkerboard).
+// u_current contiene solo la mitad de los píxeles (ancho / 2): los que
+// cumplen mod(x + y + paridad, 2) == 0. El resto se toma del frame anterior
+// (u_history), recortado al rango de sus 4 vecinos recién sombreados para
+// evitar estelas cuando la imagen cambia rápido.
+
+uniform sampler2D u_current;
+uniform sampler2D u_history;
+uniform vec2 u_size;          // Resolución completa de la escena
+uniform vec2 u_current_size;  // Resolución de u_current (ancho / 2, alto)
+uniform float u_parity;
+
+vec3 fetch_current(vec2 pixel) {
+    // Píxel a pantalla completa -> texel de la mitad sombreada este frame
+    pixel = clamp(pixel, vec2(0.0), u_size - 1.0);
+    vec2 texel = vec2(floor(pixel.x * 0.5), pixel.y) + 0.5;
+    return texture2D(u_current, texel / u_current_size).rgb;
+}
+
+void main() {
+    vec2 pixel = floor(gl_FragCoord.xy);
+
+    if (mod(pixel.x + pixel.y + u_parity, 2.0) < 0.5) {
+        gl_FragColor = vec4(fetch_current(pixel), 1.0);
+        return;
+    }
+
+    // Los 4 vecinos en cruz tienen la paridad contraria: se sombrearon este frame
+    vec3 left = fetch_current(pixel + vec2(-1.0, 0.0));
+    vec3 right = fetch_current(pixel + vec2(1.0, 0.0));
+    vec3 down = fetch_current(pixel + vec2(0.0, -1.0));
+    vec3 up = fetch_current(pixel + vec2(0.0, 1.0));
+    vec3 lo = min(min(left, right), min(down, up));
+    vec3 hi = max(max(left, right), max(down, up));
+
+    vec3 history = texture2D(u_history, (pixel + 0.5) / u_size).rgb;
+    gl_FragColor = vec4(clamp(history, lo, hi), 1.0);
+}
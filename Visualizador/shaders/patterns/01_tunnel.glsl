@@ -0,0 +1,13 @@
+// @name: Túnel
+// @cost: light
+// @particles: false
+
+float pattern_tunnel(vec2 uv, float time, float amp) {
+    vec2 p = 2.0 * uv - 1.0;
+    p.x *= u_resolution.x / u_resolution.y;
+    float r = length(p);
+    float a = atan(p.y, p.x);
+    // 0.2: Brillo del túnel | 9.0: Número de espirales | 5.0: Velocidad rotación | 10.0: Reacción bass
+    // 30.0: Frecuencia anillos | 5.0: Velocidad anillos | 0.1, 0.5: Intensidades
+    return 0.2 / r + sin(a * 9.0 + time * 5.0 + u_bass * 10.0) * 0.1 + cos(r * 30.0 - time * 5.0) * 0.5;
+}
@@ -0,0 +1,16 @@
+// @name: Zoom Cósmico
+// @cost: light
+// @particles: false
+
+float pattern_cosmic_zoom(vec2 uv, float time, float amp) {
+    vec2 p = 2.0 * uv - 1.0; p.x *= u_resolution.x / u_resolution.y;
+    float r = length(p); float a = atan(p.y, p.x);
+    // 20.0: Segmentación radial | 50.0: Reacción a música
+    float glitch_factor = floor(r * 20.0 + amp * 50.0) / 20.0;
+    float arms = 4.0; // 4.0: Número de brazos espirales
+    // 5.0: Densidad espiral | 2.0: Velocidad rotación
+    float spiral = sin(a * arms + glitch_factor * 5.0 - time * 2.0);
+    float zoom = log(r);
+    spiral *= cos(zoom * 5.0 - time); // 5.0: Intensidad zoom
+    return spiral;
+}
@@ -0,0 +1,14 @@
+// @name: Rejilla Ondulante
+// @cost: light
+// @particles: false
+
+float pattern_wobble_grid(vec2 uv, float time, float amp) {
+    vec2 d = uv;
+    // 20.0: Frecuencia ondulación | 2.0, 1.5: Velocidades | 0.05: Amplitud distorsión
+    d.x += sin(uv.y * 20.0 + time * 2.0) * 0.05 * amp;
+    d.y += cos(uv.x * 20.0 + time * 1.5) * 0.05 * amp;
+    // 20.0: Número de líneas | 10.0: Grosor de líneas (más alto = más delgadas)
+    float lx = pow(abs(sin(d.x * 3.14159 * 20.0)), 10.0);
+    float ly = pow(abs(sin(d.y * 3.14159 * 20.0)), 10.0);
+    return 1.0 - max(lx, ly);
+}
@@ -0,0 +1,27 @@
+// @name: Orbe Glitch
+// @cost: light
+// @particles: true
+// @particle_lifetime: 2.0
+
+float pattern_glitchy_orb(vec2 uv, float time, float amp) {
+    vec2 p = uv - 0.5;
+    p.x *= u_resolution.x / u_resolution.y;
+    float r = length(p);
+    float a = atan(p.y, p.x);
+    float rad = 0.35 + sin(a * 7.0 + time) * 0.02 - u_bass * 0.15;
+    float core = 1.0 - smoothstep(rad, rad + 0.05, r);
+    float rays = 0.0;
+    float row = particle_sector_row(a);
+    for (int i = 0; i < PARTICLE_BIN_CAPACITY; i++) {
+        vec4 drop = particle_fetch(row, i);
+        if (drop.w < 0.0) break;
+        float t = time - drop.z;
+        if (t > 0.0 && t < 2.0) { // 2.0: Duración del rayo (el decaimiento llega a 0)
+            vec2 dir = normalize(drop.xy - 0.5);
+            float diff = abs(a - atan(dir.y, dir.x));
+            diff = min(diff, 6.28318 - diff);
+            rays += smoothstep(0.2, 0.0, diff) * pow(1.0 - t / 2.0, 3.0);
+        }
+    }
+    return core + rays;
+}
@@ -0,0 +1,9 @@
+// @name: Tejido
+// @cost: light
+// @particles: false
+
+float pattern_woven_fabric(vec2 uv, float time, float amp) {
+    float dist = sin(uv.y * 10.0 + time * 0.5) * cos(uv.x * 10.0 + time * 0.5);
+    vec2 d = uv + dist * amp * 0.5;
+    return sin(d.x * 40.0) * cos(d.y * 40.0) + sin(d.x * 80.0 + time) * u_treble * 0.3;
+}
@@ -0,0 +1,13 @@
+// @name: Rosa Giratoria
+// @cost: light
+// @particles: false
+
+float pattern_spinning_rose(vec2 uv, float time, float amp) {
+    vec2 p = uv - 0.5;
+    p.x *= u_resolution.x / u_resolution.y;
+    float r = length(p);
+    float a = atan(p.y, p.x);
+    float pet = 7.0 + u_mid * 3.0;
+    float rad = 0.5 * cos(pet * a + time * 0.85) + sin(a * 80.0 + time) * u_treble * 0.5;
+    return 1.0 - smoothstep(abs(rad), abs(rad) + 0.06, r);
+}
@@ -0,0 +1,12 @@
+// @name: Rejilla Hexagonal Reactiva
+// @cost: light
+// @particles: false
+
+float pattern_reactive_hex_grid(vec2 uv, float time, float amp) {
+    vec2 p = uv - 0.5;
+    p.x *= u_resolution.x / u_resolution.y;
+    float pulse = time - u_last_beat_time;
+    float ring = smoothstep(pulse * 1.5, pulse * 0.8 - 0.5, length(p));
+    vec2 q = abs(fract(p * 10.0) - 0.5);
+    return (1.0 - max(q.x * 0.866 + q.y * 0.5, q.y)) * ring * (1.0 + u_beat_intensity);
+}
@@ -0,0 +1,12 @@
+// @name: Glitch Mixto
+// @cost: light
+// @particles: false
+
+float pattern_mixed_glitch(vec2 uv, float time, float amp) {
+    float g = fract(floor(uv.y * 20.0 + time * 5.0) / 20.0);
+    vec2 d = uv;
+    d.x += (g - 0.5) * u_bass * 0.3;
+    float r = sin(d.x * 30.0 + time * 2.0) * 0.5 + 0.5;
+    float gr = sin(d.x * 31.0 + time * 2.1) * 0.5 + 0.5;
+    return r * gr + sin(uv.y * 800.0 + time * 50.0) * 0.1 + u_treble * 0.5;
+}
@@ -0,0 +1,16 @@
+// @name: Triángulos Danzantes
+// @cost: light
+// @particles: false
+
+float pattern_dancing_triangles(vec2 uv, float time, float amp) {
+    vec2 p = uv * 12.0;
+    p = rotate2d(time * 0.3 + u_bass * 1.5) * (p - 6.0) + 6.0;
+    vec2 grid = fract(p) - 0.5;
+    float angle = time * 2.0 + length(floor(p)) + u_beat_intensity * 6.0;
+    grid = rotate2d(angle) * grid;
+    float tri = max(abs(grid.x) * 1.732 + grid.y, -grid.y);
+    float size = 0.35 + sin(length(floor(p)) + time * 3.0 + u_mid * 5.0) * 0.15;
+    float shape = smoothstep(size, size - 0.05, tri);
+    float pulse = pow(1.0 - tri / 0.5, 2.0) * u_treble * 0.3;
+    return shape + pulse;
+}
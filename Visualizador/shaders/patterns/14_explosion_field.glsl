@@ -0,0 +1,22 @@
+// @name: Campo de Explosiones
+// @cost: light
+// @particles: true
+// @particle_radius: 0.0
+// @particle_expansion: 0.9
+// @particle_lifetime: 1.5
+
+float pattern_explosion_field(vec2 uv, float time, float amp) {
+    float ex = 0.0;
+    float row = particle_tile_row(uv);
+    for (int i = 0; i < PARTICLE_BIN_CAPACITY; i++) {
+        vec4 drop = particle_fetch(row, i);
+        if (drop.w < 0.0) break;
+        float t = time - drop.z;
+        if (t > 0.0 && t < 1.5) {
+            float d = distance(uv, drop.xy);
+            float rad = t * 0.9;
+            ex += smoothstep(rad, rad - 0.1, d) * pow(1.0 - t / 1.5, 2.0);
+        }
+    }
+    return ex;
+}
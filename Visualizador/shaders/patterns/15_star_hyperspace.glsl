@@ -0,0 +1,44 @@
+// @name: Hiperimpulso Estelar
+// @cost: light
+// @particles: false
+
+// PATRÓN 15: Hiperimpulso Estelar (Giro "en Seco" con Beat)
+float pattern_star_hyperspace(vec2 uv, float time, float amp) {
+    vec2 p = uv - 0.5;
+    p.x *= u_resolution.x / u_resolution.y;
+
+    // --- NUEVA LÓGICA DE ROTACIÓN "EN SECO" ---
+    // 1. 'u_last_beat_time' es el timestamp del último beat.
+    float time_since_beat = time - u_last_beat_time;
+    
+    // 2. Definimos cuánto dura el giro (ej. 0.4 segundos).
+    float spin_duration = 0.4; // 0.4: Duración del giro en segundos.
+    
+    // 3. 'spin_progress' va de 0.0 (justo en el beat) a 1.0 (0.4s después).
+    float spin_progress = clamp(time_since_beat / spin_duration, 0.0, 1.0);
+    
+    // 4. Creamos una curva de "frenado". pow(..., 3.0) hace que frene más bruscamente al final.
+    // 'spin_amount' es la cantidad total de rotación extra que se añade.
+    // 6.28 = una vuelta completa (2*PI). Aumenta este número para más vueltas.
+    float spin_amount = (1.0 - pow(spin_progress, 3.0)) * 6.28; 
+    
+    // 5. El ángulo base "salta" con cada beat (usando el timestamp como "semilla")
+    // y le sumamos el giro extra que se frena.
+    float base_angle = floor(u_last_beat_time * 10.0); // Salto a una nueva posición.
+    float rotation_angle = base_angle + spin_amount;
+    
+    p = rotate2d(rotation_angle) * p;
+
+    // --- LÓGICA DE ZOOM (sin cambios) ---
+    float speed = time * 0.05 + amp * 5.0;
+    vec2 distorted_uv = p / (1.0 - fract(speed * 0.1));
+    float r = length(distorted_uv);
+    float a = atan(distorted_uv.y, distorted_uv.x);
+
+    // --- LÓGICA DE ESTRELLAS (sin cambios) ---
+    float stars = random(vec2(floor(a * 40.0), floor(r * 20.0)));
+    stars = pow(stars, 50.0);
+    float stretch = 1.0 - smoothstep(0.0, 0.5, r * (1.0 - amp * 0.9));
+    
+    return stars * stretch;
+}
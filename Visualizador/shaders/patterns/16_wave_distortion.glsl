@@ -0,0 +1,14 @@
+// @name: Distorsión de Ondas
+// @cost: light
+// @particles: false
+
+float pattern_wave_distortion(vec2 uv, float time, float amp) {
+    vec2 d = uv;
+    // 8.0, 6.0: Frecuencias de onda | 3.0, 2.0: Velocidades | 10.0, 8.0: Reacción bass/mid | 0.1: Amplitud distorsión
+    d.x += sin(uv.y * 8.0 + time * 3.0 + u_bass * 10.0) * 0.1 * amp;
+    d.y += cos(uv.x * 6.0 + time * 2.0 + u_mid * 8.0) * 0.1 * amp;
+    // 20.0: Densidad del patrón | 15.0: Densidad diagonal | 2.0: Velocidad | 5.0: Reacción treble
+    float pattern1 = sin(d.x * 20.0 + time) * cos(d.y * 20.0 - time);
+    float pattern2 = sin((d.x + d.y) * 15.0 - time * 2.0 + u_treble * 5.0);
+    return (pattern1 + pattern2) * 0.5 + 0.5;
+}
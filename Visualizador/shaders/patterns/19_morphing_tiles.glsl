@@ -0,0 +1,13 @@
+// @name: Baldosas Cambiantes
+// @cost: light
+// @particles: false
+
+float pattern_morphing_tiles(vec2 uv, float time, float amp) {
+    vec2 p = uv * 8.0;
+    p.x += sin(p.y * 2.0 + time + u_bass * 3.0) * 0.3 * amp;
+    p.y += cos(p.x * 2.0 - time + u_mid * 3.0) * 0.3 * amp;
+    vec2 grid = fract(p) - 0.5;
+    float tile = max(abs(grid.x), abs(grid.y));
+    float morph = sin(time * 2.0 + u_treble * 5.0) * 0.5 + 0.5;
+    return smoothstep(0.4 - morph * 0.2, 0.35 - morph * 0.2, tile);
+}
@@ -0,0 +1,17 @@
+// @name: Metal Líquido
+// @cost: medium
+// @particles: false
+
+float pattern_liquid_metal(vec2 uv, float time, float amp) {
+    vec2 p = (uv - 0.5) * 3.0;
+    p.x *= u_resolution.x / u_resolution.y;
+    float liquid = 0.0;
+    for (int i = 0; i < 4; i++) {
+        float fi = float(i);
+        vec2 offset = vec2(sin(time * 0.8 + fi * 2.0) * 0.5, cos(time * 0.6 + fi * 1.5) * 0.5);
+        p = abs(p) / dot(p, p) - offset * (0.8 + u_bass * 0.4);
+        p = rotate2d(time * 0.3 + fi * 0.8 + u_mid * 1.5) * p;
+        liquid += length(p) * (0.3 + u_beat_intensity * 0.3);
+    }
+    return sin(liquid * 1.5 + time * 2.0 + u_treble * 4.0) * 0.5 + 0.5;
+}
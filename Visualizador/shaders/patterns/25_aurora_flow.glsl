@@ -0,0 +1,19 @@
+// @name: Aurora
+// @cost: medium
+// @particles: false
+
+float pattern_aurora_flow(vec2 uv, float time, float amp) {
+    vec2 p = uv;
+    float flow = 0.0;
+    for (int i = 0; i < 5; i++) {
+        float fi = float(i);
+        float wave = sin(p.x * (2.0 + fi * 0.5) + fi * 2.0 + time * (1.5 + fi * 0.4) + u_bass * 4.0);
+        wave += cos(p.y * (1.5 + fi * 0.3) + fi * 1.5 - time * (1.2 + fi * 0.3) + u_mid * 3.0);
+        p.y += wave * 0.08 * amp;
+        p.x += sin(p.y * 3.0 + time + fi) * 0.05 * amp;
+        float layer = sin(p.y * (6.0 + fi * 2.0) - time * 2.0 + fi * 1.5) * exp(-fi * 0.3);
+        flow += layer;
+    }
+    float shimmer = sin(p.x * 50.0 + time * 10.0) * sin(p.y * 50.0 - time * 8.0) * u_treble * 0.2;
+    return flow * 0.25 + 0.5 + shimmer;
+}
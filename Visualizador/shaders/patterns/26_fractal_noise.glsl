@@ -0,0 +1,20 @@
+// @name: Ruido Fractal
+// @cost: light
+// @particles: false
+
+float pattern_fractal_noise(vec2 uv, float time, float amp) {
+    vec2 p = uv * 0.5; // 0.5: Escala base (en repeticiones de la textura de ruido)
+    // 0.05, 0.04: Velocidad de deriva | 0.1: Reacción bass/mid
+    vec2 drift = vec2(time * 0.05 + u_bass * 0.1, -time * 0.04 + u_mid * 0.1);
+    float noise = 0.0;
+    float amplitude = 1.0;
+    float total = 0.0;
+    for (int i = 0; i < 5; i++) {
+        noise += noise_gradient(p + drift) * amplitude;
+        total += amplitude;
+        p = rotate2d(0.5 + u_treble) * p * 2.0;
+        amplitude *= 0.5;
+    }
+    // 2.0: Contraste (el fBm se concentra alrededor de 0.5)
+    return (noise / total - 0.5) * 2.0 + 0.5;
+}
@@ -0,0 +1,13 @@
+// @name: Células de Voronoi
+// @cost: light
+// @particles: false
+
+float pattern_voronoi_cells(vec2 uv, float time, float amp) {
+    // La textura de Voronoi tiene 8 células por repetición: uv 1:1 = 8 células en pantalla
+    // 2.0: Velocidad de deformación | 3.0: Reacción bass/mid | 0.02: Amplitud del movimiento
+    vec2 warp = vec2(sin(time * 2.0 + uv.y * 6.2831 + u_bass * 3.0),
+                     cos(time * 2.0 + uv.x * 6.2831 + u_mid * 3.0)) * 0.02;
+    float min_dist = noise_voronoi(uv + warp);
+    // 0.5: Intensidad reacción a beats
+    return smoothstep(0.0, 1.0, min_dist) * (1.0 + u_beat_intensity * 0.5);
+}
@@ -0,0 +1,15 @@
+// @name: Barras Oscilantes
+// @cost: light
+// @particles: false
+
+float pattern_oscillating_bars(vec2 uv, float time, float amp) {
+    float bars = 0.0;
+    float offset1 = sin(time * 1.2 + u_bass * 3.0) * 0.3;
+    float offset2 = cos(time * 1.5 + u_mid * 3.0) * 0.3;
+    bars += smoothstep(0.012, 0.0, abs(sin((uv.y + offset1) * 12.0 + time * 1.5 + u_treble * 4.0) - 0.5));
+    bars += smoothstep(0.012, 0.0, abs(sin((uv.x + offset2) * 10.0 - time * 1.2 + u_bass * 4.0) - 0.5));
+    vec2 diag = rotate2d(0.785398) * (uv - 0.5);
+    bars += smoothstep(0.012, 0.0, abs(sin((diag.y - offset1) * 8.0 + time * 1.0 + u_mid * 3.0) - 0.5)) * 0.5;
+    float pulse = (1.0 + sin(length(uv - 0.5) * 10.0 - time * 3.0) * 0.3) * (1.0 + u_beat_intensity * 0.5);
+    return bars * pulse;
+}
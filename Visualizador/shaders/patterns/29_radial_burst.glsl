@@ -0,0 +1,17 @@
+// @name: Estallido Radial
+// @cost: light
+// @particles: false
+
+float pattern_radial_burst(vec2 uv, float time, float amp) {
+    vec2 p = uv - 0.5;
+    p.x *= u_resolution.x / u_resolution.y;
+    float r = length(p);
+    float a = atan(p.y, p.x);
+    // 16.0: Número de rayos | 2.0: Velocidad rotación | 8.0: Reacción bass
+    float rays = sin(a * 16.0 + time * 2.0 + u_bass * 8.0) * 0.5 + 0.5;
+    // 15.0: Frecuencia ondas radiales | 5.0: Velocidad | 10.0: Reacción mid
+    float pulse = sin(r * 15.0 - time * 5.0 + u_mid * 10.0) * 0.5 + 0.5;
+    // 0.8: Radio explosión | 2.0: Exponente (más alto = más concentrado en centro)
+    float burst = pow(1.0 - smoothstep(0.0, 0.8, r), 2.0) * u_beat_intensity;
+    return rays * pulse + burst;
+}
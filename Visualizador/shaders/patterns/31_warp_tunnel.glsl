@@ -0,0 +1,31 @@
+// @name: Túnel de Distorsión
+// @cost: light
+// @particles: false
+
+// PATRÓN 31: Túnel de Distorsión (REACCIÓN DE MÚSICA REDUCIDA)
+float pattern_warp_tunnel(vec2 uv, float time, float amp) {
+    vec2 p = uv - 0.5;
+    p.x *= u_resolution.x / u_resolution.y;
+    float r = length(p);
+    float a = atan(p.y, p.x);
+
+    // Reacción al volumen reducida (de 40.0 a 5.0)
+    float glitch_factor = floor(r * 20.0 + amp * 5.0) / 20.0; // Antes amp * 40.0
+    
+    // --- AJUSTE DE VELOCIDAD Y REACCIÓN ---
+    // Mantenemos las velocidades de 'time' bajas
+    
+    // Reducimos la influencia de la música (u_mid)
+    // Antes: u_mid * 2.0. Ahora: u_mid * 0.2
+    float depth = glitch_factor * 5.0 + time * 0.03 + u_mid * 0.2; 
+    
+    // Reducimos la influencia de la música (u_bass)
+    // Antes: u_bass * 4.0. Ahora: u_bass * 0.4
+    float tunnel = sin(a * 8.0 + depth) * cos(glitch_factor * 20.0 - time * 0.04 + u_bass * 0.4);
+    
+    // Reducimos la influencia de la música (u_treble)
+    // Antes: u_treble * 5.0. Ahora: u_treble * 0.5
+    float rings = sin(glitch_factor * 30.0 - time * 0.06 + u_treble * 0.5) * 0.5 + 0.5;
+    
+    return (tunnel * 0.5 + 0.5) * rings;
+}
@@ -0,0 +1,28 @@
+// @name: Sueños Pixelados
+// @cost: light
+// @particles: false
+
+// PATRÓN 32: Sueños Pixelados (Versión LENTA Y MENOS EPILÉPTICA)
+float pattern_pixelated_dreams(vec2 uv, float time, float amp) {
+    // 1. Tamaño de píxel reactivo (velocidad muy reducida)
+    float pixelSize = 25.0 + sin(time * 0.02 + u_bass * 2.0) * 10.0; // Antes: time * 0.1
+    vec2 pixelated = floor(uv * pixelSize) / pixelSize;
+
+    // 2. Patrones base (velocidad muy reducida)
+    float pattern1 = sin(pixelated.x * 40.0 + time * 0.05 + u_mid * 4.0); // Antes: time * 0.2
+    float pattern2 = cos(pixelated.y * 40.0 - time * 0.03 + u_treble * 3.0); // Antes: time * 0.15
+    
+    // 3. Combinación de patrones para un efecto glitch más nítido
+    float combined_pattern = pow(abs(pattern1 * pattern2), 5.0);
+    
+    // 4. Ruido aleatorio (velocidad DRÁSTICAMENTE reducida)
+    // Este es el cambio principal. 'time * 0.1' hace que los píxeles cambien
+    // 5 veces más lento que antes (que era 'time * 0.5').
+    float noise = random(floor(uv * pixelSize) + floor(time * 0.01)) * u_beat_intensity * 0.5; // Antes: time * 0.5
+    
+    // 5. Rejilla de píxeles (la mantenemos muy sutil)
+    float grid = (smoothstep(0.02, 0.0, fract(uv.x * pixelSize)) + smoothstep(0.02, 0.0, fract(uv.y * pixelSize))) * 0.05;
+
+    // 6. Combinación final
+    return (combined_pattern + noise) * amp * 2.0 + grid;
+}
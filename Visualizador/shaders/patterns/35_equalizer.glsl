@@ -0,0 +1,36 @@
+// @name: Ecualizador Estilizado
+// @cost: light
+// @particles: false
+
+// PATRÓN 35: Ecualizador Estilizado (Sin "pared" y más bajo)
+float pattern_equalizer(vec2 uv, float time, float amp) {
+    float num_bars = 40.0; // 40.0: Número de barras.
+    float bar_index = floor(uv.x * num_bars);
+
+    // --- LÓGICA DE ALTURA ---
+    // Cada barra lee su banda del espectro real (textura u_spectrum, escala log)
+    float height = spectrum_at((bar_index + 0.5) / num_bars) * 0.6; // 0.6: Altura máxima
+    height += sin(time * 2.0 + bar_index) * 0.02; // Ondulación base
+    
+    // Salto con el beat
+    height *= (1.0 + u_beat_intensity * 0.3); // 0.3: Salto con beat.
+
+    // --- AJUSTE DE POSICIÓN (CON BASE, SIN TECHO) ---
+    // 1. Definimos una base fija para que se vea la parte de abajo.
+    float base_height = 0.05; // Las barras empiezan al 5% de la altura.
+    
+    // 2. La altura final es la base + la altura calculada.
+    // Ya no hay 'max_height' ni 'clamp'. La altura es libre y natural.
+    float final_bar_height = base_height + height;
+
+    // 3. Dibujamos la barra SÓLO entre la base y la altura final.
+    float top = smoothstep(final_bar_height - 0.01, final_bar_height, uv.y); // Borde suave arriba
+    float bottom = smoothstep(base_height - 0.01, base_height, uv.y); // Borde suave abajo
+    float bar_fill = bottom - top; // Relleno
+
+    // 4. Ajustamos el degradado para que empiece en la base de la barra.
+    float bar_relative_y = (uv.y - base_height) / (final_bar_height - base_height);
+    float gradient = 0.3 + bar_relative_y * 0.7; // 0.3: Brillo base. 0.7: Intensidad del degradado.
+    
+    return bar_fill * gradient;
+}
@@ -0,0 +1,85 @@
+// @name: Pelo Cayendo
+// @cost: heavy
+// @particles: false
+
+// PATRÓN 36: Pelo Cayendo (Falling Hair) - OPTIMIZADO
+float pattern_falling_hair(vec2 uv, float time, float amp) {
+    float hair = 0.0;
+    // Número fijo de mechones (estable, sin bugs)
+    float num_strands = 100.0;
+    
+    for (float i = 0.0; i < num_strands; i += 1.0) {
+        // Posición horizontal de cada mechón
+        float x_base = i / (num_strands);
+        
+        // Semilla única para cada mechón
+        float strand_seed = random(vec2(x_base * 234.567, 789.123));
+        
+        // Velocidad de caída con MÁS VARIEDAD entre mechones
+        // 0.03: velocidad base | 0.05: MAYOR variación (antes 0.03)
+        float fall_speed = 0.03 + strand_seed * 0.05;
+        
+        // Tiempo de ciclo
+        float cycle_time = time * fall_speed + strand_seed * 100.0;
+        float y_progress = fract(cycle_time) * 1.5 - 0.3;
+        
+        // Longitud del mechón con MÁS VARIEDAD
+        // 0.2: longitud base | 0.25: MAYOR variación (antes 0.15)
+        float strand_length = 0.2 + strand_seed * 0.25;
+        
+        // Parámetros de curva con MÁS VARIEDAD
+        // 2.5 + 3.5: MAYOR rango de frecuencias (antes 3.0 + 2.0)
+        float wave_freq = 2.5 + strand_seed * 3.5;
+        // 0.05 + 0.08: MAYOR rango de amplitudes (antes 0.07 + 0.03)
+        float wave_amp = 0.05 + strand_seed * 0.08;
+        // Ondula un POQUITO más con ritmo rápido (0.2 = muy sutil)
+        wave_amp *= (1.0 + u_bass * 0.2);
+        
+        // Posición vertical relativa al mechón (0 = arriba, 1 = abajo)
+        float y_top = 1.3 - y_progress;
+        float y_bottom = y_top - strand_length;
+        
+        // Solo procesar si el mechón está cerca verticalmente
+        if (uv.y < y_top + 0.02 && uv.y > y_bottom - 0.02) {
+            // Normalizar posición vertical dentro del mechón (0-1)
+            float t = (y_top - uv.y) / strand_length;
+            t = clamp(t, 0.0, 1.0);
+            
+            // Calcular ondulación en este punto (con movimiento suave y constante)
+            float wave_offset = sin(t * strand_length * wave_freq + time * 0.5 + strand_seed* 6.28)* wave_amp;
+            
+            // Posición X esperada del mechón en esta altura
+            float expected_x = x_base + wave_offset;
+            
+            // Distancia horizontal al mechón
+            float dist_x = abs(uv.x - expected_x);
+            
+            // Grosor (más fino en las puntas)
+            float thickness = 0.004 * (1.0 - t*strand_seed * 1.1) * (1.0 + u_mid *strand_seed* 0.55);
+            
+            // Si estamos cerca del mechón
+            if (dist_x < thickness) {
+                // Intensidad basada en distancia
+                float intensity = 1.0 - (dist_x / thickness);
+                intensity = pow(intensity, 1.5); // Concentrar el brillo
+                
+                // Degradado a lo largo del mechón
+                float length_fade = 1.0 - t * 0.6*u_bass;
+                
+                // Fade suave en inicio y fin
+                float fade = smoothstep(0.0, 0.08, t) * smoothstep(1.0, 0.92, t);
+                
+                hair += intensity * length_fade * fade * 2.0;
+            }
+            
+            // Brillo en la punta (solo si estamos cerca del final)
+            if (t > 0.85) {
+                float tip_dist = length(uv - vec2(expected_x, y_bottom));
+                float tip_glow = smoothstep(0.015, 0.0, tip_dist) * u_beat_intensity * 1.5;
+                hair += u_bass*tip_glow;
+            }
+        }
+    }
+    
+    return hair;
+}
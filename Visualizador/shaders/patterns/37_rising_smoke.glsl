@@ -0,0 +1,62 @@
+// @name: Humo Ascendente
+// @cost: heavy
+// @particles: false
+
+// PATRÓN 37: Humo Ascendente
+float pattern_rising_smoke(vec2 uv, float time, float amp) {
+    float smoke = 0.0;
+    
+    // Ruido base para textura de humo
+    float noise1 = sin(uv.x * 10.0 + time * 0.5) * cos(uv.y * 8.0 - time * 0.3);
+    float noise2 = sin(uv.x * 15.0 - time * 0.4) * cos(uv.y * 12.0 + time * 0.6);
+    float turbulence = (noise1 + noise2) * 0.015;
+    
+    // Múltiples columnas de humo CONTINUAS con ciclos desfasados
+    for (float i = 0.0; i < 20.0; i += 1.0) {
+        float x_base = (i + 0.5) / 15.0;
+        float col_seed = random(vec2(x_base * 567.89, 234.56));
+        
+        // Velocidad de subida variable
+        float rise_speed = 0.06 + col_seed * 0.03;
+        rise_speed *= (1.0 + u_mid * 0.3);
+        
+        // DESFASE ÚNICO para cada columna - CRUCIAL para evitar sincronización
+        float time_offset = i * 7.5 + col_seed * 20.0;
+        
+        // Ciclo cada 2.5 unidades - MÁS LARGO para más continuidad
+        float cycle_height = 2.5;
+        float animated_time = (time + time_offset) * rise_speed;
+        float y_base = mod(animated_time, cycle_height) - 0.3;
+        
+        // Calcular distancia vertical al píxel desde la base de este ciclo
+        float y_from_base = uv.y - y_base;
+        
+        // El humo existe en una ventana de altura MÁS AMPLIA
+        if (y_from_base > 0.0 && y_from_base < cycle_height) {
+            // Progreso en el ciclo (0 = base, 1 = arriba)
+            float progress = y_from_base / cycle_height;
+            
+            // Ondulación lateral (aumenta con altura)
+            float sway_amount = progress * 0.1;
+            float sway = sin(uv.y * 4.0 + time + col_seed * 6.28) * sway_amount;
+            sway += cos(uv.y * 2.5 - time * 0.7 + col_seed * 3.14) * sway_amount * 0.6;
+            
+            // Posición X con turbulencia
+            float x_pos = x_base + sway + turbulence;
+            float dist_x = abs(uv.x - x_pos);
+            
+            // Grosor aumenta con la altura
+            float width = 0.012 * (1.0 + progress * progress * 5.0);
+            
+            // Intensidad con distribución suave
+            float intensity = exp(-dist_x * dist_x / (width * width * 0.5));
+            
+            // Fade: aparece suave abajo, desaparece suave arriba
+            float fade = smoothstep(0.0, 0.05, progress) * smoothstep(1.0, 0.85, progress);
+            
+            smoke += intensity * fade * 2.5;
+        }
+    }
+    
+    return smoke;
+}
@@ -0,0 +1,42 @@
+// @name: Confeti Cayendo
+// @cost: heavy
+// @particles: false
+
+// PATRÓN 38: Confeti Cayendo
+float pattern_confetti(vec2 uv, float time, float amp) {
+    float confetti = 0.0;
+    float num_pieces = 40.0;
+    
+    for (float i = 0.0; i < num_pieces; i += 1.0) {
+        float x_base = i / num_pieces;
+        float piece_seed = random(vec2(x_base * 456.789, 123.456));
+        
+        // Velocidad errática
+        float fall_speed = 0.05 + piece_seed * 0.04;
+        fall_speed *= (1.0 + u_beat_intensity * 0.8);
+        
+        float cycle_time = time * fall_speed + piece_seed * 100.0;
+        float y_progress = fract(cycle_time) * 1.5 - 0.3;
+        float y_pos = 1.3 - y_progress;
+        
+        // Movimiento caótico horizontal
+        float spin_time = time * (2.0 + piece_seed * 3.0);
+        float x_drift = sin(y_progress * 5.0 + spin_time) * 0.15;
+        float x_pos = x_base + x_drift;
+        
+        // Rotación del confeti (simula forma rectangular)
+        float rotation = spin_time + piece_seed * 6.28;
+        float size_x = 0.015 * abs(cos(rotation)) + 0.003;
+        float size_y = 0.008 * abs(sin(rotation)) + 0.002;
+        
+        vec2 piece_pos = vec2(x_pos, y_pos);
+        vec2 dist = abs(uv - piece_pos);
+        
+        if (dist.x < size_x && dist.y < size_y) {
+            float intensity = (1.0 - dist.x / size_x) * (1.0 - dist.y / size_y);
+            confetti += intensity * 4.0;
+        }
+    }
+    
+    return confetti;
+}
@@ -0,0 +1,45 @@
+// @name: Estrellas Fugaces
+// @cost: heavy
+// @particles: false
+
+// PATRÓN 39: Estrellas Fugaces
+float pattern_shooting_stars(vec2 uv, float time, float amp) {
+    float stars = 0.0;
+    float num_stars = 8.0;
+    
+    for (float i = 0.0; i < num_stars; i += 1.0) {
+        float star_seed = random(vec2(i * 678.901, 234.567));
+        
+        // Velocidad muy rápida
+        float speed = 0.3 + star_seed * 0.2;
+        speed *= (1.0 + u_bass * 0.5);
+        
+        float cycle_time = time * speed + star_seed * 50.0;
+        float progress = fract(cycle_time);
+        
+        // Trayectoria diagonal
+        float start_x = 0.2 + star_seed * 0.6;
+        float start_y = 1.2;
+        float angle = -0.5 - star_seed * 0.3;
+        
+        vec2 star_pos = vec2(
+            start_x + cos(angle) * progress * 1.5,
+            start_y + sin(angle) * progress * 1.5
+        );
+        
+        // Estela brillante
+        for (float tail = 0.0; tail < 8.0; tail += 1.0) {
+            float tail_offset = tail * 0.015;
+            vec2 tail_pos = star_pos - vec2(cos(angle), sin(angle)) * tail_offset;
+            
+            float dist = length(uv - tail_pos);
+            float tail_fade = 1.0 - tail / 8.0;
+            float glow = smoothstep(0.025, 0.0, dist) * tail_fade * 5.0;
+            
+            // Más brillante con beats
+            stars += glow * (1.5 + u_beat_intensity * 1.0);
+        }
+    }
+    
+    return stars;
+}
@@ -0,0 +1,50 @@
+// @name: Globos Subiendo
+// @cost: heavy
+// @particles: false
+
+// PATRÓN 40: Globos Subiendo
+float pattern_rising_balloons(vec2 uv, float time, float amp) {
+    float balloons = 0.0;
+    float num_balloons = 15.0;
+    
+    for (float i = 0.0; i < num_balloons; i += 1.0) {
+        float x_base = i / num_balloons;
+        float balloon_seed = random(vec2(x_base * 567.890, 345.678));
+        
+        // Velocidad de subida lenta
+        float rise_speed = 0.015 + balloon_seed * 0.01;
+        rise_speed *= (1.0 + u_mid * 0.2);
+        
+        float cycle_time = time * rise_speed + balloon_seed * 100.0;
+        float y_progress = fract(cycle_time) * 1.5 - 0.3;
+        float y_pos = -0.3 + y_progress;
+        
+        // Balanceo suave
+        float sway = sin(time * 1.5 + balloon_seed * 6.28) * 0.08;
+        float x_pos = x_base + sway;
+        
+        vec2 balloon_pos = vec2(x_pos, y_pos);
+        float dist = length(uv - balloon_pos);
+        
+        // Forma de globo (círculo con reflejo)
+        float balloon_size = 0.025 + balloon_seed * 0.015;
+        float balloon_shape = smoothstep(balloon_size, balloon_size * 0.7, dist);
+        
+        // Reflejo brillante
+        vec2 highlight_offset = vec2(-0.008, 0.012);
+        float highlight_dist = length(uv - balloon_pos - highlight_offset);
+        float highlight = smoothstep(0.008, 0.0, highlight_dist) * 1.5;
+        
+        // Cuerda del globo
+        float string_x = abs(uv.x - x_pos);
+        float string_y_start = y_pos - balloon_size;
+        float string_length = 0.1;
+        if (uv.y < string_y_start && uv.y > string_y_start - string_length && string_x < 0.001) {
+            balloons += 0.5;
+        }
+        
+        balloons += (1.0 - balloon_shape) * (3.0 + u_treble * 0.5) + highlight;
+    }
+    
+    return balloons;
+}
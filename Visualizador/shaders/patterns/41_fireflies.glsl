@@ -0,0 +1,40 @@
+// @name: Luciérnagas
+// @cost: heavy
+// @particles: false
+
+// PATRÓN 41: Luciérnagas
+float pattern_fireflies(vec2 uv, float time, float amp) {
+    float fireflies = 0.0;
+    float num_fireflies = 30.0;
+    
+    for (float i = 0.0; i < num_fireflies; i += 1.0) {
+        float fly_seed = random(vec2(i * 789.012, 456.789));
+        
+        // Movimiento errático en todas direcciones
+        float move_speed = 0.05 + fly_seed * 0.03;
+        float cycle = time * move_speed + fly_seed * 100.0;
+        
+        // Trayectoria serpenteante
+        float x_pos = 0.5 + sin(cycle * 2.0 + fly_seed * 6.28) * 0.4;
+        x_pos += cos(cycle * 3.5 + fly_seed * 3.14) * 0.15;
+        
+        float y_pos = 0.5 + cos(cycle * 1.8 + fly_seed * 4.71) * 0.4;
+        y_pos += sin(cycle * 2.7 + fly_seed * 1.57) * 0.15;
+        
+        vec2 fly_pos = vec2(x_pos, y_pos);
+        float dist = length(uv - fly_pos);
+        
+        // Parpadeo
+        float blink_cycle = time * (3.0 + fly_seed * 2.0) + fly_seed * 10.0;
+        float blink = pow(sin(blink_cycle) * 0.5 + 0.5, 3.0);
+        blink *= (0.7 + u_beat_intensity * 0.3);
+        
+        // Resplandor suave
+        float glow = smoothstep(0.025, 0.0, dist) * 4.0;
+        float halo = smoothstep(0.05, 0.0, dist) * 1.0;
+        
+        fireflies += (glow + halo) * blink;
+    }
+    
+    return fireflies;
+}
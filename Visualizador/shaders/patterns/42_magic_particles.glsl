@@ -0,0 +1,47 @@
+// @name: Partículas Mágicas
+// @cost: heavy
+// @particles: false
+
+// PATRÓN 42: Partículas Mágicas
+float pattern_magic_particles(vec2 uv, float time, float amp) {
+    float magic = 0.0;
+    float num_particles = 40.0;
+    
+    for (float i = 0.0; i < num_particles; i += 1.0) {
+        float particle_seed = random(vec2(i * 890.123, 567.890));
+        
+        // Velocidad de subida con variación
+        float rise_speed = 0.03 + particle_seed * 0.02;
+        rise_speed *= (1.0 + u_treble * 0.4);
+        
+        float cycle_time = time * rise_speed + particle_seed * 100.0;
+        float y_progress = fract(cycle_time);
+        
+        // Espiral ascendente
+        float spiral_radius = 0.15 + sin(y_progress * 6.28 * 2.0) * 0.1;
+        float spiral_angle = y_progress * 12.56 + particle_seed * 6.28;
+        
+        float center_x = 0.3 + particle_seed * 0.4;
+        float x_pos = center_x + cos(spiral_angle) * spiral_radius * (1.0 - y_progress * 0.3);
+        float y_pos = -0.2 + y_progress * 1.4;
+        
+        vec2 particle_pos = vec2(x_pos, y_pos);
+        float dist = length(uv - particle_pos);
+        
+        // Brillo pulsante
+        float pulse = sin(time * 5.0 + particle_seed * 6.28) * 0.3 + 0.7;
+        pulse *= (1.0 + u_beat_intensity * 0.5);
+        
+        // Partícula brillante con estela
+        float core = smoothstep(0.01, 0.0, dist) * 5.0;
+        float glow = smoothstep(0.03, 0.0, dist) * 2.5;
+        float halo = smoothstep(0.05, 0.0, dist) * 1.0;
+        
+        // Se desvanece al llegar arriba
+        float fade = 1.0 - pow(y_progress, 2.0);
+        
+        magic += (core + glow + halo) * pulse * fade;
+    }
+    
+    return magic;
+}
@@ -0,0 +1,49 @@
+#version 120
+
+// Composición final: escena + bloom, viñeta, contraste y saturación.
+// Lee la escena del FBO (puede estar a menor resolución que la pantalla).
+
+uniform sampler2D u_scene;
+uniform sampler2D u_bloom0;
+uniform sampler2D u_bloom1;
+uniform sampler2D u_bloom2;
+uniform int u_bloom_levels;
+uniform vec2 u_scene_scale;   // Parte usada del FBO de escena (modo ahorro < 1.0)
+uniform vec2 u_output_size;
+uniform vec2 u_wall_grid;     // Videowall: tiles (columnas, filas); (1, 1) sin videowall
+uniform vec2 u_wall_tile;     // Tile de este proceso (desde abajo a la izquierda)
+uniform float u_bloom_intensity;
+uniform float u_vignette_intensity;
+uniform float u_contrast;
+uniform float u_saturation;
+
+void main() {
+    vec2 uv = gl_FragCoord.xy / u_output_size;
+    vec3 final = texture2D(u_scene, uv * u_scene_scale).rgb;
+
+    if (u_bloom_levels > 0) {
+        vec3 bloom = texture2D(u_bloom0, uv).rgb;
+        if (u_bloom_levels > 1) bloom += texture2D(u_bloom1, uv).rgb;
+        if (u_bloom_levels > 2) bloom += texture2D(u_bloom2, uv).rgb;
+        // 2.0: Ganancia del resplandor (equivale al antiguo bloom por píxel)
+        final += bloom * u_bloom_intensity * 2.0;
+    }
+
+    if (u_vignette_intensity > 0.0) {
+        // La viñeta es del lienzo completo, no de cada tile del videowall
+        vec2 canvas_uv = (uv + u_wall_tile) / u_wall_grid;
+        float dist = length(canvas_uv - 0.5);
+        float vig = smoothstep(0.8, 0.3, dist);
+        vig = mix(1.0, vig, u_vignette_intensity);
+        final *= vig;
+    }
+
+    final = clamp((final - 0.5) * u_contrast + 0.5, 0.0, 1.0);
+
+    float lum = dot(final, vec3(0.299, 0.587, 0.114));
+    final = mix(vec3(lum), final, u_saturation);
+
+    final = clamp(final, 0.0, 1.0);
+
+    gl_FragColor = vec4(final, 1.0);
+}
@@ -0,0 +1,341 @@
+# ============================================================================
+# SIMULATION.PY - NÚCLEO DETERMINISTA DEL VISUALIZADOR (SIN PANTALLA NI AUDIO)
+# ============================================================================
+# Toda la lógica que avanza el estado del visualizador frame a frame vive en
+# step(state, features, dt):
+# - Aplicación de los rasgos de audio (amplitud, bandas, espectro)
+# - Detección de beats (umbral adaptativo + cooldown), color y partículas
+# - Programación de patrones por beats (modos order / random) y transiciones
+#
+# step() no usa pygame, relojes ni dispositivos: el tiempo lo marca dt y el
+# azar sale de generadores con semilla guardados en el estado. Con la misma
+# semilla y la misma secuencia de rasgos el resultado es siempre idéntico,
+# así que una traza de audio se puede repetir miles de veces por segundo
+# para medir rendimiento o detectar regresiones.
+#
+# Uso sin pantalla (mide pasos por segundo con rasgos sintéticos):
+#     python simulation.py
+# ============================================================================
+
+import random
+import time
+import numpy as np
+import config
+from collections import deque
+from particles import ParticleSystem
+from realtime_log import LOG, DEBUG
+from typing import Any, Dict, Iterable, List, Optional
+
+
+_LOG_PATTERN_CHANGE = LOG.message(DEBUG, "🎨 CAMBIO DE PATRÓN a: {0:.0f}. Próximo cambio en {1:.0f} beats.")
+
+
+class AudioFeatures:
+    """
+    Rasgos de un bloque de audio: la entrada de step().
+
+    Los produce AudioHandler a partir del audio en vivo, o una fuente de
+    repetición a partir de una traza grabada.
+    """
+
+    def __init__(self, amplitude: float, bass: float = 0.0, mid: float = 0.0, treble: float = 0.0,
+                 beat_energy: float = 0.0, beat_threshold: float = 1.0,
+                 spectrum: Optional[np.ndarray] = None, waveform: Optional[np.ndarray] = None,
+                 full_analysis: bool = True, beat_candidate: Optional[bool] = None):
+        """
+        Args:
+            amplitude: RMS del bloque multiplicado por SENSITIVITY
+            bass, mid, treble: Energía suavizada de cada banda
+            beat_energy: Fracción de la energía del espectro en BEAT_FREQ_RANGE
+            beat_threshold: Umbral adaptativo vigente para este bloque
+            spectrum, waveform: Texturas del shader (None = se conservan las anteriores)
+            full_analysis: False si solo se midió el RMS (modo ahorro): sin bandas ni beats
+            beat_candidate: Decisión ya tomada (p. ej. la grabada en una traza);
+                None = se compara beat_energy con beat_threshold
+        """
+        self.amplitude = amplitude
+        self.bass = bass
+        self.mid = mid
+        self.treble = treble
+        self.beat_energy = beat_energy
+        self.beat_threshold = beat_threshold
+        self.spectrum = spectrum
+        self.waveform = waveform
+        self.full_analysis = full_analysis
+        self._beat_candidate = beat_candidate
+
+    @property
+    def beat_candidate(self) -> bool:
+        """True si la energía supera el umbral (el cooldown lo aplica step())."""
+        if not self.full_analysis:
+            return False
+        if self._beat_candidate is not None:
+            return self._beat_candidate
+        return self.beat_energy > self.beat_threshold
+
+
+# ============================================================================
+# ESTADO
+# ============================================================================
+
+def get_next_beat_target(state: Dict[str, Any]) -> int:
+    """
+    Obtiene el número de beats para el próximo cambio de patrón,
+    según el modo seleccionado.
+    """
+    if state['pattern_mode'] == "random":
+        # Número aleatorio dentro del rango especificado en config.py
+        return state['rng'].randint(config.RANDOM_BEAT_RANGE[0], config.RANDOM_BEAT_RANGE[1])
+    # Número fijo del modo "order"
+    return config.SHAPE_CHANGE_BEATS
+
+
+def next_pattern_index(state: Dict[str, Any]) -> int:
+    """
+    Elige el siguiente patrón entre los programados (los compilados en el shader),
+    según el modo: aleatorio distinto del actual, o el siguiente en orden.
+    """
+    scheduled = state['scheduled_patterns']
+    if len(scheduled) == 1:
+        return scheduled[0]
+    if state['pattern_mode'] == "random":
+        candidates = [i for i in scheduled if i != state['pattern_index']]
+        return state['rng'].choice(candidates)
+    position = scheduled.index(state['pattern_index']) if state['pattern_index'] in scheduled else -1
+    return scheduled[(position + 1) % len(scheduled)]
+
+
+def initialize_state(pattern_mode: str, scheduled_patterns: List[int],
+                     initial_pattern: int = 0, seed: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Inicializa el diccionario de estado que contiene toda la información
+    del visualizador que cambia en cada frame.
+
+    Args:
+        pattern_mode: Modo elegido ('admin', 'random', 'order')
+        scheduled_patterns: Índices de los patrones compilados en el shader
+        initial_pattern: Patrón inicial (el elegido en modo admin)
+        seed: Semilla de los generadores aleatorios (None = aleatoria)
+
+    Returns:
+        Diccionario con el estado inicial del visualizador
+    """
+    if seed is None:
+        seed = random.SystemRandom().randrange(2 ** 32)
+
+    state = {
+        # === TIEMPO ===
+        'current_time': 0.0,
+
+        # === AZAR (con semilla: ejecuciones reproducibles) ===
+        'seed': seed,
+        'rng': random.Random(seed),
+
+        # === AUDIO - AMPLITUD ===
+        'current_amplitude': 0.0,
+        'smoothed_amplitude': 0.0,
+        'amplitude_history': deque(maxlen=config.AUDIO_SMOOTHING_FRAMES),
+
+        # === AUDIO - BANDAS DE FRECUENCIA ===
+        'bass_energy': 0.0,
+        'mid_energy': 0.0,
+        'treble_energy': 0.0,
+
+        # === AUDIO - ESPECTRO COMPLETO Y FORMA DE ONDA ===
+        'spectrum': np.zeros(config.SPECTRUM_BINS, dtype=np.float32),
+        'waveform': np.zeros(config.WAVEFORM_SAMPLES, dtype=np.float32),
+        'audio_frame': 0,  # Se incrementa con cada bloque analizado
+
+        # === DETECCIÓN DE BEATS ===
+        'beat_last_time': 0.0,
+        'beat_count': 0,
+        'beat_number': 0,  # Beats de la sesión (en un nodo de render, los del nodo de captura)
+        'beat_intensity': 0.0,
+        'current_beat_target': 0,  # Se establecerá después de inicializar
+
+        # === COLORES ===
+        'color_index': 0,
+
+        # === PATRONES VISUALES ===
+        'pattern_mode': pattern_mode,  # Almacena el modo elegido ('admin', 'random', 'order')
+        'pattern_index': initial_pattern,  # Usa el índice inicial (0 o el elegido por admin)
+        'prev_pattern_index': initial_pattern,
+        'pattern_change_time': 0.0,
+        'transition_progress': 1.0,  # 0.0 = transición activa, 1.0 = sin transición
+        'scheduled_patterns': scheduled_patterns,
+
+        # === PARTÍCULAS/GOTAS (efectos generados por beats) ===
+        'particles': ParticleSystem(np.random.default_rng(seed)),
+
+        # === ESTADÍSTICAS ===
+        'frames_rendered': 0,
+        'beats_detected': 0,
+        'pattern_changes': 0,
+    }
+    # Establece el primer objetivo de beats
+    state['current_beat_target'] = get_next_beat_target(state)
+    return state
+
+
+# ============================================================================
+# PASO DE SIMULACIÓN
+# ============================================================================
+
+def set_pattern(state: Dict[str, Any], pattern_index: int) -> None:
+    """Cambia al patrón indicado (con transición) y fija el próximo objetivo de beats."""
+    state['beat_count'] = 0
+    state['pattern_change_time'] = state['current_time']
+    state['prev_pattern_index'] = state['pattern_index']
+    state['pattern_index'] = pattern_index
+    state['current_beat_target'] = get_next_beat_target(state)
+    state['pattern_changes'] += 1
+
+
+def advance_pattern(state: Dict[str, Any]) -> None:
+    """Pasa al siguiente patrón (por beats o manualmente) y fija el próximo objetivo."""
+    set_pattern(state, next_pattern_index(state))
+
+
+def _decay_audio(state: Dict[str, Any]) -> None:
+    """Sin audio nuevo: la amplitud y las bandas decaen."""
+    state['current_amplitude'] *= config.DECAY_RATE
+    state['smoothed_amplitude'] *= config.DECAY_RATE
+    state['bass_energy'] *= config.DECAY_RATE
+    state['mid_energy'] *= config.DECAY_RATE
+    state['treble_energy'] *= config.DECAY_RATE
+
+
+def trigger_beat(state: Dict[str, Any], intensity: float, beat_number: Optional[int] = None) -> None:
+    """
+    Registra un beat: contador, intensidad, color y rayos de partículas.
+
+    Args:
+        state: Estado global
+        intensity: Intensidad del beat
+        beat_number: Número del beat en la sesión (None = el siguiente al último);
+            un nodo de render usa el del nodo de captura
+    """
+    state['beat_last_time'] = state['current_time']
+    state['beat_count'] += 1
+    state['beats_detected'] += 1
+    state['beat_number'] = state['beat_number'] + 1 if beat_number is None else beat_number
+    state['beat_intensity'] = intensity
+
+    state['color_index'] = (state['color_index'] + 1) % len(config.COLOR_PALETTE)
+
+    # Emisión en bloque de los rayos del beat (sin bucle por partícula). Su
+    # azar depende solo de (semilla, número de beat): todos los nodos que
+    # aplican ese beat sacan las mismas partículas, aunque se hayan perdido otros
+    rng = np.random.default_rng([state['seed'] & 0xFFFFFFFF, state['beat_number']])
+    state['particles'].spawn(state['current_time'], config.RAYS_PER_BEAT, rng)
+
+
+def _apply_features(state: Dict[str, Any], features: AudioFeatures, detect_beats: bool) -> None:
+    """Aplica los rasgos de un bloque de audio al estado."""
+    if features.full_analysis:
+        if features.spectrum is not None:
+            state['spectrum'] = features.spectrum
+        if features.waveform is not None:
+            state['waveform'] = features.waveform
+        state['audio_frame'] += 1
+
+        state['bass_energy'] = features.bass
+        state['mid_energy'] = features.mid
+        state['treble_energy'] = features.treble
+
+        # DETECCIÓN DE BEATS (umbral adaptativo del analizador + cooldown)
+        time_since_last_beat = state['current_time'] - state['beat_last_time']
+        if detect_beats and features.beat_candidate and time_since_last_beat > config.BEAT_COOLDOWN:
+            trigger_beat(state, min(features.beat_energy / features.beat_threshold, 2.0))
+    else:
+        # Solo puerta de RMS (modo ahorro): las bandas decaen
+        state['bass_energy'] *= config.DECAY_RATE
+        state['mid_energy'] *= config.DECAY_RATE
+        state['treble_energy'] *= config.DECAY_RATE
+
+    # CÁLCULO DE AMPLITUD
+    state['current_amplitude'] = max(features.amplitude, state['current_amplitude'] * config.DECAY_RATE)
+    state['amplitude_history'].append(state['current_amplitude'])
+    state['smoothed_amplitude'] = float(np.mean(state['amplitude_history']))
+
+
+def step(state: Dict[str, Any], features: Optional[AudioFeatures], dt: float,
+         local_decisions: bool = True) -> None:
+    """
+    Avanza la simulación un frame.
+
+    Args:
+        state: Estado creado con initialize_state() (se modifica en el sitio)
+        features: Rasgos del último bloque de audio, o None si no hay bloque nuevo
+        dt: Segundos transcurridos desde el paso anterior
+        local_decisions: False si los beats y cambios de patrón los decide otro
+            nodo (feature_net.py): aquí solo se aplican audio y transiciones
+    """
+    state['current_time'] += dt
+
+    if features is None:
+        _decay_audio(state)
+    else:
+        _apply_features(state, features, local_decisions)
+
+    # --- CAMBIO DE PATRÓN AUTOMÁTICO (bloqueado en modo admin) ---
+    if (local_decisions and state['pattern_mode'] != 'admin' and
+            state['beat_count'] >= state['current_beat_target']):
+        advance_pattern(state)
+        LOG.log(_LOG_PATTERN_CHANGE, state['pattern_index'], state['current_beat_target'])
+
+    # --- TRANSICIÓN ENTRE PATRONES ---
+    if config.PATTERN_TRANSITION_TIME > 0:
+        time_since_change = state['current_time'] - state['pattern_change_time']
+        state['transition_progress'] = min(time_since_change / config.PATTERN_TRANSITION_TIME, 1.0)
+    else:
+        state['transition_progress'] = 1.0
+
+
+def simulate(features: Iterable[Optional[AudioFeatures]], dt: float, pattern_mode: str,
+             scheduled_patterns: List[int], seed: int = 0) -> Dict[str, Any]:
+    """
+    Ejecuta step() sobre una secuencia de rasgos sin pantalla ni audio.
+
+    Args:
+        features: Rasgos de cada frame (None = frame sin bloque de audio nuevo)
+        dt: Paso de tiempo fijo en segundos
+        pattern_mode: 'admin', 'order' o 'random'
+        scheduled_patterns: Patrones programados
+        seed: Semilla de la simulación
+
+    Returns:
+        Estado final
+    """
+    state = initialize_state(pattern_mode, scheduled_patterns, scheduled_patterns[0], seed)
+    for frame_features in features:
+        step(state, frame_features, dt)
+    return state
+
+
+def _synthetic_features(frames: int, dt: float, bpm: float = 120.0) -> List[AudioFeatures]:
+    """Rasgos sintéticos con un golpe cada beat a 'bpm' (para medir el núcleo)."""
+    beat_period = 60.0 / bpm
+    result = []
+    for i in range(frames):
+        phase = (i * dt) % beat_period
+        on_beat = phase < dt
+        amplitude = 0.8 if on_beat else 0.2 * (1.0 - phase / beat_period)
+        result.append(AudioFeatures(amplitude, bass=amplitude, mid=0.3, treble=0.1,
+                                    beat_energy=0.6 if on_beat else 0.1, beat_threshold=0.3))
+    return result
+
+
+if __name__ == '__main__':
+    FRAMES = 60 * 60 * 10   # 10 minutos a 60 FPS
+    DT = 1.0 / 60.0
+    trace = _synthetic_features(FRAMES, DT)
+    patterns = list(range(config.TOTAL_PATTERNS))
+
+    start = time.perf_counter()
+    final_state = simulate(trace, DT, "random", patterns, seed=1234)
+    elapsed = time.perf_counter() - start
+
+    print(f"⏱️  {FRAMES} pasos en {elapsed:.3f} s ({FRAMES / elapsed:,.0f} pasos/s)")
+    print(f"   Beats: {final_state['beats_detected']} | Cambios de patrón: {final_state['pattern_changes']} | "
+          f"Patrón final: {final_state['pattern_index']}")
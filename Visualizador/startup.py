@@ -0,0 +1,240 @@
+# ============================================================================
+# STARTUP.PY - ARRANQUE EN PARALELO Y PERFIL DE TIEMPOS DE INICIO
+# ============================================================================
+# Mientras el usuario está en el menú se adelanta el trabajo lento del
+# arranque, de modo que al elegir un modo todo está (casi) listo:
+# - Hilos en segundo plano: banco de ruido (caché o generación con numpy),
+#   búsqueda del dispositivo de audio (sd.query_devices) y lectura/ensamblado
+#   del código del programa de escena.
+# - Hilo principal (dueño del contexto GL), entre dos frames del menú: se
+#   envían los shaders a compilar y linkear sin consultar el resultado. Con
+#   KHR_parallel_shader_compile el driver compila en sus propios hilos; el
+#   Renderer recoge el programa al crearse y solo espera si aún no ha acabado.
+#
+# El programa se prepara con los patrones de los modos order/random. En modo
+# admin se compila solo el patrón elegido y el precompilado se descarta.
+#
+# StartupProfiler mide cada fase (importaciones incluidas) y, con la opción
+# --startup-report, imprime el desglose al terminar el arranque.
+# ============================================================================
+
+import threading
+import time
+from contextlib import contextmanager
+from OpenGL.GL import *
+from noise_bank import load_noise_bank
+from audio_handler import find_loopback_device
+from pattern_registry import PatternRegistry
+from renderer import Renderer
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+
+class StartupProfiler:
+    """
+    Registro de las fases del arranque con su inicio y duración.
+
+    Características:
+    - Fases en primer plano (bloquean el arranque) y en segundo plano (solapadas)
+    - Seguro entre hilos (las tareas de fondo registran su propia duración)
+    - Informe tabulado con el instante de inicio relativo al proceso
+    """
+
+    def __init__(self, start: float):
+        """
+        Args:
+            start: Instante (time.perf_counter) en que empezó el programa
+        """
+        self.start = start
+        self.phases: List[Tuple[str, float, float, bool]] = []
+        self._lock = threading.Lock()
+
+    def record(self, name: str, begin: float, end: float, background: bool = False) -> None:
+        """Registra una fase ya medida."""
+        with self._lock:
+            self.phases.append((name, begin, end, background))
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """Mide el bloque 'with' como una fase en primer plano."""
+        begin = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, begin, time.perf_counter())
+
+    def report(self) -> None:
+        """Imprime el desglose de tiempos del arranque."""
+        total = time.perf_counter() - self.start
+        with self._lock:
+            phases = sorted(self.phases, key=lambda phase: phase[1])
+
+        print("\n" + "=" * 70)
+        print("   ⏱️  INFORME DE ARRANQUE")
+        print("=" * 70)
+        print(f"   {'Fase':<34}{'Inicio':>10}{'Duración':>12}")
+        for name, begin, end, background in phases:
+            label = f"{name} (fondo)" if background else name
+            print(f"   {label:<34}{(begin - self.start) * 1000:>8.1f} ms{(end - begin) * 1000:>9.1f} ms")
+        print("-" * 70)
+        print(f"   {'Total hasta el bucle principal':<34}{'':>10}{total * 1000:>9.1f} ms")
+        print("=" * 70)
+
+
+class StartupPreloader:
+    """
+    Trabajo de arranque adelantado mientras se muestra el menú.
+
+    Uso:
+        preloader = StartupPreloader(registry, profiler)
+        gui = GUI(display, on_idle=preloader.poll)    # envía la compilación
+        ...
+        Renderer(..., prepared_program=preloader.take_program(indices),
+                      noise_bank=preloader.result('noise_bank'))
+        AudioHandler(preloader.result('audio_device'))
+    """
+
+    def __init__(self, pattern_registry: PatternRegistry, profiler: StartupProfiler):
+        """
+        Lanza las tareas en segundo plano.
+
+        Args:
+            pattern_registry: Registro de patrones (para ensamblar el shader)
+            profiler: Perfil de arranque donde se registran las tareas
+        """
+        self.pattern_registry = pattern_registry
+        self.profiler = profiler
+        self._results: Dict[str, Any] = {}
+        self._threads: Dict[str, threading.Thread] = {}
+
+        # Programa enviado a compilar: (programa, vertex, fragment)
+        self.prepared_program: Optional[Tuple[int, int, int]] = None
+        self.prepared_indices: Optional[List[int]] = None
+        self._submitted = False
+
+        try:
+            self.prepared_indices = pattern_registry.scheduled_indices('order')
+        except ValueError:
+            # ENABLED_PATTERNS inválido: el error se informa al crear el Renderer
+            self.prepared_indices = None
+
+        self._start_task('noise_bank', load_noise_bank)
+        self._start_task('audio_device', find_loopback_device)
+        if self.prepared_indices is not None:
+            indices = self.prepared_indices
+            self._start_task('scene_sources',
+                             lambda: Renderer.build_scene_sources(pattern_registry, indices))
+
+    def _start_task(self, name: str, task: Callable[[], Any]) -> None:
+        """Ejecuta 'task' en un hilo daemon y guarda su resultado."""
+        def run() -> None:
+            begin = time.perf_counter()
+            try:
+                self._results[name] = task()
+            except Exception as e:
+                # El Renderer / AudioHandler repetirán el trabajo en primer plano
+                print(f"⚠️  Tarea de arranque '{name}' falló: {e}")
+                self._results[name] = None
+            self.profiler.record(name, begin, time.perf_counter(), background=True)
+
+        thread = threading.Thread(target=run, name=f"Startup-{name}", daemon=True)
+        self._threads[name] = thread
+        thread.start()
+
+    def result(self, name: str) -> Any:
+        """
+        Resultado de una tarea de fondo, esperando a que termine si hace falta.
+
+        Returns:
+            El valor devuelto por la tarea, o None si falló o no se lanzó
+        """
+        thread = self._threads.get(name)
+        if thread is None:
+            return None
+        if thread.is_alive():
+            with self.profiler.phase(f"espera: {name}"):
+                thread.join()
+        return self._results.get(name)
+
+    def poll(self) -> None:
+        """
+        Llamada entre frames del menú (hilo principal): en cuanto las fuentes
+        están listas, envía los shaders a compilar sin esperar el resultado.
+        """
+        if self._submitted:
+            return
+        thread = self._threads.get('scene_sources')
+        if thread is None or thread.is_alive():
+            return
+        self._submitted = True
+
+        sources = self._results.get('scene_sources')
+        if sources is None:
+            return
+
+        begin = time.perf_counter()
+        self._enable_parallel_compile()
+        vertex_source, fragment_source = sources
+        vertex_shader = glCreateShader(GL_VERTEX_SHADER)
+        glShaderSource(vertex_shader, vertex_source)
+        glCompileShader(vertex_shader)
+        fragment_shader = glCreateShader(GL_FRAGMENT_SHADER)
+        glShaderSource(fragment_shader, fragment_source)
+        glCompileShader(fragment_shader)
+
+        program = glCreateProgram()
+        glAttachShader(program, vertex_shader)
+        glAttachShader(program, fragment_shader)
+        glLinkProgram(program)
+        glFlush()
+
+        self.prepared_program = (program, vertex_shader, fragment_shader)
+        self.profiler.record("envío de shaders a compilar", begin, time.perf_counter())
+
+    def _enable_parallel_compile(self) -> None:
+        """Pide al driver todos sus hilos de compilación (KHR/ARB_parallel_shader_compile)."""
+        try:
+            from OpenGL.GL.KHR.parallel_shader_compile import glMaxShaderCompilerThreadsKHR
+            if bool(glMaxShaderCompilerThreadsKHR):
+                glMaxShaderCompilerThreadsKHR(0xFFFFFFFF)
+                return
+            from OpenGL.GL.ARB.parallel_shader_compile import glMaxShaderCompilerThreadsARB
+            if bool(glMaxShaderCompilerThreadsARB):
+                glMaxShaderCompilerThreadsARB(0xFFFFFFFF)
+        except Exception:
+            # Sin la extensión el driver compila igual (de forma síncrona o diferida)
+            pass
+
+    def take_program(self, scheduled_patterns: List[int]) -> Optional[Tuple[int, int, int]]:
+        """
+        Entrega el programa precompilado si corresponde a los patrones de la sesión.
+
+        Args:
+            scheduled_patterns: Patrones que va a compilar el Renderer
+
+        Returns:
+            (programa, vertex, fragment) o None (en cuyo caso se descarta)
+        """
+        # Si el usuario eligió muy rápido, la compilación se envía ahora
+        self.result('scene_sources')
+        self.poll()
+
+        prepared, self.prepared_program = self.prepared_program, None
+        if prepared is None:
+            return None
+        if scheduled_patterns == self.prepared_indices:
+            return prepared
+
+        program, vertex_shader, fragment_shader = prepared
+        glDeleteShader(vertex_shader)
+        glDeleteShader(fragment_shader)
+        glDeleteProgram(program)
+        return None
+
+    def close(self) -> None:
+        """Libera el programa precompilado si nadie lo recogió (p. ej. al salir desde el menú)."""
+        if self.prepared_program is not None:
+            program, vertex_shader, fragment_shader = self.prepared_program
+            self.prepared_program = None
+            glDeleteShader(vertex_shader)
+            glDeleteShader(fragment_shader)
+            glDeleteProgram(program)
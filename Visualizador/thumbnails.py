@@ -0,0 +1,254 @@
+# ============================================================================
+# THUMBNAILS.PY - ATLAS DE MINIATURAS ANIMADAS DE LOS PATRONES
+# ============================================================================
+# El menú admin muestra una miniatura animada de cada patrón en lugar de un
+# simple número. Para que abrir el menú no cueste 43 renders a resolución
+# completa:
+# - Todas las miniaturas (THUMBNAIL_FRAMES frames de cada patrón, a
+#   THUMBNAIL_SIZE) se dibujan en una sola pasada sobre un único FBO atlas,
+#   con un solo programa que contiene todos los patrones, y se leen de la GPU
+#   con una única llamada a glReadPixels.
+# - El resultado se guarda en CACHE_DIR con el hash del código de los shaders
+#   (y de los parámetros de las miniaturas) como clave: en los siguientes
+#   arranques solo se lee el fichero, sin ninguna llamada GL.
+#
+# El audio de las miniaturas es sintético (amplitud y bandas fijas), así que
+# la imagen es estable y reproducible.
+# ============================================================================
+
+import hashlib
+import os
+import numpy as np
+import pygame
+from OpenGL.GL import *
+from OpenGL.GL import shaders
+import config
+from noise_bank import load_noise_bank, NOISE_BANK_VERSION
+from pattern_registry import PatternRegistry
+from postprocess import RenderTarget
+from renderer import Renderer
+from typing import List, Optional, Tuple
+
+# Versión del formato de la caché (cambiarla invalida las miniaturas guardadas)
+THUMBNAIL_CACHE_VERSION: int = 1
+
+# Audio sintético con el que se animan las miniaturas
+THUMBNAIL_AMPLITUDE: float = 0.6
+THUMBNAIL_BANDS = (0.5, 0.35, 0.25)     # bass, mid, treble
+
+
+class ThumbnailAtlas:
+    """
+    Miniaturas de todos los patrones, renderizadas una vez y cacheadas en disco.
+
+    Características:
+    - Una sola pasada de render para todos los patrones y frames
+    - Caché en disco indexada por el hash de los shaders ensamblados
+    - Carga perezosa: no hace nada hasta que se abre el menú admin
+    - Devuelve Surfaces de pygame listas para dibujar en el menú
+    """
+
+    def __init__(self, pattern_registry: PatternRegistry):
+        """
+        Args:
+            pattern_registry: Registro de patrones (se incluyen todos)
+        """
+        self.pattern_registry = pattern_registry
+        self.width, self.height = config.THUMBNAIL_SIZE
+        self.frames: int = config.THUMBNAIL_FRAMES
+        self._surfaces: Optional[List[List[pygame.Surface]]] = None
+        self._failed: bool = False
+
+    def _cache_path(self, vertex_source: str, fragment_source: str) -> str:
+        """Fichero de caché para este código de shaders y estos parámetros."""
+        key = hashlib.sha256()
+        for part in (vertex_source, fragment_source,
+                     f"{THUMBNAIL_CACHE_VERSION}:{self.width}x{self.height}x{self.frames}",
+                     f"{config.THUMBNAIL_FRAME_INTERVAL}:{config.COLOR_PALETTE}",
+                     f"{NOISE_BANK_VERSION}:{config.NOISE_TEXTURE_SIZE}:{config.NOISE_SEED}"):
+            key.update(part.encode('utf-8'))
+        filename = f"thumbnails_{key.hexdigest()[:16]}.npy"
+        return os.path.join(config.CACHE_DIR, filename)
+
+    def surfaces(self) -> Optional[List[List[pygame.Surface]]]:
+        """
+        Miniaturas por patrón (lista de frames), cargadas o renderizadas al primer uso.
+
+        Returns:
+            surfaces[patrón][frame], o None si no se pudieron generar
+        """
+        if self._surfaces is not None or self._failed:
+            return self._surfaces
+
+        try:
+            indices = list(range(len(self.pattern_registry)))
+            vertex_source, fragment_source = Renderer.build_scene_sources(self.pattern_registry, indices)
+            path = self._cache_path(vertex_source, fragment_source)
+
+            thumbnails = self._load_cache(path)
+            if thumbnails is None:
+                thumbnails = self._render(vertex_source, fragment_source)
+                self._save_cache(path, thumbnails)
+        except Exception as e:
+            # Sin miniaturas el menú admin vuelve a los botones numerados
+            print(f"⚠️  No se pudieron generar las miniaturas de los patrones: {e}")
+            self._failed = True
+            return None
+
+        self._surfaces = [
+            [pygame.image.frombuffer(thumbnails[i, f].tobytes(), (self.width, self.height), "RGB")
+             for f in range(self.frames)]
+            for i in range(thumbnails.shape[0])
+        ]
+        return self._surfaces
+
+    def _load_cache(self, path: str) -> Optional[np.ndarray]:
+        """Lee las miniaturas de disco si existen y tienen la forma esperada."""
+        expected = (len(self.pattern_registry), self.frames, self.height, self.width, 3)
+        try:
+            thumbnails = np.load(path)
+        except (OSError, ValueError):
+            return None
+        if thumbnails.shape != expected or thumbnails.dtype != np.uint8:
+            return None
+        print(f"   🖼️  Miniaturas cargadas de caché: {path}")
+        return thumbnails
+
+    def _save_cache(self, path: str, thumbnails: np.ndarray) -> None:
+        """Guarda las miniaturas (si falla solo se pierde tiempo en el próximo arranque)."""
+        try:
+            os.makedirs(config.CACHE_DIR, exist_ok=True)
+            np.save(path, thumbnails)
+        except OSError as e:
+            print(f"⚠️  No se pudo guardar la caché de miniaturas: {e}")
+
+    def _render(self, vertex_source: str, fragment_source: str) -> np.ndarray:
+        """
+        Dibuja todas las miniaturas en un FBO atlas y las lee de una vez.
+
+        Returns:
+            Array uint8 de forma (patrones, frames, alto, ancho, 3), filas de arriba abajo
+        """
+        count = len(self.pattern_registry)
+        width, height = self.width, self.height
+        vertex_shader = shaders.compileShader(vertex_source, GL_VERTEX_SHADER)
+        fragment_shader = shaders.compileShader(fragment_source, GL_FRAGMENT_SHADER)
+        program = shaders.compileProgram(vertex_shader, fragment_shader)
+
+        # Atlas: una columna por frame y una fila por patrón
+        atlas = RenderTarget(width * self.frames, height * count)
+
+        quad = np.array([-1.0, -1.0, 1.0, -1.0, 1.0, 1.0, -1.0, 1.0], dtype=np.float32)
+        vbo = glGenBuffers(1)
+        glBindBuffer(GL_ARRAY_BUFFER, vbo)
+        glBufferData(GL_ARRAY_BUFFER, quad.nbytes, quad, GL_STATIC_DRAW)
+        position = glGetAttribLocation(program, "position")
+        glVertexAttribPointer(position, 2, GL_FLOAT, GL_FALSE, 0, None)
+        glEnableVertexAttribArray(position)
+
+        noise_texture, particle_texture, noise_size = self._bind_textures()
+        try:
+            glUseProgram(program)
+            self._set_constant_uniforms(program, noise_size)
+            u_time = glGetUniformLocation(program, "u_time")
+            u_last_beat_time = glGetUniformLocation(program, "u_last_beat_time")
+            u_pattern_index = glGetUniformLocation(program, "u_pattern_index")
+            u_prev_pattern_index = glGetUniformLocation(program, "u_prev_pattern_index")
+            u_base_color = glGetUniformLocation(program, "u_base_color")
+            u_frag_offset = glGetUniformLocation(program, "u_frag_offset")
+
+            glBindFramebuffer(GL_FRAMEBUFFER, atlas.fbo)
+            for index in range(count):
+                glUniform1i(u_pattern_index, index)
+                glUniform1i(u_prev_pattern_index, index)
+                glUniform3fv(u_base_color, 1, config.COLOR_PALETTE[index % len(config.COLOR_PALETTE)])
+                for frame in range(self.frames):
+                    t = 1.0 + frame * config.THUMBNAIL_FRAME_INTERVAL
+                    glUniform1f(u_time, t)
+                    glUniform1f(u_last_beat_time, t - 0.25)
+                    # Celda del atlas (origen abajo a la izquierda en OpenGL)
+                    x, y = frame * width, index * height
+                    glViewport(x, y, width, height)
+                    glUniform2f(u_frag_offset, float(x), float(y))
+                    glDrawArrays(GL_QUADS, 0, 4)
+
+            glPixelStorei(GL_PACK_ALIGNMENT, 1)
+            pixels = glReadPixels(0, 0, atlas.width, atlas.height, GL_RGB, GL_UNSIGNED_BYTE)
+        finally:
+            glBindFramebuffer(GL_FRAMEBUFFER, 0)
+            glUseProgram(0)
+            glDisableVertexAttribArray(position)
+            glBindBuffer(GL_ARRAY_BUFFER, 0)
+            glDeleteBuffers(1, [vbo])
+            glDeleteTextures([noise_texture, particle_texture])
+            glActiveTexture(GL_TEXTURE0)
+            glDeleteProgram(program)
+            atlas.delete()
+
+        image = np.frombuffer(pixels, dtype=np.uint8).reshape(atlas.height, atlas.width, 3)
+        # (patrón, alto, frame, ancho, 3) -> (patrón, frame, alto, ancho, 3), con Y hacia abajo
+        cells = image.reshape(count, height, self.frames, width, 3).transpose(0, 2, 1, 3, 4)
+        thumbnails = np.ascontiguousarray(cells[:, :, ::-1])
+        print(f"   🖼️  Miniaturas renderizadas: {count} patrones x {self.frames} frames "
+              f"({width}x{height})")
+        return thumbnails
+
+    def _bind_textures(self) -> Tuple[int, int, float]:
+        """
+        Texturas mínimas que necesitan los patrones: ruido y bins de partículas vacíos.
+        Espectro, forma de onda y espectrograma quedan sin textura (se leen como 0).
+
+        Returns:
+            Tupla (textura de ruido, textura de partículas, lado del ruido)
+        """
+        bank = load_noise_bank()
+        noise_texture = glGenTextures(1)
+        glActiveTexture(GL_TEXTURE0 + Renderer.NOISE_TEXTURE_UNIT)
+        glBindTexture(GL_TEXTURE_2D, noise_texture)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_LINEAR)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_LINEAR)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_S, GL_REPEAT)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_T, GL_REPEAT)
+        glPixelStorei(GL_UNPACK_ALIGNMENT, 1)
+        glTexImage2D(GL_TEXTURE_2D, 0, GL_RGBA8, bank.shape[1], bank.shape[0], 0,
+                     GL_RGBA, GL_UNSIGNED_BYTE, bank)
+
+        # Un tile y un sector, sin partículas (semilla < 0 marca el final del bin)
+        empty_bins = np.zeros((2, config.PARTICLE_BIN_CAPACITY, 4), dtype=np.float32)
+        empty_bins[:, :, 3] = -1.0
+        particle_texture = glGenTextures(1)
+        glActiveTexture(GL_TEXTURE0 + Renderer.PARTICLE_TEXTURE_UNIT)
+        glBindTexture(GL_TEXTURE_2D, particle_texture)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_NEAREST)
+        glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_NEAREST)
+        glTexImage2D(GL_TEXTURE_2D, 0, GL_RGBA32F, config.PARTICLE_BIN_CAPACITY, 2, 0,
+                     GL_RGBA, GL_FLOAT, empty_bins)
+        glActiveTexture(GL_TEXTURE0)
+        return noise_texture, particle_texture, float(bank.shape[0])
+
+    def _set_constant_uniforms(self, program: int, noise_size: float) -> None:
+        """Uniforms comunes a todas las celdas (programa ya en uso)."""
+        def location(name: str) -> int:
+            return glGetUniformLocation(program, name)
+
+        glUniform2f(location("u_resolution"), float(self.width), float(self.height))
+        glUniform1f(location("u_amplitude"), THUMBNAIL_AMPLITUDE)
+        glUniform1f(location("u_smooth_amplitude"), THUMBNAIL_AMPLITUDE)
+        glUniform1f(location("u_bass"), THUMBNAIL_BANDS[0])
+        glUniform1f(location("u_mid"), THUMBNAIL_BANDS[1])
+        glUniform1f(location("u_treble"), THUMBNAIL_BANDS[2])
+        glUniform1f(location("u_beat_intensity"), THUMBNAIL_AMPLITUDE)
+        glUniform1f(location("u_transition_progress"), 1.0)
+        glUniform1i(location("u_checkerboard"), 0)
+
+        glUniform1i(location("u_noise_bank"), Renderer.NOISE_TEXTURE_UNIT)
+        glUniform1f(location("u_noise_size"), noise_size)
+        glUniform1i(location("u_particle_bins"), Renderer.PARTICLE_TEXTURE_UNIT)
+        glUniform2f(location("u_particle_grid"), 1.0, 1.0)
+        glUniform1f(location("u_particle_sectors"), 1.0)
+        glUniform1f(location("u_particle_bin_rows"), 2.0)
+        # Cada sampler en su unidad (dos tipos de sampler no pueden compartir unidad)
+        glUniform1i(location("u_spectrum"), Renderer.SPECTRUM_TEXTURE_UNIT)
+        glUniform1i(location("u_waveform"), Renderer.WAVEFORM_TEXTURE_UNIT)
+        glUniform1i(location("u_spectrogram"), Renderer.SPECTROGRAM_TEXTURE_UNIT)
+        glUniform1f(location("u_spectrogram_rows"), 1.0)